@@ -60,6 +60,9 @@ try:
     from V4codercli.rr4_complete_enchanced_v4_cli_core.task_executor import TaskExecutor, ProgressReporter
     from V4codercli.rr4_complete_enchanced_v4_cli_core.output_handler import OutputHandler
     from V4codercli.rr4_complete_enchanced_v4_cli_core.data_parser import DataParser
+    from V4codercli.rr4_complete_enchanced_v4_cli_core.connection_agent import (
+        ConnectionAgent, AgentClient, AgentError, running_agent, AGENT_SUPPORTED, DEFAULT_IDLE_TIMEOUT
+    )
     
     # Import from tasks directory  
     from V4codercli.rr4_complete_enchanced_v4_cli_tasks import get_layer_collector, get_available_layers, validate_layers
@@ -73,6 +76,9 @@ except ImportError as e:
     TaskExecutor = None
     OutputHandler = None
     DataParser = None
+    running_agent = None
+    AGENT_SUPPORTED = False
+    DEFAULT_IDLE_TIMEOUT = 600
     CORE_MODULES_AVAILABLE = False
 
 # Version information
@@ -708,23 +714,21 @@ class CollectionManager:
                 'port': int(self.config.get('jump_host_port', 22))
             }
             
-            # Load and convert inventory with jump host support
-            devices = self.inventory_loader.load_csv_inventory()
-            nornir_inventory = self.inventory_loader.generate_nornir_inventory(
-                devices, 
+            # Load and convert inventory with jump host support (cached while the CSV is unchanged;
+            # YAML files are only written when asked for)
+            devices, nornir_inventory = self.inventory_loader.compile_nornir_inventory(
                 self.config.get('device_username', 'cisco'),
                 self.config.get('device_password', 'cisco'),
-                jump_host_config
+                jump_host_config,
+                save_yaml=kwargs.get('save_inventory_yaml', False)
             )
             
-            # Save Nornir inventory
-            self.inventory_loader.save_nornir_inventory(nornir_inventory)
-            
             # Initialize connection manager with jump host config
             if ConnectionManager:
                 self.connection_manager = ConnectionManager(
                     jump_host_config=jump_host_config,
-                    max_connections=workers
+                    max_connections=workers,
+                    agent=running_agent()
                 )
             else:
                 raise CLIError("ConnectionManager not available - core modules missing")
@@ -742,7 +746,8 @@ class CollectionManager:
                     inventory=devices,
                     output_handler=self.output_handler,
                     max_workers=workers,
-                    timeout=timeout
+                    timeout=timeout,
+                    nornir_inventory=nornir_inventory
                 )
                 
                 # Add progress reporting
@@ -945,7 +950,7 @@ class CollectionManager:
             self._initialize_components(**kwargs)
             
             # Execute connectivity test
-            results = self.task_executor.execute_connectivity_test()
+            results = self.task_executor.execute_connectivity_test(fast=kwargs.get('fast', False))
             
             # Display results
             self._display_connectivity_results(results)
@@ -1456,8 +1461,9 @@ def collect_group(ctx, group, workers, timeout, output_dir, inventory, layers, e
 
 @cli.command()
 @click.option('--inventory', default=CONFIG['default_inventory'], help='Inventory CSV file path')
+@click.option('--export-nornir-yaml', is_flag=True, help='Write the generated Nornir inventory as YAML files')
 @click.pass_context
-def validate_inventory(ctx, inventory):
+def validate_inventory(ctx, inventory, export_nornir_yaml):
     """Validate inventory file format and connectivity."""
     logger = ctx.obj.get('logger')
     
@@ -1495,6 +1501,15 @@ def validate_inventory(ctx, inventory):
                 click.echo(f"... and {len(devices) - 10} more devices")
             
             click.echo("-" * 60)
+            
+            if export_nornir_yaml:
+                config = EnvironmentManager().get_config()
+                inventory_loader.compile_nornir_inventory(
+                    config.get('device_username', 'cisco'),
+                    config.get('device_password', 'cisco'),
+                    save_yaml=True
+                )
+                click.echo(f"💾 Nornir inventory written to {inventory_loader.config_dir / 'inventory'}")
         else:
             # Basic file format check
             with open(inventory, 'r') as f:
@@ -1657,8 +1672,9 @@ def update_env(ctx, env_file):
 @click.option('--workers', default=CONFIG['default_workers'], help='Number of concurrent workers')
 @click.option('--timeout', default=CONFIG['default_timeout'], help='Command timeout in seconds')
 @click.option('--inventory', default=CONFIG['default_inventory'], help='Inventory CSV file path')
+@click.option('--fast', is_flag=True, help='Only check TCP port 22 and the SSH banner (no login)')
 @click.pass_context
-def test_connectivity(ctx, workers, timeout, inventory):
+def test_connectivity(ctx, workers, timeout, inventory, fast):
     """Test connectivity to devices without collecting data."""
     logger = ctx.obj.get('logger')
     
@@ -1676,7 +1692,8 @@ def test_connectivity(ctx, workers, timeout, inventory):
         collection_manager.test_connectivity(
             workers=workers,
             timeout=timeout,
-            inventory=inventory
+            inventory=inventory,
+            fast=fast
         )
         
         logger.info("Connectivity test completed successfully")
@@ -1687,6 +1704,79 @@ def test_connectivity(ctx, workers, timeout, inventory):
         click.echo(f"❌ Connectivity test failed: {e}", err=True)
         sys.exit(1)
 
+@cli.group()
+def agent():
+    """Manage the local connection agent (warm SSH sessions shared across commands)."""
+    if not AGENT_SUPPORTED:
+        click.echo("❌ The connection agent needs Unix domain sockets (not available on this platform)", err=True)
+        sys.exit(1)
+
+@agent.command('start')
+@click.option('--idle-timeout', default=DEFAULT_IDLE_TIMEOUT, help='Close sessions unused for this many seconds')
+@click.option('--foreground', is_flag=True, help='Run in the foreground instead of as a daemon')
+@click.pass_context
+def agent_start(ctx, idle_timeout, foreground):
+    """Start the connection agent."""
+    client = AgentClient()
+    if client.is_running():
+        click.echo(f"✅ Connection agent already running ({client.socket_path})")
+        return
+    
+    if foreground:
+        config = EnvironmentManager().get_config()
+        jump_host_config = {
+            'hostname': config.get('jump_host_ip'),
+            'username': config.get('jump_host_username'),
+            'password': config.get('jump_host_password'),
+            'port': int(config.get('jump_host_port', 22))
+        }
+        click.echo(f"🔌 Connection agent listening on {client.socket_path} (Ctrl+C to stop)")
+        try:
+            ConnectionAgent(jump_host_config=jump_host_config, idle_timeout=idle_timeout,
+                            max_connections=int(config.get('max_concurrent_connections', CONFIG['default_workers']))).serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+    
+    # Re-launch this script detached in foreground mode; its output goes to the log directory
+    log_dir = Path("rr4-complete-enchanced-v4-cli-logs")
+    ensure_directory_exists(log_dir)
+    with open(log_dir / "connection-agent.log", 'a') as log:
+        subprocess.Popen([sys.executable, str(Path(__file__).absolute()), 'agent', 'start', '--foreground',
+                          '--idle-timeout', str(idle_timeout)],
+                         stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+    
+    for _ in range(50):
+        if client.is_running():
+            click.echo(f"✅ Connection agent started ({client.socket_path}, idle timeout {idle_timeout}s)")
+            return
+        time.sleep(0.2)
+    click.echo(f"❌ Connection agent did not start; see {log_dir / 'connection-agent.log'}", err=True)
+    sys.exit(1)
+
+@agent.command('stop')
+def agent_stop():
+    """Stop the connection agent and close its sessions."""
+    try:
+        AgentClient().shutdown()
+        click.echo("✅ Connection agent stopped")
+    except AgentError:
+        click.echo("ℹ️  Connection agent is not running")
+
+@agent.command('status')
+def agent_status():
+    """Show whether the connection agent is running and its warm sessions."""
+    client = AgentClient()
+    try:
+        stats = client.stats()
+    except AgentError:
+        click.echo("ℹ️  Connection agent is not running")
+        return
+    click.echo(f"✅ Connection agent running ({client.socket_path})")
+    click.echo(f"📊 Warm sessions: {stats['active_connections']}/{stats['max_connections']}")
+    for key, details in stats['connection_details'].items():
+        click.echo(f"  {details['hostname']:<20} used {details['usage_count']}x, idle {details['last_used_seconds_ago']:.0f}s")
+
 def main():
     """Main entry point for the CLI application."""
     try:
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Connection Agent Module for RR4 Complete Enhanced v4 CLI
+
+An opt-in local daemon that keeps jump host and device SSH sessions warm
+between CLI invocations. It listens on a Unix socket (newline-delimited
+JSON); CLI processes borrow its sessions through AgentSession objects,
+which stand in for Netmiko connections and run each command on the
+agent's already-authenticated session. Idle sessions are closed after
+idle_timeout seconds.
+
+Start it with 'rr4-complete-enchanced-v4-cli.py agent start'.
+"""
+
+import os
+import json
+import socket
+import logging
+import tempfile
+import threading
+import socketserver
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+from .connection_manager import ConnectionManager
+
+AGENT_SUPPORTED = hasattr(socket, 'AF_UNIX')
+DEFAULT_IDLE_TIMEOUT = 600
+AGENT_SOCKET_ENV = 'RR4_AGENT_SOCKET'
+AGENT_DISABLE_ENV = 'RR4_NO_AGENT'
+
+def default_socket_path() -> Path:
+    """Per-user agent socket path (RR4_AGENT_SOCKET overrides it)."""
+    if os.getenv(AGENT_SOCKET_ENV):
+        return Path(os.getenv(AGENT_SOCKET_ENV))
+    user = os.getuid() if hasattr(os, 'getuid') else os.getenv('USERNAME', 'user')
+    return Path(tempfile.gettempdir()) / f"rr4-connection-agent-{user}.sock"
+
+class AgentError(Exception):
+    """The agent could not be reached or rejected a request."""
+    pass
+
+class _AgentRequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line, one JSON response per line."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.agent.dispatch(json.loads(line))
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+            self.wfile.flush()
+
+if AGENT_SUPPORTED:
+    class _AgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+class ConnectionAgent:
+    """Daemon side: owns a ConnectionManager whose sessions outlive CLI processes."""
+
+    def __init__(self, socket_path: Optional[Path] = None, jump_host_config: Optional[Dict[str, Any]] = None,
+                 idle_timeout: int = DEFAULT_IDLE_TIMEOUT, max_connections: int = 25):
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.idle_timeout = idle_timeout
+        self.connection_manager = ConnectionManager(jump_host_config=jump_host_config,
+                                                    max_connections=max_connections)
+        self.logger = logging.getLogger('rr4_collector.connection_agent')
+        self._session_locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._server = None
+
+    def _session_lock(self, key: str) -> threading.Lock:
+        # A Netmiko session is not thread-safe: one command at a time per device
+        with self._locks_lock:
+            return self._session_locks.setdefault(key, threading.Lock())
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle one request."""
+        op = request.get('op')
+
+        if op == 'ping':
+            stats = self.connection_manager.connection_pool.get_pool_statistics()
+            return {'ok': True, 'pid': os.getpid(), 'sessions': stats['active_connections'],
+                    'idle_timeout': self.idle_timeout}
+
+        if op == 'stats':
+            return {'ok': True, 'stats': self.connection_manager.connection_pool.get_pool_statistics()}
+
+        if op == 'probe':
+            result = self.connection_manager.probe_ssh(request['hostname'], request.get('port', 22),
+                                                       request.get('timeout', 10))
+            return {'ok': True, 'result': result}
+
+        if op in ('connect', 'run', 'prompt'):
+            device = request['device']
+            key = f"{device['hostname']}:{device.get('port', 22)}:{device['username']}"
+            with self._session_lock(key):
+                with self.connection_manager.get_connection(**device) as connection:
+                    if op == 'connect':
+                        return {'ok': True}
+                    if op == 'prompt':
+                        try:
+                            return {'ok': True, 'prompt': connection.find_prompt()}
+                        except Exception as e:
+                            return {'ok': False, 'error': str(e)}
+                    return {'ok': True, 'results': self._run(connection, request['commands'],
+                                                             request.get('timeout', 60),
+                                                             request.get('expect_string'))}
+
+        if op == 'shutdown':
+            threading.Thread(target=self.stop, daemon=True).start()
+            return {'ok': True}
+
+        return {'ok': False, 'error': f"Unknown operation: {op}"}
+
+    def _run(self, connection: Any, commands: List[str], timeout: int,
+             expect_string: Optional[str]) -> List[Dict[str, Any]]:
+        results = []
+        for command in commands:
+            try:
+                kwargs = {'read_timeout': timeout}
+                if expect_string:
+                    kwargs['expect_string'] = expect_string
+                results.append({'command': command, 'success': True,
+                                'output': connection.send_command(command, **kwargs), 'error': None})
+            except Exception as e:
+                results.append({'command': command, 'success': False, 'output': '', 'error': str(e)})
+        return results
+
+    def _reap_idle(self):
+        while not self._stopped.wait(min(60, max(1, self.idle_timeout // 4))):
+            closed = self.connection_manager.connection_pool.close_idle_connections(self.idle_timeout)
+            if closed:
+                self.logger.info(f"Closed {closed} idle session(s)")
+
+    def serve_forever(self):
+        """Listen on the Unix socket until stop() or a shutdown request."""
+        if not AGENT_SUPPORTED:
+            raise AgentError("The connection agent needs Unix domain sockets")
+        if self.socket_path.exists():
+            if AgentClient(self.socket_path).is_running():
+                raise AgentError(f"An agent is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+
+        # The socket carries device credentials: owner-only from the moment it exists
+        old_umask = os.umask(0o077)
+        try:
+            self._server = _AgentServer(str(self.socket_path), _AgentRequestHandler)
+        finally:
+            os.umask(old_umask)
+        self._server.agent = self
+
+        threading.Thread(target=self._reap_idle, daemon=True).start()
+        self.logger.info(f"Connection agent listening on {self.socket_path} (idle timeout {self.idle_timeout}s)")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stopped.set()
+            self._server.server_close()
+            self.connection_manager.close_all_connections()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+    def stop(self):
+        """Stop serving (from another thread)."""
+        self._stopped.set()
+        if self._server:
+            self._server.shutdown()
+
+class AgentSession:
+    """Stands in for a Netmiko connection; commands run on the agent's warm session."""
+
+    def __init__(self, client: 'AgentClient', device: Dict[str, Any]):
+        self.client = client
+        self.device = device
+        # Netmiko connection attributes the collectors read (platform detection, hostnames)
+        self.host = device['hostname']
+        self.device_type = device['device_type']
+        self.username = device['username']
+        self.port = device.get('port', 22)
+
+    def send_command(self, command: str, read_timeout: int = 60, expect_string: Optional[str] = None,
+                     **kwargs) -> str:
+        result = self.client.request({'op': 'run', 'device': self.device, 'commands': [command],
+                                      'timeout': read_timeout, 'expect_string': expect_string})['results'][0]
+        if not result['success']:
+            raise AgentError(result['error'])
+        return result['output']
+
+    def execute_command(self, command: str, timeout: int = 60) -> str:
+        """Fallback command interface some collectors use for non-Netmiko connections."""
+        return self.send_command(command, read_timeout=timeout)
+
+    def find_prompt(self) -> str:
+        return self.client.request({'op': 'prompt', 'device': self.device})['prompt']
+
+    def is_alive(self) -> bool:
+        return self.client.is_running()
+
+    def disconnect(self) -> None:
+        """Nothing to do: the session stays warm in the agent until it idles out."""
+        pass
+
+class AgentClient:
+    """CLI side: talks to a running ConnectionAgent."""
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: int = 600):
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.timeout = timeout
+
+    def request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one request and return the response; raises AgentError on failure."""
+        if not AGENT_SUPPORTED:
+            raise AgentError("The connection agent needs Unix domain sockets")
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(str(self.socket_path))
+                sock.sendall(json.dumps(payload).encode() + b'\n')
+                with sock.makefile('rb') as reader:
+                    line = reader.readline()
+        except OSError as e:
+            raise AgentError(f"Connection agent not reachable at {self.socket_path}: {e}")
+        if not line:
+            raise AgentError("Connection agent closed the connection")
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise AgentError(response.get('error', 'Agent request failed'))
+        return response
+
+    def is_running(self) -> bool:
+        try:
+            return bool(self.request({'op': 'ping'}))
+        except AgentError:
+            return False
+
+    def open_session(self, hostname: str, device_type: str, username: str, password: str,
+                     **kwargs) -> AgentSession:
+        """Borrow the agent's session for a device, logging in there if it has none yet."""
+        device = dict(hostname=hostname, device_type=device_type, username=username, password=password, **kwargs)
+        self.request({'op': 'connect', 'device': device})
+        return AgentSession(self, device)
+
+    def probe_ssh(self, hostname: str, port: int = 22, timeout: int = 10) -> Dict[str, Any]:
+        return self.request({'op': 'probe', 'hostname': hostname, 'port': port, 'timeout': timeout})['result']
+
+    def stats(self) -> Dict[str, Any]:
+        return self.request({'op': 'stats'})['stats']
+
+    def shutdown(self) -> None:
+        self.request({'op': 'shutdown'})
+
+def running_agent(socket_path: Optional[Path] = None) -> Optional[AgentClient]:
+    """Client for the local agent if one is running (and RR4_NO_AGENT is not set), else None."""
+    if not AGENT_SUPPORTED or os.getenv(AGENT_DISABLE_ENV):
+        return None
+    client = AgentClient(socket_path)
+    if not client.socket_path.exists() or not client.is_running():
+        return None
+    return client
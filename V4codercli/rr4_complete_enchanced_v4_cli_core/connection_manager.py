@@ -11,6 +11,7 @@ Created: 2025-01-27
 """
 
 import time
+import socket
 import logging
 import threading
 from typing import Dict, Any, Optional, List
@@ -75,6 +76,44 @@ LEGACY_SSH_ALGORITHMS = {
     ]
 }
 
+# Algorithms offered to the jump host on top of paramiko's defaults, for older jump hosts
+JUMP_HOST_SSH_ALGORITHMS = {
+    'kex': [
+        'diffie-hellman-group14-sha256',
+        'diffie-hellman-group14-sha1',
+        'diffie-hellman-group1-sha1',
+        'diffie-hellman-group-exchange-sha256',
+        'diffie-hellman-group-exchange-sha1'
+    ],
+    'ciphers': [
+        'aes128-ctr', 'aes192-ctr', 'aes256-ctr',
+        'aes128-cbc', 'aes192-cbc', 'aes256-cbc',
+        '3des-cbc'
+    ],
+    'digests': [
+        'hmac-sha2-256', 'hmac-sha2-512',
+        'hmac-sha1', 'hmac-sha1-96',
+        'hmac-md5', 'hmac-md5-96'
+    ]
+}
+
+def enable_legacy_algorithms(transport: paramiko.Transport,
+                             algorithms: Dict[str, List[str]] = JUMP_HOST_SSH_ALGORITHMS) -> None:
+    """Append legacy algorithms to a transport's offer; must run before start_client().
+    
+    Algorithms the installed paramiko no longer implements are skipped.
+    """
+    options = transport.get_security_options()
+    for name, legacy in algorithms.items():
+        for algorithm in legacy:
+            offered = tuple(getattr(options, name))
+            if algorithm in offered:
+                continue
+            try:
+                setattr(options, name, offered + (algorithm,))
+            except ValueError:
+                pass
+
 # Jump host configuration for EVE-NG environment
 def get_jump_host_config():
     """Load jump host configuration from environment or defaults."""
@@ -315,6 +354,11 @@ class ConnectionPool:
         self.connection_metadata: Dict[str, Dict[str, Any]] = {}
         self.connection_lock = threading.Lock()
         self.logger = logging.getLogger('rr4_collector.connection_pool')
+        self._pending = 0  # Connections being created outside the lock
+        # One SSH client per jump host; every device tunnel is a channel on its transport
+        self._jump_transports: Dict[tuple, paramiko.Transport] = {}
+        self._jump_lock = threading.Lock()
+        self._jump_last_used = 0.0
         self._pool_stats = {
             'total_created': 0,
             'total_reused': 0,
@@ -327,57 +371,87 @@ class ConnectionPool:
         return f"{config.hostname}:{config.port}:{config.username}"
     
     def acquire_connection(self, config: ConnectionConfig) -> Any:
-        """Acquire a connection from the pool with enhanced failure handling."""
+        """Acquire a connection from the pool with enhanced failure handling.
+        
+        The pool lock only guards the bookkeeping; logins run outside it so
+        several devices can be connected to at the same time.
+        """
         key = self.get_connection_key(config)
         
+        # Check for existing connection
         with self.connection_lock:
-            # Check for existing connection
-            if key in self.active_connections:
-                connection = self.active_connections[key]
-                if self._is_connection_alive(connection):
-                    self.logger.debug(f"Reusing connection to {config.hostname}")
+            connection = self.active_connections.get(key)
+        if connection is not None:
+            if self._is_connection_alive(connection):
+                self.logger.debug(f"Reusing connection to {config.hostname}")
+                with self.connection_lock:
                     self._pool_stats['total_reused'] += 1
-                    return connection
-                else:
-                    # Handle dead connection
-                    self.logger.warning(f"Found dead connection for {config.hostname}, attempting recovery")
-                    new_connection = self._handle_connection_failure(connection, config)
-                    if new_connection:
-                        return new_connection
-            
+                return connection
+            else:
+                # Handle dead connection
+                self.logger.warning(f"Found dead connection for {config.hostname}, attempting recovery")
+                new_connection = self._handle_connection_failure(connection, config)
+                if new_connection:
+                    return new_connection
+        
+        with self.connection_lock:
             # Check pool capacity
-            if len(self.active_connections) >= self.max_connections:
+            if len(self.active_connections) + self._pending >= self.max_connections:
                 # Try to clean up dead connections first
                 cleaned = self._cleanup_dead_connections()
                 self.logger.info(f"Cleaned up {cleaned} dead connections")
                 
                 # If still at capacity, try to free some connections
-                if len(self.active_connections) >= self.max_connections:
+                if len(self.active_connections) + self._pending >= self.max_connections:
                     freed = self._free_oldest_connections(min(3, len(self.active_connections) // 4))
                     self.logger.info(f"Freed {freed} oldest connections to make room")
             
-            # Create new connection if under limit
-            if len(self.active_connections) < self.max_connections:
+            # Reserve a slot if under limit
+            reserved = len(self.active_connections) + self._pending < self.max_connections
+            if reserved:
+                self._pending += 1
+        
+        if reserved:
+            connection = None
+            duplicate = None
+            try:
                 connection = self._create_connection_with_diagnostics(config)
-                if connection:
-                    self.active_connections[key] = connection
-                    self.connection_metadata[key] = {
-                        'created_at': time.time(),
-                        'last_used': time.time(),
-                        'hostname': config.hostname,
-                        'usage_count': 0
-                    }
-                    self._pool_stats['current_active'] += 1
-                    self._pool_stats['total_created'] += 1
-                    self.logger.info(f"Created new connection to {config.hostname}")
-                    return connection
-                else:
-                    self._pool_stats['total_failed'] += 1
-            
-            # Pool is full and couldn't create connection
+            finally:
+                with self.connection_lock:
+                    self._pending -= 1
+                    existing = self.active_connections.get(key)
+                    if connection and existing is not None:
+                        # Another thread logged in to the same device meanwhile: keep its session
+                        duplicate, connection = connection, existing
+                        self._pool_stats['total_reused'] += 1
+                    elif connection:
+                        self.active_connections[key] = connection
+                        self.connection_metadata[key] = {
+                            'created_at': time.time(),
+                            'last_used': time.time(),
+                            'hostname': config.hostname,
+                            'usage_count': 0
+                        }
+                        self._pool_stats['current_active'] += 1
+                        self._pool_stats['total_created'] += 1
+                    else:
+                        self._pool_stats['total_failed'] += 1
+            if duplicate is not None:
+                try:
+                    duplicate.disconnect()
+                except Exception as e:
+                    self.logger.debug(f"Error closing duplicate connection to {config.hostname}: {e}")
+                self.logger.debug(f"Reusing connection to {config.hostname} opened concurrently")
+                return connection
+            if connection:
+                self.logger.info(f"Created new connection to {config.hostname}")
+                return connection
+        
+        # Pool is full and couldn't create connection
+        with self.connection_lock:
             error_msg = f"Connection pool exhausted ({len(self.active_connections)}/{self.max_connections}). Unable to connect to {config.hostname}"
-            self.logger.error(error_msg)
-            raise Exception(error_msg)
+        self.logger.error(error_msg)
+        raise Exception(error_msg)
     
     def _create_connection_with_diagnostics(self, config: ConnectionConfig) -> Optional[Any]:
         """Create a new SSH connection with detailed diagnostics."""
@@ -616,8 +690,46 @@ class ConnectionPool:
             self.connection_metadata.clear()
             self._pool_stats['current_active'] = 0
             
+        with self._jump_lock:
+            for transport in self._jump_transports.values():
+                try:
+                    transport.close()
+                except Exception as e:
+                    self.logger.warning(f"Error closing jump host connection: {e}")
+            self._jump_transports.clear()
+            
         self.logger.info("All connections closed")
     
+    def close_idle_connections(self, idle_timeout: float) -> int:
+        """Close device sessions unused for idle_timeout seconds, and the jump host once nothing uses it."""
+        cutoff = time.time() - idle_timeout
+        with self.connection_lock:
+            idle_keys = [key for key, meta in self.connection_metadata.items() if meta['last_used'] < cutoff]
+            idle = [(key, self.active_connections.pop(key, None)) for key in idle_keys]
+            for key in idle_keys:
+                del self.connection_metadata[key]
+                self._pool_stats['current_active'] -= 1
+            pool_empty = not self.active_connections and not self._pending
+        
+        for key, connection in idle:
+            try:
+                connection.disconnect()
+                self.logger.debug(f"Closed idle connection: {key}")
+            except Exception as e:
+                self.logger.warning(f"Error closing connection {key}: {e}")
+        
+        with self._jump_lock:
+            if pool_empty and self._jump_transports and self._jump_last_used < cutoff:
+                for transport in self._jump_transports.values():
+                    try:
+                        transport.close()
+                    except Exception:
+                        pass
+                self._jump_transports.clear()
+                self.logger.debug("Closed idle jump host connection")
+        
+        return len(idle)
+    
     def get_pool_statistics(self) -> Dict[str, Any]:
         """Get connection pool statistics."""
         with self.connection_lock:
@@ -639,65 +751,47 @@ class ConnectionPool:
                 }
             }
 
+    def get_jump_transport(self, jump_host: Dict[str, Any], timeout: int = 60) -> paramiko.Transport:
+        """Shared SSH transport to the jump host, reconnected only when it has dropped."""
+        key = (jump_host['hostname'], jump_host.get('port', 22), jump_host['username'])
+        
+        with self._jump_lock:
+            self._jump_last_used = time.time()
+            transport = self._jump_transports.get(key)
+            if transport and transport.is_active():
+                return transport
+            if transport:
+                transport.close()
+            
+            # The transport is built by hand so the legacy algorithms are offered in the
+            # key exchange itself; SSHClient.connect gives no hook before the handshake
+            sock = socket.create_connection((jump_host['hostname'], jump_host.get('port', 22)), timeout=timeout)
+            transport = paramiko.Transport(sock)
+            try:
+                enable_legacy_algorithms(transport)
+                transport.start_client(timeout=timeout)
+                transport.auth_password(jump_host['username'], jump_host['password'])
+            except Exception:
+                transport.close()
+                raise
+            transport.set_keepalive(30)
+            self._jump_transports[key] = transport
+            self.logger.info(f"Connected to jump host {jump_host['hostname']}")
+            return transport
+
     def _create_jump_host_socket(self, config: ConnectionConfig) -> paramiko.Channel:
-        """Create SSH socket through jump host with legacy SSH support for older Cisco devices."""
+        """Open a tunnel to the device as a channel on the shared jump host transport."""
         if not config.jump_host:
             raise ValueError("Jump host configuration required")
         
-        # Create SSH client for jump host
-        jump_ssh = paramiko.SSHClient()
-        jump_ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        
         try:
-            jump_ssh.connect(
-                hostname=config.jump_host['hostname'],
-                username=config.jump_host['username'],
-                password=config.jump_host['password'],
-                port=config.jump_host.get('port', 22),
-                timeout=config.timeout
-            )
-            
-            # Create tunnel through jump host
-            transport = jump_ssh.get_transport()
+            transport = self.get_jump_transport(config.jump_host, config.timeout)
             dest_addr = (config.hostname, config.port)
             local_addr = ('127.0.0.1', 0)
-            
-            # Configure legacy SSH algorithms for older Cisco devices
-            # This is needed for devices that only support older SSH implementations
-            try:
-                # Enable legacy key exchange algorithms
-                transport.get_security_options().kex = [
-                    'diffie-hellman-group14-sha256',
-                    'diffie-hellman-group14-sha1', 
-                    'diffie-hellman-group1-sha1',
-                    'diffie-hellman-group-exchange-sha256',
-                    'diffie-hellman-group-exchange-sha1'
-                ]
-                
-                # Enable legacy ciphers
-                transport.get_security_options().ciphers = [
-                    'aes128-ctr', 'aes192-ctr', 'aes256-ctr',
-                    'aes128-cbc', 'aes192-cbc', 'aes256-cbc',
-                    '3des-cbc'
-                ]
-                
-                # Enable legacy MAC algorithms
-                transport.get_security_options().digests = [
-                    'hmac-sha2-256', 'hmac-sha2-512',
-                    'hmac-sha1', 'hmac-sha1-96',
-                    'hmac-md5', 'hmac-md5-96'
-                ]
-                
-                self.logger.debug(f"Configured legacy SSH algorithms for {config.hostname}")
-            except Exception as e:
-                self.logger.warning(f"Could not configure legacy SSH algorithms: {e}")
-            
-            channel = transport.open_channel("direct-tcpip", dest_addr, local_addr)
-            return channel
+            return transport.open_channel("direct-tcpip", dest_addr, local_addr, timeout=config.timeout)
             
         except Exception as e:
             self.logger.error(f"Failed to create jump host tunnel: {e}")
-            jump_ssh.close()
             raise
     
     def _is_connection_alive(self, connection: Any) -> bool:
@@ -831,8 +925,11 @@ class ConnectionManager:
     """Manage SSH connections with retry logic and enhanced error reporting."""
     
     def __init__(self, jump_host_config: Optional[Dict[str, Any]] = None, 
-                 max_connections: int = 25, retry_attempts: int = 3, retry_delay: int = 5):
+                 max_connections: int = 25, retry_attempts: int = 3, retry_delay: int = 5,
+                 agent: Optional[Any] = None):
         self.jump_host_config = jump_host_config
+        # Optional connection agent client (see connection_agent); sessions are borrowed from it
+        self.agent = agent
         self.retry_attempts = retry_attempts
         self.retry_delay = retry_delay
         self.connection_pool = ConnectionPool(max_connections)
@@ -842,6 +939,20 @@ class ConnectionManager:
     @contextmanager
     def get_connection(self, hostname: str, device_type: str, username: str, password: str, **kwargs):
         """Context manager for getting connections with automatic cleanup and detailed error reporting."""
+        if self.agent is not None:
+            try:
+                session = self.agent.open_session(hostname, device_type, username, password, **kwargs)
+            except Exception as e:
+                # A running agent that failed means the device failed; otherwise connect directly
+                if self.agent.is_running():
+                    raise
+                self.logger.warning(f"Connection agent unavailable, connecting to {hostname} directly: {e}")
+                self.agent = None
+            else:
+                self.logger.debug(f"Borrowed agent session for {hostname}")
+                yield session
+                return
+        
         config = ConnectionConfig(
             hostname=hostname,
             device_type=device_type,
@@ -969,6 +1080,69 @@ class ConnectionManager:
         result['response_time'] = time.time() - start_time
         return result
     
+    def probe_ssh(self, hostname: str, port: int = 22, timeout: int = 10) -> Dict[str, Any]:
+        """Fast reachability check: open TCP (through the jump host if configured) and read the SSH banner.
+        
+        No login is attempted, so this takes one round trip per device.
+        """
+        result = {
+            'hostname': hostname,
+            'success': False,
+            'tcp_open': False,
+            'banner': None,
+            'error': None,
+            'response_time': None
+        }
+        
+        if self.agent is not None:
+            try:
+                # The agent's jump host transport is already up
+                return self.agent.probe_ssh(hostname, port, timeout)
+            except Exception as e:
+                self.logger.debug(f"Agent probe failed for {hostname}, probing directly: {e}")
+        
+        start_time = time.time()
+        sock = None
+        
+        try:
+            if self.jump_host_config:
+                transport = self.connection_pool.get_jump_transport(self.jump_host_config, timeout)
+                sock = transport.open_channel("direct-tcpip", (hostname, port), ('127.0.0.1', 0), timeout=timeout)
+            else:
+                sock = socket.create_connection((hostname, port), timeout=timeout)
+            sock.settimeout(timeout)
+            result['tcp_open'] = True
+            
+            banner = b''
+            while b'\n' not in banner and len(banner) < 255:
+                chunk = sock.recv(255 - len(banner))
+                if not chunk:
+                    break
+                banner += chunk
+            result['banner'] = banner.decode('utf-8', errors='replace').strip()
+            
+            if banner.startswith(b'SSH-'):
+                result['success'] = True
+            else:
+                result['error'] = f"No SSH banner on port {port}: {result['banner'][:60] or 'connection closed'}"
+                
+        except socket.timeout:
+            result['error'] = f"Device unreachable on port {port}: timeout after {timeout}s"
+        except Exception as e:
+            if result['tcp_open']:
+                result['error'] = f"SSH banner read failed: {e}"
+            else:
+                result['error'] = f"Device unreachable on port {port}: {e}"
+        finally:
+            if sock is not None:
+                try:
+                    sock.close()
+                except Exception:
+                    pass
+        
+        result['response_time'] = time.time() - start_time
+        return result
+    
     def execute_command(self, connection: Any, command: str, timeout: int = 60) -> Dict[str, Any]:
         """Execute a command on the device."""
         result = {
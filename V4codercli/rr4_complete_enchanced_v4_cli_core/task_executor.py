@@ -16,7 +16,7 @@ import time
 import logging
 import importlib
 import importlib.util
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
@@ -28,6 +28,8 @@ from nornir.core.filter import F
 
 from .connection_manager import ConnectionManager
 from .output_handler import OutputHandler
+from .inventory_loader import nornir_inventory_config
+from .connection_agent import running_agent
 
 @dataclass
 class TaskResult:
@@ -152,7 +154,8 @@ class TaskExecutor:
     """Execute collection tasks on devices."""
     
     def __init__(self, inventory: List[Dict[str, Any]], output_handler: OutputHandler,
-                 max_workers: int = 4, timeout: int = 120):
+                 max_workers: int = 4, timeout: int = 120,
+                 nornir_inventory: Optional[Dict[str, Any]] = None):
         """Initialize task executor.
         
         Args:
@@ -160,9 +163,12 @@ class TaskExecutor:
             output_handler: Output handler instance
             max_workers: Maximum number of concurrent workers
             timeout: Command timeout in seconds
+            nornir_inventory: Generated Nornir inventory (hosts/groups); loaded in memory
+                instead of reading the YAML files from the config directory
         """
         self.logger = logging.getLogger('rr4_collector.executor')
         self.inventory = inventory
+        self.nornir_inventory = nornir_inventory
         self.output_handler = output_handler
         self.max_workers = max_workers
         self.timeout = timeout
@@ -180,42 +186,24 @@ class TaskExecutor:
     def _initialize_nornir(self):
         """Initialize Nornir from the inventory data."""
         try:
-            # Create a temporary Nornir config file
-            config_dir = Path("rr4-complete-enchanced-v4-cli-config")
-            config_dir.mkdir(exist_ok=True)
-            
-            nornir_config = {
-                "inventory": {
+            if self.nornir_inventory is not None:
+                # Hand the generated inventory straight to Nornir - no YAML dump and re-parse
+                inventory_config = nornir_inventory_config(self.nornir_inventory)
+            else:
+                config_dir = Path("rr4-complete-enchanced-v4-cli-config")
+                config_dir.mkdir(exist_ok=True)
+                inventory_config = {
                     "plugin": "SimpleInventory",
                     "options": {
                         "host_file": str(config_dir / "inventory" / "hosts.yaml"),
                         "group_file": str(config_dir / "inventory" / "groups.yaml"),
                         "defaults_file": str(config_dir / "inventory" / "defaults.yaml")
                     }
-                },
-                "runner": {
-                    "plugin": "threaded",
-                    "options": {
-                        "num_workers": self.max_workers
-                    }
-                },
-                "logging": {
-                    "enabled": True,
-                    "level": "INFO",
-                    "loggers": ["nornir"]
                 }
-            }
             
             # Initialize Nornir with the config
             self.nr = InitNornir(
-                inventory={
-                    "plugin": "SimpleInventory",
-                    "options": {
-                        "host_file": str(config_dir / "inventory" / "hosts.yaml"),
-                        "group_file": str(config_dir / "inventory" / "groups.yaml"),
-                        "defaults_file": str(config_dir / "inventory" / "defaults.yaml")
-                    }
-                },
+                inventory=inventory_config,
                 runner={
                     "plugin": "threaded",
                     "options": {
@@ -251,7 +239,13 @@ class TaskExecutor:
                 }
                 self.logger.debug(f"Connection manager using jump host: {jump_host_config['hostname']}")
             
-            self.connection_manager = ConnectionManager(jump_host_config=jump_host_config)
+            # Shared by every worker thread, so the pool must have room for all of them.
+            # Sessions are borrowed from the connection agent when one is running.
+            self.connection_manager = ConnectionManager(jump_host_config=jump_host_config,
+                                                        max_connections=max(25, self.max_workers),
+                                                        agent=running_agent())
+            if self.connection_manager.agent:
+                self.logger.info("Using warm sessions from the connection agent")
             
         except Exception as e:
             self.logger.error(f"Failed to initialize connection manager: {e}")
@@ -490,9 +484,18 @@ class TaskExecutor:
         
         return results
     
-    def execute_connectivity_test(self) -> Dict[str, Any]:
-        """Test connectivity to all devices in inventory."""
-        self.logger.info("Starting connectivity test")
+    def execute_connectivity_test(self, fast: bool = False) -> Dict[str, Any]:
+        """Test connectivity to all devices in inventory.
+        
+        Devices are tested in parallel (max_workers) over the executor's one
+        ConnectionManager, so the jump host transport is shared. Each device
+        first gets a TCP/SSH-banner probe; the full login plus
+        'show version' follows unless fast is set.
+        
+        Args:
+            fast: Only run the TCP/SSH-banner probe, skipping the login
+        """
+        self.logger.info(f"Starting connectivity test ({'fast' if fast else 'full'} mode, {self.max_workers} workers)")
         
         results = {
             'successful': [],
@@ -500,65 +503,31 @@ class TaskExecutor:
             'total_devices': len(self.inventory),
             'successful_connections': 0,
             'failed_connections': 0,
-            'success_rate': 0.0
+            'success_rate': 0.0,
+            'mode': 'fast' if fast else 'full'
         }
         
-        # Test connectivity to each device
-        for device in self.inventory:
-            try:
-                hostname = device.hostname
-                self.logger.debug(f"Testing connectivity to {hostname}")
-                
-                # Get jump host configuration from environment
-                import os
-                jump_host_config = None
-                if os.getenv('JUMP_HOST_IP'):
-                    jump_host_config = {
-                        'hostname': os.getenv('JUMP_HOST_IP'),
-                        'username': os.getenv('JUMP_HOST_USERNAME'),
-                        'password': os.getenv('JUMP_HOST_PASSWORD'),
-                        'port': int(os.getenv('JUMP_HOST_PORT', '22'))
-                    }
-                    self.logger.debug(f"Using jump host: {jump_host_config['hostname']}")
-                
-                # Create connection manager for this device with jump host config
-                connection_manager = ConnectionManager(jump_host_config=jump_host_config)
-                
-                # Test connection using the test_connectivity method
-                result = connection_manager.test_connectivity(
-                    hostname=device.management_ip,
-                    device_type=device.device_type or 'cisco_ios',
-                    username=device.username or 'cisco',
-                    password=device.password or 'cisco'
-                )
-                
-                if result.get('success', False):
-                    self.logger.debug(f"Successfully connected to {hostname}")
-                    results['successful'].append({
-                        'hostname': hostname,
-                        'ip': device.management_ip,
-                        'platform': device.platform or device.device_type
-                    })
-                    results['successful_connections'] += 1
-                else:
-                    self.logger.debug(f"Failed to connect to {hostname}: {result.get('error', 'Unknown error')}")
-                    results['failed'].append({
-                        'hostname': hostname,
-                        'ip': device.management_ip,
-                        'platform': device.platform or device.device_type,
-                        'error': result.get('error', 'Connection failed')
-                    })
-                    results['failed_connections'] += 1
-                    
-            except Exception as e:
-                hostname = getattr(device, 'hostname', 'unknown')
-                self.logger.error(f"Error testing connectivity to {hostname}: {e}")
-                results['failed'].append({
-                    'hostname': hostname,
-                    'ip': getattr(device, 'management_ip', 'unknown'),
-                    'platform': getattr(device, 'platform', 'unknown'),
-                    'error': str(e)
-                })
+        if self.connection_manager is None:
+            self._initialize_connection_manager()
+        connection_manager = self.connection_manager or ConnectionManager(max_connections=max(25, self.max_workers))
+        
+        outcomes = [None] * len(self.inventory)
+        workers = max(1, min(self.max_workers, len(self.inventory)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._test_device_connectivity, connection_manager, device, fast): index
+                for index, device in enumerate(self.inventory)
+            }
+            for future in as_completed(futures):
+                outcomes[futures[future]] = future.result()
+        
+        # Report in inventory order regardless of completion order
+        for success, entry in outcomes:
+            if success:
+                results['successful'].append(entry)
+                results['successful_connections'] += 1
+            else:
+                results['failed'].append(entry)
                 results['failed_connections'] += 1
         
         # Calculate success rate
@@ -569,6 +538,52 @@ class TaskExecutor:
         
         return results
     
+    def _test_device_connectivity(self, connection_manager: ConnectionManager, device: Any,
+                                  fast: bool) -> Tuple[bool, Dict[str, Any]]:
+        """Probe (and unless fast, log in to) one device. Returns (success, result entry)."""
+        hostname = getattr(device, 'hostname', 'unknown')
+        entry = {
+            'hostname': hostname,
+            'ip': getattr(device, 'management_ip', 'unknown'),
+            'platform': getattr(device, 'platform', None) or getattr(device, 'device_type', 'unknown')
+        }
+        
+        try:
+            self.logger.debug(f"Testing connectivity to {hostname}")
+            
+            probe = connection_manager.probe_ssh(device.management_ip, timeout=min(self.timeout, 15))
+            entry['banner'] = probe.get('banner')
+            entry['response_time'] = probe.get('response_time')
+            if not probe['success']:
+                self.logger.debug(f"Failed to reach {hostname}: {probe['error']}")
+                entry['error'] = probe['error']
+                return False, entry
+            
+            if fast:
+                return True, entry
+            
+            # Full login using the test_connectivity method
+            result = connection_manager.test_connectivity(
+                hostname=device.management_ip,
+                device_type=device.device_type or 'cisco_ios',
+                username=device.username or 'cisco',
+                password=device.password or 'cisco'
+            )
+            entry['response_time'] = result.get('response_time')
+            
+            if result.get('success', False):
+                self.logger.debug(f"Successfully connected to {hostname}")
+                return True, entry
+            
+            self.logger.debug(f"Failed to connect to {hostname}: {result.get('error', 'Unknown error')}")
+            entry['error'] = result.get('error', 'Connection failed')
+            return False, entry
+            
+        except Exception as e:
+            self.logger.error(f"Error testing connectivity to {hostname}: {e}")
+            entry['error'] = str(e)
+            return False, entry
+    
     def execute_layer_collection(self, layers: List[str], exclude_layers: Optional[List[str]] = None,
                                 timeout: int = 60) -> Dict[str, Any]:
         """Execute data collection for specified layers."""
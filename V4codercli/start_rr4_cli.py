@@ -1585,6 +1585,11 @@ class RR4StartupManager:
     def run(self):
         """Main run method"""
         try:
+            # Opt-in: keep jump host and device sessions warm across every option run from this menu
+            if os.getenv('RR4_CONNECTION_AGENT', '').lower() in ('1', 'true', 'yes'):
+                self._run_command([get_python_command(), str(self.main_script), "agent", "start"],
+                                  "Starting connection agent", critical=False, timeout=30)
+            
             while True:
                 choice = self.show_main_menu()
                 
@@ -4210,6 +4215,11 @@ class RR4StartupManager:
     def run(self):
         """Main run method"""
         try:
+            # Opt-in: keep jump host and device sessions warm across every option run from this menu
+            if os.getenv('RR4_CONNECTION_AGENT', '').lower() in ('1', 'true', 'yes'):
+                self._run_command([get_python_command(), str(self.main_script), "agent", "start"],
+                                  "Starting connection agent", critical=False, timeout=30)
+            
             while True:
                 choice = self.show_main_menu()
                 
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Unit tests for the connection agent."""
+
+import unittest
+from unittest.mock import Mock, MagicMock
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from rr4_complete_enchanced_v4_cli_core.connection_agent import (
+    AGENT_SUPPORTED, AgentClient, AgentError, ConnectionAgent, running_agent
+)
+from rr4_complete_enchanced_v4_cli_core.connection_manager import ConnectionManager
+
+@unittest.skipUnless(AGENT_SUPPORTED, "connection agent needs Unix domain sockets")
+class TestConnectionAgent(unittest.TestCase):
+    """Test cases for ConnectionAgent and AgentClient."""
+
+    def setUp(self):
+        """Start an agent whose device logins are mocked."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.temp_dir, 'agent.sock')
+        self.agent = ConnectionAgent(socket_path=self.socket_path, idle_timeout=600)
+
+        self.device_connection = Mock()
+        self.device_connection.send_command.side_effect = lambda command, **kwargs: f"output of {command}"
+        pool = self.agent.connection_manager.connection_pool
+        pool._create_connection_with_diagnostics = MagicMock(return_value=self.device_connection)
+
+        self.thread = threading.Thread(target=self.agent.serve_forever, daemon=True)
+        self.thread.start()
+        self.client = AgentClient(self.socket_path, timeout=10)
+        for _ in range(50):
+            if self.client.is_running():
+                break
+            time.sleep(0.05)
+
+    def tearDown(self):
+        self.agent.stop()
+        self.thread.join(timeout=5)
+        shutil.rmtree(self.temp_dir)
+
+    def test_sessions_stay_warm_across_managers(self):
+        """Two CLI-side managers borrow the same agent session; the device is logged in to once."""
+        for _ in range(2):
+            manager = ConnectionManager(agent=self.client)
+            with manager.get_connection('192.168.1.1', 'cisco_ios', 'admin', 'password') as connection:
+                self.assertEqual(connection.send_command("show version"), "output of show version")
+            manager.close_all_connections()
+
+        pool = self.agent.connection_manager.connection_pool
+        self.assertEqual(pool._create_connection_with_diagnostics.call_count, 1)
+        self.assertEqual(self.client.stats()['active_connections'], 1)
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o077, 0)  # Owner-only socket
+
+    def test_session_exposes_connection_attributes(self):
+        """Collectors detect the platform and host from an agent session as from Netmiko."""
+        session = self.client.open_session('192.168.1.2', 'cisco_xr', 'admin', 'password', port=2222)
+        self.assertEqual((session.host, session.device_type, session.username, session.port),
+                         ('192.168.1.2', 'cisco_xr', 'admin', 2222))
+        self.assertEqual(session.execute_command("show version", 30), "output of show version")
+        self.device_connection.send_command.assert_called_with("show version", read_timeout=30)
+
+        from rr4_complete_enchanced_v4_cli_tasks.igp_collector import IGPCollector
+        collector = IGPCollector()
+        collector.connection = session
+        self.assertEqual(collector._get_device_platform(), 'iosxr')
+
+    def test_idle_sessions_closed(self):
+        """close_idle_connections drops sessions past the idle timeout."""
+        self.client.open_session('192.168.1.1', 'cisco_ios', 'admin', 'password')
+        pool = self.agent.connection_manager.connection_pool
+        self.assertEqual(pool.close_idle_connections(600), 0)
+        self.assertEqual(pool.close_idle_connections(0), 1)
+        self.device_connection.disconnect.assert_called_once()
+        self.assertEqual(self.client.stats()['active_connections'], 0)
+
+    def test_running_agent_and_shutdown(self):
+        """running_agent finds a live agent; after shutdown the socket is gone."""
+        self.assertIsNotNone(running_agent(self.socket_path))
+        self.client.shutdown()
+        self.thread.join(timeout=5)
+        self.assertFalse(os.path.exists(self.socket_path))
+        self.assertIsNone(running_agent(self.socket_path))
+        with self.assertRaises(AgentError):
+            self.client.stats()
+
+if __name__ == '__main__':
+    unittest.main()
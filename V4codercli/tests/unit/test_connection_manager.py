@@ -6,8 +6,32 @@ from unittest.mock import Mock, patch, MagicMock
 import sys
 import os
 import time
+import socket
+import threading
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from rr4_complete_enchanced_v4_cli_core.connection_manager import ConnectionManager, ConnectionPool, ConnectionConfig
+from rr4_complete_enchanced_v4_cli_core.connection_manager import (
+    ConnectionManager, ConnectionPool, ConnectionConfig, JUMP_HOST_SSH_ALGORITHMS, enable_legacy_algorithms
+)
+
+def start_banner_server(banner):
+    """Listen on a free localhost port and greet every client with banner."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(5)
+    
+    def serve():
+        while True:
+            try:
+                client, _ = server.accept()
+            except OSError:
+                return
+            client.sendall(banner)
+            client.close()
+    
+    threading.Thread(target=serve, daemon=True).start()
+    return server
 
 class TestConnectionManager(unittest.TestCase):
     """Test cases for ConnectionManager class."""
@@ -56,6 +80,30 @@ class TestConnectionManager(unittest.TestCase):
         self.assertEqual(len(results), 2)
         self.assertTrue(all(r['success'] for r in results))
 
+    def test_probe_ssh(self):
+        """The fast probe reads the SSH banner without logging in."""
+        ssh_server = start_banner_server(b"SSH-2.0-Cisco-1.25\r\n")
+        http_server = start_banner_server(b"HTTP/1.1 400 Bad Request\r\n")
+        closed = socket.socket()
+        closed.bind(('127.0.0.1', 0))
+        closed_port = closed.getsockname()[1]
+        closed.close()
+        try:
+            result = self.manager.probe_ssh('127.0.0.1', port=ssh_server.getsockname()[1], timeout=2)
+            self.assertTrue(result['success'])
+            self.assertEqual(result['banner'], "SSH-2.0-Cisco-1.25")
+            
+            result = self.manager.probe_ssh('127.0.0.1', port=http_server.getsockname()[1], timeout=2)
+            self.assertFalse(result['success'])
+            self.assertTrue(result['tcp_open'])
+            
+            result = self.manager.probe_ssh('127.0.0.1', port=closed_port, timeout=2)
+            self.assertFalse(result['tcp_open'])
+            self.assertIn("unreachable", result['error'])
+        finally:
+            ssh_server.close()
+            http_server.close()
+
 class TestConnectionPool(unittest.TestCase):
     """Test cases for ConnectionPool class."""
     
@@ -142,5 +190,83 @@ class TestConnectionPool(unittest.TestCase):
         self.assertEqual(conn1, conn2)
         self.assertEqual(self.pool._pool_stats['total_reused'], 1)
 
+    def test_logins_run_concurrently(self):
+        """The pool lock is not held while a connection is being created."""
+        def slow_connect(config):
+            time.sleep(0.3)
+            return Mock()
+        self.pool._create_connection_with_diagnostics.side_effect = slow_connect
+        
+        configs = [ConnectionConfig(hostname=f'192.168.1.{i}', device_type='cisco_ios',
+                                    username='admin', password='password') for i in range(3)]
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            connections = list(executor.map(self.pool.acquire_connection, configs))
+        
+        self.assertLess(time.time() - start, 0.8)
+        self.assertEqual(len(self.pool.active_connections), 3)
+        self.assertEqual(len(set(map(id, connections))), 3)
+
+    def test_concurrent_logins_to_same_device(self):
+        """Two threads logging in to one device share a session; the extra login is closed."""
+        logins = []
+        def slow_connect(config):
+            time.sleep(0.2)
+            connection = Mock()
+            logins.append(connection)
+            return connection
+        self.pool._create_connection_with_diagnostics.side_effect = slow_connect
+        
+        config = ConnectionConfig(hostname='192.168.1.1', device_type='cisco_ios',
+                                  username='admin', password='password')
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            connections = list(executor.map(self.pool.acquire_connection, [config, config]))
+        
+        self.assertIs(connections[0], connections[1])
+        self.assertEqual(len(self.pool.active_connections), 1)
+        self.assertEqual(self.pool._pool_stats['current_active'], 1)
+        self.assertEqual(len(logins), 2)
+        extra = [connection for connection in logins if connection is not connections[0]]
+        extra[0].disconnect.assert_called_once()
+        connections[0].disconnect.assert_not_called()
+    
+    def test_jump_transport_offers_legacy_algorithms_before_handshake(self):
+        """Legacy algorithms are set on the jump host transport before the key exchange starts."""
+        options = SimpleNamespace(kex=('curve25519-sha256@libssh.org',), ciphers=(), digests=())
+        offered = {}
+        transport = Mock()
+        transport.get_security_options.return_value = options
+        transport.start_client.side_effect = lambda **kwargs: offered.update(vars(options))
+        
+        module = 'rr4_complete_enchanced_v4_cli_core.connection_manager'
+        with patch(f'{module}.socket.create_connection'), patch(f'{module}.paramiko.Transport', return_value=transport):
+            jump_host = {'hostname': '172.16.39.128', 'username': 'root', 'password': 'eve'}
+            self.assertIs(self.pool.get_jump_transport(jump_host), transport)
+            transport.is_active.return_value = True
+            self.assertIs(self.pool.get_jump_transport(jump_host), transport)
+        
+        transport.start_client.assert_called_once()
+        transport.auth_password.assert_called_once_with('root', 'eve')
+        self.assertEqual(offered['kex'][0], 'curve25519-sha256@libssh.org')
+        self.assertIn('diffie-hellman-group1-sha1', offered['kex'])
+        self.assertIn('3des-cbc', offered['ciphers'])
+        self.assertIn('hmac-sha1', offered['digests'])
+    
+    def test_enable_legacy_algorithms_skips_unsupported(self):
+        """Algorithms the installed paramiko does not implement are left out, defaults stay first."""
+        import paramiko
+        left, right = socket.socketpair()
+        try:
+            transport = paramiko.Transport(left)
+            options = transport.get_security_options()
+            defaults = tuple(options.ciphers)
+            enable_legacy_algorithms(transport, dict(JUMP_HOST_SSH_ALGORITHMS, kex=['no-such-kex']))
+            self.assertEqual(tuple(options.ciphers[:len(defaults)]), defaults)
+            self.assertIn('3des-cbc', options.ciphers)
+            self.assertNotIn('no-such-kex', options.kex)
+        finally:
+            left.close()
+            right.close()
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
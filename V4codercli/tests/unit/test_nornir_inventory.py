@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Unit tests for the in-memory Nornir inventory."""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import csv
+import tempfile
+from pathlib import Path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from nornir import InitNornir
+from rr4_complete_enchanced_v4_cli_core.inventory_loader import InventoryLoader, nornir_inventory_config
+
+class TestNornirInventory(unittest.TestCase):
+    """Test cases for DictInventory and the compiled inventory cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        InventoryLoader.clear_compiled_cache()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.csv_file = os.path.join(self.temp_dir.name, 'routers.csv')
+        self.write_inventory(3)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_inventory(self, count):
+        with open(self.csv_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['hostname', 'ip_address', 'platform', 'device_type', 'groups', 'model'])
+            for i in range(count):
+                writer.writerow([f'R{i}', f'172.16.39.{i + 1}', 'ios', 'cisco_ios', 'core_routers', '3725'])
+
+    def test_dict_inventory_matches_generated_inventory(self):
+        """Nornir is built from the generated dicts without writing YAML."""
+        loader = InventoryLoader(self.csv_file)
+        loader.config_dir = Path(self.temp_dir.name)
+        devices, inventory = loader.compile_nornir_inventory('admin', 'secret')
+
+        nr = InitNornir(inventory=nornir_inventory_config(inventory),
+                        runner={'plugin': 'serial'}, logging={'enabled': False})
+
+        self.assertEqual(sorted(nr.inventory.hosts), ['R0', 'R1', 'R2'])
+        host = nr.inventory.hosts['R1']
+        self.assertEqual(host.hostname, '172.16.39.2')
+        self.assertEqual(host.platform, 'ios')
+        self.assertIn('core_routers', [group.name for group in host.groups])
+        self.assertEqual(host.get_connection_parameters('netmiko').username, 'admin')
+        self.assertEqual(len(devices), 3)
+        self.assertEqual(os.listdir(self.temp_dir.name), ['routers.csv'])
+
+        # Tasks writing host data do not leak into the cached inventory
+        host.data['collected'] = True
+        self.assertNotIn('collected', inventory['hosts']['R1']['data'])
+
+    def test_compiled_inventory_cached_by_csv_hash(self):
+        """An unchanged CSV is compiled once; a changed CSV is compiled again."""
+        loader = InventoryLoader(self.csv_file)
+        with patch.object(InventoryLoader, 'generate_nornir_inventory',
+                          wraps=loader.generate_nornir_inventory) as generate:
+            _, first = loader.compile_nornir_inventory('admin', 'secret')
+            _, second = InventoryLoader(self.csv_file).compile_nornir_inventory('admin', 'secret')
+            self.assertIs(first, second)
+            self.assertEqual(generate.call_count, 1)
+
+            InventoryLoader(self.csv_file).compile_nornir_inventory('admin', 'other')
+            self.assertEqual(generate.call_count, 2)
+
+            self.write_inventory(4)
+            _, changed = loader.compile_nornir_inventory('admin', 'secret')
+            self.assertEqual(len(changed['hosts']), 4)
+            self.assertEqual(generate.call_count, 3)
+
+    def test_yaml_written_on_request(self):
+        """save_yaml writes hosts.yaml/groups.yaml into the config directory."""
+        loader = InventoryLoader(self.csv_file)
+        loader.config_dir = Path(self.temp_dir.name)
+        loader.compile_nornir_inventory('admin', 'secret', save_yaml=True)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.temp_dir.name, 'inventory'))),
+                         ['groups.yaml', 'hosts.yaml'])
+
+if __name__ == '__main__':
+    unittest.main()
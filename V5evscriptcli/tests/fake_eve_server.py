@@ -0,0 +1,208 @@
+"""
+In-process fake of the EVE-NG REST API for deployment tests
+
+Implements the lab, node, network, interface and topology endpoints used by
+EVEClient, with an optional per-request latency so concurrency is measurable,
+and records the peak number of requests in flight.
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LAB_RE = r"/api/labs(?P<lab>/.+?\.unl)"
+
+class FakeEVEServer:
+    """Fake EVE-NG API server listening on an ephemeral localhost port"""
+
+    def __init__(self, latency: float = 0.0, lab_visible_delay: float = 0.0):
+        self.latency = latency
+        self.lab_visible_delay = lab_visible_delay
+        self.labs = {}          # lab path -> time it becomes readable
+        self.nodes = {}         # lab path -> {node_id: {"name", "interfaces": {index: network_id}}}
+        self.networks = {}      # lab path -> {network_id: name}
+        self.fail_nodes = set()  # node names whose creation returns an error
+        self.topology_enabled = True
+        self.injected_errors = {}  # (method, path) -> HTTP statuses to answer before handling normally
+        self._last_id = 0
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self._server = None
+        self._routes = [
+            ("POST", re.compile(r"/api/auth/login$"), self._login),
+            ("GET", re.compile(r"/api/auth/logout$"), self._login),
+            ("POST", re.compile(r"/api/labs$"), self._create_lab),
+            ("GET", re.compile(LAB_RE + r"$"), self._get_lab),
+            ("DELETE", re.compile(LAB_RE + r"$"), self._delete_lab),
+            ("POST", re.compile(LAB_RE + r"/nodes$"), self._create_node),
+            ("POST", re.compile(LAB_RE + r"/networks$"), self._create_network),
+            ("GET", re.compile(LAB_RE + r"/topology$"), self._get_topology),
+            ("GET", re.compile(LAB_RE + r"/nodes/(?P<id>\d+)/interfaces$"), self._get_interfaces),
+            ("PUT", re.compile(LAB_RE + r"/nodes/(?P<id>\d+)/interfaces$"), self._put_interfaces),
+            ("DELETE", re.compile(LAB_RE + r"/nodes/(?P<id>\d+)$"), self._delete_node),
+            ("DELETE", re.compile(LAB_RE + r"/networks/(?P<id>\d+)$"), self._delete_network),
+        ]
+
+    @property
+    def host(self) -> str:
+        return f"127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> 'FakeEVEServer':
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                status, payload = server.dispatch(self.command, self.path, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def dispatch(self, method, path, body):
+        with self.lock:
+            self.requests.append((method, path))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            with self.lock:
+                errors = self.injected_errors.get((method, path))
+                if errors:
+                    return self._fail("Injected error", errors.pop(0))
+            for route_method, pattern, handler in self._routes:
+                match = pattern.match(path)
+                if route_method == method and match:
+                    with self.lock:
+                        return handler(body, **match.groupdict())
+            return 404, {"status": "fail", "message": f"No route for {method} {path}"}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def bindings(self, lab: str) -> dict:
+        """{node name: {interface index: network name}} for one lab"""
+        networks = self.networks.get(lab, {})
+        return {node["name"]: {index: networks.get(network_id) for index, network_id in node["interfaces"].items()}
+                for node in self.nodes.get(lab, {}).values()}
+
+    @staticmethod
+    def _ok(data=None, status=200):
+        payload = {"code": status, "status": "success", "message": "OK"}
+        if data is not None:
+            payload["data"] = data
+        return status, payload
+
+    @staticmethod
+    def _fail(message, status=404):
+        return status, {"code": status, "status": "fail", "message": message}
+
+    def _new_id(self) -> str:
+        self._last_id += 1
+        return str(self._last_id)
+
+    def _login(self, body):
+        return self._ok()
+
+    def _create_lab(self, body):
+        folder = body["path"].strip("/")
+        lab = f"/{folder}/{body['name']}.unl" if folder else f"/{body['name']}.unl"
+        self.labs[lab] = time.monotonic() + self.lab_visible_delay
+        self.nodes[lab] = {}
+        self.networks[lab] = {}
+        return self._ok()
+
+    def _get_lab(self, body, lab):
+        if lab in self.labs and time.monotonic() >= self.labs[lab]:
+            return self._ok({"name": lab})
+        return self._fail(f"Lab {lab} does not exist")
+
+    def _delete_lab(self, body, lab):
+        if self.labs.pop(lab, None) is None:
+            return self._fail(f"Lab {lab} does not exist")
+        self.nodes.pop(lab, None)
+        self.networks.pop(lab, None)
+        return self._ok()
+
+    def _create_node(self, body, lab):
+        if lab not in self.nodes:
+            return self._fail(f"Lab {lab} does not exist")
+        if body.get("name") in self.fail_nodes:
+            return self._fail(f"Cannot create node {body['name']}", 400)
+        node_id = self._new_id()
+        self.nodes[lab][node_id] = {"name": body.get("name"), "interfaces": {}}
+        return self._ok({"id": int(node_id)}, 201)
+
+    def _create_network(self, body, lab):
+        if lab not in self.networks:
+            return self._fail(f"Lab {lab} does not exist")
+        network_id = self._new_id()
+        self.networks[lab][network_id] = body.get("name")
+        return self._ok({"id": int(network_id)}, 201)
+
+    def _get_topology(self, body, lab):
+        if not self.topology_enabled or lab not in self.nodes:
+            return self._fail(f"Topology of {lab} not available")
+        links = []
+        for node_id, node in self.nodes[lab].items():
+            for index, network_id in node["interfaces"].items():
+                links.append({
+                    "type": "ethernet", "network_id": int(network_id),
+                    "source": f"node{node_id}", "source_type": "node",
+                    "source_label": f"e{index}", "source_interfaceId": int(index),
+                    "destination": f"network{network_id}", "destination_type": "network",
+                    "destination_label": "",
+                })
+        return self._ok(links)
+
+    def _get_interfaces(self, body, lab, id):
+        node = self.nodes.get(lab, {}).get(id)
+        if node is None:
+            return self._fail(f"Node {id} does not exist")
+        ethernet = {index: {"name": f"e{index}", "network_id": int(network_id)}
+                    for index, network_id in node["interfaces"].items()}
+        return self._ok({"ethernet": ethernet})
+
+    def _put_interfaces(self, body, lab, id):
+        node = self.nodes.get(lab, {}).get(id)
+        if node is None:
+            return self._fail(f"Node {id} does not exist")
+        for index, network_id in body.items():
+            if str(network_id) not in self.networks[lab]:
+                return self._fail(f"Network {network_id} does not exist", 400)
+            node["interfaces"][str(index)] = str(network_id)
+        return self._ok()
+
+    def _delete_node(self, body, lab, id):
+        if self.nodes.get(lab, {}).pop(id, None) is None:
+            return self._fail(f"Node {id} does not exist")
+        return self._ok()
+
+    def _delete_network(self, body, lab, id):
+        if self.networks.get(lab, {}).pop(id, None) is None:
+            return self._fail(f"Network {id} does not exist")
+        return self._ok()
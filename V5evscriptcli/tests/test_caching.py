@@ -163,4 +163,42 @@ def test_cache_key_generation(eve_client):
         assert mock_api.call_count == 3
         
         # Should have 3 different cache entries
-        assert len(eve_client._node_cache) == 3 
\ No newline at end of file
+        assert len(eve_client._node_cache) == 3 
+
+@pytest.mark.performance
+def test_interface_write_invalidates_node_cache(eve_client):
+    """Connecting an interface drops that node's cached interfaces and the lab topology only"""
+    with patch.object(eve_client, 'api_request') as mock_api:
+        mock_api.return_value = {"status": "success", "data": {}}
+        eve_client.get_node_interfaces("lab1", "1", "/")
+        eve_client.get_node_interfaces("lab1", "2", "/")
+        eve_client.get_lab_topology("lab1", "/")
+        assert mock_api.call_count == 3
+
+        eve_client.connect_node_to_network("lab1", "1", "f0/0", "5", "/")
+        assert "lab1_/_1_interfaces" not in eve_client._node_cache
+        assert "lab1_/_2_interfaces" in eve_client._node_cache
+        assert "lab1_/_topology" not in eve_client._lab_cache
+
+@pytest.mark.performance
+def test_lab_topology_caching(eve_client):
+    """The lab topology is parsed once and refetched only after a write to the lab"""
+    with patch.object(eve_client, 'api_request') as mock_api:
+        mock_api.return_value = {
+            "status": "success",
+            "data": [
+                {"source": "node1", "source_type": "node", "source_interfaceId": 16,
+                 "destination": "network3", "destination_type": "network", "network_id": 3},
+                {"source": "node1", "source_type": "node", "source_interfaceId": 0,
+                 "destination": "node2", "destination_type": "node"}
+            ]
+        }
+        assert eve_client.get_lab_topology("lab1", "/") == {"1": {"16": "3"}}
+        assert eve_client.verify_links("lab1", [("1", "f1/0", "3"), ("1", "f0/0", "3")]) == [("1", "f0/0", "3")]
+        assert mock_api.call_count == 1
+
+        mock_api.return_value = {"status": "success", "data": {"id": 4}}
+        eve_client.create_network("lab1", "bridge", "Net4")
+        mock_api.return_value = {"status": "success", "data": []}
+        assert eve_client.get_lab_topology("lab1", "/") == {}
+        assert mock_api.call_count == 3
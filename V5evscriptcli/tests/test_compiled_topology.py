@@ -0,0 +1,116 @@
+"""
+Test suite for precomputed router tables and compiled designer topologies
+"""
+
+import pytest
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+# Add parent directory to path to import main script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import v5_eve_ng_automation
+from v5_eve_ng_automation import (
+    EVEClient, ROUTER_SPECIFICATIONS, ROUTER_TABLES, CompiledTopology,
+    load_compiled_topology, lookup_interface_index
+)
+
+TOPOLOGIES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'topologies')
+
+def designer_topology(router_count):
+    """Designer-format topology: a chain of c3725 routers linked f1/0 <-> f0/0"""
+    nodes = {f"router-{i}": {"id": f"router-{i}", "name": f"R{i}", "type": "c3725",
+                             "interfaces": ["f0/0", "f0/1", "f1/0", "f2/0"], "position": {"x": i, "y": i}}
+             for i in range(router_count)}
+    connections = [{"source": f"router-{i}", "target": f"router-{i+1}",
+                    "sourceInterface": "f1/0", "targetInterface": "f0/0"} for i in range(router_count - 1)]
+    return {"nodes": nodes, "connections": connections}
+
+@pytest.mark.unit
+def test_router_tables_match_specifications():
+    """Tables are built from the specifications and agree with the client API"""
+    client = EVEClient("172.16.39.128", "admin", "eve")
+    assert set(ROUTER_TABLES) == set(ROUTER_SPECIFICATIONS)
+    for router_type, table in ROUTER_TABLES.items():
+        assert list(table["interfaces"]) == client.get_supported_interfaces(router_type)
+        for interface, index in table["indices"].items():
+            assert client.get_interface_index(interface, router_type) == index
+            assert lookup_interface_index(interface, router_type) == index
+    assert ROUTER_TABLES["c7200"]["ram_range"] == (256, 1024)
+    assert lookup_interface_index("f3/0", "c3725") is None
+    assert lookup_interface_index("f0/0", "unknown") is None
+
+    # Callers cannot corrupt the shared tables through returned values
+    client.get_supported_interfaces("c3725").append("f9/0")
+    client.get_router_specifications("c3725")["onboard_interfaces"].append("f9/0")
+    assert not client.is_valid_interface("f9/0", "c3725")
+    assert ROUTER_SPECIFICATIONS["c3725"]["onboard_interfaces"] == ['f0/0', 'f0/1']
+
+@pytest.mark.unit
+def test_compiled_topology_resolves_links():
+    """Links carry precomputed API indices; undeployable connections become errors"""
+    data = designer_topology(3)
+    data["connections"] += [
+        {"source": "router-0", "target": "router-2", "sourceInterface": "f1/0", "targetInterface": "f2/0"},
+        {"source": "router-0", "target": "router-9", "sourceInterface": "f0/1", "targetInterface": "f0/0"},
+        {"source": "router-2", "target": "router-0", "sourceInterface": "g0/0", "targetInterface": "f0/1"},
+    ]
+    compiled = CompiledTopology(data)
+
+    assert compiled.links[0] == {
+        'source': 'router-0', 'source_interface': 'f1/0', 'source_api_index': 16,
+        'target': 'router-1', 'target_interface': 'f0/0', 'target_api_index': 0,
+        'network': 'Net_router-0_router-1'
+    }
+    assert len(compiled.links) == 2
+    assert compiled.errors == [
+        "Connection 3: interface f1/0 on router 'R0' used multiple times",
+        "Connection 4: unknown endpoint router-9",
+        "Connection 5: invalid interface 'g0/0' for router 'R2' (type: c3725)",
+    ]
+    assert compiled.interface_mappings["router-1"] == {"f0/0": 0, "f0/1": 1, "f1/0": 16, "f2/0": 32}
+
+    plan = compiled.to_plan(EVEClient("172.16.39.128", "admin", "eve"))
+    assert plan.validate() == []
+    assert plan.nodes["router-2"]["config"]["name"] == "R2"
+    assert len(plan.links) == 4
+
+@pytest.mark.unit
+def test_saved_topologies_compile_and_cache():
+    """Saved topologies compile cleanly, match their stored mappings, and are cached until changed"""
+    for filename in sorted(os.listdir(TOPOLOGIES_DIR)):
+        path = os.path.join(TOPOLOGIES_DIR, filename)
+        compiled = load_compiled_topology(path)
+        assert compiled.errors == []
+        assert compiled.interface_mappings == compiled.data.get("interfaceMappings", compiled.interface_mappings)
+        assert load_compiled_topology(path) is compiled
+
+@pytest.mark.unit
+def test_compiled_cache_invalidated_on_change(tmp_path):
+    path = tmp_path / "topology.json"
+    path.write_text(json.dumps(designer_topology(2)))
+    first = load_compiled_topology(str(path))
+    path.write_text(json.dumps(designer_topology(3)))
+    second = load_compiled_topology(str(path))
+    assert second is not first
+    assert len(second.links) == 2
+
+@pytest.mark.performance
+def test_large_topology_validation_without_string_parsing():
+    """Validating a 500-router topology does dict lookups only - no regex matching"""
+    client = EVEClient("172.16.39.128", "admin", "eve")
+    routers = {f"R{i}": client.get_node_config_template("c3725") for i in range(500)}
+    connections = [(f"R{i}", "f1/0", f"R{i+1}", "f0/0", f"Link{i}", "0", "0") for i in range(499)]
+
+    with patch.object(v5_eve_ng_automation.re, 'match') as regex_match:
+        start_time = time.time()
+        is_valid, errors = client.validate_topology_config(routers, connections)
+        compiled = CompiledTopology(designer_topology(500))
+        elapsed = time.time() - start_time
+
+    assert (is_valid, errors) == (True, [])
+    assert compiled.errors == [] and len(compiled.links) == 499
+    regex_match.assert_not_called()
+    assert elapsed < 0.5
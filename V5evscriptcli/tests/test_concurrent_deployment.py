@@ -0,0 +1,172 @@
+"""
+Test suite for the concurrent deployment planner
+Runs real HTTP requests against a local fake EVE-NG API server
+"""
+
+import pytest
+import time
+import sys
+import os
+
+# Add parent directory to path to import main script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from v5_eve_ng_automation import (
+    EVEClient, DeploymentPlan, ConcurrentDeployer, deploy_topology,
+    TOPOLOGY_ROUTERS, TOPOLOGY_CONNECTIONS, MANAGEMENT_NETWORK_NAME
+)
+from tests.fake_eve_server import FakeEVEServer
+
+LATENCY = 0.05
+
+@pytest.fixture
+def fake_server():
+    """Start a fake EVE-NG API server with per-request latency"""
+    server = FakeEVEServer(latency=LATENCY).start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def eve_client(fake_server):
+    """EVE-NG client logged in to the fake server with an existing lab"""
+    client = EVEClient(fake_server.host, "admin", "eve")
+    assert client.login()
+    assert client.create_lab("concurrent_lab", "/", "tests", "fake server lab")
+    yield client
+    client.logout()
+
+def expected_bindings(eve_client):
+    """{router: {interface index: network name}} the default topology should produce"""
+    expected = {name: {} for name in TOPOLOGY_ROUTERS}
+    for router1, iface1, router2, iface2, link_name, _, _ in TOPOLOGY_CONNECTIONS:
+        expected[router1][eve_client.get_interface_index(iface1, "c3725")] = link_name
+        expected[router2][eve_client.get_interface_index(iface2, "c3725")] = link_name
+    for name, config in TOPOLOGY_ROUTERS.items():
+        expected[name][eve_client.get_interface_index(config["mgmt_interface"], "c3725")] = MANAGEMENT_NETWORK_NAME
+    return expected
+
+@pytest.mark.unit
+def test_plan_from_topology():
+    """The default topology becomes one node per router, one network per link plus management"""
+    plan = DeploymentPlan.from_topology()
+    assert set(plan.nodes) == set(TOPOLOGY_ROUTERS)
+    assert len(plan.networks) == len(TOPOLOGY_CONNECTIONS) + 1
+    assert len(plan.links) == 2 * len(TOPOLOGY_CONNECTIONS) + len(TOPOLOGY_ROUTERS)
+    assert plan.validate() == []
+    assert plan.operation_count == len(plan.nodes) + len(plan.networks) + len(plan.links)
+
+@pytest.mark.unit
+def test_plan_for_deployed_routers():
+    """With node_ids the plan holds exactly the deployed routers and creates none"""
+    router1, _, router2, _, link_name, _, _ = TOPOLOGY_CONNECTIONS[0]
+    connection = TOPOLOGY_CONNECTIONS[0]
+    node_ids = {router1: "1", router2: "2", "EXTRA": "9"}
+    plan = DeploymentPlan.from_topology(connections=[connection], management_network=False, node_ids=node_ids)
+
+    assert {name: node["node_id"] for name, node in plan.nodes.items()} == node_ids
+    assert all(node["config"] is None for node in plan.nodes.values())
+    assert list(plan.networks) == [link_name]
+    assert plan.validate() == []
+
+@pytest.mark.unit
+def test_plan_validation():
+    """Links to unknown nodes/networks and reused interfaces are rejected before any call"""
+    plan = DeploymentPlan()
+    plan.add_node("R1", {"name": "R1"})
+    plan.add_network("Net1")
+    plan.add_link("R1", "f0/0", "Net1")
+    plan.add_link("R1", "f0/0", "Net2")
+    plan.add_link("R2", "f0/1", "Net1")
+    assert plan.validate() == [
+        "Link references unknown network 'Net2'",
+        "Interface f0/0 on 'R1' is linked more than once",
+        "Link references unknown node 'R2'",
+    ]
+
+    result = ConcurrentDeployer(EVEClient("127.0.0.1:9", "admin", "eve"), "lab").deploy(plan)
+    assert result["success"] is False
+    assert [failure["kind"] for failure in result["failed"]] == ["plan"] * 3
+
+@pytest.mark.api
+@pytest.mark.performance
+def test_concurrent_deployment_against_fake_server(fake_server, eve_client):
+    """Whole topology is deployed concurrently with every interface bound to the right network"""
+    requests_before = len(fake_server.requests)
+    events = []
+    start_time = time.time()
+    result = ConcurrentDeployer(eve_client, "concurrent_lab", max_workers=8,
+                                on_event=events.append).deploy(DeploymentPlan.from_topology())
+    elapsed = time.time() - start_time
+
+    assert result["success"], result["failed"]
+    assert result["failed"] == [] and result["unverified"] == []
+    assert fake_server.bindings("/concurrent_lab.unl") == expected_bindings(eve_client)
+    assert len(events) == DeploymentPlan.from_topology().operation_count
+
+    # Bounded concurrency, and far quicker than issuing the same calls one by one
+    request_count = len(fake_server.requests) - requests_before
+    assert 1 < fake_server.max_in_flight <= 8
+    assert elapsed < request_count * LATENCY * 0.5
+
+    # All links verified from a single topology read
+    verification = [path for method, path in fake_server.requests[requests_before:] if method == "GET"]
+    assert verification == ["/api/labs/concurrent_lab.unl/topology"]
+
+    summary = eve_client.get_deployment_summary()
+    assert summary["nodes_count"] == len(TOPOLOGY_ROUTERS)
+    assert summary["connections_count"] == len(result["links"])
+
+@pytest.mark.api
+def test_failed_node_skips_its_links(fake_server, eve_client):
+    """Links of a node that could not be created fail; the rest of the topology is deployed"""
+    fake_server.fail_nodes.add("RR1")
+    result = deploy_topology(eve_client, "concurrent_lab")
+
+    assert result["success"] is False
+    failed = {(failure["kind"], failure["name"]) for failure in result["failed"]}
+    assert ("node", "RR1") in failed
+    assert ("link", "RR1(f1/0) -> Link_P_RR1") in failed
+    assert "RR1" not in result["nodes"]
+
+    expected = expected_bindings(eve_client)
+    del expected["RR1"]
+    assert fake_server.bindings("/concurrent_lab.unl") == expected
+
+@pytest.mark.api
+def test_create_lab_waits_for_readiness():
+    """create_lab returns once the new lab is readable instead of after a fixed sleep"""
+    server = FakeEVEServer(lab_visible_delay=0.3).start()
+    try:
+        client = EVEClient(server.host, "admin", "eve")
+        start_time = time.time()
+        assert client.create_lab("ready_lab", "/", "tests", "readiness")
+        elapsed = time.time() - start_time
+        assert 0.3 <= elapsed < 1.0
+        assert server.requests[-1] == ("GET", "/api/labs/ready_lab.unl")
+    finally:
+        server.stop()
+
+@pytest.mark.api
+def test_verify_links_sees_writes(fake_server, eve_client):
+    """A cached topology is invalidated by the client's own writes, not by a TTL"""
+    node_id = eve_client.create_node("concurrent_lab", {"type": "dynamips", "template": "c3725", "name": "R1"})
+    network_id = eve_client.create_network("concurrent_lab", "bridge", "Net1")
+    expected = [(node_id, "f1/0", network_id)]
+
+    assert eve_client.verify_links("concurrent_lab", expected) == expected
+    assert eve_client.connect_node_to_network("concurrent_lab", node_id, "f1/0", network_id)
+    assert eve_client.verify_links("concurrent_lab", expected) == []
+
+    topology_reads = fake_server.requests.count(("GET", "/api/labs/concurrent_lab.unl/topology"))
+    assert eve_client.verify_links("concurrent_lab", expected) == []
+    assert fake_server.requests.count(("GET", "/api/labs/concurrent_lab.unl/topology")) == topology_reads
+
+@pytest.mark.api
+def test_verify_links_without_topology_endpoint(fake_server, eve_client):
+    """Without the topology endpoint, verification reads each node's interfaces once"""
+    fake_server.topology_enabled = False
+    result = deploy_topology(eve_client, "concurrent_lab")
+
+    assert result["success"] and result["unverified"] == []
+    interface_reads = [path for method, path in fake_server.requests
+                       if method == "GET" and path.endswith("/interfaces")]
+    assert len(interface_reads) == len(TOPOLOGY_ROUTERS)
@@ -11,7 +11,9 @@ import os
 
 # Add parent directory to path to import main script
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import v5_eve_ng_automation
 from v5_eve_ng_automation import EVEClient
+from tests.fake_eve_server import FakeEVEServer
 
 @pytest.fixture
 def eve_client():
@@ -295,4 +297,61 @@ def test_rollback_performance(eve_client):
     assert summary["networks_count"] == 100
     
     # Performance should be reasonable (under 1 second for 200 operations)
-    assert tracking_time < 1.0 
\ No newline at end of file
+    assert tracking_time < 1.0 
+
+def deploy_fake_lab(server, count):
+    """Client tracking a lab on the fake server with count nodes and count networks"""
+    client = EVEClient(server.host, "admin", "eve")
+    client.start_deployment_tracking("rollback_lab", "/")
+    assert client.create_lab("rollback_lab", "/")
+    for i in range(count):
+        assert client.create_node("rollback_lab", {"type": "dynamips", "template": "c3725", "name": f"R{i}"})
+        assert client.create_network("rollback_lab", "bridge", f"Net{i}")
+    return client
+
+@pytest.mark.performance
+def test_parallel_rollback_against_fake_server(monkeypatch):
+    """A 30-node rollback deletes each resource class concurrently, far faster than one by one"""
+    durations = {}
+    for workers in (1, v5_eve_ng_automation.ROLLBACK_MAX_WORKERS):
+        monkeypatch.setattr(v5_eve_ng_automation, "ROLLBACK_MAX_WORKERS", workers)
+        server = FakeEVEServer().start()
+        try:
+            client = deploy_fake_lab(server, 30)
+            server.latency = 0.03
+            start_time = time.time()
+            assert client.rollback_deployment("Benchmark") == True
+            durations[workers] = time.time() - start_time
+
+            assert server.labs == {} and server.nodes == {}
+            assert server.max_in_flight <= workers
+            summary = client.last_rollback_summary
+            assert summary["nodes_deleted"] == 30 and summary["networks_deleted"] == 30
+            assert sorted(summary["deleted"]["nodes"]) == sorted(f"R{i}" for i in range(30))
+            assert summary["failed"] == {"nodes": [], "networks": []}
+        finally:
+            server.stop()
+
+    assert durations[v5_eve_ng_automation.ROLLBACK_MAX_WORKERS] < durations[1] / 3
+
+@pytest.mark.integration
+def test_rollback_retries_transient_errors(monkeypatch):
+    """Transient DELETE errors are retried with backoff; persistent ones are reported as failed"""
+    monkeypatch.setattr(v5_eve_ng_automation, "ROLLBACK_RETRY_DELAY", 0.01)
+    server = FakeEVEServer().start()
+    try:
+        client = deploy_fake_lab(server, 3)  # IDs: R0=1, Net0=2, R1=3, Net1=4, R2=5, Net2=6
+        server.injected_errors[("DELETE", "/api/labs/rollback_lab.unl/nodes/1")] = [503, 409]
+        server.injected_errors[("DELETE", "/api/labs/rollback_lab.unl/nodes/3")] = [500] * 10
+        server.injected_errors[("DELETE", "/api/labs/rollback_lab.unl/networks/4")] = [404]
+
+        assert client.rollback_deployment("Transient errors") == False
+
+        summary = client.last_rollback_summary
+        assert sorted(summary["deleted"]["nodes"]) == ["R0", "R2"]
+        assert summary["failed"]["nodes"] == ["R1"]
+        assert sorted(summary["deleted"]["networks"]) == ["Net0", "Net1", "Net2"]
+        assert summary["errors"] == ["Failed to delete node R1"]
+        assert server.injected_errors[("DELETE", "/api/labs/rollback_lab.unl/nodes/3")] == [500] * 6
+    finally:
+        server.stop()
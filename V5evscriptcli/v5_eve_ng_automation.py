@@ -19,8 +19,12 @@ import time
 import subprocess
 import re
 import os
-from typing import Dict, List, Tuple, Optional
+import random
+import copy
+from typing import Dict, List, Tuple, Optional, Callable
 from functools import wraps
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # ============================================================================
 # ENHANCED LOGGING CONFIGURATION (Addresses BUG-007)
@@ -148,11 +152,116 @@ class StructuredLogger:
 LOG_LEVEL = os.getenv('V5EVE_LOG_LEVEL', 'INFO')
 logger = StructuredLogger(__name__, LOG_LEVEL)
 
+# ============================================================================
+# ROUTER PLATFORM TABLES (NEW-001: Multi-Vendor Router Support)
+# ============================================================================
+
+# Router specifications; interface_indices is the authoritative EVE-NG API
+# index of every supported interface, in display order
+ROUTER_SPECIFICATIONS = {
+    'c3725': {
+        'description': 'Cisco 3725 Modular Router',
+        'onboard_interfaces': ['f0/0', 'f0/1'],
+        'slot_interfaces': ['f1/0', 'f2/0'],
+        'supported_modules': ['NM-1FE-TX', 'NM-4T', 'NM-16ESW'],
+        'ram_range': '128-512MB',
+        'max_slots': 2,
+        'typical_use': 'Branch office, small enterprise',
+        'interface_indices': {
+            'f0/0': '0',   # Onboard FastEthernet 0/0
+            'f0/1': '1',   # Onboard FastEthernet 0/1
+            'f1/0': '16',  # NM-1FE-TX in slot 1
+            'f2/0': '32'   # NM-1FE-TX in slot 2
+        }
+    },
+    'c7200': {
+        'description': 'Cisco 7200 Series Router',
+        'onboard_interfaces': [],
+        'slot_interfaces': ['g0/0', 'g1/0', 'g2/0', 'g3/0', 'g4/0', 'g5/0'],
+        'supported_modules': ['PA-GE', 'PA-FE-TX', 'PA-4E', 'PA-8E'],
+        'ram_range': '256-1024MB',
+        'max_slots': 6,
+        'typical_use': 'Enterprise core, service provider',
+        'interface_indices': {
+            # 6x GigabitEthernet configuration
+            'g0/0': '0', 'g1/0': '1', 'g2/0': '2', 'g3/0': '3', 'g4/0': '4', 'g5/0': '5',
+            # 4x FastEthernet + 2x GigabitEthernet configuration (alternative)
+            'f0/0': '6', 'f1/0': '7', 'f2/0': '8', 'f3/0': '9'
+        }
+    },
+    'c3640': {
+        'description': 'Cisco 3640 Modular Router',
+        'onboard_interfaces': ['f0/0', 'f0/1'],
+        'slot_interfaces': ['f1/0', 'f2/0'],
+        'supported_modules': ['NM-1FE-TX', 'NM-4T', 'NM-2FE2W'],
+        'ram_range': '128-512MB',
+        'max_slots': 2,
+        'typical_use': 'Branch office, medium enterprise',
+        'interface_indices': {'f0/0': '0', 'f0/1': '1', 'f1/0': '16', 'f2/0': '32'}
+    },
+    'c2691': {
+        'description': 'Cisco 2691 Modular Router',
+        'onboard_interfaces': ['f0/0', 'f0/1'],
+        'slot_interfaces': ['f1/0', 'f2/0'],
+        'supported_modules': ['NM-1FE-TX', 'NM-4T', 'NM-2FE2W'],
+        'ram_range': '128-512MB',
+        'max_slots': 2,
+        'typical_use': 'Small branch office',
+        'interface_indices': {'f0/0': '0', 'f0/1': '1', 'f1/0': '16', 'f2/0': '32'}
+    },
+    'c1700': {
+        'description': 'Cisco 1700 Series Router',
+        'onboard_interfaces': ['f0/0'],
+        'slot_interfaces': ['s0/0', 's0/1'],
+        'supported_modules': ['WIC-1T', 'WIC-2T', 'WIC-1ENET'],
+        'ram_range': '64-256MB',
+        'max_slots': 2,
+        'typical_use': 'Small office, home office (SOHO)',
+        'interface_indices': {
+            'f0/0': '0',   # Onboard FastEthernet 0/0
+            's0/0': '1',   # Serial 0/0 (WIC slot)
+            's0/1': '2'    # Serial 0/1 (WIC slot)
+        }
+    }
+}
+
+def build_router_tables(specifications: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Per-router-type lookup tables, built once from the specifications:
+    {router_type: {"indices": {interface: index}, "interfaces": (interface, ...),
+    "ram_range": (min_mb, max_mb), "modules": [module, ..., ""]}}.
+    Validation and index lookup become dict probes instead of regex matches.
+    """
+    tables = {}
+    for router_type, spec in specifications.items():
+        indices = dict(spec['interface_indices'])
+        min_ram, max_ram = spec['ram_range'].rstrip('MB').split('-')
+        tables[router_type] = {
+            "indices": indices,
+            "interfaces": tuple(indices),
+            "ram_range": (int(min_ram), int(max_ram)),
+            "modules": spec['supported_modules'] + ['']
+        }
+    return tables
+
+ROUTER_TABLES = build_router_tables(ROUTER_SPECIFICATIONS)
+FALLBACK_ROUTER_TYPE = 'c3725'
+NODE_NAME_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+def lookup_interface_index(interface_name: str, router_type: str = FALLBACK_ROUTER_TYPE) -> Optional[str]:
+    """API index of interface_name on router_type, or None if it has no such interface"""
+    table = ROUTER_TABLES.get(router_type)
+    return table["indices"].get(interface_name) if table else None
+
 # ============================================================================
 # ERROR RECOVERY UTILITIES (Addresses BUG-005)
 # ============================================================================
 
-def retry_on_failure(max_retries=3, delay=1, backoff=2, exceptions=(Exception,)):
+def backoff_delay(delay: float, jitter: bool = True) -> float:
+    """Randomize a backoff delay into [delay/2, delay] so concurrent retries do not align"""
+    return random.uniform(delay / 2, delay) if jitter else delay
+
+def retry_on_failure(max_retries=3, delay=1, backoff=2, exceptions=(Exception,), jitter=False):
     """
     Decorator for retrying functions on failure with exponential backoff
     Addresses BUG-005: Limited Error Recovery
@@ -172,8 +281,9 @@ def retry_on_failure(max_retries=3, delay=1, backoff=2, exceptions=(Exception,))
                         logger.error(f"Function {func.__name__} failed after {max_retries + 1} attempts: {e}")
                         break
                     
-                    logger.warning(f"Attempt {attempt + 1} failed for {func.__name__}: {e}. Retrying in {retry_delay}s...")
-                    time.sleep(retry_delay)
+                    wait_time = backoff_delay(retry_delay, jitter)
+                    logger.warning(f"Attempt {attempt + 1} failed for {func.__name__}: {e}. Retrying in {wait_time:.2f}s...")
+                    time.sleep(wait_time)
                     retry_delay *= backoff
             
             # If we get here, all retries failed
@@ -208,6 +318,19 @@ def handle_api_errors(func):
             return None
     return wrapper
 
+def wait_until(condition: Callable[[], bool], timeout: float = 2.0, interval: float = 0.1) -> bool:
+    """
+    Poll condition() until it is true or timeout expires
+    Replaces fixed sleeps: returns as soon as the server reports the resource ready
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        if condition():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
 # ============================================================================
 # CONFIGURATION SECTION
 # ============================================================================
@@ -250,6 +373,14 @@ USE_MANAGEMENT_NETWORK = True
 MANAGEMENT_NETWORK_NAME = "Management"
 MANAGEMENT_NETWORK_TYPE = "bridge"
 
+# Deployment Concurrency Settings
+DEPLOY_MAX_WORKERS = 8        # Concurrent REST calls (and pooled HTTP connections) per deployment
+LAB_READY_TIMEOUT = 2.0       # Upper bound on waiting for a new lab to become readable
+READY_POLL_INTERVAL = 0.1
+ROLLBACK_MAX_WORKERS = 8      # Concurrent DELETEs per resource class during rollback
+ROLLBACK_RETRIES = 3          # Retries of a DELETE answered with a transient error (409/423/5xx)
+ROLLBACK_RETRY_DELAY = 0.5    # First retry delay; doubles per retry, with jitter
+
 # ============================================================================
 # TOPOLOGY DEFINITION
 # ============================================================================
@@ -411,8 +542,15 @@ class EVEClient:
             "connections_created": [],
             "rollback_enabled": True
         }
+        self.last_rollback_summary = None
 
-    @retry_on_failure(max_retries=2, delay=3, exceptions=(requests.exceptions.RequestException,))
+    def configure_connection_pool(self, max_connections: int) -> None:
+        """Keep up to max_connections keep-alive connections so concurrent calls do not reconnect"""
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @retry_on_failure(max_retries=2, delay=1, exceptions=(requests.exceptions.RequestException,), jitter=True)
     def api_request(self, method, endpoint, data=None, timeout=15):
         url = f"{self.base_url}{endpoint}"
         start_time = time.time()
@@ -499,13 +637,9 @@ class EVEClient:
         api_lab_uri_path = self.get_api_lab_path(name, path)
         
         # Check if lab exists
-        try:
-            check_response = self.session.get(f"{self.base_url}/labs{api_lab_uri_path}")
-            if check_response.status_code == 200:
-                logger.log_operation_success("Lab Verification", {"name": name, "status": "already_exists"})
-                return True
-        except:
-            pass
+        if self._lab_exists(api_lab_uri_path):
+            logger.log_operation_success("Lab Verification", {"name": name, "status": "already_exists"})
+            return True
 
         # Create lab
         create_payload = {"path": path, "name": name, "author": author, "description": description, "version": version}
@@ -515,12 +649,20 @@ class EVEClient:
             logger.log_operation_success("Lab Creation", {"name": name, "path": path})
             # Track lab creation for rollback (addresses BUG-008)
             self.track_lab_creation(name)
-            time.sleep(2)
+            # Wait until the lab file is readable rather than for a fixed delay
+            if not wait_until(lambda: self._lab_exists(api_lab_uri_path), LAB_READY_TIMEOUT, READY_POLL_INTERVAL):
+                logger.warning(f"Lab '{name}' not readable after {LAB_READY_TIMEOUT}s, continuing")
             return True
         else:
             logger.log_operation_failure("Lab Creation", "API request failed", {"name": name, "response": response})
             return False
 
+    def _lab_exists(self, api_lab_uri_path: str) -> bool:
+        try:
+            return self.session.get(f"{self.base_url}/labs{api_lab_uri_path}").status_code == 200
+        except Exception:
+            return False
+
     def create_node(self, lab_name, node_config, lab_folder="/"):
         node_name = node_config.get('name', 'Unknown')
         logger.log_operation_start("Node Creation", {"name": node_name, "lab": lab_name})
@@ -536,6 +678,7 @@ class EVEClient:
 
         if isinstance(response_data, dict) and response_data.get('status') == 'success' and 'data' in response_data:
             node_id = response_data['data']['id']
+            self._invalidate_lab_cache(lab_name, lab_folder)
             logger.log_operation_success("Node Creation", {"name": node_name, "id": node_id})
             # Track node creation for rollback (addresses BUG-008)
             self.track_node_creation(node_name, str(node_id))
@@ -552,6 +695,7 @@ class EVEClient:
 
         if isinstance(response_data, dict) and response_data.get('status') == 'success' and 'data' in response_data:
             network_id = response_data['data']['id']
+            self._invalidate_lab_cache(lab_name, lab_folder)
             logger.info(f"✅ Network '{network_name}' created with ID: {network_id}")
             # Track network creation for rollback (addresses BUG-008)
             self.track_network_creation(network_name, str(network_id))
@@ -575,48 +719,12 @@ class EVEClient:
         return self._validate_interface_for_router_type(interface_name, router_type)
     
     def _validate_interface_for_router_type(self, interface_name: str, router_type: str) -> bool:
-        """Validate interface based on router type"""
-        # Define interface patterns for each router type
-        interface_patterns = {
-            'c3725': {
-                'pattern': r'^f[0-2]/[0-1]$',
-                'valid_interfaces': ['f0/0', 'f0/1', 'f1/0', 'f2/0'],
-                'description': 'FastEthernet interfaces (f0/0, f0/1 onboard; f1/0, f2/0 with NM-1FE-TX)'
-            },
-            'c7200': {
-                'pattern': r'^(g[0-5]/0|f[0-3]/0)$',
-                'valid_interfaces': ['g0/0', 'g1/0', 'g2/0', 'g3/0', 'g4/0', 'g5/0', 'f0/0', 'f1/0', 'f2/0', 'f3/0'],
-                'description': 'GigabitEthernet (g0/0-g5/0) or FastEthernet (f0/0-f3/0) interfaces'
-            },
-            'c3640': {
-                'pattern': r'^f[0-2]/[0-1]$',
-                'valid_interfaces': ['f0/0', 'f0/1', 'f1/0', 'f2/0'],
-                'description': 'FastEthernet interfaces (f0/0, f0/1 onboard; f1/0, f2/0 with NM modules)'
-            },
-            'c2691': {
-                'pattern': r'^f[0-2]/[0-1]$',
-                'valid_interfaces': ['f0/0', 'f0/1', 'f1/0', 'f2/0'],
-                'description': 'FastEthernet interfaces (f0/0, f0/1 onboard; f1/0, f2/0 with NM modules)'
-            },
-            'c1700': {
-                'pattern': r'^(f0/0|s0/[0-1])$',
-                'valid_interfaces': ['f0/0', 's0/0', 's0/1'],
-                'description': 'FastEthernet f0/0 (onboard) or Serial s0/0, s0/1 (with WIC modules)'
-            }
-        }
-        
-        if router_type not in interface_patterns:
+        """Validate interface based on router type (precomputed ROUTER_TABLES lookup)"""
+        table = ROUTER_TABLES.get(router_type)
+        if table is None:
             logger.warning(f"Unknown router type: {router_type}. Falling back to c3725 validation.")
-            router_type = 'c3725'
-        
-        pattern_info = interface_patterns[router_type]
-        
-        # First check with regex pattern
-        if not re.match(pattern_info['pattern'], interface_name):
-            return False
-        
-        # Then check against known valid interfaces (more restrictive)
-        return interface_name in pattern_info['valid_interfaces']
+            table = ROUTER_TABLES[FALLBACK_ROUTER_TYPE]
+        return interface_name in table["indices"]
 
     def get_interface_index(self, interface_name: str, router_type: str = "c3725") -> str:
         """
@@ -631,15 +739,15 @@ class EVEClient:
         - c2691: f0/0→0, f0/1→1, f1/0→16, f2/0→32 (NM slots)
         - c1700: f0/0→0, s0/0→1, s0/1→2 (WIC slots)
         """
-        if not self.is_valid_interface(interface_name, router_type):
-            raise ValueError(f"Invalid interface name '{interface_name}' for router type '{router_type}'")
-        
-        # Use cache if available
+        # Use cache if available (only valid interfaces are ever cached)
         cache_key = f"{router_type}_{interface_name}"
         if hasattr(self, '_interface_cache') and cache_key in self._interface_cache:
             return self._interface_cache[cache_key]
         
-        # Calculate interface index
+        if not self.is_valid_interface(interface_name, router_type):
+            raise ValueError(f"Invalid interface name '{interface_name}' for router type '{router_type}'")
+        
+        # Look up interface index
         index = self._calculate_interface_index(interface_name, router_type)
         
         # Cache the result
@@ -650,76 +758,28 @@ class EVEClient:
         return index
 
     def _calculate_interface_index(self, interface_name: str, router_type: str) -> str:
-        """Calculate the interface index based on router type and interface name"""
-        # Define interface mappings for each router type
-        interface_mappings = {
-            'c3725': {
-                'f0/0': '0',   # Onboard FastEthernet 0/0
-                'f0/1': '1',   # Onboard FastEthernet 0/1
-                'f1/0': '16',  # NM-1FE-TX in slot 1
-                'f2/0': '32'   # NM-1FE-TX in slot 2
-            },
-            'c7200': {
-                # 6x GigabitEthernet configuration
-                'g0/0': '0',   # GigabitEthernet 0/0
-                'g1/0': '1',   # GigabitEthernet 1/0
-                'g2/0': '2',   # GigabitEthernet 2/0
-                'g3/0': '3',   # GigabitEthernet 3/0
-                'g4/0': '4',   # GigabitEthernet 4/0
-                'g5/0': '5',   # GigabitEthernet 5/0
-                # 4x FastEthernet + 2x GigabitEthernet configuration (alternative)
-                'f0/0': '6',   # FastEthernet 0/0
-                'f1/0': '7',   # FastEthernet 1/0
-                'f2/0': '8',   # FastEthernet 2/0
-                'f3/0': '9'    # FastEthernet 3/0
-            },
-            'c3640': {
-                'f0/0': '0',   # Onboard FastEthernet 0/0
-                'f0/1': '1',   # Onboard FastEthernet 0/1
-                'f1/0': '16',  # NM module in slot 1
-                'f2/0': '32'   # NM module in slot 2
-            },
-            'c2691': {
-                'f0/0': '0',   # Onboard FastEthernet 0/0
-                'f0/1': '1',   # Onboard FastEthernet 0/1
-                'f1/0': '16',  # NM module in slot 1
-                'f2/0': '32'   # NM module in slot 2
-            },
-            'c1700': {
-                'f0/0': '0',   # Onboard FastEthernet 0/0
-                's0/0': '1',   # Serial 0/0 (WIC slot)
-                's0/1': '2'    # Serial 0/1 (WIC slot)
-            }
-        }
-        
-        if router_type not in interface_mappings:
+        """Look up the interface index based on router type and interface name"""
+        table = ROUTER_TABLES.get(router_type)
+        if table is None:
             raise ValueError(f"Unsupported router type: {router_type}")
         
-        router_mapping = interface_mappings[router_type]
-        
-        if interface_name not in router_mapping:
+        index = table["indices"].get(interface_name)
+        if index is None:
             raise ValueError(f"Interface '{interface_name}' not supported for router type '{router_type}'")
         
-        return router_mapping[interface_name]
+        return index
     
     def get_supported_interfaces(self, router_type: str) -> List[str]:
         """
         Get list of supported interfaces for a given router type
         Addresses NEW-001: Multi-Vendor Router Support
         """
-        interface_lists = {
-            'c3725': ['f0/0', 'f0/1', 'f1/0', 'f2/0'],
-            'c7200': ['g0/0', 'g1/0', 'g2/0', 'g3/0', 'g4/0', 'g5/0', 'f0/0', 'f1/0', 'f2/0', 'f3/0'],
-            'c3640': ['f0/0', 'f0/1', 'f1/0', 'f2/0'],
-            'c2691': ['f0/0', 'f0/1', 'f1/0', 'f2/0'],
-            'c1700': ['f0/0', 's0/0', 's0/1']
-        }
-        
-        if router_type not in interface_lists:
+        table = ROUTER_TABLES.get(router_type)
+        if table is None:
             logger.warning(f"Unknown router type: {router_type}. Returning c3725 interfaces.")
-            return interface_lists['c3725']
+            table = ROUTER_TABLES[FALLBACK_ROUTER_TYPE]
         
-        return interface_lists[router_type]
+        return list(table["interfaces"])
     
     def get_router_type_from_config(self, node_config: Dict) -> str:
         """
@@ -730,8 +790,7 @@ class EVEClient:
         router_type = node_config.get('template', 'c3725')
         
         # Validate router type is supported
-        supported_types = ['c3725', 'c7200', 'c3640', 'c2691', 'c1700']
-        if router_type not in supported_types:
+        if router_type not in ROUTER_TABLES:
             logger.warning(f"Unsupported router type '{router_type}'. Falling back to c3725.")
             return 'c3725'
         
@@ -775,6 +834,8 @@ class EVEClient:
         }
         
         response = self.api_request('PUT', endpoint, data)
+        # Whatever the outcome, the node's cached interfaces may now be stale
+        self._invalidate_lab_cache(lab_name, lab_folder, node_id)
         
         if isinstance(response, dict) and response.get('status') == 'success':
             logger.log_operation_success("Interface Connection", {
@@ -826,6 +887,24 @@ class EVEClient:
             return cache_dict[cache_key]
         return None
 
+    def _node_interfaces_key(self, lab_name: str, lab_folder: str, node_id) -> str:
+        return f"{lab_name}_{lab_folder}_{node_id}_interfaces"
+
+    def _topology_key(self, lab_name: str, lab_folder: str) -> str:
+        return f"{lab_name}_{lab_folder}_topology"
+
+    def _invalidate_cache(self, cache_dict: dict, *cache_keys: str) -> None:
+        """Drop specific entries after a write that changes them"""
+        for cache_key in cache_keys:
+            cache_dict.pop(cache_key, None)
+            self._cache_timestamps.pop(cache_key, None)
+
+    def _invalidate_lab_cache(self, lab_name: str, lab_folder: str = "/", node_id=None) -> None:
+        """A write to a lab changes its topology and, if given, that node's interfaces"""
+        self._invalidate_cache(self._lab_cache, self._topology_key(lab_name, lab_folder))
+        if node_id is not None:
+            self._invalidate_cache(self._node_cache, self._node_interfaces_key(lab_name, lab_folder, node_id))
+
     def clear_cache(self) -> None:
         """Clear all caches - useful for testing or when data changes"""
         self._interface_cache.clear()
@@ -837,7 +916,7 @@ class EVEClient:
 
     def get_node_interfaces(self, lab_name, node_id, lab_folder="/"):
         """Enhanced with caching to address BUG-004"""
-        cache_key = f"{lab_name}_{lab_folder}_{node_id}_interfaces"
+        cache_key = self._node_interfaces_key(lab_name, lab_folder, node_id)
         
         # Check cache first
         cached_result = self._get_cache(self._node_cache, cache_key)
@@ -885,6 +964,68 @@ class EVEClient:
         logger.warning(f"❌ Node {node_id} NOT connected to network {network_id_to_check}")
         return False
 
+    def get_lab_topology(self, lab_name, lab_folder="/") -> Optional[Dict[str, Dict[str, str]]]:
+        """
+        All interface bindings of a lab from one GET of /labs/{lab}/topology
+
+        Returns:
+            Dict[str, Dict[str, str]]: {node_id: {interface_index: network_id}},
+            or None if the topology could not be read
+        """
+        cache_key = self._topology_key(lab_name, lab_folder)
+        cached_result = self._get_cache(self._lab_cache, cache_key)
+        if cached_result is not None:
+            return cached_result
+
+        api_lab_uri_path = self.get_api_lab_path(lab_name, lab_folder)
+        response = self.api_request('GET', f'/labs{api_lab_uri_path}/topology')
+        if not (isinstance(response, dict) and response.get('status') == 'success'):
+            return None
+
+        bindings = {}
+        for link in response.get('data') or []:
+            if link.get('source_type') != 'node' or link.get('destination_type') != 'network':
+                continue
+            node_id = str(link.get('source', '')).replace('node', '', 1)
+            network_id = link.get('network_id') or str(link.get('destination', '')).replace('network', '', 1)
+            interface = link.get('source_interfaceId', link.get('source_label'))
+            bindings.setdefault(node_id, {})[str(interface)] = str(network_id)
+
+        self._set_cache(self._lab_cache, cache_key, bindings)
+        return bindings
+
+    def verify_links(self, lab_name, expected_links: List[Tuple], lab_folder="/") -> List[Tuple]:
+        """
+        Check many (node_id, interface_name, network_id[, router_type]) bindings
+        with one topology fetch; falls back to one interface read per node if
+        the topology endpoint fails
+
+        Returns:
+            List[Tuple]: the expected bindings that are missing
+        """
+        if not expected_links:
+            return []
+        topology = self.get_lab_topology(lab_name, lab_folder)
+
+        missing = []
+        for expected in expected_links:
+            node_id, interface_name, network_id = expected[:3]
+            router_type = expected[3] if len(expected) > 3 else "c3725"
+            if topology is not None:
+                interface_index = self.get_interface_index(interface_name, router_type)
+                bound = topology.get(str(node_id), {}).get(interface_index) == str(network_id)
+            else:
+                bound = self.verify_connection(lab_name, node_id, network_id, lab_folder)
+            if not bound:
+                missing.append(expected)
+
+        if missing:
+            for expected in missing:
+                logger.warning(f"❌ Node {expected[0]} {expected[1]} NOT connected to network {expected[2]}")
+        else:
+            logger.info(f"✅ Verified {len(expected_links)} link(s) in lab {lab_name}")
+        return missing
+
     # ============================================================================
     # CONFIGURATION VALIDATION (Addresses BUG-006)
     # ============================================================================
@@ -909,13 +1050,13 @@ class EVEClient:
         # Node name validation
         if 'name' in config:
             name = config['name']
-            if not re.match(r'^[a-zA-Z0-9_-]+$', name):
+            if not NODE_NAME_RE.match(name):
                 errors.append(f"Invalid node name '{name}'. Use only alphanumeric characters, underscore, and dash")
             if len(name) > 50:
                 errors.append(f"Node name '{name}' too long. Maximum 50 characters")
         
         # Template validation - Enhanced for multi-vendor support
-        valid_templates = ['c3725', 'c7200', 'c3640', 'c2691', 'c1700']
+        valid_templates = list(ROUTER_SPECIFICATIONS)
         if 'template' in config and config['template'] not in valid_templates:
             errors.append(f"Invalid template '{config['template']}'. Valid templates: {valid_templates}")
         
@@ -951,30 +1092,16 @@ class EVEClient:
         if config.get('type') == 'dynamips' and 'ram' in config:
             try:
                 ram = int(config['ram'])
-                ram_ranges = {
-                    'c3725': (128, 512),
-                    'c7200': (256, 1024),
-                    'c3640': (128, 512),
-                    'c2691': (128, 512),
-                    'c1700': (64, 256)
-                }
-                
-                min_ram, max_ram = ram_ranges.get(router_type, (128, 512))
+                table = ROUTER_TABLES.get(router_type)
+                min_ram, max_ram = table["ram_range"] if table else (128, 512)
                 if ram < min_ram or ram > max_ram:
                     errors.append(f"RAM value {ram}MB out of range for {router_type}. Valid range: {min_ram}-{max_ram}MB")
             except (ValueError, TypeError):
                 errors.append(f"Invalid RAM value '{config['ram']}'. Must be a number")
         
         # Router-specific module validation
-        valid_modules_by_router = {
-            'c3725': ['NM-1FE-TX', 'NM-4T', 'NM-16ESW', ''],
-            'c7200': ['PA-GE', 'PA-FE-TX', 'PA-4E', 'PA-8E', ''],
-            'c3640': ['NM-1FE-TX', 'NM-4T', 'NM-2FE2W', ''],
-            'c2691': ['NM-1FE-TX', 'NM-4T', 'NM-2FE2W', ''],
-            'c1700': ['WIC-1T', 'WIC-2T', 'WIC-1ENET', '']
-        }
-        
-        valid_modules = valid_modules_by_router.get(router_type, [''])
+        table = ROUTER_TABLES.get(router_type)
+        valid_modules = table["modules"] if table else ['']
         
         # Validate slots based on router type
         if router_type in ['c3725', 'c3640', 'c2691']:
@@ -1176,62 +1303,15 @@ class EVEClient:
         Get list of all supported router types
         Addresses NEW-001: Multi-Vendor Router Support
         """
-        return ['c3725', 'c7200', 'c3640', 'c2691', 'c1700']
+        return list(ROUTER_SPECIFICATIONS)
     
     def get_router_specifications(self, router_type: str) -> Dict:
         """
         Get detailed specifications for a router type
         Addresses NEW-001: Multi-Vendor Router Support
         """
-        specifications = {
-            'c3725': {
-                'description': 'Cisco 3725 Modular Router',
-                'onboard_interfaces': ['f0/0', 'f0/1'],
-                'slot_interfaces': ['f1/0', 'f2/0'],
-                'supported_modules': ['NM-1FE-TX', 'NM-4T', 'NM-16ESW'],
-                'ram_range': '128-512MB',
-                'max_slots': 2,
-                'typical_use': 'Branch office, small enterprise'
-            },
-            'c7200': {
-                'description': 'Cisco 7200 Series Router',
-                'onboard_interfaces': [],
-                'slot_interfaces': ['g0/0', 'g1/0', 'g2/0', 'g3/0', 'g4/0', 'g5/0'],
-                'supported_modules': ['PA-GE', 'PA-FE-TX', 'PA-4E', 'PA-8E'],
-                'ram_range': '256-1024MB',
-                'max_slots': 6,
-                'typical_use': 'Enterprise core, service provider'
-            },
-            'c3640': {
-                'description': 'Cisco 3640 Modular Router',
-                'onboard_interfaces': ['f0/0', 'f0/1'],
-                'slot_interfaces': ['f1/0', 'f2/0'],
-                'supported_modules': ['NM-1FE-TX', 'NM-4T', 'NM-2FE2W'],
-                'ram_range': '128-512MB',
-                'max_slots': 2,
-                'typical_use': 'Branch office, medium enterprise'
-            },
-            'c2691': {
-                'description': 'Cisco 2691 Modular Router',
-                'onboard_interfaces': ['f0/0', 'f0/1'],
-                'slot_interfaces': ['f1/0', 'f2/0'],
-                'supported_modules': ['NM-1FE-TX', 'NM-4T', 'NM-2FE2W'],
-                'ram_range': '128-512MB',
-                'max_slots': 2,
-                'typical_use': 'Small branch office'
-            },
-            'c1700': {
-                'description': 'Cisco 1700 Series Router',
-                'onboard_interfaces': ['f0/0'],
-                'slot_interfaces': ['s0/0', 's0/1'],
-                'supported_modules': ['WIC-1T', 'WIC-2T', 'WIC-1ENET'],
-                'ram_range': '64-256MB',
-                'max_slots': 2,
-                'typical_use': 'Small office, home office (SOHO)'
-            }
-        }
-        
-        return specifications.get(router_type, {})
+        spec = ROUTER_SPECIFICATIONS.get(router_type)
+        return copy.deepcopy(spec) if spec else {}
 
     def validate_topology_config(self, routers: Dict, connections: List) -> Tuple[bool, List[str]]:
         """
@@ -1253,6 +1333,7 @@ class EVEClient:
         
         # Track interface usage to detect conflicts
         interface_usage = {}
+        router_types = {name: config.get('template', 'c3725') for name, config in routers.items()}
         
         # Validate each connection with router configurations
         for connection in connections:
@@ -1264,16 +1345,14 @@ class EVEClient:
             
             # Validate connection with router configurations
             is_valid, conn_errors = self.validate_connection_config(
-                router1, iface1, router2, iface2, 
-                {name: config.get('template', 'c3725') for name, config in routers.items()},
-                routers
+                router1, iface1, router2, iface2, router_types, routers
             )
             if not is_valid:
                 errors.extend(conn_errors)
             
             # Track interface usage
-            router1_iface = f"{router1}:{iface1}"
-            router2_iface = f"{router2}:{iface2}"
+            router1_iface = (router1, iface1)
+            router2_iface = (router2, iface2)
             
             if router1_iface in interface_usage:
                 errors.append(f"Interface {iface1} on router {router1} used multiple times")
@@ -1360,6 +1439,9 @@ class EVEClient:
         """
         Rollback failed deployment by cleaning up created resources
         Addresses BUG-008: No Rollback Mechanism
+
+        Nodes are deleted concurrently, then networks, then the lab. What was
+        deleted and what failed is kept in last_rollback_summary.
         
         Returns:
             bool: True if rollback was successful, False otherwise
@@ -1377,8 +1459,12 @@ class EVEClient:
             "nodes_deleted": 0,
             "networks_deleted": 0,
             "lab_deleted": False,
+            "deleted": {"nodes": [], "networks": []},
+            "failed": {"nodes": [], "networks": []},
             "errors": []
         }
+        self.last_rollback_summary = cleanup_summary
+        start_time = time.time()
 
         if not lab_name:
             logger.warning("⚠️ No lab name found for rollback")
@@ -1389,39 +1475,17 @@ class EVEClient:
             logger.info("🔄 Rolling back connections...")
             cleanup_summary["connections_cleaned"] = len(self._deployment_state["connections_created"])
             
-            # Step 2: Delete nodes
+            # Step 2: Delete nodes (concurrently, most recently created submitted first)
             logger.info("🔄 Rolling back nodes...")
-            for node_info in reversed(self._deployment_state["nodes_created"]):
-                try:
-                    success = self._delete_node(lab_name, node_info["id"], lab_folder)
-                    if success:
-                        cleanup_summary["nodes_deleted"] += 1
-                        logger.info(f"✅ Deleted node: {node_info['name']} (ID: {node_info['id']})")
-                    else:
-                        cleanup_summary["errors"].append(f"Failed to delete node {node_info['name']}")
-                        rollback_success = False
-                except Exception as e:
-                    error_msg = f"Error deleting node {node_info['name']}: {e}"
-                    cleanup_summary["errors"].append(error_msg)
-                    logger.error(error_msg)
-                    rollback_success = False
+            if not self._delete_concurrently("node", self._deployment_state["nodes_created"],
+                                             self._delete_node, lab_name, lab_folder, cleanup_summary):
+                rollback_success = False
 
-            # Step 3: Delete networks
+            # Step 3: Delete networks, once no node is attached to them
             logger.info("🔄 Rolling back networks...")
-            for network_info in reversed(self._deployment_state["networks_created"]):
-                try:
-                    success = self._delete_network(lab_name, network_info["id"], lab_folder)
-                    if success:
-                        cleanup_summary["networks_deleted"] += 1
-                        logger.info(f"✅ Deleted network: {network_info['name']} (ID: {network_info['id']})")
-                    else:
-                        cleanup_summary["errors"].append(f"Failed to delete network {network_info['name']}")
-                        rollback_success = False
-                except Exception as e:
-                    error_msg = f"Error deleting network {network_info['name']}: {e}"
-                    cleanup_summary["errors"].append(error_msg)
-                    logger.error(error_msg)
-                    rollback_success = False
+            if not self._delete_concurrently("network", self._deployment_state["networks_created"],
+                                             self._delete_network, lab_name, lab_folder, cleanup_summary):
+                rollback_success = False
 
             # Step 4: Delete lab (optional - might want to keep empty lab)
             if self._deployment_state["lab_created"]:
@@ -1441,6 +1505,7 @@ class EVEClient:
                     rollback_success = False
 
             # Report rollback summary
+            cleanup_summary["duration"] = round(time.time() - start_time, 3)
             if rollback_success:
                 logger.log_operation_success("Deployment Rollback", cleanup_summary)
             else:
@@ -1463,12 +1528,62 @@ class EVEClient:
             logger.log_operation_failure("Deployment Rollback", f"Rollback failed: {e}", cleanup_summary)
             return False
 
+    def _delete_concurrently(self, kind: str, resources: List[Dict], delete, lab_name: str,
+                             lab_folder: str, cleanup_summary: Dict) -> bool:
+        """Delete one class of tracked resources in parallel, recording what was deleted and what failed"""
+        def delete_one(resource):
+            try:
+                return delete(lab_name, resource["id"], lab_folder), None
+            except Exception as e:
+                return False, str(e)
+
+        resources = list(reversed(resources))
+        if not resources:
+            return True
+        all_deleted = True
+        with ThreadPoolExecutor(max_workers=min(ROLLBACK_MAX_WORKERS, len(resources))) as pool:
+            for resource, (deleted, error) in zip(resources, pool.map(delete_one, resources)):
+                label = f"{resource['name']} (ID: {resource['id']})"
+                if deleted:
+                    cleanup_summary[f"{kind}s_deleted"] += 1
+                    cleanup_summary["deleted"][f"{kind}s"].append(resource["name"])
+                    logger.info(f"✅ Deleted {kind}: {label}")
+                else:
+                    error_msg = f"Error deleting {kind} {resource['name']}: {error}" if error \
+                        else f"Failed to delete {kind} {resource['name']}"
+                    cleanup_summary["failed"][f"{kind}s"].append(resource["name"])
+                    cleanup_summary["errors"].append(error_msg)
+                    logger.error(error_msg)
+                    all_deleted = False
+        return all_deleted
+
+    def _delete_resource(self, endpoint: str) -> bool:
+        """
+        DELETE endpoint, retrying transient errors (409/423/5xx) with jittered exponential backoff
+        A 404 means the resource is already gone and counts as deleted
+        """
+        delay = ROLLBACK_RETRY_DELAY
+        for attempt in range(ROLLBACK_RETRIES + 1):
+            response = self.api_request('DELETE', endpoint)
+            if isinstance(response, dict):
+                return response.get('status') == 'success'
+            status_code = getattr(response, 'status_code', None)
+            if status_code == 404:
+                return True
+            if status_code not in (409, 423) and not (status_code and status_code >= 500):
+                return False
+            if attempt < ROLLBACK_RETRIES:
+                time.sleep(backoff_delay(delay))
+                delay *= 2
+        return False
+
     def _delete_node(self, lab_name: str, node_id: str, lab_folder: str = "/") -> bool:
         """Delete a node from the lab"""
         try:
             api_lab_uri_path = self.get_api_lab_path(lab_name, lab_folder)
-            response = self.api_request('DELETE', f'/labs{api_lab_uri_path}/nodes/{node_id}')
-            return isinstance(response, dict) and response.get('status') == 'success'
+            deleted = self._delete_resource(f'/labs{api_lab_uri_path}/nodes/{node_id}')
+            self._invalidate_lab_cache(lab_name, lab_folder, node_id)
+            return deleted
         except Exception as e:
             logger.error(f"Failed to delete node {node_id}: {e}")
             return False
@@ -1477,8 +1592,9 @@ class EVEClient:
         """Delete a network from the lab"""
         try:
             api_lab_uri_path = self.get_api_lab_path(lab_name, lab_folder)
-            response = self.api_request('DELETE', f'/labs{api_lab_uri_path}/networks/{network_id}')
-            return isinstance(response, dict) and response.get('status') == 'success'
+            deleted = self._delete_resource(f'/labs{api_lab_uri_path}/networks/{network_id}')
+            self._invalidate_lab_cache(lab_name, lab_folder)
+            return deleted
         except Exception as e:
             logger.error(f"Failed to delete network {network_id}: {e}")
             return False
@@ -1487,8 +1603,11 @@ class EVEClient:
         """Delete the entire lab"""
         try:
             api_lab_uri_path = self.get_api_lab_path(lab_name, lab_folder)
-            response = self.api_request('DELETE', f'/labs{api_lab_uri_path}')
-            return isinstance(response, dict) and response.get('status') == 'success'
+            deleted = self._delete_resource(f'/labs{api_lab_uri_path}')
+            prefix = f"{lab_name}_{lab_folder}_"
+            self._invalidate_cache(self._node_cache, *[key for key in list(self._node_cache) if key.startswith(prefix)])
+            self._invalidate_lab_cache(lab_name, lab_folder)
+            return deleted
         except Exception as e:
             logger.error(f"Failed to delete lab {lab_name}: {e}")
             return False
@@ -1503,43 +1622,394 @@ class EVEClient:
         logger.debug(f"Created deployment checkpoint: {checkpoint['summary']}")
         return checkpoint
 
+# ============================================================================
+# CONCURRENT DEPLOYMENT PLANNER
+# ============================================================================
+
+class DeploymentPlan:
+    """
+    Dependency graph of one lab deployment
+
+    Nodes and networks depend on nothing and may be created in any order.
+    A link binds one node interface to one network and depends on both.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, Dict] = {}
+        self.networks: Dict[str, Dict] = {}
+        self.links: List[Dict] = []
+
+    def add_node(self, name: str, node_config: Optional[Dict] = None,
+                 router_type: str = DEFAULT_ROUTER_TEMPLATE, node_id: Optional[str] = None) -> None:
+        """Add a node to create from node_config, or an already deployed one by node_id"""
+        self.nodes[name] = {"config": node_config, "router_type": router_type, "node_id": node_id}
+
+    def add_network(self, name: str, network_type: str = "bridge", left: str = "400", top: str = "100") -> None:
+        self.networks[name] = {"type": network_type, "left": str(left), "top": str(top)}
+
+    def add_link(self, node: str, interface: str, network: str, required: bool = True) -> None:
+        """Bind node's interface to network; failures of non-required links only warn"""
+        self.links.append({"node": node, "interface": interface, "network": network, "required": required})
+
+    def validate(self) -> List[str]:
+        """Links must reference known nodes and networks, one link per node interface"""
+        errors = []
+        bound = set()
+        for link in self.links:
+            if link["node"] not in self.nodes:
+                errors.append(f"Link references unknown node '{link['node']}'")
+            if link["network"] not in self.networks:
+                errors.append(f"Link references unknown network '{link['network']}'")
+            key = (link["node"], link["interface"])
+            if key in bound:
+                errors.append(f"Interface {link['interface']} on '{link['node']}' is linked more than once")
+            bound.add(key)
+        for name, node in self.nodes.items():
+            if node["config"] is None and node["node_id"] is None:
+                errors.append(f"Node '{name}' has neither a configuration nor an existing ID")
+        return errors
+
+    @property
+    def operation_count(self) -> int:
+        """REST calls needed to deploy the plan (excluding verification)"""
+        new_nodes = sum(1 for node in self.nodes.values() if node["node_id"] is None)
+        return new_nodes + len(self.networks) + len(self.links)
+
+    @classmethod
+    def from_topology(cls, routers: Dict = None, connections: List = None,
+                      management_network: bool = None, node_ids: Dict[str, str] = None) -> 'DeploymentPlan':
+        """
+        Build the plan for a TOPOLOGY_ROUTERS / TOPOLOGY_CONNECTIONS style topology
+
+        node_ids maps already deployed routers to their node IDs; when given, the
+        plan holds exactly those routers and creates no nodes.
+        """
+        routers = TOPOLOGY_ROUTERS if routers is None else routers
+        connections = TOPOLOGY_CONNECTIONS if connections is None else connections
+        management_network = USE_MANAGEMENT_NETWORK if management_network is None else management_network
+
+        plan = cls()
+        if node_ids is not None:
+            for router_name, node_id in node_ids.items():
+                config = routers.get(router_name, {})
+                plan.add_node(router_name, router_type=config.get("template", DEFAULT_ROUTER_TEMPLATE), node_id=node_id)
+            routers = {name: routers.get(name, {}) for name in node_ids}
+        else:
+            for router_name, config in routers.items():
+                plan.add_node(router_name, topology_node_config(router_name, config), config.get("template", DEFAULT_ROUTER_TEMPLATE))
+        for router1, iface1, router2, iface2, link_name, left, top in connections:
+            plan.add_network(link_name, "bridge", left, top)
+            plan.add_link(router1, iface1, link_name)
+            plan.add_link(router2, iface2, link_name)
+        if management_network:
+            plan.add_network(MANAGEMENT_NETWORK_NAME, MANAGEMENT_NETWORK_TYPE, "400", "50")
+            for router_name, config in routers.items():
+                plan.add_link(router_name, config.get("mgmt_interface", "f0/1"), MANAGEMENT_NETWORK_NAME, required=False)
+        return plan
+
+class ConcurrentDeployer:
+    """
+    Deploys a DeploymentPlan with up to max_workers REST calls in flight
+
+    Every node and network is submitted at once; each link is submitted as soon
+    as its node and network exist. Links on the same node are issued one at a
+    time because EVE-NG rewrites the node's interface list on every PUT. The
+    response of each call is the readiness signal - there are no fixed sleeps.
+    Once everything is created, all links are verified from one topology read.
+    """
+
+    def __init__(self, eve_client: EVEClient, lab_name: str, lab_folder: str = "/",
+                 max_workers: int = DEPLOY_MAX_WORKERS, on_event: Callable[[Dict], None] = None):
+        self.eve_client = eve_client
+        self.lab_name = lab_name
+        self.lab_folder = lab_folder
+        self.max_workers = max(1, max_workers)
+        self.on_event = on_event
+        eve_client.configure_connection_pool(self.max_workers)
+
+    def deploy(self, plan: DeploymentPlan, verify: bool = True) -> Dict:
+        """
+        Create everything in the plan
+
+        Returns:
+            Dict: node and network IDs by name, completed links, failures
+            (each {"kind", "name", "error", "required"}) and "success"
+        """
+        result = {"nodes": {}, "networks": {}, "links": [], "failed": [], "unverified": [],
+                  "success": False, "duration": 0.0}
+        errors = plan.validate()
+        if errors:
+            result["failed"] = [{"kind": "plan", "name": "", "error": error, "required": True} for error in errors]
+            return result
+
+        logger.log_operation_start("Concurrent Deployment", {
+            "lab": self.lab_name, "operations": plan.operation_count, "workers": self.max_workers})
+        start_time = time.time()
+
+        result["nodes"] = {name: node["node_id"] for name, node in plan.nodes.items() if node["node_id"]}
+        waiting = {}
+        for link in plan.links:
+            waiting.setdefault(link["node"], deque()).append(link)
+        busy_nodes = set()
+        failed = set()
+        futures = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for name, node in plan.nodes.items():
+                if not node["node_id"]:
+                    future = pool.submit(self.eve_client.create_node, self.lab_name, node["config"], self.lab_folder)
+                    futures[future] = ("node", name, None)
+            for name, network in plan.networks.items():
+                future = pool.submit(self.eve_client.create_network, self.lab_name, network["type"], name,
+                                     self.lab_folder, network["left"], network["top"])
+                futures[future] = ("network", name, None)
+
+            while True:
+                self._submit_ready_links(pool, plan, result, waiting, busy_nodes, failed, futures)
+                if not futures:
+                    break
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, name, link = futures.pop(future)
+                    try:
+                        value, error = future.result(), None
+                    except Exception as e:
+                        value, error = None, str(e)
+
+                    if kind == "link":
+                        busy_nodes.discard(link["node"])
+                        if value:
+                            result["links"].append(link)
+                            self._emit({"kind": "link", "name": name, "ok": True, "link": link})
+                        else:
+                            self._fail(result, "link", name, error or "Interface connection failed",
+                                       link["required"], link)
+                        continue
+
+                    if value:
+                        result["nodes" if kind == "node" else "networks"][name] = value
+                        self._emit({"kind": kind, "name": name, "ok": True, "id": value})
+                    else:
+                        failed.add((kind, name))
+                        self._fail(result, kind, name, error or f"{kind.capitalize()} creation failed", True)
+
+        if verify and result["links"]:
+            result["unverified"] = self._verify_links(plan, result)
+
+        result["duration"] = time.time() - start_time
+        result["success"] = not any(failure["required"] for failure in result["failed"])
+        summary = {"nodes": len(result["nodes"]), "networks": len(result["networks"]),
+                   "links": len(result["links"]), "failed": len(result["failed"]),
+                   "duration": f"{result['duration']:.2f}s"}
+        if result["success"]:
+            logger.log_operation_success("Concurrent Deployment", summary)
+        else:
+            logger.log_operation_failure("Concurrent Deployment", "Some resources failed", summary)
+        return result
+
+    def _submit_ready_links(self, pool, plan, result, waiting, busy_nodes, failed, futures) -> None:
+        for node_name in list(waiting):
+            queue = waiting[node_name]
+            if ("node", node_name) in failed:
+                for link in queue:
+                    self._fail(result, "link", self._link_name(link), f"Node '{node_name}' was not created",
+                               link["required"], link)
+                del waiting[node_name]
+                continue
+            if node_name in busy_nodes or node_name not in result["nodes"]:
+                continue
+
+            for link in list(queue):
+                if ("network", link["network"]) in failed:
+                    queue.remove(link)
+                    self._fail(result, "link", self._link_name(link), f"Network '{link['network']}' was not created",
+                               link["required"], link)
+                elif link["network"] in result["networks"]:
+                    queue.remove(link)
+                    future = pool.submit(self.eve_client.connect_node_to_network, self.lab_name,
+                                         result["nodes"][node_name], link["interface"],
+                                         result["networks"][link["network"]], self.lab_folder,
+                                         plan.nodes[node_name]["router_type"])
+                    futures[future] = ("link", self._link_name(link), link)
+                    busy_nodes.add(node_name)
+                    break
+            if not queue:
+                del waiting[node_name]
+
+    def _verify_links(self, plan: DeploymentPlan, result: Dict) -> List[Dict]:
+        """Check every completed link against one fetch of the lab topology"""
+        expected = {(result["nodes"][link["node"]], link["interface"], result["networks"][link["network"]],
+                     plan.nodes[link["node"]]["router_type"]): link for link in result["links"]}
+        missing = self.eve_client.verify_links(self.lab_name, list(expected), self.lab_folder)
+        return [expected[binding] for binding in missing]
+
+    def _fail(self, result: Dict, kind: str, name: str, error: str, required: bool, link: Dict = None) -> None:
+        result["failed"].append({"kind": kind, "name": name, "error": error, "required": required})
+        self._emit({"kind": kind, "name": name, "ok": False, "error": error, "link": link})
+        if required:
+            logger.error(f"❌ {kind.capitalize()} {name}: {error}")
+        else:
+            logger.warning(f"⚠️ {kind.capitalize()} {name}: {error}")
+
+    def _emit(self, event: Dict) -> None:
+        if self.on_event:
+            self.on_event(event)
+
+    @staticmethod
+    def _link_name(link: Dict) -> str:
+        return f"{link['node']}({link['interface']}) -> {link['network']}"
+
+class CompiledTopology:
+    """
+    A web designer topology (topologies/*.json) resolved once
+
+    Router types, interface API indices and network names are worked out when
+    the topology is compiled, so validating and deploying it again costs only
+    dict lookups. Connections that cannot be deployed are left out and
+    described in errors.
+    """
+
+    def __init__(self, data: Dict):
+        self.data = data
+        self.nodes: Dict[str, Dict] = {}
+        self.networks: Dict[str, Tuple[str, str]] = {}
+        self.links: List[Dict] = []
+        self.errors: List[str] = []
+        self._compile()
+
+    def _compile(self) -> None:
+        for i, (node_id, node_data) in enumerate((self.data.get('nodes') or {}).items()):
+            router_type = node_data.get('type', FALLBACK_ROUTER_TYPE)
+            if router_type not in ROUTER_TABLES:
+                self.errors.append(f"Router '{node_data.get('name', node_id)}': unsupported type '{router_type}', using {FALLBACK_ROUTER_TYPE}")
+                router_type = FALLBACK_ROUTER_TYPE
+            position = node_data.get('position') or {}
+            self.nodes[node_id] = {
+                'name': node_data.get('name', f'Router{i+1}'),
+                'type': router_type,
+                'left': str(position.get('x', 100)),
+                'top': str(position.get('y', 100)),
+                'interfaces': node_data.get('interfaces', []),
+                'indices': ROUTER_TABLES[router_type]['indices']
+            }
+
+        used = set()
+        for i, connection in enumerate(self.data.get('connections') or []):
+            source_id, target_id = connection.get('source'), connection.get('target')
+            source_interface, target_interface = connection.get('sourceInterface'), connection.get('targetInterface')
+            source, target = self.nodes.get(source_id), self.nodes.get(target_id)
+
+            errors = []
+            if source is None or target is None:
+                errors.append(f"Connection {i+1}: unknown endpoint {source_id if source is None else target_id}")
+            elif source_id == target_id:
+                errors.append(f"Connection {i+1}: cannot connect router '{source['name']}' to itself")
+            else:
+                for node, interface in ((source, source_interface), (target, target_interface)):
+                    if interface not in node['indices']:
+                        errors.append(f"Connection {i+1}: invalid interface '{interface}' for router "
+                                      f"'{node['name']}' (type: {node['type']})")
+                    elif (node['name'], interface) in used:
+                        errors.append(f"Connection {i+1}: interface {interface} on router '{node['name']}' used multiple times")
+            if errors:
+                self.errors.extend(errors)
+                continue
+            used.add((source['name'], source_interface))
+            used.add((target['name'], target_interface))
+
+            network_name = f"Net_{source_id}_{target_id}"
+            self.networks.setdefault(network_name, (str(400 + i * 50), str(200 + i * 50)))
+            self.links.append({
+                'source': source_id,
+                'source_interface': source_interface,
+                'source_api_index': int(source['indices'][source_interface]),
+                'target': target_id,
+                'target_interface': target_interface,
+                'target_api_index': int(target['indices'][target_interface]),
+                'network': network_name
+            })
+
+    @property
+    def interface_mappings(self) -> Dict[str, Dict[str, int]]:
+        """{node_id: {interface: API index}} for every interface the designer lists per node"""
+        return {node_id: {interface: int(node['indices'][interface])
+                          for interface in node['interfaces'] if interface in node['indices']}
+                for node_id, node in self.nodes.items()}
+
+    def to_plan(self, eve_client: EVEClient) -> DeploymentPlan:
+        """DeploymentPlan keyed by designer node ID"""
+        plan = DeploymentPlan()
+        for node_id, node in self.nodes.items():
+            node_config = eve_client.get_node_config_template(node['type'])
+            node_config.update({'name': node['name'], 'left': node['left'], 'top': node['top']})
+            plan.add_node(node_id, node_config, node['type'])
+        for network_name, (left, top) in self.networks.items():
+            plan.add_network(network_name, "bridge", left, top)
+        for link in self.links:
+            plan.add_link(link['source'], link['source_interface'], link['network'])
+            plan.add_link(link['target'], link['target_interface'], link['network'])
+        return plan
+
+_compiled_topology_cache: Dict[str, Tuple[Tuple[int, int], CompiledTopology]] = {}
+
+def load_compiled_topology(path: str) -> CompiledTopology:
+    """Compile a saved topology file, reusing the compiled object until the file changes"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _compiled_topology_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    with open(path, 'r') as f:
+        compiled = CompiledTopology(json.load(f))
+    _compiled_topology_cache[path] = (signature, compiled)
+    return compiled
+
+def topology_node_config(router_name: str, config: Dict) -> Dict:
+    """EVE-NG node payload for one TOPOLOGY_ROUTERS entry"""
+    node_config = {
+        "type": config["type"],
+        "template": config["template"],
+        "name": router_name,
+        "image": config["image"],
+        "ram": config["ram"],
+        "nvram": config["nvram"],
+        "idlepc": config["idlepc"],
+        "icon": config["icon"],
+        "left": config["left"],
+        "top": config["top"],
+        "console": config["console"],
+        "config": "0",
+        "ethernet": DEFAULT_ETHERNET_COUNT
+    }
+
+    if config.get("slot1"):
+        node_config["slot1"] = config["slot1"]
+    if config.get("slot2"):
+        node_config["slot2"] = config["slot2"]
+    return node_config
+
+def deploy_topology(eve_client: EVEClient, lab_name: str, lab_folder: str = "/",
+                    max_workers: int = DEPLOY_MAX_WORKERS) -> Dict:
+    """Create routers, connections and the management network as one concurrent plan"""
+    logger.info("\n=== Deploying Enhanced MPLS L3VPN Topology ===")
+    plan = DeploymentPlan.from_topology()
+    return ConcurrentDeployer(eve_client, lab_name, lab_folder, max_workers).deploy(plan)
+
 def create_routers(eve_client: EVEClient, lab_name: str, lab_folder: str = "/") -> Optional[Dict[str, str]]:
     """Create all routers from TOPOLOGY_ROUTERS configuration"""
     logger.info("\n=== Creating Enhanced MPLS L3VPN Routers ===")
-    routers = {}
-
-    for router_name, config in TOPOLOGY_ROUTERS.items():
-        node_config = {
-            "type": config["type"],
-            "template": config["template"],
-            "name": router_name,
-            "image": config["image"],
-            "ram": config["ram"],
-            "nvram": config["nvram"],
-            "idlepc": config["idlepc"],
-            "icon": config["icon"],
-            "left": config["left"],
-            "top": config["top"],
-            "console": config["console"],
-            "config": "0",
-            "ethernet": DEFAULT_ETHERNET_COUNT
-        }
+    plan = DeploymentPlan.from_topology(connections=[], management_network=False)
+    result = ConcurrentDeployer(eve_client, lab_name, lab_folder).deploy(plan)
 
-        if config.get("slot1"):
-            node_config["slot1"] = config["slot1"]
-        if config.get("slot2"):
-            node_config["slot2"] = config["slot2"]
-
-        node_id = eve_client.create_node(lab_name, node_config, lab_folder=lab_folder)
-        if node_id:
-            routers[router_name] = node_id
-            time.sleep(1)
-        else:
-            logger.error(f"❌ Failed to create {router_name}")
-            return None
+    if not result["success"]:
+        for failure in result["failed"]:
+            logger.error(f"❌ Failed to create {failure['name']}")
+        return None
 
-    logger.info(f"✅ Successfully created all {len(routers)} routers")
-    return routers
+    logger.info(f"✅ Successfully created all {len(result['nodes'])} routers")
+    return result["nodes"]
 
 def create_connection(eve_client: EVEClient, lab_name: str, routers: Dict[str, str],
                      router1: str, iface1: str, router2: str, iface2: str,
@@ -1560,23 +2030,20 @@ def create_connection(eve_client: EVEClient, lab_name: str, routers: Dict[str, s
     network_id = eve_client.create_network(lab_name, "bridge", link_name, lab_folder=lab_folder, left=left, top=top)
     if not network_id:
         return False
-    time.sleep(1)
 
     # Connect router 1
     if not eve_client.connect_node_to_network(lab_name, routers[router1], iface1, network_id, lab_folder=lab_folder):
         logger.error(f"❌ Failed to connect {router1}")
         return False
-    time.sleep(0.5)
 
     # Connect router 2
     if not eve_client.connect_node_to_network(lab_name, routers[router2], iface2, network_id, lab_folder=lab_folder):
         logger.error(f"❌ Failed to connect {router2}")
         return False
-    time.sleep(0.5)
 
-    # Verify connections
-    eve_client.verify_connection(lab_name, routers[router1], network_id, lab_folder=lab_folder)
-    eve_client.verify_connection(lab_name, routers[router2], network_id, lab_folder=lab_folder)
+    # Verify both ends with one topology read
+    eve_client.verify_links(lab_name, [(routers[router1], iface1, network_id),
+                                       (routers[router2], iface2, network_id)], lab_folder=lab_folder)
 
     logger.info(f"✅ Successfully connected {router1}({iface1}) <-> {router2}({iface2})")
     return True
@@ -1584,13 +2051,28 @@ def create_connection(eve_client: EVEClient, lab_name: str, routers: Dict[str, s
 def create_all_connections(eve_client: EVEClient, lab_name: str, routers: Dict[str, str], lab_folder: str = "/") -> bool:
     """Create all topology connections"""
     logger.info("\n=== Creating All Enhanced MPLS Topology Connections ===")
-    
-    success_count = 0
+
     total_connections = len(TOPOLOGY_CONNECTIONS)
+    valid_connections = []
+    for connection in TOPOLOGY_CONNECTIONS:
+        router1, iface1, router2, iface2 = connection[:4]
+        # Validate connection configuration (addresses BUG-006)
+        is_valid, errors = eve_client.validate_connection_config(router1, iface1, router2, iface2, routers)
+        if is_valid:
+            valid_connections.append(connection)
+        else:
+            logger.error(f"❌ Connection validation failed for {router1}({iface1}) <-> {router2}({iface2}):")
+            for error in errors:
+                logger.error(f"  - {error}")
+
+    plan = DeploymentPlan.from_topology(connections=valid_connections, management_network=False, node_ids=routers)
+    result = ConcurrentDeployer(eve_client, lab_name, lab_folder).deploy(plan)
 
-    for router1, iface1, router2, iface2, link_name, left, top in TOPOLOGY_CONNECTIONS:
-        if create_connection(eve_client, lab_name, routers, router1, iface1, router2, iface2, link_name, lab_folder, left, top):
-            success_count += 1
+    bound = {(link["node"], link["interface"], link["network"]) for link in result["links"]}
+    success_count = sum(
+        1 for router1, iface1, router2, iface2, link_name, _, _ in valid_connections
+        if (router1, iface1, link_name) in bound and (router2, iface2, link_name) in bound
+    )
 
     logger.info(f"\n✅ Successfully created {success_count}/{total_connections} connections")
     return success_count == total_connections
@@ -1602,21 +2084,16 @@ def create_management_network(eve_client: EVEClient, lab_name: str, routers: Dic
 
     logger.info("\n=== Creating Enhanced Management Network ===")
 
-    mgmt_network_id = eve_client.create_network(lab_name, MANAGEMENT_NETWORK_TYPE, MANAGEMENT_NETWORK_NAME, 
-                                              lab_folder=lab_folder, left="400", top="50")
-    if not mgmt_network_id:
-        return False
-
-    success_count = 0
+    plan = DeploymentPlan()
+    plan.add_network(MANAGEMENT_NETWORK_NAME, MANAGEMENT_NETWORK_TYPE, "400", "50")
     for router_name, router_id in routers.items():
-        mgmt_interface = TOPOLOGY_ROUTERS[router_name].get("mgmt_interface", "f0/1")
-        logger.info(f"Connecting {router_name} management interface {mgmt_interface}...")
-
-        if eve_client.connect_node_to_network(lab_name, router_id, mgmt_interface, mgmt_network_id, lab_folder=lab_folder):
-            success_count += 1
+        config = TOPOLOGY_ROUTERS[router_name]
+        plan.add_node(router_name, router_type=config.get("template", DEFAULT_ROUTER_TEMPLATE), node_id=router_id)
+        plan.add_link(router_name, config.get("mgmt_interface", "f0/1"), MANAGEMENT_NETWORK_NAME)
+    result = ConcurrentDeployer(eve_client, lab_name, lab_folder).deploy(plan, verify=False)
 
-    logger.info(f"✅ Connected {success_count}/{len(routers)} routers to management network")
-    return success_count == len(routers)
+    logger.info(f"✅ Connected {len(result['links'])}/{len(routers)} routers to management network")
+    return result["success"]
 
 def main():
     """Enhanced main function with SSH integration, configuration validation, and rollback"""
@@ -1655,21 +2132,16 @@ def main():
             eve_client.rollback_deployment("Lab creation failed")
             return
 
-        # Create routers
-        routers = create_routers(eve_client, LAB_NAME, lab_folder=LAB_PATH)
-        if not routers:
-            logger.error("❌ Failed to create routers")
-            eve_client.rollback_deployment("Router creation failed")
+        # Create routers, connections (critical test of interface mapping fix) and
+        # management network concurrently, each call as soon as its dependencies exist
+        result = deploy_topology(eve_client, LAB_NAME, lab_folder=LAB_PATH)
+        if not result["success"]:
+            for failure in result["failed"]:
+                if failure["required"]:
+                    logger.error(f"❌ Failed to create {failure['kind']} {failure['name']}: {failure['error']}")
+            eve_client.rollback_deployment("Topology deployment failed")
             return
-
-        # Create connections (critical test of interface mapping fix)
-        if not create_all_connections(eve_client, LAB_NAME, routers, lab_folder=LAB_PATH):
-            logger.error("❌ Failed to create all connections")
-            eve_client.rollback_deployment("Connection creation failed")
-            return
-
-        # Create management network
-        if not create_management_network(eve_client, LAB_NAME, routers, lab_folder=LAB_PATH):
+        if result["failed"]:
             logger.warning("⚠️ Management network creation had issues, continuing...")
 
         # Disable rollback for successful deployment
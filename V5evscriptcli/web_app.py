@@ -29,7 +29,8 @@ import sys
 
 # Import our existing EVE-NG automation system
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from v5_eve_ng_automation import EVEClient, StructuredLogger
+from v5_eve_ng_automation import (EVEClient, StructuredLogger, ConcurrentDeployer,
+                                  CompiledTopology, load_compiled_topology, lookup_interface_index)
 
 # Initialize Flask application
 app = Flask(__name__)
@@ -351,8 +352,7 @@ def load_topology(filename):
         if not os.path.exists(filepath):
             return jsonify({'success': False, 'error': 'Topology file not found'}), 404
         
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        data = load_compiled_topology(filepath).data
         
         return jsonify({'success': True, 'data': data})
     except Exception as e:
@@ -533,21 +533,15 @@ def handle_save_topology(data):
             web_logger.warning("Interface mappings missing from topology data, reconstructing...")
             data['interfaceMappings'] = {}
             
-            # Reconstruct interface mappings using EVE-NG client
-            eve_client = EVEClient("172.16.39.128", "admin", "eve")
-            for node_id, node_data in data['nodes'].items():
-                router_type = node_data.get('type', 'c3725')
+            # Reconstruct interface mappings from the precomputed router tables
+            compiled = CompiledTopology(data)
+            mappings = compiled.interface_mappings
+            for node_id, node in compiled.nodes.items():
                 data['interfaceMappings'][node_id] = {}
-                
-                # Get correct interface mappings for this router type
-                interfaces = node_data.get('interfaces', [])
-                for interface in interfaces:
-                    try:
-                        api_index = eve_client.get_interface_index(interface, router_type)
-                        data['interfaceMappings'][node_id][interface] = int(api_index)
-                    except Exception as e:
-                        web_logger.warning(f"Failed to get interface index for {interface}: {e}")
-                        data['interfaceMappings'][node_id][interface] = 0
+                for interface in node['interfaces']:
+                    if interface not in mappings[node_id]:
+                        web_logger.warning(f"Failed to get interface index for {interface} on {node['type']}")
+                    data['interfaceMappings'][node_id][interface] = mappings[node_id].get(interface, 0)
         
         # Create topologies directory if it doesn't exist
         os.makedirs('topologies', exist_ok=True)
@@ -694,8 +688,9 @@ def handle_get_interface_mapping(data):
             })
             return
         
-        eve_client = EVEClient("172.16.39.128", "admin", "eve")
-        api_index = eve_client.get_interface_index(interface_name, router_type)
+        api_index = lookup_interface_index(interface_name, router_type)
+        if api_index is None:
+            raise ValueError(f"Invalid interface name '{interface_name}' for router type '{router_type}'")
         
         emit('interface_mapping_response', {
             'success': True,
@@ -736,10 +731,6 @@ def deploy_topology_background(deployment_id, topology_data):
             deployment_info = active_deployments.get(deployment_id, {})
         
         lab_name = deployment_info.get('lab_name', 'WebTopology')
-        nodes = topology_data.get('nodes', {})
-        connections = topology_data.get('connections', [])
-        interface_mappings = topology_data.get('interfaceMappings', {})
-        
         socketio.emit('deployment_update', {
             'deployment_id': deployment_id,
             'message': f'Creating lab: {lab_name}',
@@ -759,156 +750,77 @@ def deploy_topology_background(deployment_id, topology_data):
         
         update_deployment_status(deployment_id, 'creating_nodes', 20)
         
-        # Create nodes with proper router configurations
-        node_progress_step = 40 // max(len(nodes), 1)
-        current_progress = 20
-        
-        for i, (node_id, node_data) in enumerate(nodes.items()):
-            try:
-                router_type = node_data.get('type', 'c3725')
-                router_name = node_data.get('name', f'Router{i+1}')
-                
-                socketio.emit('deployment_update', {
-                    'deployment_id': deployment_id,
-                    'message': f'Creating router: {router_name} ({router_type})',
-                    'progress': current_progress
-                }, room=deployment_id)
-                
-                # Get router configuration template
-                node_config = eve_client.get_node_config_template(router_type)
-                node_config.update({
-                    'name': router_name,
-                    'left': str(node_data.get('position', {}).get('x', 100)),
-                    'top': str(node_data.get('position', {}).get('y', 100))
-                })
-                
-                # Create the node
-                node_result = eve_client.create_node(lab_name, node_config)
-                if node_result:
+        # Resolve router types and interface indices once, then build the
+        # node/network/link dependency graph; nodes and networks are created
+        # concurrently and each interface is connected once both exist
+        compiled = CompiledTopology(topology_data)
+        for error_msg in compiled.errors:
+            add_deployment_error(deployment_id, error_msg)
+            web_logger.error(error_msg)
+        plan = compiled.to_plan(eve_client)
+        node_names = {node_id: node['name'] for node_id, node in compiled.nodes.items()}
+        
+        progress = {'done': 0, 'total': max(plan.operation_count, 1)}
+        
+        def on_deploy_event(event):
+            progress['done'] += 1
+            current_progress = 20 + 70 * progress['done'] // progress['total']
+            
+            if event['kind'] == 'node':
+                node_id = event['name']
+                router_name = node_names.get(node_id, node_id)
+                if event['ok']:
                     with deployment_lock:
                         active_deployments[deployment_id]['created_resources']['nodes'][node_id] = {
-                            'eve_id': node_result,
+                            'eve_id': event['id'],
                             'name': router_name,
-                            'type': router_type
+                            'type': plan.nodes[node_id]['router_type']
                         }
-                    
-                    web_logger.info(f"Created node {router_name} with EVE-NG ID: {node_result}")
-                    current_progress += node_progress_step
-                    
+                    web_logger.info(f"Created node {router_name} with EVE-NG ID: {event['id']}")
+                    message = f"Created router: {router_name} ({plan.nodes[node_id]['router_type']})"
                 else:
-                    error_msg = f"Failed to create router {router_name}"
-                    add_deployment_error(deployment_id, error_msg)
-                    
-            except Exception as e:
-                error_msg = f"Failed to create router {node_data.get('name', node_id)}: {str(e)}"
-                add_deployment_error(deployment_id, error_msg)
-                web_logger.error(error_msg)
-        
-        update_deployment_status(deployment_id, 'creating_networks', 60)
-        
-        # Create networks for connections
-        networks_created = {}
-        connection_progress_step = 30 // max(len(connections), 1)
-        current_progress = 60
-        
-        for i, connection in enumerate(connections):
-            try:
-                source_id = connection.get('source')
-                target_id = connection.get('target')
-                source_interface = connection.get('sourceInterface')
-                target_interface = connection.get('targetInterface')
-                
-                # Get the correct API indices from saved mappings or calculate them
-                source_api_index = connection.get('sourceApiIndex')
-                target_api_index = connection.get('targetApiIndex')
-                
-                if source_api_index is None and interface_mappings.get(source_id):
-                    source_api_index = interface_mappings[source_id].get(source_interface)
-                
-                if target_api_index is None and interface_mappings.get(target_id):
-                    target_api_index = interface_mappings[target_id].get(target_interface)
-                
-                # Fallback to calculating indices if not found
-                if source_api_index is None:
-                    source_router_type = nodes[source_id].get('type', 'c3725')
-                    source_api_index = int(eve_client.get_interface_index(source_interface, source_router_type))
-                
-                if target_api_index is None:
-                    target_router_type = nodes[target_id].get('type', 'c3725')
-                    target_api_index = int(eve_client.get_interface_index(target_interface, target_router_type))
-                
-                network_name = f"Net_{source_id}_{target_id}"
-                
-                socketio.emit('deployment_update', {
-                    'deployment_id': deployment_id,
-                    'message': f'Creating connection: {source_interface}({source_api_index}) ↔ {target_interface}({target_api_index})',
-                    'progress': current_progress
-                }, room=deployment_id)
-                
-                # Create network if not exists
-                if network_name not in networks_created:
-                    network_result = eve_client.create_network(
-                        lab_name, 
-                        network_type="bridge", 
-                        network_name=network_name,
-                        left=str(400 + i * 50),
-                        top=str(200 + i * 50)
-                    )
-                    networks_created[network_name] = network_result
-                    
+                    message = f"Failed to create router {router_name}"
+                    add_deployment_error(deployment_id, message)
+            elif event['kind'] == 'network':
+                if event['ok']:
                     with deployment_lock:
-                        active_deployments[deployment_id]['created_resources']['networks'][network_name] = network_result
-                
-                network_id = networks_created[network_name]
-                
-                # Connect source node to network
-                source_eve_id = active_deployments[deployment_id]['created_resources']['nodes'][source_id]['eve_id']
-                source_router_type = nodes[source_id].get('type', 'c3725')
-                
-                source_connection_result = eve_client.connect_node_to_network(
-                    lab_name, 
-                    source_eve_id, 
-                    source_interface, 
-                    network_id,
-                    router_type=source_router_type
-                )
-                
-                # Connect target node to network
-                target_eve_id = active_deployments[deployment_id]['created_resources']['nodes'][target_id]['eve_id']
-                target_router_type = nodes[target_id].get('type', 'c3725')
-                
-                target_connection_result = eve_client.connect_node_to_network(
-                    lab_name, 
-                    target_eve_id, 
-                    target_interface, 
-                    network_id,
-                    router_type=target_router_type
-                )
-                
-                if source_connection_result and target_connection_result:
-                    with deployment_lock:
-                        active_deployments[deployment_id]['created_resources']['connections'].append({
-                            'source': source_id,
-                            'source_interface': source_interface,
-                            'source_api_index': source_api_index,
-                            'target': target_id,
-                            'target_interface': target_interface,
-                            'target_api_index': target_api_index,
-                            'network': network_name
-                        })
-                    
-                    web_logger.info(f"Connected {source_interface}({source_api_index}) ↔ {target_interface}({target_api_index})")
-                    
+                        active_deployments[deployment_id]['created_resources']['networks'][event['name']] = event['id']
+                    message = f"Created network: {event['name']}"
                 else:
-                    error_msg = f"Failed to create connection between {source_interface} and {target_interface}"
-                    add_deployment_error(deployment_id, error_msg)
-                
-                current_progress += connection_progress_step
-                
-            except Exception as e:
-                error_msg = f"Failed to create connection {i+1}: {str(e)}"
+                    message = f"Failed to create network {event['name']}"
+                    add_deployment_error(deployment_id, message)
+            else:
+                link = event['link']
+                router_name = node_names.get(link['node'], link['node']) if link else ''
+                if event['ok']:
+                    message = f"Connected {router_name} {link['interface']} to {link['network']}"
+                else:
+                    message = f"Failed to connect {router_name}: {event['error']}"
+                    add_deployment_error(deployment_id, message)
+            
+            socketio.emit('deployment_update', {
+                'deployment_id': deployment_id,
+                'message': message,
+                'progress': current_progress
+            }, room=deployment_id)
+        
+        result = ConcurrentDeployer(eve_client, lab_name, on_event=on_deploy_event).deploy(plan)
+        for failure in result['failed']:
+            if failure['kind'] == 'plan':
+                add_deployment_error(deployment_id, failure['error'])
+        
+        bound = {(link['node'], link['interface'], link['network']) for link in result['links']}
+        for connection in compiled.links:
+            if ((connection['source'], connection['source_interface'], connection['network']) in bound and
+                    (connection['target'], connection['target_interface'], connection['network']) in bound):
+                with deployment_lock:
+                    active_deployments[deployment_id]['created_resources']['connections'].append(connection)
+                web_logger.info(f"Connected {connection['source_interface']}({connection['source_api_index']}) ↔ "
+                                f"{connection['target_interface']}({connection['target_api_index']})")
+            else:
+                error_msg = (f"Failed to create connection between {connection['source_interface']} "
+                             f"and {connection['target_interface']}")
                 add_deployment_error(deployment_id, error_msg)
-                web_logger.error(error_msg)
         
         # Complete deployment
         update_deployment_status(deployment_id, 'completed', 100)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Audit Result Rollups for NetAuditPro
+Summary tables (per run, per device, per phase) over audit_phase_results,
+kept up to date by SQLite triggers as the batched writer inserts rows, plus
+the paginated, index-backed queries the results views and JSON API use.
+None of these queries touch the raw details JSON.
+"""
+
+import sqlite3
+from typing import Dict, List, Optional
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+
+# Seconds between start_time and end_time; 0 while a phase has no end time
+_DURATION = "COALESCE((julianday(NEW.end_time) - julianday(NEW.start_time)) * 86400.0, 0)"
+_RAW_DURATION = "COALESCE((julianday(end_time) - julianday(start_time)) * 86400.0, 0)"
+
+def _status_flags(status_expr: str) -> List[str]:
+    """0/1 expressions feeding success_count, failure_count, skipped_count and other_count"""
+    return [f"CASE WHEN {status_expr} = 'SUCCESS' THEN 1 ELSE 0 END",
+            f"CASE WHEN {status_expr} = 'FAILURE' THEN 1 ELSE 0 END",
+            f"CASE WHEN {status_expr} = 'SKIPPED' THEN 1 ELSE 0 END",
+            f"CASE WHEN {status_expr} NOT IN ('SUCCESS', 'FAILURE', 'SKIPPED') THEN 1 ELSE 0 END"]
+
+def _status_counts(status_expr: str) -> str:
+    return ", ".join(_status_flags(status_expr))
+
+def _status_sums(status_expr: str) -> str:
+    return ", ".join(f"SUM({flag})" for flag in _status_flags(status_expr))
+
+_COUNTER_UPDATES = '''
+        result_count = result_count + excluded.result_count,
+        success_count = success_count + excluded.success_count,
+        failure_count = failure_count + excluded.failure_count,
+        skipped_count = skipped_count + excluded.skipped_count,
+        other_count = other_count + excluded.other_count,
+        total_duration_seconds = total_duration_seconds + excluded.total_duration_seconds'''
+
+_COUNTER_COLUMNS = '''
+        result_count INTEGER NOT NULL DEFAULT 0,
+        success_count INTEGER NOT NULL DEFAULT 0,
+        failure_count INTEGER NOT NULL DEFAULT 0,
+        skipped_count INTEGER NOT NULL DEFAULT 0,
+        other_count INTEGER NOT NULL DEFAULT 0,
+        total_duration_seconds REAL NOT NULL DEFAULT 0'''
+
+ROLLUP_SCHEMA = [
+    f'''CREATE TABLE IF NOT EXISTS audit_run_summary (
+        audit_run_id TEXT PRIMARY KEY,
+        first_seen DATETIME,
+        last_seen DATETIME,
+        router_count INTEGER NOT NULL DEFAULT 0,{_COUNTER_COLUMNS}
+    )''',
+    "CREATE INDEX IF NOT EXISTS idx_run_summary_last_seen ON audit_run_summary (last_seen)",
+    f'''CREATE TABLE IF NOT EXISTS audit_device_summary (
+        audit_run_id TEXT NOT NULL,
+        router_hostname TEXT NOT NULL,
+        router_ip TEXT,
+        last_phase_number INTEGER,{_COUNTER_COLUMNS},
+        PRIMARY KEY (audit_run_id, router_hostname)
+    )''',
+    "CREATE INDEX IF NOT EXISTS idx_device_summary_router ON audit_device_summary (router_hostname, audit_run_id)",
+    f'''CREATE TABLE IF NOT EXISTS audit_phase_summary (
+        audit_run_id TEXT NOT NULL,
+        phase_name TEXT NOT NULL,
+        phase_number INTEGER,
+        max_duration_seconds REAL NOT NULL DEFAULT 0,{_COUNTER_COLUMNS},
+        PRIMARY KEY (audit_run_id, phase_name)
+    )''',
+    # Rows inserted from here on are folded into the summaries inside the writer's transaction
+    f'''CREATE TRIGGER IF NOT EXISTS trg_phase_results_rollup
+    AFTER INSERT ON audit_phase_results
+    BEGIN
+        INSERT INTO audit_run_summary
+            (audit_run_id, first_seen, last_seen, result_count, success_count, failure_count,
+             skipped_count, other_count, total_duration_seconds)
+        VALUES (NEW.audit_run_id, NEW.start_time, COALESCE(NEW.end_time, NEW.start_time), 1,
+                {_status_counts("NEW.status")}, {_DURATION})
+        ON CONFLICT (audit_run_id) DO UPDATE SET
+            first_seen = MIN(first_seen, excluded.first_seen),
+            last_seen = MAX(last_seen, excluded.last_seen),{_COUNTER_UPDATES};
+
+        UPDATE audit_run_summary SET router_count = router_count + 1
+        WHERE audit_run_id = NEW.audit_run_id
+          AND NOT EXISTS (SELECT 1 FROM audit_device_summary
+                          WHERE audit_run_id = NEW.audit_run_id AND router_hostname = NEW.router_hostname);
+
+        INSERT INTO audit_device_summary
+            (audit_run_id, router_hostname, router_ip, last_phase_number, result_count, success_count,
+             failure_count, skipped_count, other_count, total_duration_seconds)
+        VALUES (NEW.audit_run_id, NEW.router_hostname, NEW.router_ip, NEW.phase_number, 1,
+                {_status_counts("NEW.status")}, {_DURATION})
+        ON CONFLICT (audit_run_id, router_hostname) DO UPDATE SET
+            router_ip = COALESCE(excluded.router_ip, router_ip),
+            last_phase_number = MAX(last_phase_number, excluded.last_phase_number),{_COUNTER_UPDATES};
+
+        INSERT INTO audit_phase_summary
+            (audit_run_id, phase_name, phase_number, max_duration_seconds, result_count, success_count,
+             failure_count, skipped_count, other_count, total_duration_seconds)
+        VALUES (NEW.audit_run_id, NEW.phase_name, NEW.phase_number, {_DURATION}, 1,
+                {_status_counts("NEW.status")}, {_DURATION})
+        ON CONFLICT (audit_run_id, phase_name) DO UPDATE SET
+            max_duration_seconds = MAX(max_duration_seconds, excluded.max_duration_seconds),{_COUNTER_UPDATES};
+    END''',
+    # One-off backfill for databases written before the rollups existed; a no-op once the summaries hold any run
+    f'''INSERT INTO audit_device_summary
+        (audit_run_id, router_hostname, router_ip, last_phase_number, result_count, success_count,
+         failure_count, skipped_count, other_count, total_duration_seconds)
+    SELECT audit_run_id, router_hostname, MAX(router_ip), MAX(phase_number), COUNT(*),
+           {_status_sums("status")}, SUM({_RAW_DURATION})
+    FROM audit_phase_results
+    WHERE NOT EXISTS (SELECT 1 FROM audit_run_summary)
+    GROUP BY audit_run_id, router_hostname''',
+    f'''INSERT INTO audit_phase_summary
+        (audit_run_id, phase_name, phase_number, max_duration_seconds, result_count, success_count,
+         failure_count, skipped_count, other_count, total_duration_seconds)
+    SELECT audit_run_id, phase_name, MAX(phase_number), MAX({_RAW_DURATION}), COUNT(*),
+           {_status_sums("status")}, SUM({_RAW_DURATION})
+    FROM audit_phase_results
+    WHERE NOT EXISTS (SELECT 1 FROM audit_run_summary)
+    GROUP BY audit_run_id, phase_name''',
+    f'''INSERT INTO audit_run_summary
+        (audit_run_id, first_seen, last_seen, router_count, result_count, success_count,
+         failure_count, skipped_count, other_count, total_duration_seconds)
+    SELECT audit_run_id, MIN(start_time), MAX(COALESCE(end_time, start_time)), COUNT(DISTINCT router_hostname),
+           COUNT(*), {_status_sums("status")}, SUM({_RAW_DURATION})
+    FROM audit_phase_results
+    WHERE NOT EXISTS (SELECT 1 FROM audit_run_summary)
+    GROUP BY audit_run_id''',
+]
+
+# Phase rows for the detail view; details is deliberately left out
+_PHASE_ROW_COLUMNS = ("router_hostname, router_ip, phase_number, phase_name, status, summary, "
+                      "error_message, start_time, end_time")
+
+def clamp_page(page, per_page) -> tuple:
+    """Normalise user-supplied paging arguments"""
+    try:
+        page = max(int(page), 1)
+    except (TypeError, ValueError):
+        page = 1
+    try:
+        per_page = min(max(int(per_page), 1), MAX_PAGE_SIZE)
+    except (TypeError, ValueError):
+        per_page = DEFAULT_PAGE_SIZE
+    return page, per_page
+
+class AuditResultsQuery:
+    """Read-side API over the rollup tables and the indexed raw results"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _fetch(self, sql: str, params=()) -> List[Dict]:
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def _count(self, sql: str, params=()) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchone()[0]
+        finally:
+            conn.close()
+
+    def list_runs(self, page=1, per_page=DEFAULT_PAGE_SIZE) -> Dict:
+        """Newest runs first, one summary row each"""
+        page, per_page = clamp_page(page, per_page)
+        runs = self._fetch(
+            "SELECT * FROM audit_run_summary ORDER BY last_seen DESC LIMIT ? OFFSET ?",
+            (per_page, (page - 1) * per_page))
+        total = self._count("SELECT COUNT(*) FROM audit_run_summary")
+        return {'runs': runs, 'page': page, 'per_page': per_page, 'total': total}
+
+    def run_summary(self, audit_run_id: str) -> Optional[Dict]:
+        rows = self._fetch("SELECT * FROM audit_run_summary WHERE audit_run_id = ?", (audit_run_id,))
+        return rows[0] if rows else None
+
+    def run_phases(self, audit_run_id: str) -> List[Dict]:
+        return self._fetch(
+            "SELECT * FROM audit_phase_summary WHERE audit_run_id = ? ORDER BY phase_number",
+            (audit_run_id,))
+
+    def run_devices(self, audit_run_id: str, page=1, per_page=DEFAULT_PAGE_SIZE) -> Dict:
+        """One page of a run's devices, each with its phase rows (without details)"""
+        page, per_page = clamp_page(page, per_page)
+        devices = self._fetch(
+            "SELECT * FROM audit_device_summary WHERE audit_run_id = ? "
+            "ORDER BY router_hostname LIMIT ? OFFSET ?",
+            (audit_run_id, per_page, (page - 1) * per_page))
+        if devices:
+            hostnames = [device['router_hostname'] for device in devices]
+            placeholders = ", ".join("?" for _ in hostnames)
+            phase_rows = self._fetch(
+                f"SELECT {_PHASE_ROW_COLUMNS} FROM audit_phase_results "
+                f"WHERE audit_run_id = ? AND router_hostname IN ({placeholders}) "
+                "ORDER BY router_hostname, phase_number, id",
+                (audit_run_id, *hostnames))
+            by_host = {hostname: [] for hostname in hostnames}
+            for row in phase_rows:
+                by_host[row['router_hostname']].append(row)
+            for device in devices:
+                device['phases'] = by_host[device['router_hostname']]
+        total = self._count("SELECT COUNT(*) FROM audit_device_summary WHERE audit_run_id = ?", (audit_run_id,))
+        return {'devices': devices, 'page': page, 'per_page': per_page, 'total': total}
+
+    def trends(self, limit=30, router_hostname: Optional[str] = None) -> List[Dict]:
+        """Per-run status counts and durations, oldest first, for the last `limit` runs"""
+        limit = clamp_page(1, limit)[1]
+        if router_hostname:
+            sql = '''
+                SELECT r.audit_run_id, r.last_seen, d.result_count, d.success_count, d.failure_count,
+                       d.skipped_count, d.other_count, d.total_duration_seconds
+                FROM audit_device_summary d JOIN audit_run_summary r USING (audit_run_id)
+                WHERE d.router_hostname = ?
+                ORDER BY r.last_seen DESC LIMIT ?'''
+            params = (router_hostname, limit)
+        else:
+            sql = '''
+                SELECT audit_run_id, last_seen, router_count, result_count, success_count, failure_count,
+                       skipped_count, other_count, total_duration_seconds
+                FROM audit_run_summary ORDER BY last_seen DESC LIMIT ?'''
+            params = (limit,)
+        rows = self._fetch(sql, params)
+        rows.reverse()
+        for row in rows:
+            row['success_rate'] = round(100.0 * row['success_count'] / row['result_count'], 1) if row['result_count'] else 0.0
+        return rows
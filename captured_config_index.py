@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Captured Configuration Index for NetAuditPro
+Persistent SQLite index of captured router configuration files
+(router, audit date, path, size, mtime) so the captured-configs pages
+query the index instead of walking every audit directory on each request.
+Audit directories are rescanned only when their mtime or the size/mtime of
+a file already indexed in them changes, either after an audit finishes or
+from a lightweight polling thread. The index file is created on first use.
+"""
+
+import os
+import sqlite3
+import threading
+import zipfile
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+INDEX_FILENAME = ".captured_configs_index.sqlite"
+DEFAULT_POLL_INTERVAL = 30
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def is_config_file(filename: str) -> bool:
+    """Same selection rule the captured-configs page has always used"""
+    return filename.endswith('.conf') or filename.endswith('.cfg') or 'running-config' in filename
+
+def router_name_from_filename(filename: str) -> str:
+    return os.path.splitext(filename)[0].replace('-running-config', '')
+
+class CapturedConfigIndex:
+    """SQLite-backed index of captured configuration files under a report directory"""
+
+    def __init__(self, report_base_dir: str, index_path: Optional[str] = None):
+        self.report_base_dir = report_base_dir
+        self.index_path = index_path or os.path.join(report_base_dir, INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._poll_thread = None
+        self._poll_stop = threading.Event()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        """Open (and if needed create) the index on first use"""
+        with self._lock:
+            if self._conn is None:
+                os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+                conn = sqlite3.connect(self.index_path, check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                self._create_schema(conn)
+                self._conn = conn
+            return self._conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        with conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS audit_dirs (
+                    audit_date TEXT PRIMARY KEY,
+                    dir_mtime REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS config_files (
+                    audit_date TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    router_name TEXT NOT NULL,
+                    filepath TEXT NOT NULL,
+                    filesize INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    PRIMARY KEY (audit_date, filename)
+                );
+                CREATE INDEX IF NOT EXISTS idx_config_files_router
+                    ON config_files (router_name, mtime DESC);
+            ''')
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> int:
+        """Rescan audit directories whose mtime or indexed files changed; returns the number rescanned"""
+        if not os.path.isdir(self.report_base_dir):
+            return 0
+
+        conn = self._db()
+        known_files: Dict[str, Dict[str, Tuple[int, float]]] = defaultdict(dict)
+        with self._lock:
+            known = {row["audit_date"]: row["dir_mtime"]
+                     for row in conn.execute("SELECT audit_date, dir_mtime FROM audit_dirs")}
+            for row in conn.execute("SELECT audit_date, filepath, filesize, mtime FROM config_files"):
+                known_files[row["audit_date"]][row["filepath"]] = (row["filesize"], row["mtime"])
+
+        present = {}
+        with os.scandir(self.report_base_dir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    present[entry.name] = entry.stat().st_mtime
+
+        rescanned = 0
+        for audit_date, dir_mtime in present.items():
+            # Rewriting a config in place leaves the directory mtime alone, so indexed files are stat'ed too
+            if known.get(audit_date) != dir_mtime or self._files_changed(known_files.get(audit_date, {})):
+                self.index_audit_dir(audit_date, dir_mtime)
+                rescanned += 1
+
+        removed = set(known) - set(present)
+        if removed:
+            with self._lock, conn:
+                conn.executemany("DELETE FROM config_files WHERE audit_date = ?", [(d,) for d in removed])
+                conn.executemany("DELETE FROM audit_dirs WHERE audit_date = ?", [(d,) for d in removed])
+        return rescanned
+
+    @staticmethod
+    def _files_changed(indexed: Dict[str, Tuple[int, float]]) -> bool:
+        """True if any indexed file is gone or its size/mtime differ from the index"""
+        for filepath, (filesize, mtime) in indexed.items():
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                return True
+            if (stat.st_size, stat.st_mtime) != (filesize, mtime):
+                return True
+        return False
+
+    def index_audit_dir(self, audit_date: str, dir_mtime: Optional[float] = None):
+        """(Re)index one audit directory, e.g. right after an audit has written it"""
+        audit_path = os.path.join(self.report_base_dir, audit_date)
+        rows = []
+        with os.scandir(audit_path) as entries:
+            for entry in entries:
+                if entry.is_file() and is_config_file(entry.name):
+                    stat = entry.stat()
+                    rows.append((audit_date, entry.name, router_name_from_filename(entry.name),
+                                 entry.path, stat.st_size, stat.st_mtime))
+        if dir_mtime is None:
+            dir_mtime = os.stat(audit_path).st_mtime
+
+        conn = self._db()
+        with self._lock, conn:
+            conn.execute("DELETE FROM config_files WHERE audit_date = ?", (audit_date,))
+            conn.executemany("INSERT INTO config_files VALUES (?, ?, ?, ?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO audit_dirs VALUES (?, ?)", (audit_date, dir_mtime))
+
+    def start_polling(self, interval: float = DEFAULT_POLL_INTERVAL):
+        """Refresh now and then every interval seconds in a daemon thread, off the request path"""
+        if self._poll_thread and self._poll_thread.is_alive():
+            return
+
+        def poll():
+            while True:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Error refreshing captured config index: {e}")
+                if self._poll_stop.wait(interval):
+                    break
+
+        self._poll_stop.clear()
+        self._poll_thread = threading.Thread(target=poll, name="config-index-poller", daemon=True)
+        self._poll_thread.start()
+
+    def stop_polling(self):
+        self._poll_stop.set()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _row_to_config(row: sqlite3.Row) -> Dict[str, Any]:
+        last_modified = datetime.fromtimestamp(row["mtime"])
+        return {
+            'router_name': row["router_name"],
+            'audit_date': row["audit_date"],
+            'filename': row["filename"],
+            'filepath': row["filepath"],
+            'filesize': row["filesize"],
+            'last_modified': last_modified,
+            'last_modified_str': last_modified.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def count_routers(self) -> int:
+        conn = self._db()
+        with self._lock:
+            return conn.execute("SELECT COUNT(DISTINCT router_name) FROM config_files").fetchone()[0]
+
+    def router_page(self, page: int = 1, per_page: int = 25) -> Tuple[List[str], Dict[str, List[Dict[str, Any]]], int]:
+        """
+        One page of routers (alphabetical) with their configs, newest first.
+        Returns (router_names, configs_by_router, total_router_count).
+        """
+        page = max(1, page)
+        conn = self._db()
+        with self._lock:
+            total = conn.execute("SELECT COUNT(DISTINCT router_name) FROM config_files").fetchone()[0]
+            names = [row[0] for row in conn.execute(
+                "SELECT DISTINCT router_name FROM config_files ORDER BY router_name LIMIT ? OFFSET ?",
+                (per_page, (page - 1) * per_page)
+            )]
+            configs: Dict[str, List[Dict[str, Any]]] = {name: [] for name in names}
+            if names:
+                placeholders = ",".join("?" * len(names))
+                for row in conn.execute(
+                    f"SELECT * FROM config_files WHERE router_name IN ({placeholders}) "
+                    "ORDER BY router_name, mtime DESC", names
+                ):
+                    configs[row["router_name"]].append(self._row_to_config(row))
+        return names, configs, total
+
+    def files_for_router(self, router_name: str) -> List[Dict[str, Any]]:
+        """All configs for a router, newest audit first (matches the legacy download rule)"""
+        conn = self._db()
+        with self._lock:
+            rows = conn.execute(
+                "SELECT * FROM config_files WHERE router_name = ? OR instr(filename, ?) > 0 "
+                "ORDER BY audit_date DESC", (router_name, router_name)
+            ).fetchall()
+        return [self._row_to_config(row) for row in rows]
+
+def iter_combined_configs(config_files: List[Dict[str, Any]]) -> Iterator[str]:
+    """Yield the combined all-configs download piece by piece, one file chunk at a time"""
+    for config in config_files:
+        yield f"===== {config['filename']} ({config['audit_date']}) =====\n\n"
+        with open(config['filepath'], 'r') as f:
+            while True:
+                chunk = f.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        yield "\n\n" + "=" * 80 + "\n\n"
+
+class _ChunkBuffer:
+    """Write-only sink for zipfile that hands back what was written since the last drain"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def iter_configs_zip(config_files: List[Dict[str, Any]]) -> Iterator[bytes]:
+    """Yield a zip archive of the given configs as it is compressed, without buffering the archive"""
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for config in config_files:
+            arcname = f"{config['audit_date']}/{config['filename']}"
+            with open(config['filepath'], 'rb') as src, archive.open(arcname, 'w') as dest:
+                while True:
+                    chunk = src.read(STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dest.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            data = buffer.drain()
+            if data:
+                yield data
+    yield buffer.drain()
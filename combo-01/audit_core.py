@@ -42,13 +42,15 @@ except ImportError:
 # Import cryptography libraries for secure credential management
 try:
     from cryptography.fernet import Fernet
-    from cryptography.hazmat.primitives import hashes
-    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
     cryptography_available = True
 except ImportError:
     cryptography_available = False
     print(f"{Fore.YELLOW}Warning: cryptography package not available. Secure credential storage disabled.{Style.RESET_ALL}")
 
+# credential_vault is shared from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from credential_vault import derive_fernet_key, inherited_key, key_handoff
+
 # Global constants
 VERSION = "3.11.0"
 DEFAULT_LOG_DIR = "logs"
@@ -207,17 +209,33 @@ class CredentialManager:
             except Exception as e:
                 print(f"{Fore.YELLOW}Warning: Could not set secure permissions on salt file: {e}{Style.RESET_ALL}")
         
-        # Generate key from password
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=self.salt,
-            iterations=100000,
-        )
-        
-        # Derive the key from the password
-        key = base64.urlsafe_b64encode(kdf.derive(master_password.encode()))
+        # Derive the key from the password (once per process, see credential_vault)
+        self.key = derive_fernet_key(master_password, self.salt)
+        self.cipher_suite = Fernet(self.key)
+    
+    def initialize_from_parent(self):
+        """
+        Use the key a parent process handed down with key_handoff()
+        Returns False if none was passed (or it was derived with another salt),
+        in which case the caller prompts for the master password as usual
+        """
+        if not self.salt_file.exists():
+            return False
+        with open(self.salt_file, 'rb') as f:
+            salt = f.read()
+        key = inherited_key(salt)
+        if not key:
+            return False
+        self.salt = salt
+        self.key = key
         self.cipher_suite = Fernet(key)
+        return True
+    
+    def key_handoff(self):
+        """Context manager yielding (env, pass_fds) that give child processes this manager's key"""
+        if not self.key:
+            raise ValueError("Credential manager not initialized with a master password")
+        return key_handoff(self.key, self.salt)
     
     def encrypt(self, plaintext):
         """
@@ -22,10 +22,8 @@ import subprocess
 import datetime
 import argparse
 import platform
-import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Import core functionality
+# Import core functionality (audit_core puts the repository root on sys.path for the shared inventory_engine)
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     from audit_core import (
@@ -33,6 +31,12 @@ try:
         prompt_for_master_password, AuditResult, AuditReport,
         Fore, Style, colorama_available
     )
+    from connectivity_engine import (
+        AsyncConnectivityEngine, build_ping_command, parse_ping_output, ping_error_result,
+        dns_result_from_addresses, dns_error_result,
+        DEFAULT_MAX_CONCURRENCY, DEFAULT_PER_HOST_LIMIT
+    )
+    from inventory_engine import load_inventory
 except ImportError as e:
     print(f"Error importing audit_core module: {e}")
     print("Make sure audit_core.py is in the same directory.")
@@ -51,9 +55,11 @@ if not logger:
 class ConnectivityAuditor:
     """Handles connectivity auditing for network devices"""
     
-    def __init__(self, test_mode=False):
+    def __init__(self, test_mode=False, max_concurrency=DEFAULT_MAX_CONCURRENCY, per_host_limit=DEFAULT_PER_HOST_LIMIT):
         """Initialize the connectivity auditor"""
         self.test_mode = test_mode
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
         self.devices = []
         self.results = []
         self.timestamp = datetime.datetime.now()
@@ -80,57 +86,54 @@ class ConnectivityAuditor:
                 print(f"{Fore.RED}Error: CSV file not found: {csv_file}{Style.RESET_ALL}")
                 return False
             
-            with open(csv_file, 'r') as f:
-                # Read the first line to check the format
-                header = f.readline().strip()
-                f.seek(0)  # Reset file position
-                
-                # Check if this is routers01.csv format
-                is_routers01_format = 'management_ip' in header and 'model_name' in header
-                
+            # Parsed once and cached by mtime/content hash (see inventory_engine)
+            inventory = load_inventory(csv_file)
+            
+            # Check if this is routers01.csv format
+            is_routers01_format = inventory.has_columns('management_ip', 'model_name')
+            
+            if is_routers01_format:
+                logger.info(f"Detected routers01.csv format")
+                print(f"{Fore.GREEN}Detected routers01.csv format{Style.RESET_ALL}")
+            
+            for row in inventory.rows():
+                # For routers01.csv format
                 if is_routers01_format:
-                    logger.info(f"Detected routers01.csv format")
-                    print(f"{Fore.GREEN}Detected routers01.csv format{Style.RESET_ALL}")
-                
-                csv_reader = csv.DictReader(f)
-                for row in csv_reader:
-                    # For routers01.csv format
-                    if is_routers01_format:
-                        if 'hostname' not in row or 'management_ip' not in row:
-                            logger.warning(f"Skipping row in routers01.csv: missing required fields")
-                            continue
-                        
-                        # Add device with routers01.csv specific field mapping
-                        self.devices.append({
-                            'hostname': row['hostname'],
-                            'ip': row['management_ip'],
-                            'description': f"WAN IP: {row.get('wan_ip', 'N/A')}",
-                            'check_ports': [22, 23, 80, 443],  # Default ports to check
-                            'dns_check': True,
-                            'device_type': 'cisco_ios',
-                            'username': 'admin',
-                            'password': 'cisco123',
-                            'secret': 'cisco123',
-                            'model': row.get('model_name', 'Unknown')
-                        })
-                    # For standard format
-                    else:
-                        if 'hostname' not in row or 'ip' not in row:
-                            logger.warning(f"Skipping row in CSV: missing required fields")
-                            continue
-                        
-                        self.devices.append({
-                            'hostname': row['hostname'],
-                            'ip': row['ip'],
-                            'description': row.get('description', ''),
-                            'check_ports': [int(p.strip()) for p in row.get('check_ports', '22,23,80,443').split(',') if p.strip()],
-                            'dns_check': row.get('dns_check', 'false').lower() == 'true',
-                            'device_type': row.get('device_type', 'cisco_ios'),
-                            'username': row.get('username', 'admin'),
-                            'password': row.get('password', 'cisco123'),
-                            'secret': row.get('secret', 'cisco123'),
-                            'model': row.get('model', 'Unknown')
-                        })
+                    if 'hostname' not in row or 'management_ip' not in row:
+                        logger.warning(f"Skipping row in routers01.csv: missing required fields")
+                        continue
+                    
+                    # Add device with routers01.csv specific field mapping
+                    self.devices.append({
+                        'hostname': row['hostname'],
+                        'ip': row['management_ip'],
+                        'description': f"WAN IP: {row.get('wan_ip', 'N/A')}",
+                        'check_ports': [22, 23, 80, 443],  # Default ports to check
+                        'dns_check': True,
+                        'device_type': 'cisco_ios',
+                        'username': 'admin',
+                        'password': 'cisco123',
+                        'secret': 'cisco123',
+                        'model': row.get('model_name', 'Unknown')
+                    })
+                # For standard format
+                else:
+                    if 'hostname' not in row or 'ip' not in row:
+                        logger.warning(f"Skipping row in CSV: missing required fields")
+                        continue
+                    
+                    self.devices.append({
+                        'hostname': row['hostname'],
+                        'ip': row['ip'],
+                        'description': row.get('description', ''),
+                        'check_ports': [int(p.strip()) for p in row.get('check_ports', '22,23,80,443').split(',') if p.strip()],
+                        'dns_check': row.get('dns_check', 'false').lower() == 'true',
+                        'device_type': row.get('device_type', 'cisco_ios'),
+                        'username': row.get('username', 'admin'),
+                        'password': row.get('password', 'cisco123'),
+                        'secret': row.get('secret', 'cisco123'),
+                        'model': row.get('model', 'Unknown')
+                    })
             
             if not self.devices:
                 logger.warning(f"No valid devices found in {csv_file}")
@@ -219,20 +222,7 @@ class ConnectivityAuditor:
             }
         
         try:
-            # Determine platform for correct ping command format
-            platform_system = platform.system().lower()
-            
-            # Different ping command parameters based on OS
-            if platform_system == "windows":
-                # Windows ping uses -n for count and -w for timeout in milliseconds
-                ping_cmd = ["ping", "-n", str(count), "-w", str(timeout * 1000), ip]
-            elif platform_system in ["linux", "darwin"]:  # Linux or macOS
-                # Linux/Unix ping uses -c for count and -W for timeout in seconds
-                ping_cmd = ["ping", "-c", str(count), "-W", str(timeout), ip]
-            else:
-                # Default to Linux-style for other OSes
-                logger.warning(f"Unrecognized OS: {platform_system}, using Linux-style ping command")
-                ping_cmd = ["ping", "-c", str(count), "-W", str(timeout), ip]
+            ping_cmd = build_ping_command(ip, count, timeout)
                 
             # Log the ping command being used
             logger.debug(f"Running ping command: {' '.join(ping_cmd)}")
@@ -243,122 +233,15 @@ class ConnectivityAuditor:
                                    stderr=subprocess.PIPE, 
                                    text=True)
             
-            # Parse ping output
-            output = result.stdout
-            
-            # Initialize result values
-            success = result.returncode == 0
-            packets_sent = count
-            packets_received = 0
-            packet_loss = 100
-            rtt_min = rtt_avg = rtt_max = None
-            ttl = None
-            error_msg = None
-            
             # Log the ping output for debugging
-            logger.debug(f"Ping output for {ip}:\n{output}")
-            
-            # Parse packet statistics based on OS
-            platform_system = platform.system().lower()
+            logger.debug(f"Ping output for {ip}:\n{result.stdout}")
             
-            if platform_system == "windows":
-                # Windows ping output parsing
-                if "Packets: Sent = " in output:
-                    stats_line = re.search(r"Packets: Sent = (\d+), Received = (\d+), Lost = (\d+) \((\d+)% loss\)", output)
-                    if stats_line:
-                        packets_sent = int(stats_line.group(1))
-                        packets_received = int(stats_line.group(2))
-                        packet_loss = int(stats_line.group(4))
-                
-                if "Minimum = " in output:
-                    # Handle both integer and decimal formats in Windows output
-                    rtt_line = re.search(r"Minimum = ([\d.]+)ms, Maximum = ([\d.]+)ms, Average = ([\d.]+)ms", output)
-                    if rtt_line:
-                        rtt_min = float(rtt_line.group(1))
-                        rtt_max = float(rtt_line.group(2))
-                        rtt_avg = float(rtt_line.group(3))
-                
-                # Extract TTL from Windows output
-                ttl_match = re.search(r"TTL=(\d+)", output)
-                if ttl_match:
-                    ttl = int(ttl_match.group(1))
-                    
-                # Check for specific Windows error messages
-                if "could not find host" in output.lower() or "could not resolve target" in output.lower():
-                    error_msg = "Could not resolve hostname"
-                elif "Request timed out" in output:
-                    error_msg = "Request timed out"
-                    
-            elif platform_system in ["linux", "darwin"]:  # Linux or macOS
-                # Linux/Unix ping output parsing
-                if "packets transmitted" in output:
-                    stats_line = re.search(r"(\d+) packets transmitted, (\d+) received.+?([\d.]+)% packet loss", output)
-                    if stats_line:
-                        packets_sent = int(stats_line.group(1))
-                        packets_received = int(stats_line.group(2))
-                        packet_loss = float(stats_line.group(3))
-                
-                if "min/avg/max" in output:
-                    rtt_line = re.search(r"min/avg/max(?:/mdev)? = ([\d.]+)/([\d.]+)/([\d.]+)", output)
-                    if rtt_line:
-                        rtt_min = float(rtt_line.group(1))
-                        rtt_avg = float(rtt_line.group(2))
-                        rtt_max = float(rtt_line.group(3))
-                
-                # Extract TTL from Linux/Unix output
-                ttl_match = re.search(r"ttl=(\d+)", output, re.IGNORECASE)
-                if ttl_match:
-                    ttl = int(ttl_match.group(1))
-                    
-                # Check for specific Linux error messages
-                if "unknown host" in output.lower():
-                    error_msg = "Unknown host"
-                elif "Name or service not known" in output:
-                    error_msg = "Name or service not known"
-                elif "100% packet loss" in output:
-                    error_msg = "100% packet loss"
-            else:
-                # Generic parsing for other platforms
-                logger.warning(f"Using generic ping output parsing for platform: {platform_system}")
-                # Try both Windows and Linux patterns
-                stats_line = re.search(r"(\d+) packets transmitted, (\d+) received.+?([\d.]+)% packet loss", output)
-                if stats_line:
-                    packets_sent = int(stats_line.group(1))
-                    packets_received = int(stats_line.group(2))
-                    packet_loss = float(stats_line.group(3))
-                else:
-                    # Try Windows pattern
-                    stats_line = re.search(r"Packets: Sent = (\d+), Received = (\d+), Lost = (\d+) \((\d+)% loss\)", output)
-                    if stats_line:
-                        packets_sent = int(stats_line.group(1))
-                        packets_received = int(stats_line.group(2))
-                        packet_loss = int(stats_line.group(4))
-            
-            return {
-                'success': success,
-                'packets_sent': packets_sent,
-                'packets_received': packets_received,
-                'packet_loss_percent': packet_loss,
-                'rtt_min_ms': rtt_min,
-                'rtt_avg_ms': rtt_avg,
-                'rtt_max_ms': rtt_max,
-                'ttl': ttl,
-                'error': error_msg
-            }
+            # Parse packet statistics, RTT and TTL (shared with the asyncio engine)
+            return parse_ping_output(result.stdout, result.returncode, count)
             
         except Exception as e:
             logger.error(f"Error performing ping to {ip}: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'packets_sent': count,
-                'packets_received': 0,
-                'packet_loss_percent': 100,
-                'rtt_min_ms': None,
-                'rtt_avg_ms': None,
-                'rtt_max_ms': None,
-                'ttl': None
-            }
+            return ping_error_result(str(e), count)
     
     def check_port(self, ip, port, timeout=2, retries=2, retry_delay=1):
         """
@@ -526,38 +409,19 @@ class ConnectivityAuditor:
         try:
             # Resolve hostname
             info = socket.getaddrinfo(hostname, None)
-            ip_addresses = [addr[4][0] for addr in info]
-            
-            # Get first IPv4 address
-            actual_ip = next((ip for ip in ip_addresses if ':' not in ip), None)
-            
-            if not actual_ip:
-                return {
-                    'hostname': hostname,
-                    'resolved': False,
-                    'ip': None,
-                    'matches_expected': False,
-                    'error': "No IPv4 address found"
-                }
-            
-            return {
-                'hostname': hostname,
-                'resolved': True,
-                'ip': actual_ip,
-                'matches_expected': expected_ip is None or actual_ip == expected_ip,
-                'error': None
-            }
+            return dns_result_from_addresses(hostname, [addr[4][0] for addr in info], expected_ip)
         except Exception as e:
-            return {
-                'hostname': hostname,
-                'resolved': False,
-                'ip': None,
-                'matches_expected': False,
-                'error': str(e)
-            }
+            return dns_error_result(hostname, str(e))
     
     def audit_device(self, device):
         """Perform a comprehensive connectivity audit for a single device"""
+        ping_result = self.check_ping(device['ip'])
+        port_results = [self.check_port(device['ip'], port) for port in device['check_ports']]
+        dns_result = self.check_dns(device['hostname'], device['ip']) if device['dns_check'] else None
+        return self.build_audit_result(device, ping_result, port_results, dns_result)
+    
+    def build_audit_result(self, device, ping_result, port_results, dns_result=None):
+        """Turn the ping, port and DNS check results for a device into its AuditResult"""
         hostname = device['hostname']
         ip = device['ip']
         
@@ -575,7 +439,6 @@ class ConnectivityAuditor:
         
         # Phase 1: ICMP Ping Test
         print(f"  {Fore.CYAN}⏳ Testing ICMP connectivity...{Style.RESET_ALL}")
-        ping_result = self.check_ping(ip)
         
         ping_status = "Success" if ping_result['success'] else "Failed"
         ping_details = {
@@ -604,11 +467,8 @@ class ConnectivityAuditor:
         
         # Phase 2: TCP Port Testing
         print(f"  {Fore.CYAN}⏳ Testing TCP ports...{Style.RESET_ALL}")
-        port_results = []
-        
-        for port in device['check_ports']:
-            port_result = self.check_port(ip, port)
-            port_results.append(port_result)
+        for port_result in port_results:
+            port = port_result['port']
             
             if port_result['open']:
                 retry_info = ""
@@ -636,7 +496,6 @@ class ConnectivityAuditor:
         # Phase 3: DNS Resolution (if enabled)
         if device['dns_check']:
             print(f"  {Fore.CYAN}⏳ Testing DNS resolution...{Style.RESET_ALL}")
-            dns_result = self.check_dns(hostname, ip)
             
             dns_status = "Success" if dns_result['resolved'] else "Failed"
             dns_details = {
@@ -691,6 +550,21 @@ class ConnectivityAuditor:
         self.results.append(audit_result)
         return audit_result
     
+    def probe_devices(self):
+        """
+        Run the ping, port and DNS checks for all devices.
+        Returns one (ping_result, port_results, dns_result) tuple, or the exception raised, per device.
+        """
+        if self.test_mode:
+            # Simulated checks return immediately, so there is nothing to overlap
+            return [(self.check_ping(d['ip']),
+                     [self.check_port(d['ip'], port) for port in d['check_ports']],
+                     self.check_dns(d['hostname'], d['ip']) if d['dns_check'] else None)
+                    for d in self.devices]
+        
+        engine = AsyncConnectivityEngine(max_concurrency=self.max_concurrency, per_host_limit=self.per_host_limit)
+        return engine.run(self.devices)
+    
     def run_audit(self):
         """Run the connectivity audit for all devices"""
         if not self.devices:
@@ -698,21 +572,24 @@ class ConnectivityAuditor:
             print(f"{Fore.RED}Error: No devices to audit. Please load devices first.{Style.RESET_ALL}")
             return False
         
+        # Devices handed over by network_audit.py come from its own CSV loader, without the
+        # connectivity-specific fields; fill in the same defaults as load_devices_from_csv
+        self.devices = [dict({'check_ports': [22, 23, 80, 443], 'dns_check': False}, **device)
+                        for device in self.devices]
+        
         start_time = time.time()
         print(f"{Fore.CYAN}Starting connectivity audit for {len(self.devices)} devices...{Style.RESET_ALL}")
         logger.info(f"Starting connectivity audit for {len(self.devices)} devices")
         
-        # Use ThreadPoolExecutor for parallel auditing
-        with ThreadPoolExecutor(max_workers=min(10, len(self.devices))) as executor:
-            future_to_device = {executor.submit(self.audit_device, device): device for device in self.devices}
-            
-            for future in as_completed(future_to_device):
-                device = future_to_device[future]
-                try:
-                    result = future.result()
-                    logger.info(f"Completed audit for {device['hostname']} ({device['ip']})")
-                except Exception as e:
-                    logger.error(f"Error auditing {device['hostname']} ({device['ip']}): {e}")
+        # Probe every device at once on the asyncio engine, then build results in device order
+        for device, probes in zip(self.devices, self.probe_devices()):
+            if isinstance(probes, Exception):
+                continue  # Already logged by the engine
+            try:
+                self.build_audit_result(device, *probes)
+                logger.info(f"Completed audit for {device['hostname']} ({device['ip']})")
+            except Exception as e:
+                logger.error(f"Error auditing {device['hostname']} ({device['ip']}): {e}")
         
         elapsed_time = time.time() - start_time
         logger.info(f"Completed connectivity audit in {elapsed_time:.2f} seconds")
@@ -748,13 +625,15 @@ def main():
     parser.add_argument("-c", "--csv", type=str, default="devices.csv", help="CSV file with device details")
     parser.add_argument("--no-report", action="store_true", help="Skip report generation (used when running as part of a unified audit)")
     parser.add_argument("--timestamp", type=str, help="Use specified timestamp for report naming (for consistency across reports)")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY, help="Maximum simultaneous TCP probes across all devices")
+    parser.add_argument("--per-host-limit", type=int, default=DEFAULT_PER_HOST_LIMIT, help="Maximum simultaneous TCP probes per device")
     args = parser.parse_args()
     
     # Ensure directories exist
     ensure_directories()
     
     # Create the auditor
-    auditor = ConnectivityAuditor(test_mode=args.test)
+    auditor = ConnectivityAuditor(test_mode=args.test, max_concurrency=args.max_concurrency, per_host_limit=args.per_host_limit)
     
     # Load devices
     if not auditor.load_devices_from_csv(args.csv):
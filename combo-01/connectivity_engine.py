@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Network Audit Tool - Asyncio Connectivity Engine (v3.11)
+
+Probes every (device, port) pair, ping and DNS lookup of an audit concurrently
+on one event loop instead of a 10-thread pool of blocking checks:
+- TCP ports via asyncio.open_connection under global and per-host limits
+- ICMP via the system ping command, run as bounded batches of async subprocesses
+- DNS via the event loop's getaddrinfo
+
+Result dictionaries, retry counts and latency statistics are the same as the
+blocking checks in connectivity_audit.py, which share parse_ping_output.
+"""
+
+import asyncio
+import os
+import platform
+import re
+import socket
+import time
+import logging
+
+logger = logging.getLogger("network_audit")
+
+DEFAULT_MAX_CONCURRENCY = 256   # Simultaneous TCP connection attempts across all devices
+DEFAULT_PER_HOST_LIMIT = 4      # Simultaneous TCP connection attempts against one device
+DEFAULT_PING_CONCURRENCY = 32   # Ping subprocesses alive at once
+
+def build_ping_command(ip, count=4, timeout=2, platform_system=None):
+    """Return the ping command line for this OS"""
+    platform_system = platform_system or platform.system().lower()
+    if platform_system == "windows":
+        # Windows ping uses -n for count and -w for timeout in milliseconds
+        return ["ping", "-n", str(count), "-w", str(timeout * 1000), ip]
+    if platform_system not in ["linux", "darwin"]:
+        logger.warning(f"Unrecognized OS: {platform_system}, using Linux-style ping command")
+    # Linux/Unix ping uses -c for count and -W for timeout in seconds
+    return ["ping", "-c", str(count), "-W", str(timeout), ip]
+
+def parse_ping_output(output, returncode, count=4, platform_system=None):
+    """Parse ping output into the connectivity audit's ping result dictionary"""
+    platform_system = platform_system or platform.system().lower()
+
+    success = returncode == 0
+    packets_sent = count
+    packets_received = 0
+    packet_loss = 100
+    rtt_min = rtt_avg = rtt_max = None
+    ttl = None
+    error_msg = None
+
+    if platform_system == "windows":
+        # Windows ping output parsing
+        if "Packets: Sent = " in output:
+            stats_line = re.search(r"Packets: Sent = (\d+), Received = (\d+), Lost = (\d+) \((\d+)% loss\)", output)
+            if stats_line:
+                packets_sent = int(stats_line.group(1))
+                packets_received = int(stats_line.group(2))
+                packet_loss = int(stats_line.group(4))
+
+        if "Minimum = " in output:
+            # Handle both integer and decimal formats in Windows output
+            rtt_line = re.search(r"Minimum = ([\d.]+)ms, Maximum = ([\d.]+)ms, Average = ([\d.]+)ms", output)
+            if rtt_line:
+                rtt_min = float(rtt_line.group(1))
+                rtt_max = float(rtt_line.group(2))
+                rtt_avg = float(rtt_line.group(3))
+
+        ttl_match = re.search(r"TTL=(\d+)", output)
+        if ttl_match:
+            ttl = int(ttl_match.group(1))
+
+        if "could not find host" in output.lower() or "could not resolve target" in output.lower():
+            error_msg = "Could not resolve hostname"
+        elif "Request timed out" in output:
+            error_msg = "Request timed out"
+
+    elif platform_system in ["linux", "darwin"]:
+        # Linux/Unix ping output parsing
+        if "packets transmitted" in output:
+            stats_line = re.search(r"(\d+) packets transmitted, (\d+) received.+?([\d.]+)% packet loss", output)
+            if stats_line:
+                packets_sent = int(stats_line.group(1))
+                packets_received = int(stats_line.group(2))
+                packet_loss = float(stats_line.group(3))
+
+        if "min/avg/max" in output:
+            rtt_line = re.search(r"min/avg/max(?:/mdev)? = ([\d.]+)/([\d.]+)/([\d.]+)", output)
+            if rtt_line:
+                rtt_min = float(rtt_line.group(1))
+                rtt_avg = float(rtt_line.group(2))
+                rtt_max = float(rtt_line.group(3))
+
+        ttl_match = re.search(r"ttl=(\d+)", output, re.IGNORECASE)
+        if ttl_match:
+            ttl = int(ttl_match.group(1))
+
+        if "unknown host" in output.lower():
+            error_msg = "Unknown host"
+        elif "Name or service not known" in output:
+            error_msg = "Name or service not known"
+        elif "100% packet loss" in output:
+            error_msg = "100% packet loss"
+    else:
+        # Generic parsing for other platforms - try both Linux and Windows patterns
+        logger.warning(f"Using generic ping output parsing for platform: {platform_system}")
+        stats_line = re.search(r"(\d+) packets transmitted, (\d+) received.+?([\d.]+)% packet loss", output)
+        if stats_line:
+            packets_sent = int(stats_line.group(1))
+            packets_received = int(stats_line.group(2))
+            packet_loss = float(stats_line.group(3))
+        else:
+            stats_line = re.search(r"Packets: Sent = (\d+), Received = (\d+), Lost = (\d+) \((\d+)% loss\)", output)
+            if stats_line:
+                packets_sent = int(stats_line.group(1))
+                packets_received = int(stats_line.group(2))
+                packet_loss = int(stats_line.group(4))
+
+    return {
+        'success': success,
+        'packets_sent': packets_sent,
+        'packets_received': packets_received,
+        'packet_loss_percent': packet_loss,
+        'rtt_min_ms': rtt_min,
+        'rtt_avg_ms': rtt_avg,
+        'rtt_max_ms': rtt_max,
+        'ttl': ttl,
+        'error': error_msg
+    }
+
+def ping_error_result(error, count=4):
+    """Ping result dictionary for a ping that could not be run at all"""
+    return {
+        'success': False,
+        'error': error,
+        'packets_sent': count,
+        'packets_received': 0,
+        'packet_loss_percent': 100,
+        'rtt_min_ms': None,
+        'rtt_avg_ms': None,
+        'rtt_max_ms': None,
+        'ttl': None
+    }
+
+def dns_result_from_addresses(hostname, ip_addresses, expected_ip=None):
+    """DNS check result dictionary from the addresses a lookup returned"""
+    actual_ip = next((ip for ip in ip_addresses if ':' not in ip), None)
+    if not actual_ip:
+        return {
+            'hostname': hostname,
+            'resolved': False,
+            'ip': None,
+            'matches_expected': False,
+            'error': "No IPv4 address found"
+        }
+    return {
+        'hostname': hostname,
+        'resolved': True,
+        'ip': actual_ip,
+        'matches_expected': expected_ip is None or actual_ip == expected_ip,
+        'error': None
+    }
+
+def dns_error_result(hostname, error):
+    return {
+        'hostname': hostname,
+        'resolved': False,
+        'ip': None,
+        'matches_expected': False,
+        'error': error
+    }
+
+class AsyncConnectivityEngine:
+    """Runs the ping, port and DNS checks for many devices concurrently on one event loop"""
+
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY, per_host_limit=DEFAULT_PER_HOST_LIMIT,
+                 ping_concurrency=DEFAULT_PING_CONCURRENCY, port_timeout=2, retries=2, retry_delay=1,
+                 ping_count=4, ping_timeout=2):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.ping_concurrency = ping_concurrency
+        self.port_timeout = port_timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.ping_count = ping_count
+        self.ping_timeout = ping_timeout
+        self._global_limit = None
+        self._ping_limit = None
+        self._host_limits = {}
+
+    def _host_limit(self, ip):
+        if ip not in self._host_limits:
+            self._host_limits[ip] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[ip]
+
+    async def check_ping(self, ip):
+        """Run the system ping as an async subprocess and parse it like the blocking check"""
+        ping_cmd = build_ping_command(ip, self.ping_count, self.ping_timeout)
+        logger.debug(f"Running ping command: {' '.join(ping_cmd)}")
+        try:
+            async with self._ping_limit:
+                process = await asyncio.create_subprocess_exec(
+                    *ping_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                )
+                stdout, _ = await process.communicate()
+            output = stdout.decode(errors='replace')
+            logger.debug(f"Ping output for {ip}:\n{output}")
+            return parse_ping_output(output, process.returncode, self.ping_count)
+        except Exception as e:
+            logger.error(f"Error performing ping to {ip}: {e}")
+            return ping_error_result(str(e), self.ping_count)
+
+    async def _connect_once(self, ip, port):
+        """One TCP connection attempt; returns the connect time in milliseconds"""
+        async with self._global_limit, self._host_limit(ip):
+            start_time = time.time()
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout=self.port_timeout)
+            response_time = (time.time() - start_time) * 1000
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception as e:
+            logger.debug(f"Error closing socket: {e}")
+        return response_time
+
+    async def check_port(self, ip, port):
+        """Async equivalent of ConnectivityAuditor.check_port with the same retry semantics"""
+        retry_count = 0
+        last_error = None
+
+        while retry_count <= self.retries:
+            try:
+                response_time = await self._connect_once(ip, port)
+                logger.info(f"Port {port} on {ip} is open (response time: {response_time:.2f} ms)")
+                return {
+                    'port': port,
+                    'open': True,
+                    'response_time_ms': response_time,
+                    'error': None,
+                    'retries': retry_count
+                }
+            except socket.gaierror:
+                # DNS resolution error - no point in retrying
+                logger.info(f"DNS resolution error for {ip}:{port}")
+                return {
+                    'port': port,
+                    'open': False,
+                    'response_time_ms': None,
+                    'error': "DNS resolution failed",
+                    'retries': retry_count
+                }
+            except asyncio.TimeoutError:
+                last_error = "Connection timed out"
+            except OSError as e:
+                # connect_ex reported these as an errno, so they are retried like the blocking check
+                last_error = os.strerror(e.errno) if e.errno else str(e)
+            except Exception as e:
+                last_error = str(e)
+
+            logger.debug(f"Port {port} check failed on attempt {retry_count+1}/{self.retries+1}: {last_error}")
+            retry_count += 1
+            if retry_count <= self.retries:
+                await asyncio.sleep(self.retry_delay)
+
+        logger.info(f"Port {port} on {ip} is closed after {retry_count} attempts: {last_error}")
+        return {
+            'port': port,
+            'open': False,
+            'response_time_ms': None,
+            'error': last_error,
+            'retries': retry_count - 1
+        }
+
+    async def check_dns(self, hostname, expected_ip=None):
+        """Resolve hostname on the event loop's resolver"""
+        try:
+            info = await asyncio.get_running_loop().getaddrinfo(hostname, None)
+            return dns_result_from_addresses(hostname, [addr[4][0] for addr in info], expected_ip)
+        except Exception as e:
+            return dns_error_result(hostname, str(e))
+
+    async def probe_device(self, device):
+        """Run every check for one device concurrently; returns (ping, ports, dns)"""
+        ip = device['ip']
+        ping_task = self.check_ping(ip)
+        port_tasks = [self.check_port(ip, port) for port in device['check_ports']]
+        dns_task = self.check_dns(device['hostname'], ip) if device['dns_check'] else asyncio.sleep(0)
+        ping_result, dns_result, *port_results = await asyncio.gather(ping_task, dns_task, *port_tasks)
+        return ping_result, port_results, dns_result
+
+    async def probe_devices(self, devices):
+        """Probe all devices at once; results are returned in device order"""
+        self._global_limit = asyncio.Semaphore(self.max_concurrency)
+        self._ping_limit = asyncio.Semaphore(self.ping_concurrency)
+        self._host_limits = {}
+        results = await asyncio.gather(*(self.probe_device(device) for device in devices), return_exceptions=True)
+        for device, result in zip(devices, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error auditing {device['hostname']} ({device['ip']}): {result}")
+        return results
+
+    def run(self, devices):
+        """Blocking entry point for synchronous callers"""
+        return asyncio.run(self.probe_devices(devices))
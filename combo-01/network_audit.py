@@ -24,7 +24,7 @@ import platform
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Import core functionality
+# Import core functionality (audit_core puts the repository root on sys.path for the shared inventory_engine)
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     from audit_core import (
@@ -32,6 +32,8 @@ try:
         prompt_for_master_password, AuditResult, AuditReport,
         Fore, Style, colorama_available
     )
+    from session_broker import SessionBroker
+    from inventory_engine import load_inventory
 except ImportError as e:
     print(f"Error importing audit_core module: {e}")
     print("Make sure audit_core.py is in the same directory.")
@@ -60,6 +62,8 @@ class NetworkAuditTool:
         self.no_report = options.no_report if hasattr(options, 'no_report') else False
         self.master_password = None
         self.cred_manager = None
+        self.sequential = getattr(options, 'sequential', False)
+        self.session_broker = None  # One shared device session per router for the whole run
         
         # Set timestamp based on command line or generate a new one
         if hasattr(options, 'timestamp') and options.timestamp:
@@ -73,6 +77,7 @@ class NetworkAuditTool:
             self.timestamp = datetime.datetime.now()
         self.devices = []
         self.results = {}  # Results by audit type
+        self.module_status = {}  # Audit type -> whether its module completed
         self.connection_failures = 0
         self.fallback_activated = False
         
@@ -117,9 +122,19 @@ class NetworkAuditTool:
     
     def setup_credentials(self):
         """Set up secure credentials manager if needed"""
+        if self.cred_manager:
+            return True  # Handed in by the in-process runner (run_all_in_order.py)
+        
         if 'security' in self.audit_types or self.jump_host:
             # We need credential management for secure modules
             try:
+                # A parent runner (run_all_in_order.py) may already have derived the key
+                cred_manager = CredentialManager()
+                if cred_manager.initialize_from_parent():
+                    self.cred_manager = cred_manager
+                    logger.info("Credential manager initialized with the key from the parent process")
+                    return True
+                
                 # Prompt for master password
                 self.master_password = prompt_for_master_password()
                 
@@ -144,54 +159,51 @@ class NetworkAuditTool:
                 print(f"{Fore.RED}Error: CSV file not found: {csv_path}{Style.RESET_ALL}")
                 return False
             
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                # Read the first line to check the format
-                header = f.readline().strip()
-                f.seek(0)  # Reset file position
-                
-                # Check if this is routers01.csv format
-                is_routers01_format = 'management_ip' in header and 'model_name' in header
-                
+            # Parsed once and cached by mtime/content hash (see inventory_engine)
+            inventory = load_inventory(csv_path)
+            
+            # Check if this is routers01.csv format
+            is_routers01_format = inventory.has_columns('management_ip', 'model_name')
+            
+            if is_routers01_format:
+                logger.info(f"Detected routers01.csv format")
+                print(f"{Fore.GREEN}Detected routers01.csv format{Style.RESET_ALL}")
+            
+            for row in inventory.rows():
+                # For routers01.csv format
                 if is_routers01_format:
-                    logger.info(f"Detected routers01.csv format")
-                    print(f"{Fore.GREEN}Detected routers01.csv format{Style.RESET_ALL}")
-                
-                csv_reader = csv.DictReader(f)
-                for row in csv_reader:
-                    # For routers01.csv format
-                    if is_routers01_format:
-                        if 'hostname' not in row or 'management_ip' not in row:
-                            logger.warning(f"Skipping row in routers01.csv: missing required fields")
-                            continue
-                        
-                        # Add device with routers01.csv specific field mapping
-                        self.devices.append({
-                            'hostname': row['hostname'],
-                            'ip': row['management_ip'],
-                            'device_type': 'cisco_ios',
-                            'username': 'admin', 
-                            'password': 'cisco123',
-                            'secret': 'cisco123',
-                            'enable_password': 'cisco123',
-                            'model': row.get('model_name', 'Unknown'),
-                            'wan_ip': row.get('wan_ip', 'N/A')
-                        })
-                    # For standard format
-                    else:
-                        if 'hostname' not in row or 'ip' not in row:
-                            logger.warning(f"Skipping row in CSV: missing required fields")
-                            continue
-                        
-                        self.devices.append({
-                            'hostname': row['hostname'],
-                            'ip': row['ip'],
-                            'device_type': row.get('device_type', 'cisco_ios'),
-                            'username': row.get('username', 'admin'),
-                            'password': row.get('password', 'cisco123'),
-                            'secret': row.get('secret', 'cisco123'),
-                            'enable_password': row.get('enable_password', 'cisco123'),
-                            'model': row.get('model', 'Unknown')
-                        })
+                    if 'hostname' not in row or 'management_ip' not in row:
+                        logger.warning(f"Skipping row in routers01.csv: missing required fields")
+                        continue
+                    
+                    # Add device with routers01.csv specific field mapping
+                    self.devices.append({
+                        'hostname': row['hostname'],
+                        'ip': row['management_ip'],
+                        'device_type': 'cisco_ios',
+                        'username': 'admin', 
+                        'password': 'cisco123',
+                        'secret': 'cisco123',
+                        'enable_password': 'cisco123',
+                        'model': row.get('model_name', 'Unknown'),
+                        'wan_ip': row.get('wan_ip', 'N/A')
+                    })
+                # For standard format
+                else:
+                    if 'hostname' not in row or 'ip' not in row:
+                        logger.warning(f"Skipping row in CSV: missing required fields")
+                        continue
+                    
+                    self.devices.append({
+                        'hostname': row['hostname'],
+                        'ip': row['ip'],
+                        'device_type': row.get('device_type', 'cisco_ios'),
+                        'username': row.get('username', 'admin'),
+                        'password': row.get('password', 'cisco123'),
+                        'secret': row.get('secret', 'cisco123'),
+                        'enable_password': row.get('enable_password', 'cisco123'),
+                        'model': row.get('model', 'Unknown')
+                    })
             
             if not self.devices:
                 logger.warning(f"No valid devices found in {self.csv_file}")
@@ -264,7 +276,6 @@ class NetworkAuditTool:
         print(f"{Fore.CYAN}RUNNING CONNECTIVITY AUDIT{Style.RESET_ALL}")
         print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
         
-        original_test_mode = self.test_mode
         fallback_used = False
         
         try:
@@ -277,13 +288,13 @@ class NetworkAuditTool:
             auditor.timestamp = self.timestamp  # Use consistent timestamp
             
             # Run the audit
-            if not auditor.run_audit() and not self.test_mode and self.auto_fallback:
+            success = auditor.run_audit()
+            if not success and not self.test_mode and self.auto_fallback:
                 # If real mode failed and auto-fallback is enabled, try test mode
                 logger.warning("Connectivity audit failed with real connections, falling back to test mode")
                 print(f"\n{Fore.YELLOW}Warning: Connection failures detected. Falling back to test mode...{Style.RESET_ALL}")
                 
-                # Switch to test mode
-                self.test_mode = True
+                # Fall back to test mode for this module only
                 self.fallback_activated = True
                 fallback_used = True
                 
@@ -296,9 +307,8 @@ class NetworkAuditTool:
                 if not auditor.run_audit():
                     logger.error("Connectivity audit failed even in test mode")
                     print(f"{Fore.RED}Error: Connectivity audit failed even in test mode{Style.RESET_ALL}")
-                    self.test_mode = original_test_mode  # Restore original mode
                     return False
-            elif not auditor.run_audit():
+            elif not success:
                 # Failed without fallback
                 logger.error("Failed to run connectivity audit")
                 return False
@@ -328,9 +338,6 @@ class NetworkAuditTool:
             logger.error(f"Error running connectivity audit: {e}")
             print(f"{Fore.RED}Error running connectivity audit: {e}{Style.RESET_ALL}")
             return False
-        finally:
-            # Always restore original test mode setting
-            self.test_mode = original_test_mode
     
     def run_security_audit(self):
         """Run the security audit module"""
@@ -338,7 +345,6 @@ class NetworkAuditTool:
         print(f"{Fore.CYAN}RUNNING SECURITY AUDIT{Style.RESET_ALL}")
         print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
         
-        original_test_mode = self.test_mode
         fallback_used = False
         
         try:
@@ -361,7 +367,7 @@ class NetworkAuditTool:
             # First attempt with real connections if not in test mode
             for device in auditor.devices:
                 print(f"\n{Fore.CYAN}Auditing device: {device['hostname']} ({device['ip']}){Style.RESET_ALL}")
-                result = execute_all_phases(device, auditor.test_mode)
+                result = execute_all_phases(device, auditor.test_mode, self.session_broker)
                 
                 # Check if connectivity phase failed
                 if result.phases.get('connectivity', {}).get('status') == 'Failed':
@@ -374,8 +380,7 @@ class NetworkAuditTool:
                 logger.warning(f"Security audit had {connection_failures}/{len(auditor.devices)} connection failures, falling back to test mode")
                 print(f"\n{Fore.YELLOW}Warning: {connection_failures}/{len(auditor.devices)} connection failures detected. Falling back to test mode for security audit...{Style.RESET_ALL}")
                 
-                # Switch to test mode
-                self.test_mode = True
+                # Fall back to test mode for this module only
                 self.fallback_activated = True
                 fallback_used = True
                 
@@ -415,9 +420,6 @@ class NetworkAuditTool:
             logger.error(f"Error running security audit: {e}")
             print(f"{Fore.RED}Error running security audit: {e}{Style.RESET_ALL}")
             return False
-        finally:
-            # Always restore original test mode setting
-            self.test_mode = original_test_mode
     
     def run_telnet_audit(self):
         """Run the telnet audit module"""
@@ -425,7 +427,6 @@ class NetworkAuditTool:
         print(f"{Fore.CYAN}RUNNING TELNET AUDIT{Style.RESET_ALL}")
         print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
         
-        original_test_mode = self.test_mode
         fallback_used = False
         
         try:
@@ -433,7 +434,7 @@ class NetworkAuditTool:
             from telnet_audit import TelnetAuditor
             
             # First attempt with current test mode setting
-            auditor = TelnetAuditor(test_mode=self.test_mode, jump_host=self.jump_host)
+            auditor = TelnetAuditor(test_mode=self.test_mode, jump_host=self.jump_host, session_broker=self.session_broker)
             auditor.devices = self.devices.copy()
             auditor.timestamp = self.timestamp  # Use consistent timestamp
             
@@ -445,8 +446,7 @@ class NetworkAuditTool:
                 logger.warning("Telnet audit failed with real connections, falling back to test mode")
                 print(f"\n{Fore.YELLOW}Warning: Connection failures detected. Falling back to test mode for telnet audit...{Style.RESET_ALL}")
                 
-                # Switch to test mode
-                self.test_mode = True
+                # Fall back to test mode for this module only
                 self.fallback_activated = True
                 fallback_used = True
                 
@@ -461,7 +461,6 @@ class NetworkAuditTool:
                 if not success:
                     logger.error("Telnet audit failed even in test mode")
                     print(f"{Fore.RED}Error: Telnet audit failed even in test mode{Style.RESET_ALL}")
-                    self.test_mode = original_test_mode  # Restore original mode
                     return False
             elif not success:
                 # Failed without fallback
@@ -494,9 +493,6 @@ class NetworkAuditTool:
             logger.error(f"Error running telnet audit: {e}")
             print(f"{Fore.RED}Error running telnet audit: {e}{Style.RESET_ALL}")
             return False
-        finally:
-            # Always restore original test mode setting
-            self.test_mode = original_test_mode
     
     def generate_unified_report(self):
         """Generate a unified report combining all audit results"""
@@ -509,9 +505,10 @@ class NetworkAuditTool:
         print(f"{Fore.CYAN}GENERATING UNIFIED AUDIT REPORT{Style.RESET_ALL}")
         print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
         
-        # Combine all audit results
+        # Combine all audit results (in audit type order, whatever order the modules finished in)
         all_results = []
-        for audit_type, results in self.results.items():
+        for audit_type in self.audit_types:
+            results = self.results.get(audit_type)
             if results:
                 all_results.extend(results)
         
@@ -565,14 +562,35 @@ class NetworkAuditTool:
                 print(f"{Fore.RED}Failed to load devices. Exiting.{Style.RESET_ALL}")
                 return False
         
-        # Run selected audit modules
-        for audit_type in self.audit_types:
-            if audit_type == 'connectivity':
-                self.run_connectivity_audit()
-            elif audit_type == 'security':
-                self.run_security_audit()
-            elif audit_type == 'telnet':
-                self.run_telnet_audit()
+        # Security and telnet audits borrow one shared session per device instead of each logging in
+        if not self.test_mode:
+            self.session_broker = SessionBroker()
+        
+        audit_runners = {
+            'connectivity': self.run_connectivity_audit,
+            'security': self.run_security_audit,
+            'telnet': self.run_telnet_audit
+        }
+        
+        try:
+            if self.sequential:
+                for audit_type in self.audit_types:
+                    self.module_status[audit_type] = bool(audit_runners[audit_type]())
+            else:
+                # Modules run side by side; the broker's per-device lease keeps them off the
+                # same session at the same time, and connectivity never touches a session
+                with ThreadPoolExecutor(max_workers=len(self.audit_types)) as executor:
+                    futures = {executor.submit(audit_runners[audit_type]): audit_type for audit_type in self.audit_types}
+                    for future in as_completed(futures):
+                        try:
+                            self.module_status[futures[future]] = bool(future.result())
+                        except Exception as e:
+                            self.module_status[futures[future]] = False
+                            logger.error(f"Error running {futures[future]} audit: {e}")
+        finally:
+            if self.session_broker:
+                logger.info(f"Shared session broker made {self.session_broker.login_count} device logins")
+                self.session_broker.close_all()
         
         # Generate unified report
         self.generate_unified_report()
@@ -607,6 +625,8 @@ def main():
                         help="Use specified timestamp for report naming (for consistency across reports)")
     parser.add_argument("--no-report", action="store_true", 
                         help="Skip individual module reports and only generate the unified report")
+    parser.add_argument("--sequential", action="store_true",
+                        help="Run audit modules one after another instead of concurrently")
     
     args = parser.parse_args()
     
@@ -10,8 +10,15 @@ This script runs all the audit modules in the correct order:
 5. telnet_audit.py
 6. network_audit.py (combines all previous modules)
 
+By default the modules run inside this process, sharing one inventory load,
+one credential manager and one set of device sessions; --subprocess runs each
+script in its own interpreter as before, and --benchmark compares the
+start-up cost of the two modes.
+
 Usage:
     python run_all_in_order.py --test
+    python run_all_in_order.py --test --subprocess
+    python run_all_in_order.py --benchmark
     
 Cross-platform compatible with Windows and Ubuntu.
 """
@@ -23,9 +30,24 @@ import subprocess
 import argparse
 import platform
 import datetime
+import importlib
+import statistics
+from contextlib import nullcontext
 from pathlib import Path
 
-def run_script(script_name, args=None):
+# Import core functionality
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+try:
+    from audit_core import CredentialManager, prompt_for_master_password
+except ImportError as e:
+    print(f"Error importing audit_core module: {e}")
+    print("Make sure audit_core.py is in the same directory.")
+    sys.exit(1)
+
+# Auditor modules network_audit.py drives; imported once by the in-process runner
+AUDIT_MODULES = ["connectivity_audit", "security_audit", "telnet_audit"]
+
+def run_script(script_name, args=None, extra_env=None, pass_fds=()):
     """Run a Python script and return its output and exit code"""
     print(f"\n{'='*70}")
     print(f"RUNNING: {script_name}")
@@ -35,11 +57,14 @@ def run_script(script_name, args=None):
     if args:
         cmd.extend(args)
     
+    env = dict(os.environ, **extra_env) if extra_env else None
     process = subprocess.Popen(
         cmd, 
         stdout=subprocess.PIPE, 
         stderr=subprocess.PIPE,
-        text=True
+        text=True,
+        env=env,
+        pass_fds=pass_fds
     )
     
     stdout, stderr = process.communicate()
@@ -56,9 +81,82 @@ def run_script(script_name, args=None):
     
     return process.returncode == 0
 
+def run_in_process(test_mode, csv_path, timestamp, cred_manager=None):
+    """
+    Run every audit module once inside this interpreter
+    The inventory is parsed once and the credential manager and device sessions are
+    shared; connectivity, security and telnet audits run side by side (see NetworkAuditTool).
+    Returns a dict of module name -> "SUCCESS"/"FAILED".
+    """
+    print(f"\n{'='*70}")
+    print(f"RUNNING IN-PROCESS: {', '.join(AUDIT_MODULES)}, network_audit")
+    print(f"{'='*70}\n")
+    
+    # Import the auditor modules up front so each is loaded once, before any thread needs it;
+    # network_audit goes last because every module points the shared logger at its own file
+    for module_name in AUDIT_MODULES:
+        importlib.import_module(module_name)
+    from audit_core import ensure_directories
+    from network_audit import NetworkAuditTool
+    
+    ensure_directories()
+    options = argparse.Namespace(
+        all=True, connectivity=False, security=False, telnet=False,
+        test=test_mode, csv=str(csv_path), jump_host=None, auto_fallback=True,
+        timestamp=timestamp, no_report=False, sequential=False
+    )
+    audit_tool = NetworkAuditTool(options)
+    audit_tool.cred_manager = cred_manager
+    completed = audit_tool.run_all_audits()
+    
+    results = {f"{audit_type}_audit": "SUCCESS" if audit_tool.module_status.get(audit_type) else "FAILED"
+               for audit_type in audit_tool.audit_types}
+    results["network_audit (unified report)"] = "SUCCESS" if completed else "FAILED"
+    return results
+
+def benchmark_startup(modules=None, repeat=3, cwd=None):
+    """
+    Compare interpreter start-up cost of the two modes, without touching any device
+    Subprocess mode starts one interpreter per module and imports it there; in-process
+    mode starts one interpreter and imports all of them. Returns median seconds per mode.
+    """
+    modules = list(modules or ["audit_core"] + AUDIT_MODULES + ["network_audit"])
+    cwd = cwd or Path(__file__).parent.absolute()
+    
+    def timed(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=cwd, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return time.perf_counter() - start
+    
+    subprocess_runs, in_process_runs = [], []
+    for _ in range(repeat):
+        subprocess_runs.append(sum(timed(f"import {module}") for module in modules))
+        in_process_runs.append(timed("import " + ", ".join(modules)))
+    
+    return {
+        'modules': modules,
+        'subprocess': statistics.median(subprocess_runs),
+        'in_process': statistics.median(in_process_runs)
+    }
+
+def print_benchmark(result):
+    """Print the start-up benchmark table"""
+    print("\nSTART-UP BENCHMARK (median, interpreter start + imports):")
+    print("="*70)
+    print(f"{'subprocess mode'.ljust(30)} {result['subprocess']:>10.3f}s  ({len(result['modules'])} interpreters)")
+    print(f"{'in-process mode'.ljust(30)} {result['in_process']:>10.3f}s  (1 interpreter)")
+    if result['in_process'] > 0:
+        print(f"{'speed-up'.ljust(30)} {result['subprocess'] / result['in_process']:>10.1f}x")
+    print("="*70)
+
 def main():
     parser = argparse.ArgumentParser(description="Run all audit modules in order")
     parser.add_argument("--test", action="store_true", help="Run in test mode")
+    parser.add_argument("--subprocess", action="store_true",
+                        help="Run each script in its own Python process (the pre-3.11 behaviour)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Measure start-up time of subprocess vs in-process mode and exit")
     args = parser.parse_args()
     
     test_arg = ["--test"] if args.test else []
@@ -69,6 +167,10 @@ def main():
     # Change to the script directory
     os.chdir(script_dir)
     
+    if args.benchmark:
+        print_benchmark(benchmark_startup(cwd=script_dir))
+        return
+    
     # Create necessary directories if they don't exist using pathlib
     required_dirs = ["logs", "reports", "data", "config"]
     for dir_name in required_dirs:
@@ -96,11 +198,26 @@ def main():
         ("network_audit.py", test_arg + csv_arg + ["-a", "--timestamp", current_time])
     ]
     
-    # Run each script in order
-    results = {}
-    for script, script_args in scripts:
-        success = run_script(script, script_args)
-        results[script] = "SUCCESS" if success else "FAILED"
+    # Ask for the master password once and derive the key here; network_audit.py
+    # receives the key over an inherited pipe instead of prompting and deriving again
+    cred_manager = None
+    try:
+        cred_manager = CredentialManager(prompt_for_master_password())
+    except ImportError as e:
+        print(f"Credential hand-off disabled: {e}")
+    
+    if not args.subprocess:
+        results = run_in_process(args.test, csv_path, current_time, cred_manager)
+    else:
+        # Run each script in order
+        results = {}
+        with (cred_manager.key_handoff() if cred_manager else nullcontext(({}, ()))) as (key_env, key_fds):
+            for script, script_args in scripts:
+                if script == "network_audit.py":
+                    success = run_script(script, script_args, extra_env=key_env, pass_fds=key_fds)
+                else:
+                    success = run_script(script, script_args)
+                results[script] = "SUCCESS" if success else "FAILED"
     
     # Print summary
     print("\nEXECUTION SUMMARY:")
@@ -16,7 +16,6 @@ Cross-platform compatible with Windows and Ubuntu.
 
 import os
 import sys
-import sqlite3
 import csv
 import time
 import datetime
@@ -27,14 +26,17 @@ import platform
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Import core functionality
+# Import core functionality (sqlite_batch_writer and inventory_engine are shared from the repository root)
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 try:
     from audit_core import (
         VERSION, ensure_directories, setup_logging, CredentialManager,
         prompt_for_master_password, AuditResult, AuditReport,
         Fore, Style, colorama_available, DEFAULT_DB_NAME
     )
+    from sqlite_batch_writer import get_writer, migrate_database
+    from inventory_engine import load_inventory
 except ImportError as e:
     print(f"Error importing audit_core module: {e}")
     print("Make sure audit_core.py is in the same directory.")
@@ -59,60 +61,79 @@ if not logger:
     print("Failed to set up logging. Exiting.")
     sys.exit(1)
 
+AUDIT_DB_SCHEMA = [
+    # audit_runs table
+    '''
+    CREATE TABLE IF NOT EXISTS audit_runs (
+        id TEXT PRIMARY KEY,
+        timestamp TEXT,
+        audit_type TEXT,
+        description TEXT
+    )
+    ''',
+    # audit_results table
+    '''
+    CREATE TABLE IF NOT EXISTS audit_results (
+        id TEXT PRIMARY KEY,
+        audit_run_id TEXT,
+        device_hostname TEXT,
+        device_ip TEXT,
+        timestamp TEXT,
+        phase_name TEXT,
+        status TEXT,
+        details TEXT,
+        error TEXT,
+        FOREIGN KEY (audit_run_id) REFERENCES audit_runs (id)
+    )
+    ''',
+    # audit_recommendations table
+    '''
+    CREATE TABLE IF NOT EXISTS audit_recommendations (
+        id TEXT PRIMARY KEY,
+        audit_result_id TEXT,
+        recommendation TEXT,
+        severity TEXT,
+        reference TEXT,
+        FOREIGN KEY (audit_result_id) REFERENCES audit_results (id)
+    )
+    ''',
+    # Indexes (created in place on existing databases)
+    "CREATE INDEX IF NOT EXISTS idx_audit_results_run_device_phase ON audit_results (audit_run_id, device_hostname, phase_name)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_recommendations_result ON audit_recommendations (audit_result_id)"
+]
+
+INSERT_RESULT_SQL = '''
+    INSERT INTO audit_results 
+    (id, audit_run_id, device_hostname, device_ip, timestamp, 
+    phase_name, status, details, error)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_RECOMMENDATION_SQL = '''
+    INSERT INTO audit_recommendations
+    (id, audit_result_id, recommendation, severity, reference)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+def get_db_path():
+    """Path of the audit results database using pathlib for cross-platform compatibility"""
+    return Path(__file__).parent.absolute() / 'data' / DEFAULT_DB_NAME
+
+def new_row_id():
+    """
+    Time-ordered 32-hex-digit key. Keeps the existing TEXT primary keys (and the rows
+    already stored under uuid4 keys) valid while new rows append to the end of the index
+    instead of landing on random B-tree pages.
+    """
+    return f"{time.time_ns():016x}{uuid.uuid4().hex[:16]}"
+
 def initialize_database():
-    """Initialize the SQLite database for storing audit results using pathlib for cross-platform compatibility"""
-    # Use pathlib for cross-platform path handling
-    script_dir = Path(__file__).parent.absolute()
-    data_dir = script_dir / 'data'
-    data_dir.mkdir(exist_ok=True, parents=True)  # Ensure data directory exists
-    db_path = data_dir / DEFAULT_DB_NAME
+    """Initialize (or migrate in place) the SQLite database for storing audit results in WAL mode"""
+    db_path = get_db_path()
+    db_path.parent.mkdir(exist_ok=True, parents=True)  # Ensure data directory exists
     
     try:
-        # Connect to database (creates it if it doesn't exist)
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
-        
-        # Create audit_runs table if it doesn't exist
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS audit_runs (
-            id TEXT PRIMARY KEY,
-            timestamp TEXT,
-            audit_type TEXT,
-            description TEXT
-        )
-        ''')
-        
-        # Create audit_results table if it doesn't exist
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS audit_results (
-            id TEXT PRIMARY KEY,
-            audit_run_id TEXT,
-            device_hostname TEXT,
-            device_ip TEXT,
-            timestamp TEXT,
-            phase_name TEXT,
-            status TEXT,
-            details TEXT,
-            error TEXT,
-            FOREIGN KEY (audit_run_id) REFERENCES audit_runs (id)
-        )
-        ''')
-        
-        # Create audit_recommendations table if it doesn't exist
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS audit_recommendations (
-            id TEXT PRIMARY KEY,
-            audit_result_id TEXT,
-            recommendation TEXT,
-            severity TEXT,
-            reference TEXT,
-            FOREIGN KEY (audit_result_id) REFERENCES audit_results (id)
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
-        
+        migrate_database(str(db_path), AUDIT_DB_SCHEMA)
         logger.info(f"Database initialized: {db_path}")
         return True
         
@@ -122,57 +143,35 @@ def initialize_database():
         return False
 
 def log_to_database(audit_run_id, result):
-    """Log audit results to the database using pathlib for cross-platform compatibility"""
-    # Use pathlib for cross-platform path handling
-    script_dir = Path(__file__).parent.absolute()
-    db_path = script_dir / 'data' / DEFAULT_DB_NAME
-    
+    """Queue audit results for the batched database writer"""
     try:
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
+        writer = get_writer(str(get_db_path()))
         
         # Insert results for each phase
         for phase_name, phase_data in result.phases.items():
-            result_id = str(uuid.uuid4())
-            cursor.execute(
-                '''
-                INSERT INTO audit_results 
-                (id, audit_run_id, device_hostname, device_ip, timestamp, 
-                phase_name, status, details, error)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''',
-                (
-                    result_id,
-                    audit_run_id,
-                    result.device_info.get('hostname', 'Unknown'),
-                    result.device_info.get('ip', result.device_info.get('host', 'Unknown')),
-                    result.timestamp.isoformat(),
-                    phase_name,
-                    phase_data.get('status', 'Unknown'),
-                    json.dumps(phase_data.get('details', {})),
-                    phase_data.get('error', None)
-                )
-            )
+            result_id = new_row_id()
+            writer.submit(INSERT_RESULT_SQL, (
+                result_id,
+                audit_run_id,
+                result.device_info.get('hostname', 'Unknown'),
+                result.device_info.get('ip', result.device_info.get('host', 'Unknown')),
+                result.timestamp.isoformat(),
+                phase_name,
+                phase_data.get('status', 'Unknown'),
+                json.dumps(phase_data.get('details', {})),
+                phase_data.get('error', None)
+            ))
             
             # Insert recommendations related to this result
             for recommendation in result.recommendations:
-                cursor.execute(
-                    '''
-                    INSERT INTO audit_recommendations
-                    (id, audit_result_id, recommendation, severity, reference)
-                    VALUES (?, ?, ?, ?, ?)
-                    ''',
-                    (
-                        str(uuid.uuid4()),
-                        result_id,
-                        recommendation.get('text', ''),
-                        recommendation.get('severity', 'medium'),
-                        recommendation.get('reference', None)
-                    )
-                )
+                writer.submit(INSERT_RECOMMENDATION_SQL, (
+                    new_row_id(),
+                    result_id,
+                    recommendation.get('text', ''),
+                    recommendation.get('severity', 'medium'),
+                    recommendation.get('reference', None)
+                ))
         
-        conn.commit()
-        conn.close()
         return True
         
     except Exception as e:
@@ -220,54 +219,51 @@ class SecurityAuditor:
                 print(f"{Fore.RED}Error: CSV file not found: {csv_file}{Style.RESET_ALL}")
                 return False
             
-            with open(csv_file, 'r') as f:
-                # Read the first line to check the format
-                header = f.readline().strip()
-                f.seek(0)  # Reset file position
-                
-                # Check if this is routers01.csv format
-                is_routers01_format = 'management_ip' in header and 'model_name' in header
-                
+            # Parsed once and cached by mtime/content hash (see inventory_engine)
+            inventory = load_inventory(csv_file)
+            
+            # Check if this is routers01.csv format
+            is_routers01_format = inventory.has_columns('management_ip', 'model_name')
+            
+            if is_routers01_format:
+                logger.info(f"Detected routers01.csv format")
+                print(f"{Fore.GREEN}Detected routers01.csv format{Style.RESET_ALL}")
+            
+            for row in inventory.rows():
+                # For routers01.csv format
                 if is_routers01_format:
-                    logger.info(f"Detected routers01.csv format")
-                    print(f"{Fore.GREEN}Detected routers01.csv format{Style.RESET_ALL}")
-                
-                csv_reader = csv.DictReader(f)
-                for row in csv_reader:
-                    # For routers01.csv format
-                    if is_routers01_format:
-                        if 'hostname' not in row or 'management_ip' not in row:
-                            logger.warning(f"Skipping row in routers01.csv: missing required fields")
-                            continue
-                        
-                        # Add device with routers01.csv specific field mapping
-                        self.devices.append({
-                            'hostname': row['hostname'],
-                            'ip': row['management_ip'],
-                            'device_type': 'cisco_ios',
-                            'username': 'admin', 
-                            'password': 'cisco123',
-                            'secret': 'cisco123',
-                            'enable_password': 'cisco123',
-                            'model': row.get('model_name', 'Unknown'),
-                            'wan_ip': row.get('wan_ip', 'N/A')
-                        })
-                    # For standard format
-                    else:
-                        if 'hostname' not in row or 'ip' not in row:
-                            logger.warning(f"Skipping row in CSV: missing required fields")
-                            continue
-                        
-                        self.devices.append({
-                            'hostname': row['hostname'],
-                            'ip': row['ip'],
-                            'device_type': row.get('device_type', 'cisco_ios'),
-                            'username': row.get('username', 'admin'),
-                            'password': row.get('password', 'cisco123'),
-                            'secret': row.get('secret', 'cisco123'),
-                            'enable_password': row.get('enable_password', 'cisco123'),
-                            'model': row.get('model', 'Unknown')
-                        })
+                    if 'hostname' not in row or 'management_ip' not in row:
+                        logger.warning(f"Skipping row in routers01.csv: missing required fields")
+                        continue
+                    
+                    # Add device with routers01.csv specific field mapping
+                    self.devices.append({
+                        'hostname': row['hostname'],
+                        'ip': row['management_ip'],
+                        'device_type': 'cisco_ios',
+                        'username': 'admin', 
+                        'password': 'cisco123',
+                        'secret': 'cisco123',
+                        'enable_password': 'cisco123',
+                        'model': row.get('model_name', 'Unknown'),
+                        'wan_ip': row.get('wan_ip', 'N/A')
+                    })
+                # For standard format
+                else:
+                    if 'hostname' not in row or 'ip' not in row:
+                        logger.warning(f"Skipping row in CSV: missing required fields")
+                        continue
+                    
+                    self.devices.append({
+                        'hostname': row['hostname'],
+                        'ip': row['ip'],
+                        'device_type': row.get('device_type', 'cisco_ios'),
+                        'username': row.get('username', 'admin'),
+                        'password': row.get('password', 'cisco123'),
+                        'secret': row.get('secret', 'cisco123'),
+                        'enable_password': row.get('enable_password', 'cisco123'),
+                        'model': row.get('model', 'Unknown')
+                    })
             
             if not self.devices:
                 logger.warning(f"No valid devices found in {csv_file}")
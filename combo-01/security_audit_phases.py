@@ -483,8 +483,18 @@ def execute_phase5_reporting(device, phase_results, test_mode=False):
     return (True, report_data, details, None)
 
 # Main function to execute all 5 phases for a device
-def execute_all_phases(device, test_mode=False):
-    """Execute all 5 phases of the security audit for a single device"""
+def execute_all_phases(device, test_mode=False, session_broker=None):
+    """
+    Execute all 5 phases of the security audit for a single device
+    With a session_broker, the device's run-wide shared session is borrowed
+    for phases 2-3 instead of logging in again
+    """
+    if session_broker and not test_mode:
+        with session_broker.lease(device) as shared_session:
+            return _execute_all_phases(device, test_mode, shared_session)
+    return _execute_all_phases(device, test_mode)
+
+def _execute_all_phases(device, test_mode=False, shared_session=None):
     audit_result = AuditResult(
         device_info={
             'hostname': device.get('hostname'),
@@ -517,7 +527,16 @@ def execute_all_phases(device, test_mode=False):
     # Phase 2: Authentication Testing (only if connectivity successful)
     if success:
         print(f"  {Fore.CYAN}⏳ Phase 2: Authentication Testing{Style.RESET_ALL}")
-        success, connection, details, error = execute_phase2_authentication(device, None, test_mode)
+        if shared_session is not None and not shared_session[0]:
+            # The broker's login already failed for this run; report it without retrying
+            success, connection, details, error = (False, None, {
+                'method': 'SSH authentication',
+                'protocol': 'SSH',
+                'username': device.get('username')
+            }, shared_session[1])
+        else:
+            shared_connection = shared_session[1] if shared_session else None
+            success, connection, details, error = execute_phase2_authentication(device, shared_connection, test_mode)
         phase_results['authentication'] = (success, connection, details, error)
         
         audit_result.add_phase_result(
@@ -637,8 +656,8 @@ def execute_all_phases(device, test_mode=False):
     else:
         print(f"  {Fore.RED}✗ Phase 5: Reporting failed: {error}{Style.RESET_ALL}")
     
-    # Close connection if it was opened
-    if connection and not test_mode:
+    # Close connection if it was opened here (shared sessions are closed by the broker)
+    if connection and not test_mode and shared_session is None:
         try:
             connection.disconnect()
         except:
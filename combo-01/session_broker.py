@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Network Audit Tool - Device Session Broker (v3.11)
+
+Opens one authenticated SSH session per device per audit run and lends it
+to every audit module that needs it (security, telnet), instead of each
+module logging in to every router on its own.
+
+A lease holds the device's lock for as long as the borrower uses the session,
+so two modules never interleave commands on one Netmiko connection, while
+different devices are still worked on in parallel.
+"""
+
+import threading
+import logging
+from contextlib import contextmanager
+
+# Import netmiko for device connections
+try:
+    from netmiko import ConnectHandler
+    from netmiko.exceptions import NetmikoTimeoutException, NetmikoAuthenticationException
+    netmiko_available = True
+except ImportError:
+    netmiko_available = False
+
+logger = logging.getLogger("network_audit")
+
+ENABLE_DEVICE_TYPES = ['cisco_ios', 'cisco_xe', 'cisco_xr', 'cisco_nxos']
+
+def connect_device(device):
+    """
+    Open an authenticated Netmiko session to a device
+    Returns a tuple of (success, connection or error message)
+    """
+    if not netmiko_available:
+        return False, "Netmiko package not available"
+
+    device_params = {
+        'device_type': device.get('device_type', 'cisco_ios'),
+        'ip': device.get('ip'),
+        'username': device.get('username'),
+        'password': device.get('password'),
+        'secret': device.get('secret'),
+        'port': 22,
+        'timeout': 10
+    }
+
+    try:
+        conn = ConnectHandler(**device_params)
+
+        # Enter enable mode if needed
+        if device.get('device_type') in ENABLE_DEVICE_TYPES:
+            conn.enable()
+
+        return True, conn
+    except NetmikoTimeoutException:
+        return False, "Connection timed out"
+    except NetmikoAuthenticationException:
+        return False, "Authentication failed"
+    except Exception as e:
+        return False, str(e)
+
+class SessionBroker:
+    """Run-wide cache of one device session per device, lent out under a per-device lock"""
+
+    def __init__(self, connect_func=connect_device):
+        self.connect_func = connect_func
+        self._sessions = {}      # device key -> (success, connection or error)
+        self._locks = {}         # device key -> lock held by the current borrower
+        self._lock = threading.Lock()
+        self.login_count = 0
+
+    @staticmethod
+    def _device_key(device):
+        return device.get('ip') or device.get('hostname')
+
+    def _device_lock(self, key):
+        with self._lock:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def _session_usable(self, entry):
+        success, conn = entry
+        if not success:
+            return True  # Failed logins are cached too, so a dead router costs one attempt per run
+        try:
+            return conn.is_alive()
+        except Exception:
+            return False
+
+    @contextmanager
+    def lease(self, device):
+        """
+        Borrow the device's session for the duration of the with-block
+        Yields a tuple of (success, connection or error message); the broker keeps ownership
+        """
+        key = self._device_key(device)
+        with self._device_lock(key):
+            entry = self._sessions.get(key)
+            if entry is None or not self._session_usable(entry):
+                if entry is not None:
+                    logger.info(f"Session to {device.get('hostname')} was lost, reconnecting")
+                self.login_count += 1
+                entry = self.connect_func(device)
+                self._sessions[key] = entry
+                if entry[0]:
+                    logger.info(f"Opened shared session to {device.get('hostname')} ({device.get('ip')})")
+                else:
+                    logger.warning(f"Shared session to {device.get('hostname')} failed: {entry[1]}")
+            yield entry
+
+    def close_all(self):
+        """Disconnect every session opened during the run"""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for success, conn in sessions.values():
+            if success and conn is not None:
+                try:
+                    conn.disconnect()
+                except Exception as e:
+                    logger.debug(f"Error closing shared session: {e}")
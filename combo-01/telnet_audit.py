@@ -24,7 +24,7 @@ import platform
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Import core functionality
+# Import core functionality (audit_core puts the repository root on sys.path for the shared inventory_engine)
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     from audit_core import (
@@ -32,6 +32,7 @@ try:
         prompt_for_master_password, AuditResult, AuditReport,
         Fore, Style, colorama_available
     )
+    from inventory_engine import load_inventory
 except ImportError as e:
     print(f"Error importing audit_core module: {e}")
     print("Make sure audit_core.py is in the same directory.")
@@ -59,7 +60,7 @@ if not logger:
 class TelnetAuditor:
     """Handles telnet vulnerability auditing for network devices"""
     
-    def __init__(self, test_mode=False, jump_host=None):
+    def __init__(self, test_mode=False, jump_host=None, session_broker=None):
         """Initialize the telnet auditor"""
         self.test_mode = test_mode
         self.devices = []
@@ -67,6 +68,7 @@ class TelnetAuditor:
         self.timestamp = datetime.datetime.now()
         self.jump_host = jump_host
         self.jump_conn = None
+        self.session_broker = session_broker  # Run-wide shared sessions (see session_broker.py)
         
         # Print banner
         self.print_banner()
@@ -91,52 +93,49 @@ class TelnetAuditor:
                 print(f"{Fore.RED}Error: CSV file not found: {csv_file}{Style.RESET_ALL}")
                 return False
             
-            with open(csv_file, 'r') as f:
-                # Read the first line to check the format
-                header = f.readline().strip()
-                f.seek(0)  # Reset file position
-                
-                # Check if this is routers01.csv format
-                is_routers01_format = 'management_ip' in header and 'model_name' in header
-                
+            # Parsed once and cached by mtime/content hash (see inventory_engine)
+            inventory = load_inventory(csv_file)
+            
+            # Check if this is routers01.csv format
+            is_routers01_format = inventory.has_columns('management_ip', 'model_name')
+            
+            if is_routers01_format:
+                logger.info(f"Detected routers01.csv format")
+                print(f"{Fore.GREEN}Detected routers01.csv format{Style.RESET_ALL}")
+            
+            for row in inventory.rows():
+                # For routers01.csv format
                 if is_routers01_format:
-                    logger.info(f"Detected routers01.csv format")
-                    print(f"{Fore.GREEN}Detected routers01.csv format{Style.RESET_ALL}")
-                
-                csv_reader = csv.DictReader(f)
-                for row in csv_reader:
-                    # For routers01.csv format
-                    if is_routers01_format:
-                        if 'hostname' not in row or 'management_ip' not in row:
-                            logger.warning(f"Skipping row in routers01.csv: missing required fields")
-                            continue
-                        
-                        # Add device with routers01.csv specific field mapping
-                        self.devices.append({
-                            'hostname': row['hostname'],
-                            'ip': row['management_ip'],
-                            'device_type': 'cisco_ios',
-                            'username': 'admin', 
-                            'password': 'cisco123',
-                            'secret': 'cisco123',
-                            'model': row.get('model_name', 'Unknown'),
-                            'wan_ip': row.get('wan_ip', 'N/A')
-                        })
-                    # For standard format
-                    else:
-                        if 'hostname' not in row or 'ip' not in row:
-                            logger.warning(f"Skipping row in CSV: missing required fields")
-                            continue
-                        
-                        self.devices.append({
-                            'hostname': row['hostname'],
-                            'ip': row['ip'],
-                            'device_type': row.get('device_type', 'cisco_ios'),
-                            'username': row.get('username', 'admin'),
-                            'password': row.get('password', 'cisco123'),
-                            'secret': row.get('secret', 'cisco123'),
-                            'model': row.get('model', 'Unknown')
-                        })
+                    if 'hostname' not in row or 'management_ip' not in row:
+                        logger.warning(f"Skipping row in routers01.csv: missing required fields")
+                        continue
+                    
+                    # Add device with routers01.csv specific field mapping
+                    self.devices.append({
+                        'hostname': row['hostname'],
+                        'ip': row['management_ip'],
+                        'device_type': 'cisco_ios',
+                        'username': 'admin', 
+                        'password': 'cisco123',
+                        'secret': 'cisco123',
+                        'model': row.get('model_name', 'Unknown'),
+                        'wan_ip': row.get('wan_ip', 'N/A')
+                    })
+                # For standard format
+                else:
+                    if 'hostname' not in row or 'ip' not in row:
+                        logger.warning(f"Skipping row in CSV: missing required fields")
+                        continue
+                    
+                    self.devices.append({
+                        'hostname': row['hostname'],
+                        'ip': row['ip'],
+                        'device_type': row.get('device_type', 'cisco_ios'),
+                        'username': row.get('username', 'admin'),
+                        'password': row.get('password', 'cisco123'),
+                        'secret': row.get('secret', 'cisco123'),
+                        'model': row.get('model', 'Unknown')
+                    })
             
             if not self.devices:
                 logger.warning(f"No valid devices found in {csv_file}")
@@ -248,6 +247,12 @@ class TelnetAuditor:
     
     def audit_device_telnet(self, device):
         """Audit a single device for telnet vulnerabilities"""
+        if self.session_broker and not self.test_mode:
+            with self.session_broker.lease(device) as shared_session:
+                return self._audit_device_telnet(device, shared_session)
+        return self._audit_device_telnet(device)
+    
+    def _audit_device_telnet(self, device, shared_session=None):
         hostname = device['hostname']
         ip = device['ip']
         
@@ -273,7 +278,7 @@ class TelnetAuditor:
             conn_error = None if conn_success else "Connection refused"
             connection = None  # No actual connection in test mode
         else:
-            conn_success, conn_result = self.connect_to_device(device)
+            conn_success, conn_result = shared_session or self.connect_to_device(device)
             if conn_success:
                 connection = conn_result
                 conn_error = None
@@ -499,8 +504,8 @@ class TelnetAuditor:
         else:
             print(f"  {Fore.GREEN}✓ Telnet port (23) is not accessible{Style.RESET_ALL}")
         
-        # Close connection if we opened one
-        if connection and not self.test_mode:
+        # Close connection if we opened one (shared sessions are closed by the broker)
+        if connection and not self.test_mode and shared_session is None:
             try:
                 connection.disconnect()
             except:
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the asyncio connectivity engine
+"""
+
+import asyncio
+import errno
+import os
+import socket
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from connectivity_engine import AsyncConnectivityEngine, parse_ping_output
+
+LINUX_PING_OUTPUT = """PING 10.0.0.1 (10.0.0.1) 56(84) bytes of data.
+64 bytes from 10.0.0.1: icmp_seq=1 ttl=255 time=1.52 ms
+64 bytes from 10.0.0.1: icmp_seq=2 ttl=255 time=1.31 ms
+
+--- 10.0.0.1 ping statistics ---
+4 packets transmitted, 3 received, 25% packet loss, time 3004ms
+rtt min/avg/max/mdev = 1.310/1.415/1.520/0.105 ms
+"""
+
+WINDOWS_PING_OUTPUT = """Reply from 10.0.0.1: bytes=32 time=2ms TTL=255
+Ping statistics for 10.0.0.1:
+    Packets: Sent = 4, Received = 4, Lost = 0 (0% loss),
+Approximate round trip times in milli-seconds:
+    Minimum = 1ms, Maximum = 3ms, Average = 2ms
+"""
+
+def closed_port():
+    """A local port with nothing listening on it"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class TestPingParsing(unittest.TestCase):
+    """Ping output parsing shared by the blocking and async checks"""
+
+    def test_linux_output(self):
+        result = parse_ping_output(LINUX_PING_OUTPUT, 0, platform_system="linux")
+        self.assertEqual((result['packets_sent'], result['packets_received']), (4, 3))
+        self.assertEqual(result['packet_loss_percent'], 25.0)
+        self.assertEqual((result['rtt_min_ms'], result['rtt_avg_ms'], result['rtt_max_ms']), (1.31, 1.415, 1.52))
+        self.assertEqual(result['ttl'], 255)
+
+    def test_windows_output(self):
+        result = parse_ping_output(WINDOWS_PING_OUTPUT, 0, platform_system="windows")
+        self.assertEqual(result['packet_loss_percent'], 0)
+        self.assertEqual((result['rtt_min_ms'], result['rtt_avg_ms'], result['rtt_max_ms']), (1.0, 2.0, 3.0))
+        self.assertEqual(result['ttl'], 255)
+
+class TestAsyncConnectivityEngine(unittest.TestCase):
+    """Test cases for AsyncConnectivityEngine"""
+
+    def setUp(self):
+        self.server = socket.socket()
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(64)
+        self.open_port = self.server.getsockname()[1]
+
+    def tearDown(self):
+        self.server.close()
+
+    def _probe(self, engine, devices):
+        with patch.object(AsyncConnectivityEngine, "check_ping", side_effect=self._fake_ping):
+            return engine.run(devices)
+
+    async def _fake_ping(self, ip):
+        return parse_ping_output(LINUX_PING_OUTPUT, 0, platform_system="linux")
+
+    def test_open_and_closed_ports(self):
+        """Open ports succeed first time; closed ports are retried like the blocking check"""
+        engine = AsyncConnectivityEngine(retries=2, retry_delay=0)
+        refused = closed_port()
+        device = {'hostname': 'localhost', 'ip': '127.0.0.1', 'check_ports': [self.open_port, refused], 'dns_check': False}
+
+        (ping_result, port_results, dns_result), = self._probe(engine, [device])
+
+        self.assertTrue(ping_result['success'])
+        self.assertIsNone(dns_result)
+        self.assertTrue(port_results[0]['open'])
+        self.assertEqual(port_results[0]['retries'], 0)
+        self.assertFalse(port_results[1]['open'])
+        self.assertEqual(port_results[1]['error'], os.strerror(errno.ECONNREFUSED))
+        self.assertEqual(port_results[1]['retries'], 2)
+
+    def test_dns_resolution(self):
+        """Names are resolved on the event loop with the blocking check's result shape"""
+        engine = AsyncConnectivityEngine()
+        result = asyncio.run(engine.check_dns('localhost', '127.0.0.1'))
+        self.assertTrue(result['resolved'])
+        self.assertTrue(result['matches_expected'])
+
+    def test_results_in_device_order(self):
+        """Results line up with the device list regardless of completion order"""
+        engine = AsyncConnectivityEngine(retry_delay=0)
+        devices = [{'hostname': f'd{i}', 'ip': '127.0.0.1', 'check_ports': [self.open_port], 'dns_check': False}
+                   for i in range(50)]
+        results = self._probe(engine, devices)
+        self.assertEqual(len(results), 50)
+        self.assertTrue(all(r[1][0]['open'] for r in results))
+
+    def test_per_host_limit(self):
+        """No more than per_host_limit connections are attempted against one host at a time"""
+        engine = AsyncConnectivityEngine(per_host_limit=2, retry_delay=0)
+        active = {'now': 0, 'peak': 0}
+        real_open_connection = asyncio.open_connection
+
+        async def counting_open_connection(*args, **kwargs):
+            active['now'] += 1
+            active['peak'] = max(active['peak'], active['now'])
+            try:
+                await asyncio.sleep(0.01)
+                return await real_open_connection(*args, **kwargs)
+            finally:
+                active['now'] -= 1
+
+        device = {'hostname': 'localhost', 'ip': '127.0.0.1', 'check_ports': [self.open_port] * 10, 'dns_check': False}
+        with patch("connectivity_engine.asyncio.open_connection", side_effect=counting_open_connection):
+            results = self._probe(engine, [device])
+
+        self.assertTrue(all(r['open'] for r in results[0][1]))
+        self.assertEqual(active['peak'], 2)
+
+if __name__ == "__main__":
+    unittest.main()
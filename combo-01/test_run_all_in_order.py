@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the sequential runner's in-process mode and start-up benchmark
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import run_all_in_order
+from run_all_in_order import benchmark_startup, run_in_process
+
+class TestRunAllInOrder(unittest.TestCase):
+    """Test cases for run_in_process and benchmark_startup"""
+
+    def test_in_process_mode_starts_one_interpreter(self):
+        """Every audit runs inside this interpreter: no subprocess is launched"""
+        audit_tool = MagicMock()
+        audit_tool.audit_types = ["connectivity", "security", "telnet"]
+        audit_tool.module_status = {"connectivity": True, "security": False, "telnet": True}
+        audit_tool.run_all_audits.return_value = True
+
+        with patch.object(run_all_in_order.subprocess, "run") as subprocess_run, \
+                patch.object(run_all_in_order.subprocess, "Popen") as popen, \
+                patch("audit_core.ensure_directories"), \
+                patch("network_audit.NetworkAuditTool", return_value=audit_tool):
+            results = run_in_process(True, "inventory.csv", "20250101_000000", cred_manager="manager")
+            again = run_in_process(True, "inventory.csv", "20250101_000000", cred_manager="manager")
+
+        self.assertEqual(subprocess_run.call_count + popen.call_count, 0)
+        self.assertEqual(audit_tool.cred_manager, "manager")
+        self.assertEqual(results, {
+            "connectivity_audit": "SUCCESS",
+            "security_audit": "FAILED",
+            "telnet_audit": "SUCCESS",
+            "network_audit (unified report)": "SUCCESS"
+        })
+        self.assertEqual(again, results)
+
+    def test_benchmark_interpreter_counts(self):
+        """Subprocess mode starts one interpreter per module, in-process mode one for all"""
+        modules = ["json", "csv", "decimal", "email.parser"]
+        with patch.object(run_all_in_order.subprocess, "run") as subprocess_run:
+            result = benchmark_startup(modules=modules, repeat=2, cwd=".")
+
+        codes = [call.args[0][-1] for call in subprocess_run.call_args_list]
+        self.assertEqual(len(codes), 2 * (len(modules) + 1))
+        self.assertEqual(codes.count("import json, csv, decimal, email.parser"), 2)
+        self.assertEqual(result['modules'], modules)
+        self.assertGreaterEqual(result['subprocess'], 0)
+
+if __name__ == "__main__":
+    unittest.main()
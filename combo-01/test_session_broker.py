@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the run-wide device session broker
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from session_broker import SessionBroker
+
+DEVICE = {'hostname': 'R1', 'ip': '10.0.0.1', 'device_type': 'cisco_ios'}
+
+class TestSessionBroker(unittest.TestCase):
+    """Test cases for SessionBroker"""
+
+    def setUp(self):
+        self.logins = []
+
+        def connect(device):
+            self.logins.append(device['ip'])
+            conn = MagicMock()
+            conn.is_alive.return_value = True
+            return True, conn
+
+        self.broker = SessionBroker(connect_func=connect)
+
+    def test_one_login_per_device(self):
+        """Every module borrowing the device gets the same session"""
+        with self.broker.lease(DEVICE) as (ok, first):
+            self.assertTrue(ok)
+        with self.broker.lease(DEVICE) as (ok, second):
+            self.assertIs(first, second)
+        with self.broker.lease({'hostname': 'R2', 'ip': '10.0.0.2'}):
+            pass
+        self.assertEqual(self.logins, ['10.0.0.1', '10.0.0.2'])
+        self.assertEqual(self.broker.login_count, 2)
+
+    def test_failed_login_cached(self):
+        """A failed login is reported to every borrower without retrying"""
+        attempts = []
+        broker = SessionBroker(connect_func=lambda device: attempts.append(device) or (False, "Authentication failed"))
+        for _ in range(3):
+            with broker.lease(DEVICE) as (ok, error):
+                self.assertFalse(ok)
+                self.assertEqual(error, "Authentication failed")
+        self.assertEqual(len(attempts), 1)
+
+    def test_dead_session_reopened(self):
+        """A session that dropped between leases is reconnected"""
+        with self.broker.lease(DEVICE) as (ok, conn):
+            conn.is_alive.return_value = False
+        with self.broker.lease(DEVICE) as (ok, replacement):
+            self.assertIsNot(conn, replacement)
+        self.assertEqual(len(self.logins), 2)
+
+    def test_lease_serialises_borrowers(self):
+        """Two modules never hold the same device's session at once"""
+        holders = {'now': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        def borrow():
+            with self.broker.lease(DEVICE):
+                with lock:
+                    holders['now'] += 1
+                    holders['peak'] = max(holders['peak'], holders['now'])
+                time.sleep(0.01)
+                with lock:
+                    holders['now'] -= 1
+
+        threads = [threading.Thread(target=borrow) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(holders['peak'], 1)
+        self.assertEqual(len(self.logins), 1)
+
+    def test_close_all_disconnects(self):
+        """close_all disconnects every open session"""
+        with self.broker.lease(DEVICE) as (ok, conn):
+            pass
+        self.broker.close_all()
+        conn.disconnect.assert_called_once()
+
+if __name__ == "__main__":
+    unittest.main()
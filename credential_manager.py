@@ -6,12 +6,11 @@ Provides encryption, decryption, and password hashing functionality
 
 import os
 import base64
-import hashlib
 import secrets
 import logging
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives import hashes
+
+from credential_vault import derive_fernet_key, pbkdf2_sha256, constant_time_equals
 
 class CredentialManager:
     """
@@ -42,16 +41,8 @@ class CredentialManager:
             with open(self.salt_file, 'wb') as f:
                 f.write(self.salt)
         
-        # Derive key from password and salt
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=self.salt,
-            iterations=100000,
-        )
-        
-        # Create the key and cipher suite
-        self.key = base64.urlsafe_b64encode(kdf.derive(master_password.encode()))
+        # Derive key from password and salt (cached for the process by the shared vault)
+        self.key = derive_fernet_key(master_password, self.salt)
         self.cipher_suite = Fernet(self.key)
     
     def encrypt(self, plaintext):
@@ -94,13 +85,7 @@ class CredentialManager:
             salt = secrets.token_hex(16)
         
         # Create a hash with the password and salt
-        hash_obj = hashlib.pbkdf2_hmac(
-            'sha256', 
-            password.encode(), 
-            salt.encode(), 
-            100000
-        )
-        password_hash = hash_obj.hex()
+        password_hash = pbkdf2_sha256(password.encode(), salt.encode()).hex()
         
         return password_hash, salt
     
@@ -109,7 +94,7 @@ class CredentialManager:
         Verify a password against a stored hash and salt
         """
         hash_to_check, _ = self.hash_password(password, salt)
-        return hash_to_check == stored_hash
+        return constant_time_equals(hash_to_check, stored_hash)
 
 
 if __name__ == "__main__":
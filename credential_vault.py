@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Credential Vault for NetAuditPro
+Shared key derivation for every CredentialManager: PBKDF2-HMAC-SHA256 runs
+once per (master password, salt) per process instead of on every initialize,
+hash_password and verify_password call. A derived key can be handed to child
+processes through an inherited pipe so they do not prompt and derive again,
+and inventory credentials can be decrypted in one pass at load time.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+KDF_ITERATIONS = 100000
+KEY_LENGTH = 32
+KEY_FD_ENV = "NETAUDIT_VAULT_KEY_FD"   # Read end of the pipe carrying the parent's derived key
+FERNET_PREFIX = "gAAAAAB"              # Every Fernet token starts with this
+MAX_CACHED_KEYS = 32                   # hash_password salts are random, so only recent derivations are kept
+
+_derived: "OrderedDict[tuple, bytes]" = OrderedDict()
+_derive_lock = threading.Lock()
+_inherited = None
+_inherited_lock = threading.Lock()
+
+def pbkdf2_sha256(password: bytes, salt: bytes, iterations: int = KDF_ITERATIONS, length: int = KEY_LENGTH) -> bytes:
+    """PBKDF2-HMAC-SHA256, memoised in a small per-process LRU"""
+    # The cache is keyed by a digest so the plaintext password is not kept around as a dict key
+    cache_key = (hashlib.sha256(salt + b"\0" + password).digest(), iterations, length)
+    with _derive_lock:
+        derived = _derived.get(cache_key)
+        if derived is not None:
+            _derived.move_to_end(cache_key)
+            return derived
+        derived = _derived[cache_key] = hashlib.pbkdf2_hmac("sha256", password, salt, iterations, length)
+        if len(_derived) > MAX_CACHED_KEYS:
+            _derived.popitem(last=False)
+        return derived
+
+def derive_fernet_key(master_password: str, salt: bytes) -> bytes:
+    """Fernet key for a master password and salt, identical to the per-tool PBKDF2HMAC derivation"""
+    return base64.urlsafe_b64encode(pbkdf2_sha256(master_password.encode(), salt))
+
+def constant_time_equals(a, b) -> bool:
+    return hmac.compare_digest(a, b)
+
+def clear_key_cache():
+    """Forget every derived key (e.g. after the master password changes)"""
+    with _derive_lock:
+        _derived.clear()
+
+@contextmanager
+def key_handoff(fernet_key: bytes, salt: bytes):
+    """
+    Share a derived key with child processes started inside the with-block
+    Yields (env, pass_fds) to merge into the child's Popen arguments. On Windows,
+    where fds cannot be passed, both are empty and children derive for themselves.
+    """
+    if os.name != "posix":
+        yield {}, ()
+        return
+    read_fd, write_fd = os.pipe()
+    try:
+        os.write(write_fd, base64.b64encode(salt) + b":" + fernet_key)
+    finally:
+        os.close(write_fd)
+    try:
+        yield {KEY_FD_ENV: str(read_fd)}, (read_fd,)
+    finally:
+        os.close(read_fd)
+
+def inherited_key(salt: bytes) -> Optional[bytes]:
+    """
+    The key passed down by a parent's key_handoff, or None
+    The key is only accepted if it was derived with the same salt this process would use.
+    """
+    global _inherited
+    with _inherited_lock:
+        if _inherited is None:
+            _inherited = (None, None)
+            fd = os.environ.pop(KEY_FD_ENV, None)
+            if fd is not None:
+                try:
+                    chunks = []
+                    while True:
+                        chunk = os.read(int(fd), 4096)
+                        if not chunk:
+                            break
+                        chunks.append(chunk)
+                    os.close(int(fd))
+                    parent_salt, _, key = b"".join(chunks).partition(b":")
+                    _inherited = (base64.b64decode(parent_salt), key)
+                except (OSError, ValueError):
+                    pass
+        parent_salt, key = _inherited
+    if key and parent_salt == salt:
+        return key
+    return None
+
+def decrypt_inventory(decrypt, routers: Iterable[dict],
+                      fields: Tuple[str, ...] = ("password", "secret")) -> Tuple[List[dict], List[str]]:
+    """
+    Decrypt the encrypted credential fields of every inventory row in one pass
+    `decrypt` is the CredentialManager's decrypt method. Returns (decrypted copies,
+    hostnames that failed); rows that fail keep their original values.
+    """
+    decrypted, failed = [], []
+    for router in routers:
+        row = dict(router)
+        for field in fields:
+            value = row.get(field)
+            if isinstance(value, str) and value.startswith(FERNET_PREFIX):
+                try:
+                    row[field] = decrypt(value)
+                except Exception:
+                    failed.append(row.get("hostname", "Unknown"))
+                    row[field] = value
+        decrypted.append(row)
+    return decrypted, sorted(set(failed))
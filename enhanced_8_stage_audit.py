@@ -121,6 +121,69 @@ def analyze_line_config(line_header: str, config_lines: List[str], device_name:
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
 
+# A4 readiness tuning: the old fixed 3-second wait is now only the upper bound
+A4_MAX_WAIT = 3.0
+A4_MIN_WAIT = 0.25
+A4_LATENCY_FACTOR = 2.0
+A4_MIN_POLL_INTERVAL = 0.05
+A4_MAX_POLL_INTERVAL = 0.5
+PAGINATION_MARKERS = ("--More--", " --More-- ", "<--- More --->")
+
+def is_output_complete(output: Optional[str]) -> bool:
+    """Check that command output is not truncated at a pagination prompt"""
+    if output is None:
+        return False
+    tail = output.rstrip()[-40:]
+    return not any(marker.strip() in tail for marker in PAGINATION_MARKERS)
+
+def wait_for_device_ready(device_connection, observed_latency: float, last_output: Optional[str] = None,
+                          max_wait: float = A4_MAX_WAIT) -> Dict[str, Any]:
+    """
+    A4: Adaptive readiness check replacing the fixed 3-second wait.
+    Polls for the device prompt with an interval and budget scaled to the
+    latency observed on the previous command, returning as soon as the
+    prompt is back and the previous output is complete.
+    """
+    started = time.time()
+    budget = min(max_wait, max(A4_MIN_WAIT, observed_latency * A4_LATENCY_FACTOR))
+    poll_interval = min(A4_MAX_POLL_INTERVAL, max(A4_MIN_POLL_INTERVAL, observed_latency / 4))
+    deadline = started + budget
+    
+    readiness = {
+        "ready": False,
+        "prompt": None,
+        "output_complete": last_output is None or is_output_complete(last_output),
+        "attempts": 0,
+        "budget": round(budget, 3),
+        "waited": 0.0,
+        "error": None
+    }
+    
+    # Connections without prompt detection (exec-channel wrappers) return only
+    # after the command channel has closed, so completed output means ready
+    if not hasattr(device_connection, "find_prompt"):
+        readiness["ready"] = readiness["output_complete"]
+        readiness["waited"] = round(time.time() - started, 3)
+        return readiness
+    
+    while True:
+        readiness["attempts"] += 1
+        try:
+            prompt = device_connection.find_prompt()
+            if prompt and prompt.strip().endswith(("#", ">")):
+                readiness["prompt"] = prompt.strip()
+                readiness["ready"] = readiness["output_complete"]
+                break
+        except Exception as prompt_error:
+            readiness["error"] = str(prompt_error)
+        
+        if time.time() + poll_interval > deadline:
+            break
+        time.sleep(poll_interval)
+    
+    readiness["waited"] = round(time.time() - started, 3)
+    return readiness
+
 def assess_aux_risk(telnet_allowed, login_method, exec_timeout):
     """Assess security risk based on configuration"""
     if telnet_allowed != "YES":
@@ -147,7 +210,7 @@ def execute_8_stage_device_audit(jump_client, device, device_index, total_device
     A1. Ping test (record failures but continue to A2)
     A2. SSH connection and credential verification
     A3. Authorization test with 'show line' command
-    A4. Wait 3 seconds after command execution
+    A4. Adaptive readiness check (prompt returned, output complete)
     A5. Data collection and save to timestamped folder
     A6. Data processing for dashboard updates
     A7. Core telnet security analysis (aux, vty, con lines)
@@ -255,9 +318,13 @@ def execute_8_stage_device_audit(jump_client, device, device_index, total_device
         log_func(f"📍 Stage A3: Authorization Test for {device_name}")
         progress_func(device_name, device_index, total_devices, f"A3: Authorization - {device_name}")
         
+        show_line_output = None
+        observed_latency = A4_MAX_WAIT
         try:
             log_func(f"⚡ A3: Executing 'show line' command on {device_name}")
+            command_started = time.time()
             show_line_output = device_connection.send_command('show line', read_timeout=30)
+            observed_latency = time.time() - command_started
             
             if show_line_output and len(show_line_output.strip()) > 0:
                 audit_stages["A3_authorization"]["status"] = "success"
@@ -282,17 +349,29 @@ def execute_8_stage_device_audit(jump_client, device, device_index, total_device
             device_results["stage_failures"].append("A3_authorization")
             log_func(f"⚠️ A3: Authorization error for {device_name}: {auth_error}")
         
-        # ===== STAGE A4: WAIT AND CONFIRM DATA COLLECTION =====
-        log_func(f"📍 Stage A4: Wait and Confirm Data Collection for {device_name}")
+        # ===== STAGE A4: READINESS CHECK BEFORE DATA COLLECTION =====
+        log_func(f"📍 Stage A4: Readiness Check before Data Collection for {device_name}")
         progress_func(device_name, device_index, total_devices, f"A4: Wait Confirm - {device_name}")
         
         try:
-            log_func(f"⏳ A4: Waiting 3 seconds before confirming data collection for {device_name}")
-            time.sleep(3)
+            log_func(f"⏳ A4: Confirming prompt and output completion for {device_name} (observed latency {observed_latency:.2f}s)")
+            readiness = wait_for_device_ready(device_connection, observed_latency, show_line_output)
             
-            audit_stages["A4_wait_confirm"]["status"] = "success"
-            audit_stages["A4_wait_confirm"]["details"] = "3-second wait completed, ready for data collection"
-            log_func(f"✅ A4: Wait period completed for {device_name}")
+            if readiness["ready"]:
+                audit_stages["A4_wait_confirm"]["status"] = "success"
+                audit_stages["A4_wait_confirm"]["details"] = (
+                    f"Device ready after {readiness['waited']:.2f}s "
+                    f"({readiness['attempts']} prompt check(s), budget {readiness['budget']:.2f}s)"
+                )
+                log_func(f"✅ A4: {device_name} ready for data collection after {readiness['waited']:.2f}s")
+            else:
+                audit_stages["A4_wait_confirm"]["status"] = "failed"
+                audit_stages["A4_wait_confirm"]["details"] = f"Readiness not confirmed within {readiness['budget']:.2f}s"
+                audit_stages["A4_wait_confirm"]["error"] = readiness["error"] or (
+                    "Incomplete command output" if not readiness["output_complete"] else "Prompt not detected"
+                )
+                device_results["stage_failures"].append("A4_wait_confirm")
+                log_func(f"❌ A4: Readiness not confirmed for {device_name}: {audit_stages['A4_wait_confirm']['error']}")
             
         except Exception as wait_error:
             audit_stages["A4_wait_confirm"]["status"] = "error"
@@ -311,13 +390,28 @@ def execute_8_stage_device_audit(jump_client, device, device_index, total_device
             # Execute all audit commands
             log_func(f"🔍 A5: Collecting comprehensive data from {device_name}")
             
-            for cmd_name, command in core_commands.items():
-                if cmd_name == 'show_line':  # Already executed in A3
-                    continue
-                    
+            pending_commands = {name: cmd for name, cmd in core_commands.items() if name != 'show_line'}  # show_line already executed in A3
+            
+            # Shell-backed connections can pipeline the whole command set in one round-trip window
+            pipelined_outputs = {}
+            if pending_commands and hasattr(device_connection, "send_commands"):
+                try:
+                    log_func(f"⚡ A5: Pipelining {len(pending_commands)} commands on {device_name}")
+                    outputs = device_connection.send_commands(list(pending_commands.values()),
+                                                              read_timeout=60 * len(pending_commands))
+                    pipelined_outputs = dict(zip(pending_commands.keys(), outputs))
+                except Exception as pipeline_error:
+                    # The session replaces its shell channel when a pipeline fails, so the
+                    # per-command fallback never reads output left over from the pipeline
+                    log_func(f"⚠️ A5: Pipelined collection failed on {device_name}: {pipeline_error} - falling back to one command at a time on a fresh shell")
+            
+            for cmd_name, command in pending_commands.items():
                 try:
-                    log_func(f"⚡ A5: Executing '{cmd_name}' on {device_name}")
-                    output = device_connection.send_command(command, read_timeout=60)
+                    if cmd_name in pipelined_outputs:
+                        output = pipelined_outputs[cmd_name]
+                    else:
+                        log_func(f"⚡ A5: Executing '{cmd_name}' on {device_name}")
+                        output = device_connection.send_command(command, read_timeout=60)
                     
                     device_results["commands"][cmd_name] = {
                         "command": command,
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Inventory Engine for NetAuditPro
+One CSV inventory loader shared by the audit tools. A file is parsed in a
+single pass into per-column lists, IPs and hostnames are validated once per
+distinct value across a whole column, duplicates are found with hash sets,
+and parsed files are cached by mtime/size and content hash, so reloading an
+unchanged 50,000-row inventory is a dictionary lookup.
+"""
+
+import csv
+import hashlib
+import io
+import ipaddress
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+REQUIRED_COLUMNS = ('hostname', 'ip', 'device_type')
+
+HOSTNAME_RE = re.compile(r'^[a-zA-Z0-9][-a-zA-Z0-9\.]*[a-zA-Z0-9]$')
+IPV4_RE = re.compile(r'^(?:(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\.){3}(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)$')
+
+def is_valid_hostname(hostname: str) -> bool:
+    """Validates if a hostname has a valid format."""
+    if not hostname or len(hostname) > 255:
+        return False
+    return bool(HOSTNAME_RE.match(hostname))
+
+def is_valid_ip_address(value: str) -> bool:
+    """Strict IPv4/IPv6 address check; the regex fast path avoids ipaddress for dotted quads"""
+    if IPV4_RE.match(value):
+        return True
+    try:
+        ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+def is_valid_ip(ip: str) -> bool:
+    """Validates if an IP address has a valid format (DNS names are accepted too)."""
+    return is_valid_ip_address(ip) or is_valid_hostname(ip)
+
+def invalid_indexes(values: Sequence[str], check) -> List[int]:
+    """Indexes of values failing `check`, calling it once per distinct value"""
+    bad = {value for value in set(values) if not check(value)}
+    if not bad:
+        return []
+    return [i for i, value in enumerate(values) if value in bad]
+
+class InventoryTable:
+    """A parsed inventory held column-wise; row dicts are only built on request"""
+
+    def __init__(self, headers: List[str], columns: Dict[str, List[str]], row_count: int, content_hash: str = ""):
+        self.headers = headers
+        self.columns = columns
+        self.row_count = row_count
+        self.content_hash = content_hash
+
+    @classmethod
+    def from_text(cls, text: str) -> "InventoryTable":
+        """Parse CSV text in one pass; cells are stripped, short rows padded, blank lines skipped"""
+        reader = csv.reader(io.StringIO(text))
+        headers = [header.strip() for header in next(reader, [])]
+        width = len(headers)
+        rows = [row if len(row) == width else (row + [''] * (width - len(row)))[:width]
+                for row in reader if row]
+        transposed = zip(*rows) if rows else [()] * width
+        columns = {header: [value.strip() for value in column] for header, column in zip(headers, transposed)}
+        content_hash = hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+        return cls(headers, columns, len(rows), content_hash)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], headers: Sequence[str]) -> "InventoryTable":
+        """Build a table from already-parsed row dicts (e.g. an uploaded CSV)"""
+        records = list(records)
+        columns = {header: [str(record.get(header) or '').strip() for record in records] for header in headers}
+        return cls(list(headers), columns, len(records))
+
+    def has_columns(self, *names: str) -> bool:
+        return all(name in self.columns for name in names)
+
+    def column(self, name: str) -> List[str]:
+        return self.columns.get(name) or [''] * self.row_count
+
+    def rows(self) -> List[Dict[str, str]]:
+        """Fresh row dicts (callers may modify them without touching the cached table)"""
+        if not self.headers:
+            return []
+        return [dict(zip(self.headers, values)) for values in zip(*(self.columns[h] for h in self.headers))]
+
+    def missing(self, names: Sequence[str]) -> Dict[str, List[int]]:
+        """Row indexes with an empty value, per column"""
+        return {name: [i for i, value in enumerate(self.column(name)) if not value] for name in names}
+
+    def duplicates(self, name: str) -> Dict[str, List[int]]:
+        """Non-empty values that occur more than once in a column, with their row indexes"""
+        seen, repeated = set(), set()
+        for value in self.column(name):
+            if value in seen:
+                repeated.add(value)
+            elif value:
+                seen.add(value)
+        if not repeated:
+            return {}
+        positions = {value: [] for value in repeated}
+        for i, value in enumerate(self.column(name)):
+            if value in positions:
+                positions[value].append(i)
+        return positions
+
+    def validate(self, required: Sequence[str] = REQUIRED_COLUMNS, hostname_column: str = 'hostname',
+                 ip_column: str = 'ip', allow_dns_names: bool = True) -> List[Tuple[int, str]]:
+        """
+        Bulk-validate the table
+        Returns (row number, message) pairs sorted by row; row numbers are 1-based
+        data rows and 0 is used for problems with the header itself.
+        """
+        missing_headers = [h for h in required if h not in self.columns]
+        if missing_headers:
+            return [(0, f"CSV is missing required headers: {', '.join(missing_headers)}")]
+
+        errors: Dict[int, str] = {}
+        missing_by_row: Dict[int, List[str]] = {}
+        for name, indexes in self.missing(required).items():
+            for i in indexes:
+                missing_by_row.setdefault(i, []).append(name)
+        for i, names in missing_by_row.items():
+            errors[i] = f"Row {i + 1} missing required fields: {', '.join(names)}"
+
+        if hostname_column in self.columns:
+            hostnames = self.column(hostname_column)
+            for i in invalid_indexes(hostnames, is_valid_hostname):
+                errors.setdefault(i, f"Row {i + 1}: Invalid hostname format: {hostnames[i]}")
+        if ip_column in self.columns:
+            ips = self.column(ip_column)
+            for i in invalid_indexes(ips, is_valid_ip if allow_dns_names else is_valid_ip_address):
+                errors.setdefault(i, f"Row {i + 1}: Invalid IP address format: {ips[i]}")
+        return [(i + 1, errors[i]) for i in sorted(errors)]
+
+    def to_router_dict(self, key: str = 'hostname', skip_empty: bool = False) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """{"routers": {hostname: {other fields}}}, the inventory shape used by the web tools"""
+        routers = {}
+        for row in self.rows():
+            name = row.pop(key, '')
+            if not name:
+                continue
+            routers[name] = {k: v for k, v in row.items() if v} if skip_empty else row
+        return {"routers": routers}
+
+_cache: Dict[str, Tuple[Tuple[int, int], InventoryTable]] = {}
+_cache_lock = threading.Lock()
+
+def load_inventory(path: str, encoding: str = 'utf-8') -> InventoryTable:
+    """
+    Parsed inventory for a CSV file, cached per process
+    An unchanged mtime/size is a cache hit without reading the file; otherwise
+    the content hash decides whether it really has to be parsed again.
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    with open(key, 'r', encoding=encoding, newline='') as f:
+        text = f.read()
+    if cached and cached[1].content_hash == hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest():
+        table = cached[1]  # Touched but not changed
+    else:
+        table = InventoryTable.from_text(text)
+    with _cache_lock:
+        _cache[key] = (stamp, table)
+    return table
+
+def clear_inventory_cache(path: Optional[str] = None):
+    """Drop one file (or every file) from the cache"""
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(path), None)
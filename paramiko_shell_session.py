@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Persistent Interactive Shell Session for NetAuditPro
+Keeps one Paramiko shell channel per device instead of opening an
+exec_command channel per command, frames command output by prompt and
+supports pipelining several show commands with sentinel markers
+"""
+
+import re
+import socket
+import time
+import uuid
+from typing import Callable, List, Optional
+
+import paramiko
+
+# Generic IOS/IOS-XE prompt at the end of the buffer (hostname followed by > or #)
+PROMPT_PATTERN = re.compile(r"([\w.\-@/:]+(?:\([\w.\-]+\))?[>#])\s*$")
+PASSWORD_PATTERN = re.compile(r"[Pp]assword:\s*$")
+SENTINEL_PREFIX = "! RR-SENTINEL"
+READ_CHUNK_SIZE = 65535
+
+class ShellSessionError(Exception):
+    """Raised when the shell channel cannot be opened or a command cannot be framed"""
+
+class ParamikoShellSession:
+    """Netmiko-like command interface backed by one persistent interactive shell channel"""
+
+    def __init__(self, client: paramiko.SSHClient, device_name: str = "device",
+                 enable_password: str = None, timeout: float = 60,
+                 log_func: Optional[Callable[[str], None]] = None):
+        self.client = client
+        self.device_name = device_name
+        self.enable_password = enable_password
+        self.timeout = timeout
+        self.log_func = log_func
+        self.channel = None
+        self.prompt = None
+        self._prompt_pattern = PROMPT_PATTERN
+
+    def _log(self, message: str):
+        if self.log_func:
+            self.log_func(message)
+
+    # ------------------------------------------------------------------
+    # Channel handling
+    # ------------------------------------------------------------------
+
+    def _ensure_shell(self):
+        """Open the shell channel once, learn the prompt and disable paging"""
+        if self.channel is not None and not self.channel.closed:
+            return self.channel
+
+        try:
+            self.channel = self.client.invoke_shell(width=511, height=0)
+        except Exception as e:
+            raise ShellSessionError(f"Failed to open shell channel on {self.device_name}: {e}")
+
+        self._log(f"🔗 Opened persistent shell channel to {self.device_name}")
+        self._learn_prompt()
+        self._run_framed("terminal length 0", self.timeout)
+        self._run_framed("terminal width 511", self.timeout)
+        return self.channel
+
+    def _learn_prompt(self):
+        """Wake the line and capture the prompt the device presents"""
+        self.channel.sendall("\n")
+        buffer = self._read_until(lambda buf: PROMPT_PATTERN.search(buf) is not None, self.timeout)
+        self._set_prompt(PROMPT_PATTERN.search(buffer).group(1))
+
+    def _set_prompt(self, prompt: str):
+        self.prompt = prompt.strip()
+        hostname = re.escape(self.prompt.rstrip(">#"))
+        self._prompt_pattern = re.compile(rf"({hostname}(?:\([\w.\-]+\))?[>#])\s*$")
+
+    def _read_until(self, predicate: Callable[[str], bool], timeout: float) -> str:
+        """Block on the channel until predicate(buffer) holds or the timeout expires"""
+        buffer = ""
+        deadline = time.time() + timeout
+
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise ShellSessionError(f"Timed out after {timeout}s waiting for {self.device_name}")
+
+            self.channel.settimeout(remaining)
+            try:
+                data = self.channel.recv(READ_CHUNK_SIZE)
+            except socket.timeout:
+                continue
+
+            if not data:
+                raise ShellSessionError(f"Shell channel to {self.device_name} closed unexpectedly")
+
+            buffer += data.decode("utf-8", errors="ignore").replace("\r", "")
+            if predicate(buffer):
+                return buffer
+
+    def _prompt_returned(self, buffer: str) -> bool:
+        return self._prompt_pattern.search(buffer) is not None
+
+    def _run_framed(self, command: str, timeout: float) -> str:
+        self.channel.sendall(command + "\n")
+        buffer = self._read_until(self._prompt_returned, timeout)
+        return self._strip_framing(buffer.splitlines(), command)
+
+    def _strip_framing(self, lines: List[str], command: str) -> str:
+        """Remove the echoed command line and a trailing line holding only the device prompt"""
+        if lines and self._prompt_pattern.match(lines[-1].strip()):
+            lines = lines[:-1]
+        for index, line in enumerate(lines):
+            if line.rstrip().endswith(command):
+                lines = lines[index + 1:]
+                break
+        return "\n".join(lines).strip("\n")
+
+    # ------------------------------------------------------------------
+    # Netmiko-compatible interface
+    # ------------------------------------------------------------------
+
+    def find_prompt(self, **kwargs) -> str:
+        """Send a bare newline and return the prompt once it comes back"""
+        self._ensure_shell()
+        self.channel.sendall("\n")
+        buffer = self._read_until(self._prompt_returned, kwargs.get("timeout", self.timeout))
+        self._set_prompt(self._prompt_pattern.search(buffer).group(1))
+        return self.prompt
+
+    def send_command(self, command: str, **kwargs) -> str:
+        """Send one command on the shared shell and return its output framed by the prompt"""
+        timeout = kwargs.get("read_timeout", kwargs.get("timeout", self.timeout))
+        self._ensure_shell()
+        try:
+            return self._run_framed(command, timeout)
+        except ShellSessionError:
+            # Late output would otherwise frame the next command
+            self.reset_shell()
+            raise
+
+    def send_commands(self, commands: List[str], **kwargs) -> List[str]:
+        """
+        Pipeline several show commands in one write. Each command is followed by an
+        exec-mode comment carrying a unique sentinel, so the whole command set comes
+        back in one round-trip window and is split on the echoed sentinels.
+        """
+        if not commands:
+            return []
+
+        timeout = kwargs.get("read_timeout", kwargs.get("timeout", self.timeout * len(commands)))
+        self._ensure_shell()
+
+        token = uuid.uuid4().hex[:8]
+        sentinels = [f"{SENTINEL_PREFIX}-{token}-{index}" for index in range(len(commands))]
+        payload = "".join(f"{command}\n{sentinel}\n" for command, sentinel in zip(commands, sentinels))
+
+        last_sentinel = sentinels[-1]
+
+        def pipeline_complete(buffer: str) -> bool:
+            position = buffer.rfind(last_sentinel)
+            return position != -1 and self._prompt_returned(buffer[position + len(last_sentinel):])
+
+        self.channel.sendall(payload)
+        try:
+            buffer = self._read_until(pipeline_complete, timeout)
+        except ShellSessionError:
+            self.reset_shell()
+            raise
+
+        outputs = []
+        current = []
+        sentinel_index = 0
+        for line in buffer.splitlines():
+            if sentinel_index < len(sentinels) and sentinels[sentinel_index] in line:
+                outputs.append(self._strip_framing(current, commands[sentinel_index]))
+                current = []
+                sentinel_index += 1
+            else:
+                current.append(line)
+
+        if len(outputs) != len(commands):
+            self.reset_shell()
+            raise ShellSessionError(
+                f"Pipelined output from {self.device_name} could not be framed "
+                f"({len(outputs)}/{len(commands)} sentinels seen)"
+            )
+        return outputs
+
+    def reset_shell(self):
+        """
+        Replace the shell channel with a fresh one. Output still in flight from an
+        abandoned pipeline would otherwise be read back as the next command's output.
+        """
+        privileged = bool(self.prompt and self.prompt.endswith("#"))
+        if self.channel is not None:
+            self.channel.close()
+        self.channel = None
+        self.prompt = None
+        self._prompt_pattern = PROMPT_PATTERN
+
+        try:
+            self._ensure_shell()
+            if privileged:
+                self.enable()
+        except ShellSessionError as e:
+            if self.channel is not None:
+                self.channel.close()
+            self.channel = None
+            self._log(f"⚠️ Could not reopen shell channel on {self.device_name}: {e}")
+
+    def enable(self):
+        """Enter privileged exec mode, answering the enable password prompt"""
+        self._ensure_shell()
+        if not self.prompt or self.prompt.endswith("#"):
+            return
+
+        self.channel.sendall("enable\n")
+        buffer = self._read_until(
+            lambda buf: PASSWORD_PATTERN.search(buf) is not None or self._prompt_returned(buf),
+            self.timeout
+        )
+        if PASSWORD_PATTERN.search(buffer):
+            self.channel.sendall(f"{self.enable_password or ''}\n")
+            buffer = self._read_until(self._prompt_returned, self.timeout)
+        self._set_prompt(self._prompt_pattern.search(buffer).group(1))
+
+    def disconnect(self):
+        """Close the shell channel and the underlying SSH client"""
+        try:
+            if self.channel is not None:
+                self.channel.close()
+        finally:
+            self.channel = None
+            self.client.close()
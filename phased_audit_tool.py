@@ -14,6 +14,7 @@ Phases:
 import sqlite3
 import datetime
 import json
+from html import escape
 import uuid
 import os
 import getpass
@@ -25,10 +26,12 @@ from netmiko.exceptions import NetmikoTimeoutException, NetmikoAuthenticationExc
 from flask import Flask, render_template, jsonify, request, Response
 from flask_socketio import SocketIO, emit
 
+from sqlite_batch_writer import get_writer, flush_writer, migrate_database
+from audit_rollups import AuditResultsQuery, ROLLUP_SCHEMA, DEFAULT_PAGE_SIZE
+from credential_vault import derive_fernet_key, pbkdf2_sha256, constant_time_equals, decrypt_inventory
+
 # Import cryptography libraries for secure credential management
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 # Import colorama for colored terminal output if available
 try:
@@ -78,17 +81,9 @@ class CredentialManager:
                 f.write(self.salt)
             os.chmod(self.salt_file, 0o600)  # Only user can read/write
         
-        # Generate key from password
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=self.salt,
-            iterations=100000,
-        )
-        
-        # Derive the key from the password
-        key = base64.urlsafe_b64encode(kdf.derive(master_password.encode()))
-        self.cipher_suite = Fernet(key)
+        # Derive the key from the password (once per process, shared by every manager)
+        self.key = derive_fernet_key(master_password, self.salt)
+        self.cipher_suite = Fernet(self.key)
     
     def encrypt(self, plaintext):
         """
@@ -125,14 +120,7 @@ class CredentialManager:
         if not salt:
             salt = os.urandom(16)
             
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        
-        password_hash = kdf.derive(password.encode())
+        password_hash = pbkdf2_sha256(password.encode(), salt)
         return base64.b64encode(password_hash).decode(), base64.b64encode(salt).decode()
     
     def verify_password(self, password, stored_hash, salt):
@@ -143,7 +131,7 @@ class CredentialManager:
             password, 
             base64.b64decode(salt)
         )
-        return password_hash == stored_hash
+        return constant_time_equals(password_hash, stored_hash)
 
 
 def prompt_for_master_password(confirm=True):
@@ -187,11 +175,8 @@ app.config['SECRET_KEY'] = 'phased_audit_secret_key'
 app.config['PORT'] = 5012
 socketio = SocketIO(app)
 
-def initialize_database():
-    """Initializes the SQLite database and creates the audit_phase_results table if it doesn't exist."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute('''
+AUDIT_PHASE_RESULTS_SCHEMA = [
+    '''
         CREATE TABLE IF NOT EXISTS audit_phase_results (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             audit_run_id TEXT NOT NULL,
@@ -206,16 +191,25 @@ def initialize_database():
             start_time DATETIME,
             end_time DATETIME
         )
-    ''')
-    conn.commit()
-    conn.close()
+    ''',
+    # Added in place on existing databases; covers the per-run/per-router lookups of the results views
+    "CREATE INDEX IF NOT EXISTS idx_phase_results_run_router_phase "
+    "ON audit_phase_results (audit_run_id, router_hostname, phase_name)"
+]
+
+INSERT_PHASE_RESULT_SQL = '''
+    INSERT INTO audit_phase_results 
+        (audit_run_id, router_hostname, router_ip, phase_number, phase_name, status, summary, details, error_message, start_time, end_time)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def initialize_database():
+    """Initializes the SQLite database (WAL mode) and creates/migrates the audit_phase_results table, indexes and rollups."""
+    migrate_database(DATABASE_NAME, AUDIT_PHASE_RESULTS_SCHEMA + ROLLUP_SCHEMA)
     print(f"Database {DATABASE_NAME} initialized/verified.")
 
 def log_phase_result(audit_run_id, router_hostname, router_ip, phase_number, phase_name, status, summary="", details=None, error_message="", start_time=None, end_time=None):
-    """Logs the result of an audit phase to the database."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    
+    """Queues the result of an audit phase for the batched database writer."""
     current_time = datetime.datetime.now()
     if start_time is None:
         start_time = current_time
@@ -224,13 +218,10 @@ def log_phase_result(audit_run_id, router_hostname, router_ip, phase_number, pha
 
     details_json = json.dumps(details) if details is not None else None
 
-    cursor.execute('''
-        INSERT INTO audit_phase_results 
-            (audit_run_id, router_hostname, router_ip, phase_number, phase_name, status, summary, details, error_message, start_time, end_time)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (audit_run_id, router_hostname, router_ip, phase_number, phase_name, status, summary, details_json, error_message, start_time, end_time))
-    conn.commit()
-    conn.close()
+    get_writer(DATABASE_NAME).submit(
+        INSERT_PHASE_RESULT_SQL,
+        (audit_run_id, router_hostname, router_ip, phase_number, phase_name, status, summary, details_json, error_message, start_time, end_time)
+    )
 
 # --- Phase 1: Helper Function ---
 def _ping_device(ip_address):
@@ -303,8 +294,11 @@ def execute_phase1_connectivity(audit_run_id, router_config):
     return {"status": status, "details": details, "error": error}
 
 # --- Phase 2: Authentication Testing ---
-def execute_phase2_authentication(audit_run_id, router_config, phase1_result, cred_manager=None):
-    """Attempts to authenticate to the router using provided credentials."""
+def execute_phase2_authentication(audit_run_id, router_config, phase1_result, cred_manager=None, credentials=None):
+    """Attempts to authenticate to the router using provided credentials.
+    
+    credentials, when given, holds the already decrypted password and secret and is used as-is.
+    """
     hostname = router_config.get('hostname')
     ip_address = router_config.get('ip')
     phase_name = "Authentication Testing"
@@ -324,11 +318,15 @@ def execute_phase2_authentication(audit_run_id, router_config, phase1_result, cr
     username = router_config.get('username')
     
     # Securely handle password with credential manager if available
-    password = router_config.get('password')
-    secret = router_config.get('secret', '') # Optional enable secret
+    if credentials is not None:
+        password = credentials.get('password')
+        secret = credentials.get('secret') or ''
+    else:
+        password = router_config.get('password')
+        secret = router_config.get('secret', '') # Optional enable secret
     
     # Check if credentials are encrypted and need decryption
-    if cred_manager and password and password.startswith('gAAAAAB'):
+    if credentials is None and cred_manager and password and password.startswith('gAAAAAB'):
         try:
             print(f"{Fore.CYAN}Decrypting router credentials with master password...{Style.RESET_ALL}")
             password = cred_manager.decrypt(password)
@@ -785,22 +783,7 @@ def run_audit():
     
     return html_results
 
-@app.route('/view-results')
-def view_results():
-    """View past audit results from the database."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    # Get unique audit run IDs
-    cursor.execute("SELECT DISTINCT audit_run_id FROM audit_phase_results ORDER BY timestamp DESC")
-    audit_runs = cursor.fetchall()
-    
-    html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Past Audit Results</title>
+RESULTS_PAGE_STYLE = """
         <style>
             body { font-family: Arial, sans-serif; margin: 20px; }
             h1, h2 { color: #2c3e50; }
@@ -815,6 +798,7 @@ def view_results():
             .success { color: green; }
             .failure { color: red; }
             .skipped { color: orange; }
+            .pager a { margin: 0 10px; }
             .back-btn {
                 display: inline-block; 
                 padding: 10px 15px; 
@@ -825,6 +809,42 @@ def view_results():
                 margin: 10px 0;
             }
         </style>
+"""
+
+_results_schema_ready = False
+
+def get_results_query():
+    """Query API over the rollup tables; creates/backfills them on first use in this process."""
+    global _results_schema_ready
+    if not _results_schema_ready:
+        initialize_database()
+        _results_schema_ready = True
+    flush_writer(DATABASE_NAME)  # Make queued phase results (and their rollups) visible
+    return AuditResultsQuery(DATABASE_NAME)
+
+def _pager_html(base_url, page, per_page, total):
+    """Previous/next links for a paginated results page."""
+    last_page = max((total + per_page - 1) // per_page, 1)
+    links = []
+    if page > 1:
+        links.append(f'<a href="{base_url}?page={page - 1}&per_page={per_page}">&laquo; Newer</a>')
+    links.append(f'Page {page} of {last_page}')
+    if page < last_page:
+        links.append(f'<a href="{base_url}?page={page + 1}&per_page={per_page}">Older &raquo;</a>')
+    return f'<p class="pager">{" ".join(links)}</p>'
+
+@app.route('/view-results')
+def view_results():
+    """View past audit runs, one summary row per run, newest first."""
+    query = get_results_query()
+    listing = query.list_runs(request.args.get('page', 1), request.args.get('per_page', DEFAULT_PAGE_SIZE))
+    
+    html = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Past Audit Results</title>
+        {RESULTS_PAGE_STYLE}
     </head>
     <body>
         <div class="container">
@@ -832,50 +852,99 @@ def view_results():
             <a href="/" class="back-btn">Back to Home</a>
     """
     
-    if not audit_runs:
+    if not listing['runs']:
         html += "<p>No audit results found in the database.</p>"
     else:
-        for audit_run in audit_runs:
-            audit_run_id = audit_run['audit_run_id']
-            html += f'<div class="audit-run"><h2>Audit Run: {audit_run_id}</h2>'
-            
-            # Get results for this audit run
-            cursor.execute("""
-                SELECT * FROM audit_phase_results 
-                WHERE audit_run_id = ? 
-                ORDER BY hostname, phase_number
-            """, (audit_run_id,))
-            results = cursor.fetchall()
-            
-            current_hostname = None
-            for result in results:
-                if result['hostname'] != current_hostname:
-                    if current_hostname:
-                        html += '</div>'  # Close previous device div
-                    current_hostname = result['hostname']
-                    html += f'<div class="device"><h3>Device: {current_hostname} ({result["ip_address"]})</h3>'
-                
-                status_class = "success" if result['status'] == "SUCCESS" else "failure" if result['status'] == "FAILURE" else "skipped"
-                html += f'<div class="phase"><h4>Phase {result["phase_number"]}: {result["phase_name"]}</h4>'
-                html += f'<p class="{status_class}">Status: {result["status"]}</p>'
-                html += f'<p>Summary: {result["summary"]}</p>'
-                if result['error']:
-                    html += f'<p class="failure">Error: {result["error"]}</p>'
-                html += '</div>'  # Close phase div
-            
-            if current_hostname:
-                html += '</div>'  # Close last device div
+        for run in listing['runs']:
+            run_id = escape(run['audit_run_id'])
+            html += f'<div class="audit-run"><h2><a href="/view-results/{run_id}">Audit Run: {run_id}</a></h2>'
+            html += f'<p>{escape(str(run["first_seen"]))} &ndash; {escape(str(run["last_seen"]))} | '
+            html += f'Routers: {run["router_count"]} | Duration: {run["total_duration_seconds"]:.1f}s</p>'
+            html += f'<p><span class="success">Success: {run["success_count"]}</span> | '
+            html += f'<span class="failure">Failure: {run["failure_count"]}</span> | '
+            html += f'<span class="skipped">Skipped: {run["skipped_count"] + run["other_count"]}</span></p>'
             html += '</div>'  # Close audit run div
+        html += _pager_html('/view-results', listing['page'], listing['per_page'], listing['total'])
     
     html += """
         </div>
     </body>
     </html>
     """
+    return html
+
+@app.route('/view-results/<audit_run_id>')
+def view_run_results(audit_run_id):
+    """View one audit run's per-phase totals and a page of its devices."""
+    query = get_results_query()
+    run = query.run_summary(audit_run_id)
+    if run is None:
+        return "<p>Audit run not found.</p>", 404
+    listing = query.run_devices(audit_run_id, request.args.get('page', 1), request.args.get('per_page', DEFAULT_PAGE_SIZE))
+    
+    html = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Audit Run {escape(audit_run_id)}</title>
+        {RESULTS_PAGE_STYLE}
+    </head>
+    <body>
+        <div class="container">
+            <h1>Audit Run: {escape(audit_run_id)}</h1>
+            <a href="/view-results" class="back-btn">Back to Past Results</a>
+    """
     
-    conn.close()
+    html += '<div class="audit-run"><h2>Phases</h2>'
+    for phase in query.run_phases(audit_run_id):
+        html += f'<p>Phase {phase["phase_number"]}: {escape(phase["phase_name"])} &ndash; '
+        html += f'<span class="success">{phase["success_count"]} ok</span>, '
+        html += f'<span class="failure">{phase["failure_count"]} failed</span>, '
+        html += f'max {phase["max_duration_seconds"]:.1f}s</p>'
+    html += '</div>'
+    
+    for device in listing['devices']:
+        html += f'<div class="device"><h3>Device: {escape(device["router_hostname"])} ({escape(str(device["router_ip"]))})</h3>'
+        for result in device['phases']:
+            status_class = "success" if result['status'] == "SUCCESS" else "failure" if result['status'] == "FAILURE" else "skipped"
+            html += f'<div class="phase"><h4>Phase {result["phase_number"]}: {escape(result["phase_name"])}</h4>'
+            html += f'<p class="{status_class}">Status: {escape(result["status"])}</p>'
+            html += f'<p>Summary: {escape(str(result["summary"]))}</p>'
+            if result['error_message']:
+                html += f'<p class="failure">Error: {escape(result["error_message"])}</p>'
+            html += '</div>'  # Close phase div
+        html += '</div>'  # Close device div
+    html += _pager_html(f'/view-results/{escape(audit_run_id)}', listing['page'], listing['per_page'], listing['total'])
+    
+    html += """
+        </div>
+    </body>
+    </html>
+    """
     return html
 
+@app.route('/api/audit-runs')
+def api_audit_runs():
+    """Paginated run summaries as JSON."""
+    query = get_results_query()
+    return jsonify(query.list_runs(request.args.get('page', 1), request.args.get('per_page', DEFAULT_PAGE_SIZE)))
+
+@app.route('/api/audit-runs/<audit_run_id>')
+def api_audit_run(audit_run_id):
+    """One run's summary, per-phase totals and a page of its devices as JSON."""
+    query = get_results_query()
+    run = query.run_summary(audit_run_id)
+    if run is None:
+        return jsonify({'error': 'Audit run not found'}), 404
+    devices = query.run_devices(audit_run_id, request.args.get('page', 1), request.args.get('per_page', DEFAULT_PAGE_SIZE))
+    return jsonify({'run': run, 'phases': query.run_phases(audit_run_id), **devices})
+
+@app.route('/api/audit-trends')
+def api_audit_trends():
+    """Status counts and durations per run for the last N runs (optionally for one router), from the rollups only."""
+    query = get_results_query()
+    return jsonify({'trends': query.trends(request.args.get('limit', 30), request.args.get('router'))})
+
 # --- Main Audit Orchestrator ---
 def perform_phased_audit(routers_to_audit):
     """Orchestrates the 5-phase audit for a list of routers."""
@@ -901,7 +970,16 @@ def perform_phased_audit(routers_to_audit):
     # Store results for each router
     overall_results = {}
 
+    # Credentials already encrypted in the inventory are decrypted in one pass here, so a
+    # wrong master password or stale salt is reported once instead of per router. Phase 2
+    # gets these values directly and does not decrypt again.
+    routers_to_audit = list(routers_to_audit)
+    decrypted_routers, undecryptable = decrypt_inventory(cred_manager.decrypt, routers_to_audit)
+    if undecryptable:
+        print(f"{Fore.RED}Could not decrypt stored credentials for: {', '.join(undecryptable)}{Style.RESET_ALL}")
+
     # Process router inventory first - ensure all credentials are encrypted
+    # (rows stored encrypted keep their ciphertext; only plaintext fields are encrypted)
     secure_routers = []
     for router in routers_to_audit:
         # Create a copy of the router config to avoid modifying the original
@@ -920,7 +998,7 @@ def perform_phased_audit(routers_to_audit):
         secure_routers.append(router_copy)
     
     # Now start the audit process with securely encrypted credentials
-    for router_config in secure_routers:
+    for router_config, decrypted in zip(secure_routers, decrypted_routers):
         hostname = router_config.get('hostname', 'UnknownRouter')
         print(f"\n{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}🔎 Auditing Router: {hostname}{Style.RESET_ALL}")
@@ -932,7 +1010,8 @@ def perform_phased_audit(routers_to_audit):
         router_results['phase1'] = phase1_res
 
         # Phase 2: Authentication Testing (pass credential manager for secure password handling)
-        phase2_res = execute_phase2_authentication(audit_run_id, router_config, phase1_res, cred_manager)
+        credentials = {'password': decrypted.get('password'), 'secret': decrypted.get('secret', '')}
+        phase2_res = execute_phase2_authentication(audit_run_id, router_config, phase1_res, cred_manager, credentials)
         router_results['phase2'] = phase2_res
 
         # Phase 3: Configuration Audit
@@ -950,6 +1029,7 @@ def perform_phased_audit(routers_to_audit):
         overall_results[hostname] = router_results
         print(f"--- Finished auditing Router: {hostname} ---")
 
+    flush_writer(DATABASE_NAME)  # Commit the run's queued phase results
     print(f"\nPhased audit run {audit_run_id} completed.")
     # Placeholder: Add overall summary reporting here if needed
     return overall_results
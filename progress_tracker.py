@@ -1,14 +1,65 @@
 #!/usr/bin/env python3
 """
 NetAuditPro Progress Tracker Module
-Provides comprehensive progress tracking for router and stage-level audit operations
+Provides comprehensive progress tracking for router and stage-level audit operations,
+including any number of devices audited concurrently
 """
 
+import itertools
 import json
+import re
+import sys
 import threading
 import time
-from datetime import datetime
-from typing import Dict, Optional, List
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, NamedTuple, Optional, List, Tuple
+
+HISTORY_SIZE = 50        # Ring buffer capacity for progress events
+SNAPSHOT_HISTORY = 10    # History entries included in to_dict()/to_json()
+EWMA_ALPHA = 0.3        # Weight of the newest sample in device duration/interval averages
+BENCHMARK_MIN_UPDATES_PER_SECOND = 10000  # --benchmark exits non-zero below this rate
+
+# Placeholders spliced with live (time-dependent) values in to_json()
+_ELAPSED = "__elapsed_time__"
+_THROUGHPUT = "__throughput__"
+_LIVE_FIELDS_RE = re.compile(f'"({_ELAPSED}|{_THROUGHPUT})"')
+
+
+def _detached(value):
+    """Copy the dicts and lists of a cached view, so callers cannot mutate the cache"""
+    if isinstance(value, dict):
+        return {key: _detached(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_detached(item) for item in value]
+    return value
+
+
+class _Device(NamedTuple):
+    """One in-flight device"""
+    name: str
+    index: Optional[int]
+    stage: int
+    stage_description: str
+    started: float  # time.monotonic()
+
+
+class _State(NamedTuple):
+    """Immutable progress state; every change publishes a new instance"""
+    version: int
+    router_index: int = 0
+    router_name: str = ""
+    stage: int = 0
+    stage_description: str = ""
+    is_completed: bool = False
+    is_failed: bool = False
+    error_message: str = ""
+    devices: Tuple[_Device, ...] = ()
+    completed_devices: int = 0
+    failed_devices: int = 0
+    ewma_duration: float = 0.0   # Seconds per device, 0.0 until the first device finishes
+    ewma_interval: float = 0.0   # Seconds between device completions
+    last_completion: float = 0.0  # time.monotonic() of the latest completion
 
 
 class ProgressTracker:
@@ -25,6 +76,19 @@ class ProgressTracker:
     - Thread-safe operations
     - JSON serialization for API responses
     - Progress history tracking
+    - Concurrent devices, each with its own stage, start time and ETA
+    - Throughput (devices/min) and completion estimate from EWMAs
+    
+    The router/stage cursor (update_router, update_stage) describes one
+    device at a time. Parallel audits use start_device, update_device_stage
+    and finish_device instead; the cursor then follows the most recently
+    updated device and overall progress counts every in-flight stage.
+    
+    State lives in one immutable _State swapped in by reference, so readers
+    (API polls, log calls) never take a lock. Writers hold the lock only for
+    the swap. Dicts, summary strings and the JSON body are built once per
+    state version and served from cache until the next change; history is a
+    fixed-size ring buffer of compact event tuples.
     """
     
     def __init__(self, total_routers: int):
@@ -35,12 +99,8 @@ class ProgressTracker:
             total_routers (int): Total number of routers to be audited
         """
         self.total_routers = total_routers
-        self.current_router_index = 0  # 0-based index
-        self.current_stage = 0  # 0-based index (0=A1, 1=A2, etc.)
         self.total_stages = 8  # A1 through A8
-        self.router_name = ""
         self.stage_name = ""
-        self.stage_description = ""
         
         # Stage mapping for display purposes
         self.stage_names = [
@@ -58,17 +118,35 @@ class ProgressTracker:
             "Comprehensive Reporting"
         ]
         
-        # Thread safety
+        # Thread safety: serializes writers only
         self._lock = threading.Lock()
+        self._versions = itertools.count(1)
+        self._state = _State(version=0)
+        self._views: Optional[Tuple[_State, Dict]] = None
         
-        # Progress history
+        # Progress history: (timestamp, event_type, data, state)
+        self._history = deque(maxlen=HISTORY_SIZE)
         self.start_time = datetime.now()
-        self.progress_history: List[Dict] = []
-        
-        # Status tracking
-        self.is_completed = False
-        self.is_failed = False
-        self.error_message = ""
+        self._start = time.monotonic()
+    
+    # State accessors (read-only views of the current state)
+    current_router_index = property(lambda self: self._state.router_index)
+    current_stage = property(lambda self: self._state.stage)
+    router_name = property(lambda self: self._state.router_name)
+    stage_description = property(lambda self: self._state.stage_description)
+    is_completed = property(lambda self: self._state.is_completed)
+    is_failed = property(lambda self: self._state.is_failed)
+    error_message = property(lambda self: self._state.error_message)
+    
+    @property
+    def update_count(self) -> int:
+        """Number of state changes published since creation"""
+        return self._state.version
+    
+    @property
+    def progress_history(self) -> List[Dict]:
+        """Progress events in the ring buffer, oldest first"""
+        return [_detached(self._history_entry(event)) for event in list(self._history)]
         
     def get_router_progress(self) -> Dict:
         """
@@ -77,23 +155,7 @@ class ProgressTracker:
         Returns:
             dict: Router progress data including current, total, percentage, and name
         """
-        with self._lock:
-            # Calculate 1-based display numbers
-            current_display = self.current_router_index + 1 if self.current_router_index < self.total_routers else self.total_routers
-            
-            # Calculate percentage
-            if self.total_routers > 0:
-                percentage = (current_display / self.total_routers) * 100
-            else:
-                percentage = 0.0
-                
-            return {
-                "current": current_display,
-                "total": self.total_routers,
-                "percentage": round(percentage, 2),
-                "router_name": self.router_name,
-                "router_index": self.current_router_index
-            }
+        return _detached(self._view("router"))
     
     def get_stage_progress(self) -> Dict:
         """
@@ -102,28 +164,7 @@ class ProgressTracker:
         Returns:
             dict: Stage progress data including current, total, percentage, and description
         """
-        with self._lock:
-            # Calculate 1-based display numbers
-            current_display = self.current_stage + 1 if self.current_stage < self.total_stages else self.total_stages
-            
-            # Calculate percentage
-            if self.total_stages > 0:
-                percentage = (current_display / self.total_stages) * 100
-            else:
-                percentage = 0.0
-                
-            # Get stage name and description
-            stage_name = self.stage_names[self.current_stage] if self.current_stage < len(self.stage_names) else f"A{current_display}"
-            stage_desc = self.stage_descriptions[self.current_stage] if self.current_stage < len(self.stage_descriptions) else self.stage_description
-                
-            return {
-                "current": current_display,
-                "total": self.total_stages,
-                "percentage": round(percentage, 2),
-                "stage_name": stage_name,
-                "stage_description": stage_desc,
-                "stage_index": self.current_stage
-            }
+        return _detached(self._view("stage"))
     
     def get_combined_progress(self) -> Dict:
         """
@@ -132,26 +173,28 @@ class ProgressTracker:
         Returns:
             dict: Combined progress data with both router and stage information
         """
-        router_progress = self.get_router_progress()
-        stage_progress = self.get_stage_progress()
-        
-        # Calculate overall progress (router progress + stage progress within current router)
-        if self.total_routers > 0 and self.total_stages > 0:
-            router_weight = (self.current_router_index / self.total_routers) * 100
-            stage_weight = (stage_progress["percentage"] / self.total_stages) * (100 / self.total_routers)
-            overall_percentage = router_weight + stage_weight
-        else:
-            overall_percentage = 0.0
+        state, views = self._current()
+        combined = self._state_view("combined", state, views)
+        return dict(_detached(combined), elapsed_time=self._get_elapsed_time(),
+                    throughput=self._throughput(state, time.monotonic()))
+    
+    def get_device_progress(self) -> Dict:
+        """
+        Get per-device progress for every in-flight device.
         
-        return {
-            "router": router_progress,
-            "stage": stage_progress,
-            "overall_percentage": round(overall_percentage, 2),
-            "is_completed": self.is_completed,
-            "is_failed": self.is_failed,
-            "error_message": self.error_message,
-            "elapsed_time": self._get_elapsed_time()
-        }
+        Returns:
+            dict: In-flight devices with stage, elapsed time and ETA, plus counts and throughput
+        """
+        now = time.monotonic()
+        state, views = self._current()
+        devices = []
+        for device, view in zip(state.devices, self._state_view("devices", state, views)):
+            elapsed = now - device.started
+            devices.append(dict(_detached(view), elapsed_time=round(elapsed, 2),
+                                eta_seconds=self._device_eta(state, device, elapsed)))
+        combined = self._state_view("combined", state, views)
+        return dict(_detached(combined["devices"]), devices=devices, overall_percentage=combined["overall_percentage"],
+                    throughput=self._throughput(state, now))
     
     def update_router(self, router_index: int, router_name: str = "") -> None:
         """
@@ -162,17 +205,11 @@ class ProgressTracker:
             router_name (str): Name of the current router
         """
         with self._lock:
-            self.current_router_index = router_index
-            self.router_name = router_name
-            self.current_stage = 0  # Reset stage when moving to new router
-            self.stage_name = ""
-            self.stage_description = ""
-            
-            # Add to history
-            self._add_to_history("router_update", {
+            # Reset stage when moving to new router
+            self._publish("router_update", {
                 "router_index": router_index,
                 "router_name": router_name
-            })
+            }, router_index=router_index, router_name=router_name, stage=0, stage_description="")
     
     def update_stage(self, stage_index: int, stage_description: str = "") -> None:
         """
@@ -182,18 +219,13 @@ class ProgressTracker:
             stage_index (int): 0-based index of the current stage (0=A1, 1=A2, etc.)
             stage_description (str): Optional custom description for the stage
         """
+        description = stage_description or self._stage_description(stage_index)
         with self._lock:
-            self.current_stage = stage_index
-            self.stage_description = stage_description or (
-                self.stage_descriptions[stage_index] if stage_index < len(self.stage_descriptions) else ""
-            )
-            
-            # Add to history
-            self._add_to_history("stage_update", {
+            self._publish("stage_update", {
                 "stage_index": stage_index,
-                "stage_name": self.stage_names[stage_index] if stage_index < len(self.stage_names) else f"A{stage_index + 1}",
-                "stage_description": self.stage_description
-            })
+                "stage_name": self._stage_name(stage_index),
+                "stage_description": description
+            }, stage=stage_index, stage_description=description)
     
     def next_stage(self) -> bool:
         """
@@ -203,21 +235,14 @@ class ProgressTracker:
             bool: True if successfully moved to next stage, False if already at last stage
         """
         with self._lock:
-            if self.current_stage < self.total_stages - 1:
-                self.current_stage += 1
-                self.stage_description = (
-                    self.stage_descriptions[self.current_stage] 
-                    if self.current_stage < len(self.stage_descriptions) 
-                    else ""
-                )
-                
-                # Add to history
-                self._add_to_history("stage_next", {
-                    "new_stage_index": self.current_stage,
-                    "stage_name": self.stage_names[self.current_stage] if self.current_stage < len(self.stage_names) else f"A{self.current_stage + 1}"
-                })
-                return True
-            return False
+            stage = self._state.stage + 1
+            if stage >= self.total_stages:
+                return False
+            self._publish("stage_next", {
+                "new_stage_index": stage,
+                "stage_name": self._stage_name(stage)
+            }, stage=stage, stage_description=self._stage_description(stage))
+            return True
     
     def next_router(self) -> bool:
         """
@@ -227,31 +252,99 @@ class ProgressTracker:
             bool: True if successfully moved to next router, False if already at last router
         """
         with self._lock:
-            if self.current_router_index < self.total_routers - 1:
-                self.current_router_index += 1
-                self.current_stage = 0  # Reset to first stage
-                self.router_name = ""
-                self.stage_description = ""
-                
-                # Add to history
-                self._add_to_history("router_next", {
-                    "new_router_index": self.current_router_index
-                })
-                return True
-            return False
+            router_index = self._state.router_index + 1
+            if router_index >= self.total_routers:
+                return False
+            # Reset to first stage
+            self._publish("router_next", {
+                "new_router_index": router_index
+            }, router_index=router_index, router_name="", stage=0, stage_description="")
+            return True
+    
+    def start_device(self, device_name: str, device_index: Optional[int] = None) -> None:
+        """
+        Mark a device as in flight at its first stage.
+        
+        Args:
+            device_name (str): Device hostname
+            device_index (int): Optional 0-based position of the device in the inventory
+        """
+        description = self._stage_description(0)
+        device = _Device(device_name, device_index, 0, description, time.monotonic())
+        with self._lock:
+            state = self._state
+            devices = tuple(d for d in state.devices if d.name != device_name) + (device,)
+            self._publish("device_start", {
+                "device_name": device_name,
+                "device_index": device_index
+            }, devices=devices, router_index=state.router_index if device_index is None else device_index,
+                router_name=device_name, stage=0, stage_description=description)
+    
+    def update_device_stage(self, device_name: str, stage_index: int, stage_description: str = "") -> None:
+        """
+        Move an in-flight device to a stage (starting it if it is not in flight).
+        
+        Args:
+            device_name (str): Device hostname
+            stage_index (int): 0-based index of the stage (0=A1, 1=A2, etc.)
+            stage_description (str): Optional custom description for the stage
+        """
+        description = stage_description or self._stage_description(stage_index)
+        now = time.monotonic()
+        with self._lock:
+            state = self._state
+            devices = list(state.devices)
+            for position, device in enumerate(devices):
+                if device.name == device_name:
+                    devices[position] = device._replace(stage=stage_index, stage_description=description)
+                    break
+            else:
+                devices.append(_Device(device_name, None, stage_index, description, now))
+            self._publish("device_stage", {
+                "device_name": device_name,
+                "stage_index": stage_index,
+                "stage_name": self._stage_name(stage_index)
+            }, devices=tuple(devices), router_name=device_name, stage=stage_index, stage_description=description)
+    
+    def finish_device(self, device_name: str, success: bool = True) -> None:
+        """
+        Mark an in-flight device as finished and update the throughput averages.
+        
+        Args:
+            device_name (str): Device hostname
+            success (bool): Whether the device audit succeeded
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._state
+            finished = next((d for d in state.devices if d.name == device_name), None)
+            duration = now - finished.started if finished else None
+            changes = {}
+            # Devices finished without being started (skipped) count toward completion, not throughput
+            if finished:
+                changes.update(
+                    devices=tuple(d for d in state.devices if d is not finished),
+                    ewma_duration=_ewma(state.ewma_duration, duration),
+                    ewma_interval=_ewma(state.ewma_interval, now - (state.last_completion or self._start)),
+                    last_completion=now
+                )
+            if success:
+                changes["completed_devices"] = state.completed_devices + 1
+            else:
+                changes["failed_devices"] = state.failed_devices + 1
+            self._publish("device_finish", {
+                "device_name": device_name,
+                "success": success,
+                "duration": round(duration, 2) if duration is not None else None
+            }, **changes)
     
     def complete_audit(self) -> None:
         """Mark the entire audit as completed."""
         with self._lock:
-            self.is_completed = True
-            self.current_router_index = self.total_routers
-            self.current_stage = self.total_stages
-            
-            # Add to history
-            self._add_to_history("audit_completed", {
+            self._publish("audit_completed", {
                 "total_routers": self.total_routers,
                 "total_time": self._get_elapsed_time()
-            })
+            }, is_completed=True, router_index=self.total_routers, stage=self.total_stages)
     
     def fail_audit(self, error_message: str = "") -> None:
         """
@@ -261,32 +354,21 @@ class ProgressTracker:
             error_message (str): Optional error message describing the failure
         """
         with self._lock:
-            self.is_failed = True
-            self.error_message = error_message
-            
-            # Add to history
-            self._add_to_history("audit_failed", {
+            self._publish("audit_failed", {
                 "error_message": error_message,
-                "failed_at_router": self.current_router_index,
-                "failed_at_stage": self.current_stage
-            })
+                "failed_at_router": self._state.router_index,
+                "failed_at_stage": self._state.stage
+            }, is_failed=True, error_message=error_message)
     
     def reset(self) -> None:
         """Reset the progress tracker to initial state."""
         with self._lock:
-            self.current_router_index = 0
-            self.current_stage = 0
-            self.router_name = ""
             self.stage_name = ""
-            self.stage_description = ""
-            self.is_completed = False
-            self.is_failed = False
-            self.error_message = ""
             self.start_time = datetime.now()
-            self.progress_history.clear()
-            
-            # Add to history
-            self._add_to_history("progress_reset", {})
+            self._start = time.monotonic()
+            self._history.clear()
+            self._state = _State(version=self._state.version)
+            self._publish("progress_reset", {})
     
     def get_progress_summary(self) -> str:
         """
@@ -295,15 +377,7 @@ class ProgressTracker:
         Returns:
             str: Human-readable progress summary
         """
-        router_progress = self.get_router_progress()
-        stage_progress = self.get_stage_progress()
-        
-        return (
-            f"Router {router_progress['current']}/{router_progress['total']} "
-            f"({router_progress['percentage']:.2f}%) - "
-            f"Stage {stage_progress['stage_name']}/{self.total_stages} "
-            f"({stage_progress['percentage']:.2f}%)"
-        )
+        return self._view("text")["summary"]
     
     def get_detailed_status(self) -> str:
         """
@@ -312,22 +386,19 @@ class ProgressTracker:
         Returns:
             str: Detailed status string
         """
-        router_progress = self.get_router_progress()
-        stage_progress = self.get_stage_progress()
-        
-        status_parts = [
-            f"Router {router_progress['current']}/{router_progress['total']} ({router_progress['percentage']:.2f}%)"
-        ]
+        return self._view("text")["detailed_status"]
+    
+    def get_log_messages(self, kind: str) -> Tuple[str, str]:
+        """
+        Get the console and raw trace log lines for the current state.
         
-        if router_progress['router_name']:
-            status_parts.append(f"[{router_progress['router_name']}]")
+        Args:
+            kind (str): "router", "stage" or "combined"
             
-        status_parts.append(f"Stage {stage_progress['stage_name']}/{self.total_stages} ({stage_progress['percentage']:.2f}%)")
-        
-        if stage_progress['stage_description']:
-            status_parts.append(f"[{stage_progress['stage_description']}]")
-        
-        return " - ".join(status_parts)
+        Returns:
+            tuple: (console message, raw trace message)
+        """
+        return self._view("text")["log"][kind]
     
     def to_dict(self) -> Dict:
         """
@@ -336,23 +407,12 @@ class ProgressTracker:
         Returns:
             dict: Complete progress tracker state
         """
-        return {
-            "total_routers": self.total_routers,
-            "current_router_index": self.current_router_index,
-            "current_stage": self.current_stage,
-            "total_stages": self.total_stages,
-            "router_name": self.router_name,
-            "stage_description": self.stage_description,
-            "router_progress": self.get_router_progress(),
-            "stage_progress": self.get_stage_progress(),
-            "combined_progress": self.get_combined_progress(),
-            "is_completed": self.is_completed,
-            "is_failed": self.is_failed,
-            "error_message": self.error_message,
-            "start_time": self.start_time.isoformat(),
-            "elapsed_time": self._get_elapsed_time(),
-            "progress_history": self.progress_history[-10:]  # Last 10 history entries
-        }
+        elapsed = self._get_elapsed_time()
+        state, views = self._current()
+        snapshot = _detached(self._state_view("snapshot", state, views))
+        snapshot["combined_progress"].update(elapsed_time=elapsed, throughput=self._throughput(state, time.monotonic()))
+        snapshot["elapsed_time"] = elapsed
+        return snapshot
     
     def to_json(self) -> str:
         """
@@ -361,33 +421,283 @@ class ProgressTracker:
         Returns:
             str: JSON representation of progress tracker
         """
-        return json.dumps(self.to_dict(), indent=2)
+        # The body is serialized once per change; only elapsed time and throughput are live
+        state, views = self._current()
+        live = {
+            _ELAPSED: json.dumps(self._get_elapsed_time()),
+            _THROUGHPUT: json.dumps(self._throughput(state, time.monotonic()))
+        }
+        parts = self._state_view("json_parts", state, views)
+        return "".join(live[part] if position % 2 else part for position, part in enumerate(parts))
     
     def _get_elapsed_time(self) -> float:
         """Get elapsed time since start in seconds."""
-        return (datetime.now() - self.start_time).total_seconds()
+        return time.monotonic() - self._start
+    
+    def _stage_name(self, stage_index: int) -> str:
+        return self.stage_names[stage_index] if stage_index < len(self.stage_names) else f"A{stage_index + 1}"
     
-    def _add_to_history(self, event_type: str, data: Dict) -> None:
+    def _stage_description(self, stage_index: int) -> str:
+        return self.stage_descriptions[stage_index] if stage_index < len(self.stage_descriptions) else ""
+    
+    def _publish(self, event_type: str, data: Dict, **changes) -> None:
         """
-        Add an event to the progress history.
+        Swap in a new state and record the event (caller holds the writer lock).
         
         Args:
             event_type (str): Type of event
             data (dict): Event data
+            **changes: Changed _State fields
         """
-        history_entry = {
-            "timestamp": datetime.now().isoformat(),
+        state = self._state._replace(version=next(self._versions), **changes)
+        self._state = state
+        self._history.append((time.time(), event_type, data, state))
+    
+    def _current(self) -> Tuple[_State, Dict]:
+        """The current state and its view cache, reset on the first read after a change"""
+        state = self._state
+        cached = self._views
+        if cached is None or cached[0] is not state:
+            cached = (state, {})
+            self._views = cached
+        return cached
+    
+    def _view(self, name: str):
+        """One view of the current state, built on its first read after a change"""
+        return self._state_view(name, *self._current())
+    
+    def _state_view(self, name: str, state: _State, views: Dict):
+        view = views.get(name)
+        if view is None:
+            view = views[name] = getattr(self, f"_build_{name}")(state, views)
+        return view
+    
+    def _router_view(self, state: _State) -> Dict:
+        # Calculate 1-based display numbers
+        current_display = state.router_index + 1 if state.router_index < self.total_routers else self.total_routers
+        percentage = (current_display / self.total_routers) * 100 if self.total_routers > 0 else 0.0
+        return {
+            "current": current_display,
+            "total": self.total_routers,
+            "percentage": round(percentage, 2),
+            "router_name": state.router_name,
+            "router_index": state.router_index
+        }
+    
+    def _stage_view(self, state: _State) -> Dict:
+        # Calculate 1-based display numbers
+        current_display = state.stage + 1 if state.stage < self.total_stages else self.total_stages
+        percentage = (current_display / self.total_stages) * 100 if self.total_stages > 0 else 0.0
+        return {
+            "current": current_display,
+            "total": self.total_stages,
+            "percentage": round(percentage, 2),
+            "stage_name": self.stage_names[state.stage] if state.stage < len(self.stage_names) else f"A{current_display}",
+            "stage_description": (self.stage_descriptions[state.stage] if state.stage < len(self.stage_descriptions)
+                                  else state.stage_description),
+            "stage_index": state.stage
+        }
+    
+    def _history_entry(self, event: Tuple) -> Dict:
+        timestamp, event_type, data, state = event
+        return {
+            "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
             "event_type": event_type,
             "data": data,
-            "router_progress": self.get_router_progress(),
-            "stage_progress": self.get_stage_progress()
+            "router_progress": self._router_view(state),
+            "stage_progress": self._stage_view(state)
+        }
+    
+    def _build_router(self, state: _State, views: Dict) -> Dict:
+        return self._router_view(state)
+    
+    def _build_stage(self, state: _State, views: Dict) -> Dict:
+        return self._stage_view(state)
+    
+    def _build_combined(self, state: _State, views: Dict) -> Dict:
+        stage = self._state_view("stage", state, views)
+        
+        # Overall progress: finished devices plus the completed stages of in-flight ones
+        if state.devices or state.completed_devices or state.failed_devices:
+            finished = state.completed_devices + state.failed_devices
+            in_flight = sum(device.stage for device in state.devices) / self.total_stages
+            overall_percentage = min((finished + in_flight) / self.total_routers * 100, 100.0) if self.total_routers else 0.0
+        # Overall progress (router progress + stage progress within current router)
+        elif self.total_routers > 0 and self.total_stages > 0:
+            router_weight = (state.router_index / self.total_routers) * 100
+            stage_weight = (stage["percentage"] / self.total_stages) * (100 / self.total_routers)
+            overall_percentage = router_weight + stage_weight
+        else:
+            overall_percentage = 0.0
+        
+        return {
+            "router": self._state_view("router", state, views),
+            "stage": stage,
+            "overall_percentage": round(overall_percentage, 2),
+            "is_completed": state.is_completed,
+            "is_failed": state.is_failed,
+            "error_message": state.error_message,
+            "elapsed_time": _ELAPSED,
+            "devices": {
+                "total": self.total_routers,
+                "in_flight": len(state.devices),
+                "in_flight_names": [device.name for device in state.devices],
+                "completed": state.completed_devices,
+                "failed": state.failed_devices
+            },
+            "throughput": _THROUGHPUT
+        }
+    
+    def _build_devices(self, state: _State, views: Dict) -> List[Dict]:
+        now_wall, now = time.time(), time.monotonic()
+        return [{
+            "device_name": device.name,
+            "device_index": device.index,
+            "stage": self._stage_view(state._replace(stage=device.stage, stage_description=device.stage_description)),
+            "started_at": datetime.fromtimestamp(now_wall - (now - device.started)).isoformat()
+        } for device in state.devices]
+    
+    def _device_eta(self, state: _State, device: _Device, elapsed: float) -> Optional[float]:
+        """Seconds until a device finishes: from the duration EWMA, else extrapolated from its stages"""
+        if state.ewma_duration:
+            return round(max(state.ewma_duration - elapsed, 0.0), 1)
+        if device.stage:
+            return round(elapsed / device.stage * (self.total_stages - device.stage), 1)
+        return None
+    
+    def _throughput(self, state: _State, now: float) -> Dict:
+        """Devices/min and completion estimate from the EWMA of completion intervals"""
+        remaining = max(self.total_routers - state.completed_devices - state.failed_devices, 0)
+        if not state.ewma_interval:
+            return {"devices_per_minute": 0.0, "average_device_seconds": None,
+                    "eta_seconds": None, "estimated_completion": None}
+        eta = max(remaining * state.ewma_interval - (now - state.last_completion), 0.0) if remaining else 0.0
+        return {
+            "devices_per_minute": round(60.0 / state.ewma_interval, 2),
+            "average_device_seconds": round(state.ewma_duration, 2) if state.ewma_duration else None,
+            "eta_seconds": round(eta, 1),
+            "estimated_completion": (datetime.now() + timedelta(seconds=eta)).replace(microsecond=0).isoformat()
         }
+    
+    def _build_text(self, state: _State, views: Dict) -> Dict:
+        combined = self._state_view("combined", state, views)
+        router, stage, overall = combined["router"], combined["stage"], combined["overall_percentage"]
         
-        self.progress_history.append(history_entry)
+        router_text = f"Router {router['current']}/{router['total']} ({router['percentage']:.2f}%)"
+        stage_text = f"Stage {stage['stage_name']}/{self.total_stages} ({stage['percentage']:.2f}%)"
+        status_parts = [router_text]
+        if router['router_name']:
+            status_parts.append(f"[{router['router_name']}]")
+        status_parts.append(stage_text)
+        if stage['stage_description']:
+            status_parts.append(f"[{stage['stage_description']}]")
         
-        # Keep only last 50 entries to prevent memory bloat
-        if len(self.progress_history) > 50:
-            self.progress_history = self.progress_history[-50:]
+        stage_of = f"{stage['stage_name']}/A{self.total_stages} ({stage['percentage']:.2f}%)"
+        return {
+            "summary": f"{router_text} - {stage_text}",
+            "detailed_status": " - ".join(status_parts),
+            "log": {
+                "router": (
+                    f"📍 Processing router {router['current']} of {router['total']} ({router['percentage']:.2f}%): {router['router_name']}",
+                    f"[PROGRESS] [ROUTER] {router['current']}/{router['total']} ({router['percentage']:.2f}%): {router['router_name']}"
+                ),
+                "stage": (
+                    f"📍 Stage {stage['stage_name']} of A{self.total_stages} ({stage['percentage']:.2f}%): {stage['stage_description']}",
+                    f"[PROGRESS] [STAGE] {stage_of}: {stage['stage_description']}"
+                ),
+                "combined": (
+                    f"📊 Progress: {router_text} - Stage {stage_of} - Overall: {overall:.2f}%",
+                    f"[PROGRESS] [COMBINED] {router_text} | Stage {stage_of} | Overall {overall:.2f}%"
+                )
+            }
+        }
+    
+    def _build_snapshot(self, state: _State, views: Dict) -> Dict:
+        # Only history published up to this state belongs in its snapshot
+        history = [event for event in list(self._history)[-SNAPSHOT_HISTORY:] if event[3].version <= state.version]
+        return {
+            "total_routers": self.total_routers,
+            "current_router_index": state.router_index,
+            "current_stage": state.stage,
+            "total_stages": self.total_stages,
+            "router_name": state.router_name,
+            "stage_description": state.stage_description,
+            "router_progress": self._state_view("router", state, views),
+            "stage_progress": self._state_view("stage", state, views),
+            "combined_progress": self._state_view("combined", state, views),
+            "is_completed": state.is_completed,
+            "is_failed": state.is_failed,
+            "error_message": state.error_message,
+            "start_time": self.start_time.isoformat(),
+            "elapsed_time": _ELAPSED,
+            "progress_history": [self._history_entry(event) for event in history]
+        }
+    
+    def _build_json_parts(self, state: _State, views: Dict) -> List[str]:
+        return _LIVE_FIELDS_RE.split(json.dumps(self._state_view("snapshot", state, views), indent=2))
+
+
+def _ewma(average: float, sample: float, alpha: float = EWMA_ALPHA) -> float:
+    """Exponentially weighted moving average; the first sample seeds it"""
+    return sample if not average else alpha * sample + (1 - alpha) * average
+
+
+def benchmark_updates(workers: int = 64, updates_per_worker: int = 2000, pollers: int = 2,
+                      poll_interval: float = 0.01) -> Dict:
+    """
+    Measure tracker update throughput with concurrent device workers and API pollers.
+    
+    Args:
+        workers (int): Number of device worker threads issuing updates
+        updates_per_worker (int): Updates issued by each worker
+        pollers (int): Threads serializing the tracker like /api/progress-detailed clients
+        poll_interval (float): Seconds between polls of each poller
+        
+    Returns:
+        dict: Update count, elapsed seconds, updates per second and polls served
+    """
+    tracker = ProgressTracker(workers)
+    start_barrier = threading.Barrier(workers + 1)
+    stop_polling = threading.Event()
+    polls = itertools.count()
+    
+    def worker(index: int) -> None:
+        start_barrier.wait()
+        for n in range(updates_per_worker):
+            if n % tracker.total_stages == 0:
+                tracker.update_router(index, f"R{index}")
+            else:
+                tracker.update_stage(n % tracker.total_stages)
+    
+    def poller() -> None:
+        while not stop_polling.wait(poll_interval):
+            tracker.to_json()
+            tracker.get_combined_progress()
+            next(polls)
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    poll_threads = [threading.Thread(target=poller) for _ in range(pollers)]
+    for thread in threads + poll_threads:
+        thread.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    stop_polling.set()
+    for thread in poll_threads:
+        thread.join()
+    
+    updates = workers * updates_per_worker
+    return {
+        "workers": workers,
+        "updates": updates,
+        "published": tracker.update_count,
+        "seconds": round(seconds, 4),
+        "updates_per_second": round(updates / seconds) if seconds > 0 else 0,
+        "polls": next(polls),
+        "history_size": len(tracker.progress_history)
+    }
 
 
 # Global progress tracker instance (will be initialized when audit starts)
@@ -437,16 +747,7 @@ def log_router_progress(progress_tracker: ProgressTracker, log_raw_trace_func=No
         progress_tracker (ProgressTracker): Progress tracker instance
         log_raw_trace_func (callable): Function to log to raw trace logs
     """
-    progress = progress_tracker.get_router_progress()
-    
-    # Console log with emoji and formatting
-    message = f"📍 Processing router {progress['current']} of {progress['total']} ({progress['percentage']:.2f}%): {progress['router_name']}"
-    print(message)
-    
-    # Raw trace log
-    if log_raw_trace_func:
-        raw_message = f"[PROGRESS] [ROUTER] {progress['current']}/{progress['total']} ({progress['percentage']:.2f}%): {progress['router_name']}"
-        log_raw_trace_func(raw_message)
+    _log_progress(progress_tracker, "router", log_raw_trace_func)
 
 
 def log_stage_progress(progress_tracker: ProgressTracker, log_raw_trace_func=None) -> None:
@@ -457,16 +758,7 @@ def log_stage_progress(progress_tracker: ProgressTracker, log_raw_trace_func=Non
         progress_tracker (ProgressTracker): Progress tracker instance
         log_raw_trace_func (callable): Function to log to raw trace logs
     """
-    stage_progress = progress_tracker.get_stage_progress()
-    
-    # Console log with emoji and formatting
-    message = f"📍 Stage {stage_progress['stage_name']} of A{progress_tracker.total_stages} ({stage_progress['percentage']:.2f}%): {stage_progress['stage_description']}"
-    print(message)
-    
-    # Raw trace log
-    if log_raw_trace_func:
-        raw_message = f"[PROGRESS] [STAGE] {stage_progress['stage_name']}/A{progress_tracker.total_stages} ({stage_progress['percentage']:.2f}%): {stage_progress['stage_description']}"
-        log_raw_trace_func(raw_message)
+    _log_progress(progress_tracker, "stage", log_raw_trace_func)
 
 
 def log_combined_progress(progress_tracker: ProgressTracker, log_raw_trace_func=None) -> None:
@@ -477,29 +769,30 @@ def log_combined_progress(progress_tracker: ProgressTracker, log_raw_trace_func=
         progress_tracker (ProgressTracker): Progress tracker instance
         log_raw_trace_func (callable): Function to log to raw trace logs
     """
-    combined = progress_tracker.get_combined_progress()
-    router = combined['router']
-    stage = combined['stage']
-    
-    # Console log with emoji and formatting
-    message = (
-        f"📊 Progress: Router {router['current']}/{router['total']} ({router['percentage']:.2f}%) - "
-        f"Stage {stage['stage_name']}/A{progress_tracker.total_stages} ({stage['percentage']:.2f}%) - "
-        f"Overall: {combined['overall_percentage']:.2f}%"
-    )
+    _log_progress(progress_tracker, "combined", log_raw_trace_func)
+
+
+def _log_progress(progress_tracker: ProgressTracker, kind: str, log_raw_trace_func=None) -> None:
+    # Messages are formatted once per progress change and reused until the next one
+    message, raw_message = progress_tracker.get_log_messages(kind)
     print(message)
-    
-    # Raw trace log
     if log_raw_trace_func:
-        raw_message = (
-            f"[PROGRESS] [COMBINED] Router {router['current']}/{router['total']} ({router['percentage']:.2f}%) | "
-            f"Stage {stage['stage_name']}/A{progress_tracker.total_stages} ({stage['percentage']:.2f}%) | "
-            f"Overall {combined['overall_percentage']:.2f}%"
-        )
         log_raw_trace_func(raw_message)
 
 
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        result = benchmark_updates()
+        print(f"{result['updates']} updates from {result['workers']} workers in {result['seconds']}s: "
+              f"{result['updates_per_second']} updates/s, {result['polls']} snapshot polls served")
+        if result["published"] != result["updates"]:
+            print(f"Lost updates: {result['updates'] - result['published']}")
+            sys.exit(1)
+        if result["updates_per_second"] < BENCHMARK_MIN_UPDATES_PER_SECOND:
+            print(f"Below the {BENCHMARK_MIN_UPDATES_PER_SECOND} updates/s target")
+            sys.exit(1)
+        sys.exit(0)
+    
     # Test the progress tracker
     print("Testing NetAuditPro Progress Tracker...")
     
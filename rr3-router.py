@@ -25,7 +25,7 @@ def get_netmiko_device_type(device_type):
 import paramiko
 from colorama import Fore, Style, init as colorama_init
 from netmiko import ConnectHandler, NetmikoTimeoutException, NetmikoAuthenticationException
-from flask import Flask, render_template, render_template_string, redirect, url_for, request, jsonify, send_from_directory, flash, Response
+from flask import Flask, render_template, render_template_string, redirect, url_for, request, jsonify, send_from_directory, flash, Response, make_response, stream_with_context
 from dotenv import load_dotenv, set_key, find_dotenv
 from werkzeug.utils import secure_filename
 from jinja2 import DictLoader
@@ -40,6 +40,10 @@ import matplotlib.pyplot as plt
 from flask_socketio import SocketIO, emit
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from shell_relay import ShellRelay
+from captured_config_index import CapturedConfigIndex, iter_combined_configs, iter_configs_zip
+from inventory_engine import InventoryTable, is_valid_hostname, is_valid_ip, load_inventory
+from streaming_reports import ReportJobManager, build_streaming_pdf, cached_chart, chunked_table_flowables, create_write_only_workbook, save_workbook, styled_row
 
 colorama_init(autoreset=True)
 
@@ -1831,22 +1835,7 @@ def validate_csv_data_list(data_list: list, headers: list) -> tuple[bool, str]:
 
     return True, "CSV data is valid."
 
-# Helper validation functions for CSV data
-def is_valid_hostname(hostname):
-    """Validates if a hostname has a valid format."""
-    if not hostname or len(hostname) > 255:
-        return False
-    # Basic hostname validation - alphanumeric chars, hyphens, and dots
-    return bool(re.match(r'^[a-zA-Z0-9][-a-zA-Z0-9\.]*[a-zA-Z0-9]$', hostname))
-
-def is_valid_ip(ip):
-    """Validates if an IP address has a valid format."""
-    try:
-        ipaddress.ip_address(ip)
-        return True
-    except ValueError:
-        # If not a valid IP, check if it's a valid hostname (for DNS names)
-        return is_valid_hostname(ip)
+# Hostname/IP validation helpers (is_valid_hostname, is_valid_ip) come from inventory_engine
 
 def validate_csv_data_list(data_list: List[Dict], headers: List[str]) -> tuple[bool, str]:
     """Validates a list of CSV data rows directly without converting to YAML.
@@ -1864,32 +1853,13 @@ def validate_csv_data_list(data_list: List[Dict], headers: List[str]) -> tuple[b
     if not headers:
         return False, "CSV headers are missing"
     
-    # Check for required headers
-    required_headers = ['hostname', 'ip', 'device_type']
-    missing_headers = [h for h in required_headers if h not in headers]
-    
-    if missing_headers:
-        return False, f"CSV is missing required headers: {', '.join(missing_headers)}"
-    
-    # Validate each row
-    for i, row in enumerate(data_list):
-        row_num = i + 1  # 1-based indexing for user-friendly messages
-        
-        # Check for required fields
-        missing = [h for h in required_headers if not row.get(h,'').strip()]
-        if missing:
-            return False, f"Row {row_num} missing required fields: {', '.join(missing)}"
-        
-        # Validate hostname format
-        hostname = row.get('hostname', '').strip()
-        if not is_valid_hostname(hostname):
-            return False, f"Row {row_num}: Invalid hostname format: {hostname}"
-        
-        # Validate IP address format
-        ip = row.get('ip', '').strip()
-        if not is_valid_ip(ip):
-            return False, f"Row {row_num}: Invalid IP address format: {ip}"
-    
+    return validate_inventory_table(InventoryTable.from_records(data_list, headers))
+
+def validate_inventory_table(table: InventoryTable) -> tuple[bool, str]:
+    """Bulk-validates a parsed inventory; reports the first problem like validate_csv_data_list."""
+    errors = table.validate(required=['hostname', 'ip', 'device_type'])
+    if errors:
+        return False, errors[0][1]
     return True, ""
 
 def validate_csv_inventory_row(row: Dict, row_num: int) -> tuple[bool, str, Dict[str, Any]]:
@@ -2147,39 +2117,25 @@ def load_active_inventory():
             return
 
     try:
-        with open(inventory_path, 'r', newline='') as f_load_inv:
-            csv_content_str = f_load_inv.read()
-        
-        # Parse CSV string into list of dictionaries and headers
-        parsed_data, headers = read_csv_data_from_str(csv_content_str)
-        
-        if parsed_data is None:
-            log_to_ui_and_console(f"Error: Failed to parse CSV data from '{inventory_path}'. Using empty inventory.", console_only=True)
-            ACTIVE_INVENTORY_DATA = {"routers": {}}
-            return
+        # Parsed column-wise and cached by mtime/content hash (see inventory_engine)
+        inventory_table = load_inventory(inventory_path)
         
-        # Validate the CSV data
-        is_valid, msg = validate_csv_data_list(parsed_data, headers)
+        if inventory_table.row_count == 0:
+            is_valid, msg = False, "CSV data is empty"
+        else:
+            is_valid, msg = validate_inventory_table(inventory_table)
         
         if not is_valid:
             log_to_ui_and_console(f"Error: CSV inventory '{active_file_basename}' is invalid: {msg}. Using empty inventory.", console_only=True)
             ACTIVE_INVENTORY_DATA = {"routers": {}}
             return
         
-        # Convert the list of dictionaries to the router dictionary format
-        router_dict = {"routers": {}}
-        for row in parsed_data:
-            hostname = row.get('hostname', '').strip()
-            if not hostname:
-                continue
-            
-            # Create a copy of the row dict for the router details
-            router_details = row.copy()
-            # Remove hostname from details as it's used as the key
-            if 'hostname' in router_details:
-                del router_details['hostname']
-            
-            router_dict["routers"][hostname] = router_details
+        duplicate_hostnames = inventory_table.duplicates('hostname')
+        if duplicate_hostnames:
+            log_to_ui_and_console(f"Warning: Duplicate hostnames in '{active_file_basename}' (last row wins): {', '.join(sorted(duplicate_hostnames))}", console_only=True)
+        
+        # Convert the table to the router dictionary format (hostname is the key)
+        router_dict = inventory_table.to_router_dict()
         
         ACTIVE_INVENTORY_DATA = router_dict
         log_to_ui_and_console(f"Successfully loaded CSV inventory: {active_file_basename} with {len(router_dict['routers'])} routers", console_only=True)
@@ -2197,6 +2153,11 @@ SUMMARY_FILENAME: str = "summary.txt"
 PDF_SUMMARY_FILENAME: str = "audit_summary_report.pdf"
 EXCEL_SUMMARY_FILENAME: str = "audit_summary_report.xlsx"
 detailed_reports_manifest: Dict[str, Any] = {}
+report_jobs = ReportJobManager()  # Background PDF/Excel builds, addressed by job id
+CAPTURED_CONFIGS_PER_PAGE: int = 25
+captured_config_index = CapturedConfigIndex(os.path.join(os.path.dirname(os.path.abspath(__file__)), BASE_DIR_NAME))  # Index file created on first use
+last_report_job_ids: Dict[str, str] = {}
+last_run_inv_routers: Dict[str, Any] = {}  # _INV_ROUTERS of the last finished run, reused by POST /report_jobs
 last_run_summary_data: Dict[str, Any] = {
     "total_routers": 0, "icmp_reachable": 0, "ssh_auth_ok": 0, "collected": 0, 
     "with_violations": 0, "failed_icmp": 0, "failed_ssh_auth": 0, "failed_collection": 0,
@@ -3260,26 +3221,26 @@ def run_the_audit_logic():
                     fh_summary.write(f"{r_name_iter_manifest:<25} | {files_dict_manifest.get('a', 'N/A'):<40} | {files_dict_manifest.get('b', 'N/A'):<40} | {files_dict_manifest.get('c', 'N/A'):<40}\n")
         detailed_reports_manifest["summary_file"] = {"folder": "", "filename": os.path.basename(summary_txt_file_path)}
         try:
-            current_audit_progress["status_message"] = "Generating PDF Summary Report..."
-            AUDIT_PROGRESS["status_message"] = "Generating PDF Summary Report..."
+            current_audit_progress["status_message"] = "Queueing PDF/Excel Summary Reports..."
+            AUDIT_PROGRESS["status_message"] = "Queueing PDF/Excel Summary Reports..."
             
             # Emit progress update
             try:
                 socketio.emit('progress_update', AUDIT_PROGRESS, namespace='/')
             except Exception as e:
                 print(f"Error emitting progress update: {e}")
-                
-            log_to_ui_and_console("Generating PDF summary report...")
-            pdf_path = generate_pdf_summary_report(last_run_summary_data, detailed_reports_manifest, current_run_failures, _INV_ROUTERS, base_report_path)
-            detailed_reports_manifest["pdf_summary_file"] = {"folder": "", "filename": os.path.basename(pdf_path)}
-            log_to_ui_and_console(f"PDF summary report saved to {pdf_path}")
-            
-            # Generate Excel summary report
-            log_to_ui_and_console("Generating Excel summary report...")
-            excel_path = generate_excel_summary_report(last_run_summary_data, detailed_reports_manifest, current_run_failures, _INV_ROUTERS, base_report_path)
-            detailed_reports_manifest["excel_summary_file"] = {"folder": "", "filename": os.path.basename(excel_path)}
-            log_to_ui_and_console(f"Excel summary report saved to {excel_path}")
-        except Exception as pdf_e: log_to_ui_and_console(f"{Fore.RED}Failed to generate PDF summary: {pdf_e}{Style.RESET_ALL}")
+            
+            # Reports build on the background worker from snapshots of this run's data
+            last_run_inv_routers.clear(); last_run_inv_routers.update(_INV_ROUTERS)  # Normalized routers (CSV or legacy) for report rebuilds
+            report_args = (json.loads(json.dumps(last_run_summary_data, default=str)), dict(detailed_reports_manifest), dict(current_run_failures), dict(last_run_inv_routers), base_report_path)
+            last_report_job_ids["pdf"] = report_jobs.submit("pdf", generate_pdf_summary_report, *report_args)
+            detailed_reports_manifest["pdf_summary_file"] = {"folder": "", "filename": PDF_SUMMARY_FILENAME}
+            log_to_ui_and_console(f"PDF summary report queued (job {last_report_job_ids['pdf']})")
+            
+            last_report_job_ids["excel"] = report_jobs.submit("excel", generate_excel_summary_report, *report_args)
+            detailed_reports_manifest["excel_summary_file"] = {"folder": "", "filename": EXCEL_SUMMARY_FILENAME}
+            log_to_ui_and_console(f"Excel summary report queued (job {last_report_job_ids['excel']})")
+        except Exception as pdf_e: log_to_ui_and_console(f"{Fore.RED}Failed to queue summary reports: {pdf_e}{Style.RESET_ALL}")
         log_to_ui_and_console(f"\nAudit process finished. Reports in {base_report_path}/")
         audit_status = "Completed"
         current_audit_progress["status_message"] = "Audit Completed"
@@ -3331,54 +3292,86 @@ def run_the_audit_logic():
         elif audit_status == "Completed": last_successful_audit_completion_time = datetime.now(); current_audit_progress["status_message"] = "Audit Completed"; current_audit_progress["percentage_complete"] = 100;
         if not last_successful_audit_completion_time and audit_status == "Completed": last_successful_audit_completion_time = datetime.now()
         audit_paused = False; audit_pause_event.set()
+        try: captured_config_index.refresh()
+        except Exception as e_index: log_to_ui_and_console(f"{Fore.YELLOW}Warn: Captured config index refresh failed: {e_index}{Style.RESET_ALL}", console_only=True)
 
-def generate_audit_charts_for_pdf(summary_data, base_report_dir_for_charts):
-    chart_paths = {}; plt.style.use('seaborn-v0_8-whitegrid')
+CHART_CACHE_DIRNAME: str = ".chart-cache"
+CHART_STYLE: str = "seaborn-v0_8-whitegrid"  # Applied per figure: cached_chart renders under a lock, never via global style
+
+def _render_overall_status_chart(summary_data, chart_path):
     labels_overall = ['Collected (Clean)', 'Collected (Violations)', 'Failed Collection', 'Failed SSH Auth', 'Failed ICMP']
     succeeded_cleanly = summary_data.get('collected', 0) - summary_data.get('with_violations', 0)
     sizes_overall = [max(0, succeeded_cleanly), max(0, summary_data.get('with_violations', 0)), max(0, summary_data.get('failed_collection', 0)), max(0, summary_data.get('failed_ssh_auth', 0)), max(0, summary_data.get('failed_icmp', 0))]
     filtered_labels_overall = [label_item for i, label_item in enumerate(labels_overall) if sizes_overall[i] > 0]
     filtered_sizes_overall = [size_item for size_item in sizes_overall if size_item > 0]
-    if sum(filtered_sizes_overall) > 0:
-        fig1, ax1 = plt.subplots(figsize=(8, 5)); ax1.pie(filtered_sizes_overall, labels=filtered_labels_overall, autopct='%1.1f%%', startangle=140, colors=plt.cm.Paired.colors); ax1.axis('equal'); plt.title('Overall Audit Status Distribution', fontsize=14); chart_path1 = os.path.join(base_report_dir_for_charts, "overall_status_chart.png"); plt.savefig(chart_path1, bbox_inches='tight'); plt.close(fig1); chart_paths['overall'] = chart_path1
-    else: chart_paths['overall'] = None
+    if sum(filtered_sizes_overall) <= 0: return False
+    with plt.style.context(CHART_STYLE):
+        fig1, ax1 = plt.subplots(figsize=(8, 5)); ax1.pie(filtered_sizes_overall, labels=filtered_labels_overall, autopct='%1.1f%%', startangle=140, colors=plt.cm.Paired.colors); ax1.axis('equal'); ax1.set_title('Overall Audit Status Distribution', fontsize=14); fig1.savefig(chart_path, bbox_inches='tight'); plt.close(fig1)
+    return True
+
+def _render_success_failure_chart(summary_data, chart_path):
     labels_success_fail = ['Total Configured', 'Data Collected', 'Any Failure Stage']; total_configured = summary_data.get('total_routers', 0); data_collected = summary_data.get('collected', 0); any_failure = total_configured - data_collected
-    if total_configured > 0:
-        sizes_success_fail = [total_configured, data_collected, max(0, any_failure)]; fig2, ax2 = plt.subplots(figsize=(7, 5)); bars = ax2.bar(labels_success_fail, sizes_success_fail, color=['skyblue', 'lightgreen', 'salmon']); ax2.set_ylabel('Number of Routers'); ax2.set_title('Audit Stage Completion Counts', fontsize=14)
+    if total_configured <= 0: return False
+    sizes_success_fail = [total_configured, data_collected, max(0, any_failure)]
+    with plt.style.context(CHART_STYLE):
+        fig2, ax2 = plt.subplots(figsize=(7, 5)); bars = ax2.bar(labels_success_fail, sizes_success_fail, color=['skyblue', 'lightgreen', 'salmon']); ax2.set_ylabel('Number of Routers'); ax2.set_title('Audit Stage Completion Counts', fontsize=14)
         for bar_item in bars: yval = bar_item.get_height(); ax2.text(bar_item.get_x() + bar_item.get_width()/2.0, yval + 0.5, int(yval), ha='center', va='bottom', fontweight='bold')
-        plt.xticks(rotation=15, ha="right"); chart_path2 = os.path.join(base_report_dir_for_charts, "success_failure_chart.png"); plt.savefig(chart_path2, bbox_inches='tight'); plt.close(fig2); chart_paths['success_fail'] = chart_path2
-    else: chart_paths['success_fail'] = None
-    return chart_paths
+        plt.setp(ax2.get_xticklabels(), rotation=15, ha="right"); fig2.savefig(chart_path, bbox_inches='tight'); plt.close(fig2)
+    return True
 
-def generate_pdf_summary_report(summary_data, manifest_data, failure_details, inv_routers_map, base_report_dir):
-    pdf_filepath = os.path.join(base_report_dir, PDF_SUMMARY_FILENAME); doc = SimpleDocTemplate(pdf_filepath); styles = getSampleStyleSheet(); story = []
-    story.append(Paragraph("Router Audit Summary Report", styles['h1'])); story.append(Paragraph(f"<b>Date of Audit:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal'])); story.append(Paragraph(f"<b>Active Inventory File:</b> {APP_CONFIG.get('ACTIVE_INVENTORY_FILE', 'N/A')} (Format: {APP_CONFIG.get('ACTIVE_INVENTORY_FORMAT','yaml').upper()})", styles['Normal'])); story.append(Spacer(1, 0.2 * inch)) # Added format
+def generate_audit_charts_for_pdf(summary_data, base_report_dir_for_charts):
+    """Render (or reuse) the summary charts; images are cached per hash of the counts they plot."""
+    chart_counts = {k: summary_data.get(k, 0) for k in ('total_routers', 'collected', 'with_violations', 'failed_collection', 'failed_ssh_auth', 'failed_icmp')}
+    cache_dir = os.path.join(base_report_dir_for_charts, CHART_CACHE_DIRNAME)
+    return {
+        'overall': cached_chart(cache_dir, "overall_status_chart", chart_counts, lambda path: _render_overall_status_chart(chart_counts, path)),
+        'success_fail': cached_chart(cache_dir, "success_failure_chart", chart_counts, lambda path: _render_success_failure_chart(chart_counts, path))
+    }
+
+REPORT_MANIFEST_SUMMARY_KEYS = ('summary_file', 'pdf_summary_file', 'excel_summary_file')
+
+def _iter_router_status_details(summary_data, failure_details, inv_routers_map):
+    """Yield (router, status, failure_reason) for every inventory router without building a list."""
+    router_keys = inv_routers_map.keys() if isinstance(inv_routers_map, dict) else []
+    per_router_status = summary_data.get("per_router_status", {})
+    for r_name in router_keys:
+        yield r_name, per_router_status.get(r_name, "Status Unknown"), failure_details.get(r_name)
+
+def _iter_manifest_rows(manifest_data):
+    for r_name, files_dict in manifest_data.items():
+        if r_name not in REPORT_MANIFEST_SUMMARY_KEYS:
+            yield [r_name, files_dict.get('a', 'N/A'), files_dict.get('b', 'N/A'), files_dict.get('c', 'N/A')]
+
+def _iter_pdf_summary_flowables(summary_data, manifest_data, failure_details, inv_routers_map, base_report_dir):
+    styles = getSampleStyleSheet()
+    yield Paragraph("Router Audit Summary Report", styles['h1']); yield Paragraph(f"<b>Date of Audit:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']); yield Paragraph(f"<b>Active Inventory File:</b> {APP_CONFIG.get('ACTIVE_INVENTORY_FILE', 'N/A')} (Format: {APP_CONFIG.get('ACTIVE_INVENTORY_FORMAT','yaml').upper()})", styles['Normal']); yield Spacer(1, 0.2 * inch)
     chart_image_paths = generate_audit_charts_for_pdf(summary_data, base_report_dir)
-    if chart_image_paths.get('overall') and os.path.exists(chart_image_paths['overall']): story.append(ReportLabImage(chart_image_paths['overall'], width=6 * inch, height=3.75 * inch)); story.append(Spacer(1, 0.2 * inch))
-    if chart_image_paths.get('success_fail') and os.path.exists(chart_image_paths['success_fail']): story.append(ReportLabImage(chart_image_paths['success_fail'], width=5.5 * inch, height=3.9 * inch)); story.append(Spacer(1, 0.2 * inch))
-    story.append(Paragraph("Overall Audit Metrics", styles['h2']))
+    if chart_image_paths.get('overall') and os.path.exists(chart_image_paths['overall']): yield ReportLabImage(chart_image_paths['overall'], width=6 * inch, height=3.75 * inch); yield Spacer(1, 0.2 * inch)
+    if chart_image_paths.get('success_fail') and os.path.exists(chart_image_paths['success_fail']): yield ReportLabImage(chart_image_paths['success_fail'], width=5.5 * inch, height=3.9 * inch); yield Spacer(1, 0.2 * inch)
+    yield Paragraph("Overall Audit Metrics", styles['h2'])
     summary_table_content = [ [Paragraph("<b>Metric</b>", styles['Normal']), Paragraph("<b>Value</b>", styles['Normal'])], ["Total Routers in Inventory", summary_data.get('total_routers', 0)], ["ICMP Reachable / Failed", f"{summary_data.get('icmp_reachable', 0)} / {summary_data.get('failed_icmp', 0)}"], ["SSH Authenticated / Failed", f"{summary_data.get('ssh_auth_ok', 0)} / {summary_data.get('failed_ssh_auth', 0)}"], ["Data Collected / Failed", f"{summary_data.get('collected', 0)} / {summary_data.get('failed_collection', 0)}"], ["Routers with Physical Line Telnet Violations", summary_data.get('with_violations', 0)], ["Total Physical Lines with Telnet Enabled", summary_data.get('total_physical_line_issues', 0)]]
-    summary_table = Table(summary_table_content, colWidths=[3 * inch, 3 * inch]); summary_table.setStyle(TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.darkblue), ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke), ('ALIGN', (0, 0), (-1, -1), 'LEFT'), ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'), ('BOTTOMPADDING', (0, 0), (-1, 0), 12), ('BACKGROUND', (0, 1), (-1, -1), colors.beige), ('GRID', (0, 0), (-1, -1), 1, colors.black)])); story.append(summary_table); story.append(Spacer(1, 0.2 * inch))
-    story.append(Paragraph("Per-Router Detailed Status", styles['h2']))
-    router_status_data = [[Paragraph("<b>Router (Inventory Name)</b>", styles['Normal']), Paragraph("<b>Status & Details</b>", styles['Normal'])]]; router_keys_for_pdf = inv_routers_map.keys() if isinstance(inv_routers_map, dict) else []
-    for r_name_pdf in router_keys_for_pdf:
-        status_pdf = summary_data.get("per_router_status", {}).get(r_name_pdf, "Status Unknown"); fail_reason_pdf = failure_details.get(r_name_pdf); details_pdf_str = status_pdf
-        if fail_reason_pdf: details_pdf_str += f" (Reason: {str(fail_reason_pdf)[:200]})"
-        router_status_data.append([Paragraph(r_name_pdf, styles['Normal']), Paragraph(details_pdf_str, styles['Normal'])])
-    status_table = Table(router_status_data, colWidths=[1.5 * inch, 4.5 * inch]); status_table.setStyle(TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.lightblue), ('TEXTCOLOR', (0, 0), (-1, 0), colors.black), ('ALIGN', (0, 0), (-1, -1), 'LEFT'), ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'), ('GRID', (0, 0), (-1, -1), 1, colors.black), ('VALIGN', (0, 0), (-1, -1), 'TOP')])); story.append(status_table); story.append(Spacer(1, 0.2 * inch))
-    if any(k not in ['summary_file', 'pdf_summary_file'] for k in manifest_data):
-        story.append(Paragraph("Individual Report File Index", styles['h2']))
-        file_index_data = [[Paragraph(s_header, styles['Normal']) for s_header in ["<b>Router</b>", "<b>Report A (Raw Data)</b>", "<b>Report B (Audit Detail)</b>", "<b>Report C (Parsed Line)</b>"]]]
-        for r_name_pdf_manifest, files_dict_pdf_manifest in manifest_data.items():
-            if r_name_pdf_manifest not in ['summary_file', 'pdf_summary_file']:
-                file_index_data.append([r_name_pdf_manifest, files_dict_pdf_manifest.get('a', 'N/A'), files_dict_pdf_manifest.get('b', 'N/A'), files_dict_pdf_manifest.get('c', 'N/A')])
-        index_table = Table(file_index_data, colWidths=[1.5 * inch, 1.5 * inch, 1.5 * inch, 1.5 * inch]); index_table.setStyle(TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.lightgreen), ('TEXTCOLOR', (0, 0), (-1, 0), colors.black), ('ALIGN', (0, 0), (-1, -1), 'LEFT'), ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'), ('GRID', (0, 0), (-1, -1), 1, colors.black)])); story.append(index_table)
-    doc.build(story); print(f"PDF report generated at {pdf_filepath}")
+    summary_table = Table(summary_table_content, colWidths=[3 * inch, 3 * inch]); summary_table.setStyle(TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.darkblue), ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke), ('ALIGN', (0, 0), (-1, -1), 'LEFT'), ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'), ('BOTTOMPADDING', (0, 0), (-1, 0), 12), ('BACKGROUND', (0, 1), (-1, -1), colors.beige), ('GRID', (0, 0), (-1, -1), 1, colors.black)])); yield summary_table; yield Spacer(1, 0.2 * inch)
+    yield Paragraph("Per-Router Detailed Status", styles['h2'])
+    status_rows = ([Paragraph(r_name_pdf, styles['Normal']), Paragraph(status_pdf + (f" (Reason: {str(fail_reason_pdf)[:200]})" if fail_reason_pdf else ""), styles['Normal'])] for r_name_pdf, status_pdf, fail_reason_pdf in _iter_router_status_details(summary_data, failure_details, inv_routers_map))
+    yield from chunked_table_flowables([Paragraph("<b>Router (Inventory Name)</b>", styles['Normal']), Paragraph("<b>Status & Details</b>", styles['Normal'])], status_rows, [1.5 * inch, 4.5 * inch], [('BACKGROUND', (0, 0), (-1, 0), colors.lightblue), ('TEXTCOLOR', (0, 0), (-1, 0), colors.black), ('ALIGN', (0, 0), (-1, -1), 'LEFT'), ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'), ('GRID', (0, 0), (-1, -1), 1, colors.black), ('VALIGN', (0, 0), (-1, -1), 'TOP')])
+    yield Spacer(1, 0.2 * inch)
+    if any(k not in REPORT_MANIFEST_SUMMARY_KEYS for k in manifest_data):
+        yield Paragraph("Individual Report File Index", styles['h2'])
+        yield from chunked_table_flowables([Paragraph(s_header, styles['Normal']) for s_header in ["<b>Router</b>", "<b>Report A (Raw Data)</b>", "<b>Report B (Audit Detail)</b>", "<b>Report C (Parsed Line)</b>"]], _iter_manifest_rows(manifest_data), [1.5 * inch, 1.5 * inch, 1.5 * inch, 1.5 * inch], [('BACKGROUND', (0, 0), (-1, 0), colors.lightgreen), ('TEXTCOLOR', (0, 0), (-1, 0), colors.black), ('ALIGN', (0, 0), (-1, -1), 'LEFT'), ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'), ('GRID', (0, 0), (-1, -1), 1, colors.black)])
+
+def generate_pdf_summary_report(summary_data, manifest_data, failure_details, inv_routers_map, base_report_dir):
+    """Build the PDF summary by streaming router rows into chunked tables (see streaming_reports)."""
+    pdf_filepath = os.path.join(base_report_dir, PDF_SUMMARY_FILENAME)
+    build_streaming_pdf(pdf_filepath, _iter_pdf_summary_flowables(summary_data, manifest_data, failure_details, inv_routers_map, base_report_dir)); print(f"PDF report generated at {pdf_filepath}")
     return pdf_filepath
 
 def generate_excel_summary_report(summary_data, manifest_data, failure_details, inv_routers_map, base_report_dir):
     """Generate an Excel summary report of the audit results.
     
+    Rows are streamed into an openpyxl write_only workbook, so memory stays flat
+    regardless of inventory size. write_only sheets cannot merge cells, so section
+    titles sit in column A only.
+    
     Args:
         summary_data: Dictionary containing summary metrics (last_run_summary_data)
         manifest_data: Dictionary containing paths to reports (detailed_reports_manifest)
@@ -3391,47 +3384,35 @@ def generate_excel_summary_report(summary_data, manifest_data, failure_details,
     """
     excel_filepath = os.path.join(base_report_dir, EXCEL_SUMMARY_FILENAME)
     
-    # Create a new workbook and get the active sheet
-    wb = openpyxl.Workbook()
-    sheet = wb.active
-    sheet.title = "Audit Summary"
+    # Create a write_only workbook; rows are flushed as they are appended
+    wb, sheet = create_write_only_workbook("Audit Summary")
     
     # Define styles
     title_font = Font(name='Calibri', size=16, bold=True)
+    section_font = Font(name='Calibri', size=14, bold=True)
     header_font = Font(name='Calibri', size=12, bold=True, color="FFFFFF")
-    normal_font = Font(name='Calibri', size=11)
     header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
     alt_row_fill = PatternFill(start_color="E6F0FD", end_color="E6F0FD", fill_type="solid")
     center_align = Alignment(horizontal='center', vertical='center')
     left_align = Alignment(horizontal='left', vertical='center')
     
+    # Column widths must be set before the first row is written
+    sheet.column_dimensions['A'].width = 40
+    sheet.column_dimensions['B'].width = 20
+    sheet.column_dimensions['C'].width = 50
+    sheet.column_dimensions['D'].width = 40
+    
     # Sheet title and metadata
-    sheet.merge_cells('A1:C1')
-    sheet['A1'] = "Router Audit Summary Report"
-    sheet['A1'].font = title_font
-    sheet['A1'].alignment = center_align
-    sheet.row_dimensions[1].height = 30
-    
-    # Metadata
-    sheet['A3'] = "Date of Audit:"
-    sheet['B3'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    sheet['A4'] = "Active Inventory:"
-    sheet['B4'] = f"{APP_CONFIG.get('ACTIVE_INVENTORY_FILE', 'N/A')} (Format: {APP_CONFIG.get('ACTIVE_INVENTORY_FORMAT','csv').upper()})"
+    sheet.append(styled_row(sheet, ["Router Audit Summary Report"], font=title_font, alignment=center_align))
+    sheet.append([])
+    sheet.append(["Date of Audit:", datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
+    sheet.append(["Active Inventory:", f"{APP_CONFIG.get('ACTIVE_INVENTORY_FILE', 'N/A')} (Format: {APP_CONFIG.get('ACTIVE_INVENTORY_FORMAT','csv').upper()})"])
+    sheet.append([])
     
     # Overall Audit Metrics section
-    sheet['A6'] = "Overall Audit Metrics"
-    sheet['A6'].font = Font(name='Calibri', size=14, bold=True)
-    sheet.merge_cells('A6:C6')
-    
-    # Metrics header row
-    sheet['A8'] = "Metric"
-    sheet['B8'] = "Value"
-    sheet['A8'].font = header_font
-    sheet['B8'].font = header_font
-    sheet['A8'].fill = header_fill
-    sheet['B8'].fill = header_fill
-    sheet['A8'].alignment = left_align
-    sheet['B8'].alignment = left_align
+    sheet.append(styled_row(sheet, ["Overall Audit Metrics"], font=section_font))
+    sheet.append([])
+    sheet.append(styled_row(sheet, ["Metric", "Value"], font=header_font, fill=header_fill, alignment=left_align))
     
     # Metrics data
     metrics = [
@@ -3449,86 +3430,34 @@ def generate_excel_summary_report(summary_data, manifest_data, failure_details,
         ("'transport input all'", summary_data.get('failure_category_transport_all', 0))
     ]
     
-    row_num = 9
     for i, (desc, val) in enumerate(metrics):
-        sheet[f'A{row_num}'] = desc
-        sheet[f'B{row_num}'] = val
-        if i % 2 == 1:  # Apply alternate row coloring
-            sheet[f'A{row_num}'].fill = alt_row_fill
-            sheet[f'B{row_num}'].fill = alt_row_fill
-        row_num += 1
-    
-    # Adjust column widths
-    sheet.column_dimensions['A'].width = 40
-    sheet.column_dimensions['B'].width = 20
-    sheet.column_dimensions['C'].width = 50
+        sheet.append(styled_row(sheet, [desc, val], fill=alt_row_fill if i % 2 == 1 else None))  # Alternate row coloring
     
     # Per-Router Detailed Status section
-    row_num += 2  # Add some space
-    sheet[f'A{row_num}'] = "Per-Router Detailed Status"
-    sheet[f'A{row_num}'].font = Font(name='Calibri', size=14, bold=True)
-    sheet.merge_cells(f'A{row_num}:D{row_num}')
-    row_num += 2
-    
-    # Router status header row
-    sheet[f'A{row_num}'] = "Router (Inventory Name)"
-    sheet[f'B{row_num}'] = "Status"
-    sheet[f'C{row_num}'] = "Details/Failure Reason"
-    for col in ['A', 'B', 'C']:
-        sheet[f'{col}{row_num}'].font = header_font
-        sheet[f'{col}{row_num}'].fill = header_fill
-        sheet[f'{col}{row_num}'].alignment = left_align
-    row_num += 1
-    
-    # Router status data
-    router_keys = inv_routers_map.keys() if isinstance(inv_routers_map, dict) else []
-    for i, r_name in enumerate(router_keys):
-        status = summary_data.get("per_router_status", {}).get(r_name, "Status Unknown")
-        fail_reason = failure_details.get(r_name)
+    sheet.append([])
+    sheet.append([])
+    sheet.append(styled_row(sheet, ["Per-Router Detailed Status"], font=section_font))
+    sheet.append([])
+    sheet.append(styled_row(sheet, ["Router (Inventory Name)", "Status", "Details/Failure Reason"], font=header_font, fill=header_fill, alignment=left_align))
+    
+    # Router status data, streamed one row at a time
+    for i, (r_name, status, fail_reason) in enumerate(_iter_router_status_details(summary_data, failure_details, inv_routers_map)):
         details_str = str(fail_reason) if fail_reason else ""
-        
-        sheet[f'A{row_num}'] = r_name
-        sheet[f'B{row_num}'] = status
-        sheet[f'C{row_num}'] = details_str
-        
-        if i % 2 == 1:  # Apply alternate row coloring
-            for col in ['A', 'B', 'C']:
-                sheet[f'{col}{row_num}'].fill = alt_row_fill
-        row_num += 1
+        sheet.append(styled_row(sheet, [r_name, status, details_str], fill=alt_row_fill if i % 2 == 1 else None))
     
     # Report File Index section
-    row_num += 2  # Add some space
-    sheet[f'A{row_num}'] = "Report File Index"
-    sheet[f'A{row_num}'].font = Font(name='Calibri', size=14, bold=True)
-    sheet.merge_cells(f'A{row_num}:D{row_num}')
-    row_num += 2
-    
-    # Report index header row
-    sheet[f'A{row_num}'] = "Router"
-    sheet[f'B{row_num}'] = "Report A (Raw Data)"
-    sheet[f'C{row_num}'] = "Report B (Audit Detail)"
-    sheet[f'D{row_num}'] = "Report C (Parsed Line)"
-    for col in ['A', 'B', 'C', 'D']:
-        sheet[f'{col}{row_num}'].font = header_font
-        sheet[f'{col}{row_num}'].fill = header_fill
-        sheet[f'{col}{row_num}'].alignment = left_align
-    row_num += 1
+    sheet.append([])
+    sheet.append([])
+    sheet.append(styled_row(sheet, ["Report File Index"], font=section_font))
+    sheet.append([])
+    sheet.append(styled_row(sheet, ["Router", "Report A (Raw Data)", "Report B (Audit Detail)", "Report C (Parsed Line)"], font=header_font, fill=header_fill, alignment=left_align))
     
     # Report index data
-    for i, (r_name, files_dict) in enumerate(manifest_data.items()):
-        if r_name not in ['summary_file', 'pdf_summary_file', 'excel_summary_file']:
-            sheet[f'A{row_num}'] = r_name
-            sheet[f'B{row_num}'] = files_dict.get('a', 'N/A')
-            sheet[f'C{row_num}'] = files_dict.get('b', 'N/A')
-            sheet[f'D{row_num}'] = files_dict.get('c', 'N/A')
-            
-            if i % 2 == 1:  # Apply alternate row coloring
-                for col in ['A', 'B', 'C', 'D']:
-                    sheet[f'{col}{row_num}'].fill = alt_row_fill
-            row_num += 1
+    for i, index_row in enumerate(_iter_manifest_rows(manifest_data)):
+        sheet.append(styled_row(sheet, index_row, fill=alt_row_fill if i % 2 == 1 else None))
     
     # Save the workbook
-    wb.save(excel_filepath)
+    save_workbook(wb, excel_filepath)  # Built in a per-job temp file, then moved into place
     print(f"Excel report generated at {excel_filepath}")
     return excel_filepath
 
@@ -5548,10 +5477,8 @@ HTML_CAPTURED_CONFIGS_TEMPLATE = """{% extends "base_layout.html" %}
                                 <a href="/download_all_configs/{{ router_name }}" class="btn btn-success">
                                     <i class="fas fa-download"></i> Download All {{ router_name }} Configs
                                 </a>
-                            </div>
-                            <div class="mb-3">
-                                <a href="/download_all_configs/{{ router_name }}" class="btn btn-success">
-                                    <i class="fas fa-download"></i> Download All {{ router_name }} Configs
+                                <a href="/download_all_configs/{{ router_name }}?format=zip" class="btn btn-outline-success">
+                                    <i class="fas fa-file-archive"></i> Download as ZIP
                                 </a>
                             </div>
                             <div class="table-responsive">
@@ -5590,6 +5517,15 @@ HTML_CAPTURED_CONFIGS_TEMPLATE = """{% extends "base_layout.html" %}
                 </div>
             {% endfor %}
         </div>
+        {% if total_pages > 1 %}
+        <nav class="mt-3" aria-label="Captured configuration pages">
+            <ul class="pagination justify-content-center">
+                <li class="page-item {% if page <= 1 %}disabled{% endif %}"><a class="page-link" href="?page={{ page - 1 }}">Previous</a></li>
+                <li class="page-item disabled"><span class="page-link">Page {{ page }} of {{ total_pages }} ({{ total_routers }} routers)</span></li>
+                <li class="page-item {% if page >= total_pages %}disabled{% endif %}"><a class="page-link" href="?page={{ page + 1 }}">Next</a></li>
+            </ul>
+        </nav>
+        {% endif %}
     {% else %}
         <div class="alert alert-info">
             <i class="fas fa-info-circle"></i> No router configurations have been captured yet. Run an audit to collect router configurations.
@@ -7118,61 +7054,19 @@ def stop_reset_audit():
 
 @app.route('/captured_configs')
 def captured_configs():
-    """Display captured configurations for each router"""
+    """Display captured configurations for each router, one page of routers at a time"""
     global APP_CONFIG, current_audit_progress, audit_status, last_run_summary_data
     
-    report_base_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), BASE_DIR_NAME)
-    config_files = []
+    page = request.args.get('page', 1, type=int) or 1
+    sorted_router_names, router_configs, total_routers = [], {}, 0
     
-    # Find all configuration files from past audits
+    # Query the persistent index; it is refreshed when an audit finishes and by the poller, not per request
     try:
-        # Check if the reports directory exists
-        if os.path.exists(report_base_dir):
-            # Get a list of subdirectories (audit timestamps)
-            for audit_dir in sorted(os.listdir(report_base_dir), reverse=True):
-                audit_path = os.path.join(report_base_dir, audit_dir)
-                if os.path.isdir(audit_path):
-                    # Scan for router config files in this audit
-                    for router_file in os.listdir(audit_path):
-                        if router_file.endswith('.conf') or router_file.endswith('.cfg') or 'running-config' in router_file:
-                            router_name = os.path.splitext(router_file)[0]
-                            router_name = router_name.replace('-running-config', '')
-                            
-                            # Get file stats
-                            file_path = os.path.join(audit_path, router_file)
-                            file_size = os.path.getsize(file_path)
-                            last_modified = datetime.fromtimestamp(os.path.getmtime(file_path))
-                            
-                            # Add to the list of config files
-                            config_files.append({
-                                'router_name': router_name,
-                                'audit_date': audit_dir,
-                                'filename': router_file,
-                                'filepath': file_path,
-                                'filesize': file_size,
-                                'last_modified': last_modified,
-                                # Convert datetime to string to avoid JSON serialization issues
-                                'last_modified_str': last_modified.strftime('%Y-%m-%d %H:%M:%S')
-                            })
+        sorted_router_names, router_configs, total_routers = captured_config_index.router_page(page, CAPTURED_CONFIGS_PER_PAGE)
     except Exception as e:
-        print(f"Error scanning for config files: {e}")
-        
-    # Group config files by router name
-    router_configs = {}
-    for config in config_files:
-        router_name = config['router_name']
-        if router_name not in router_configs:
-            router_configs[router_name] = []
-        router_configs[router_name].append(config)
-    
-    # Sort each router's configs by date
-    for router_name in router_configs:
-        router_configs[router_name] = sorted(router_configs[router_name], 
-                                           key=lambda x: x['last_modified_str'], 
-                                           reverse=True)
+        print(f"Error querying captured config index: {e}")
     
-    # Sort routers alphabetically
-    sorted_router_names = sorted(router_configs.keys())
+    total_pages = max(1, (total_routers + CAPTURED_CONFIGS_PER_PAGE - 1) // CAPTURED_CONFIGS_PER_PAGE)
     
     # Initialize chart_data with default values to avoid JSON serialization issues
     chart_data = {"labels": ["No Router Configs"], "values": [1], "colors": ["#D3D3D3"]}
@@ -7180,6 +7074,9 @@ def captured_configs():
     return render_template_string(HTML_CAPTURED_CONFIGS_TEMPLATE, 
                           router_configs=router_configs,
                           sorted_router_names=sorted_router_names,
+                          page=page,
+                          total_pages=total_pages,
+                          total_routers=total_routers,
                           current_audit_progress=current_audit_progress,
                           audit_status=audit_status,
                           last_run_summary=last_run_summary_data,
@@ -7254,40 +7151,20 @@ def download_config(audit_date, filename):
 
 @app.route('/download_all_configs/<router_name>')
 def download_all_configs(router_name):
-    """Download all configurations for a specific router"""
+    """Download all configurations for a specific router, streamed as text or as a zip (?format=zip)"""
     try:
-        report_base_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), BASE_DIR_NAME)
-        
-        # Find all configuration files for this router
-        config_files = []
-        for audit_dir in sorted(os.listdir(report_base_dir), reverse=True):
-            audit_path = os.path.join(report_base_dir, audit_dir)
-            if os.path.isdir(audit_path):
-                for router_file in os.listdir(audit_path):
-                    if (router_file.endswith('.conf') or router_file.endswith('.cfg') or 'running-config' in router_file) and                        (router_name in router_file or router_name == os.path.splitext(router_file)[0].replace('-running-config', '')):
-                        config_files.append({
-                            'audit_date': audit_dir,
-                            'filename': router_file,
-                            'filepath': os.path.join(audit_path, router_file)
-                        })
+        config_files = captured_config_index.files_for_router(router_name)
         
         if not config_files:
             return "No configuration files found for this router", 404
         
-        # Create a combined text file with all configurations
-        combined_content = ""
-        for config in sorted(config_files, key=lambda x: x['audit_date'], reverse=True):
-            with open(config['filepath'], 'r') as f:
-                file_content = f.read()
-            
-            combined_content += f"===== {config['filename']} ({config['audit_date']}) =====\n\n"
-            combined_content += file_content
-            combined_content += "\n\n" + "="*80 + "\n\n"
-        
-        # Create a response with the combined content
-        response = make_response(combined_content)
-        response.headers['Content-Type'] = 'text/plain'
-        response.headers['Content-Disposition'] = f'attachment; filename={router_name}_all_configs.txt'
+        safe_router_name = secure_filename(router_name) or "router"
+        if request.args.get('format') == 'zip':
+            response = Response(stream_with_context(iter_configs_zip(config_files)), mimetype='application/zip')
+            response.headers['Content-Disposition'] = f'attachment; filename={safe_router_name}_all_configs.zip'
+        else:
+            response = Response(stream_with_context(iter_combined_configs(config_files)), mimetype='text/plain')
+            response.headers['Content-Disposition'] = f'attachment; filename={safe_router_name}_all_configs.txt'
         
         return response
     except Exception as e:
@@ -7480,6 +7357,32 @@ def serve_report_file(folder_relative_path): # (No changes needed)
     if not os.path.exists(os.path.join(actual_directory, filename_part)): flash(f"Report file '{filename_part}' not found.", "danger"); return redirect(url_for('index'))
     return send_from_directory(actual_directory, filename_part, as_attachment=True)
 
+@app.route('/report_jobs', methods=['GET', 'POST'])
+def report_jobs_index():
+    """GET lists report jobs; POST rebuilds the PDF and Excel summaries of the last run in the background."""
+    if request.method == 'POST':
+        base_report_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), BASE_DIR_NAME)
+        report_args = (json.loads(json.dumps(last_run_summary_data, default=str)), dict(detailed_reports_manifest), dict(current_run_failures), dict(last_run_inv_routers), base_report_dir)
+        last_report_job_ids["pdf"] = report_jobs.submit("pdf", generate_pdf_summary_report, *report_args)
+        last_report_job_ids["excel"] = report_jobs.submit("excel", generate_excel_summary_report, *report_args)
+        return jsonify({"success": True, "jobs": dict(last_report_job_ids)})
+    return jsonify({"jobs": report_jobs.list_jobs(), "latest": dict(last_report_job_ids)})
+
+@app.route('/report_jobs/<job_id>')
+def report_job_status(job_id):
+    job = report_jobs.get(job_id)
+    if not job: return jsonify({"error": "Unknown report job"}), 404
+    job["download_url"] = url_for('download_report_job', job_id=job_id) if job["status"] == "completed" else None
+    job.pop("filepath", None)  # Never expose server paths
+    return jsonify(job)
+
+@app.route('/report_jobs/<job_id>/download')
+def download_report_job(job_id):
+    job = report_jobs.get(job_id)
+    if not job: return jsonify({"error": "Unknown report job"}), 404
+    if job["status"] != "completed": return jsonify({"error": f"Report job is {job['status']}", "status": job["status"]}), 409
+    return send_from_directory(os.path.dirname(job["filepath"]), os.path.basename(job["filepath"]), as_attachment=True)
+
 @app.route('/view_report/<folder>/<filename>')
 def view_json_report(folder, filename): # (No changes needed)
     base_report_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), BASE_DIR_NAME); safe_folder = secure_filename(folder); safe_filename = secure_filename(filename)
@@ -7504,22 +7407,21 @@ def inject_now():
         'APP_PORT': app.config.get('PORT', 5007)  # Default to 5007 if not set
     }
 
-def interactive_shell_reader(sid: str, paramiko_channel: paramiko.channel.Channel): # (No changes needed)
-    try:
-        while paramiko_channel.active and sid in interactive_sessions:
-            if paramiko_channel.recv_ready(): data = paramiko_channel.recv(4096).decode('utf-8', errors='replace'); socketio.emit('shell_output', {'output': data}, room=sid, namespace='/')
-            elif paramiko_channel.exit_status_ready(): break
-            time.sleep(0.05)
-    except Exception as e: print(f"Error in shell_reader for {sid}: {e}"); socketio.emit('shell_error', {'error': f"Shell reader error: {str(e)}"}, room=sid, namespace='/')
-    finally:
-        print(f"Shell reader thread for {sid} ended.")
-        if sid in interactive_sessions and interactive_sessions[sid].get('channel') == paramiko_channel:
-            socketio.emit('shell_stopped', {'message': 'Shell session ended or error.'}, room=sid, namespace='/'); cleanup_interactive_session(sid)
+def emit_shell_output(sid: str, output: str, ack_callback=None):
+    socketio.emit('shell_output', {'output': output}, to=sid, namespace='/', callback=ack_callback)
+
+def handle_relay_session_closed(sid: str):
+    if sid in interactive_sessions:
+        socketio.emit('shell_stopped', {'message': 'Shell session ended or error.'}, room=sid, namespace='/'); cleanup_interactive_session(sid)
+
+# One selector loop relays output for every web terminal; it replaces the per-session 50 ms polling reader threads
+shell_relay = ShellRelay(emit_shell_output, on_closed=handle_relay_session_closed)
 
 def cleanup_interactive_session(sid: str): # (No changes needed)
     session_data = interactive_sessions.pop(sid, None)
     if session_data:
         print(f"Cleaning up interactive session for {sid}")
+        shell_relay.unregister(sid)
         if session_data.get('channel'):
             try: session_data['channel'].close()
             except: pass
@@ -7728,8 +7630,8 @@ def handle_start_interactive_shell(data: Dict[str, Any]): # (No changes needed)
         if not all([jump_host, jump_user]): emit('shell_error', {'error': "Jump host/user not configured."}, room=sid); return
         client.connect(jump_host, username=jump_user, password=jump_pass, timeout=10, allow_agent=False, look_for_keys=False)
         channel = client.invoke_shell(term='xterm-color', width=data.get('cols', 80), height=data.get('rows', 24))
-        reader_thread = threading.Thread(target=interactive_shell_reader, args=(sid, channel), daemon=True)
-        interactive_sessions[sid] = {'client': client, 'channel': channel, 'thread': reader_thread}; reader_thread.start()
+        interactive_sessions[sid] = {'client': client, 'channel': channel}
+        shell_relay.register(sid, channel, flow_control=bool(data.get('ack_output')))  # Clients that ack shell_output frames get backpressure
         emit('shell_started', {'message': f'Connected to {jump_host}.'}, room=sid); print(f"Interactive shell started for {sid} on {jump_host}")
     except Exception as e: print(f"Failed to start shell for {sid}: {e}"); emit('shell_error', {'error': f"Failed to connect: {sanitize_log_message(str(e))}"}, room=sid); client.close()
 
@@ -7838,6 +7740,7 @@ if __name__ == '__main__':
         load_active_inventory()
     
     log_to_ui_and_console(f"Reports in: {report_base_dir_main}", console_only=True)
+    captured_config_index.start_polling()
     log_to_ui_and_console(f"Inventories in: {app.config['UPLOAD_FOLDER']}", console_only=True)
     log_to_ui_and_console(f"Active inventory: {APP_CONFIG.get('ACTIVE_INVENTORY_FILE', 'N/A')} (Format: {APP_CONFIG.get('ACTIVE_INVENTORY_FORMAT','yaml').upper()})", console_only=True)
     log_to_ui_and_console(f"Jump Ping Path: {APP_CONFIG.get('JUMP_PING_PATH', '/bin/ping (default)')}", console_only=True)
@@ -14,6 +14,7 @@ Phases:
 import sqlite3
 import datetime
 import json
+from html import escape
 import uuid
 import subprocess # Added for Phase 1
 import re # Added for Phase 1 RTT parsing
@@ -27,6 +28,9 @@ from netmiko import ConnectHandler
 from netmiko.exceptions import NetmikoTimeoutException, NetmikoAuthenticationException, SSHException
 from flask import Flask, render_template, jsonify, request, Response, redirect, url_for
 
+from sqlite_batch_writer import get_writer, flush_writer, migrate_database
+from audit_rollups import AuditResultsQuery, ROLLUP_SCHEMA, DEFAULT_PAGE_SIZE
+
 DATABASE_NAME = 'phased_audit_results.sqlite'
 
 # Initialize Flask app
@@ -34,11 +38,8 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = 'phased_audit_secret_key'
 app.config['PORT'] = 5012
 
-def initialize_database():
-    """Initializes the SQLite database and creates the audit_phase_results table if it doesn't exist."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute('''
+AUDIT_PHASE_RESULTS_SCHEMA = [
+    '''
         CREATE TABLE IF NOT EXISTS audit_phase_results (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             audit_run_id TEXT NOT NULL,
@@ -53,16 +54,25 @@ def initialize_database():
             start_time DATETIME,
             end_time DATETIME
         )
-    ''')
-    conn.commit()
-    conn.close()
+    ''',
+    # Added in place on existing databases; covers the per-run/per-router lookups of the results views
+    "CREATE INDEX IF NOT EXISTS idx_phase_results_run_router_phase "
+    "ON audit_phase_results (audit_run_id, router_hostname, phase_name)"
+]
+
+INSERT_PHASE_RESULT_SQL = '''
+    INSERT INTO audit_phase_results 
+        (audit_run_id, router_hostname, router_ip, phase_number, phase_name, status, summary, details, error_message, start_time, end_time)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def initialize_database():
+    """Initializes the SQLite database (WAL mode) and creates/migrates the audit_phase_results table, indexes and rollups."""
+    migrate_database(DATABASE_NAME, AUDIT_PHASE_RESULTS_SCHEMA + ROLLUP_SCHEMA)
     print(f"Database {DATABASE_NAME} initialized/verified.")
 
 def log_phase_result(audit_run_id, router_hostname, router_ip, phase_number, phase_name, status, summary="", details=None, error_message="", start_time=None, end_time=None):
-    """Logs the result of an audit phase to the database."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    
+    """Queues the result of an audit phase for the batched database writer."""
     current_time = datetime.datetime.now()
     if start_time is None:
         start_time = current_time
@@ -71,13 +81,10 @@ def log_phase_result(audit_run_id, router_hostname, router_ip, phase_number, pha
 
     details_json = json.dumps(details) if details is not None else None
 
-    cursor.execute('''
-        INSERT INTO audit_phase_results 
-            (audit_run_id, router_hostname, router_ip, phase_number, phase_name, status, summary, details, error_message, start_time, end_time)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (audit_run_id, router_hostname, router_ip, phase_number, phase_name, status, summary, details_json, error_message, start_time, end_time))
-    conn.commit()
-    conn.close()
+    get_writer(DATABASE_NAME).submit(
+        INSERT_PHASE_RESULT_SQL,
+        (audit_run_id, router_hostname, router_ip, phase_number, phase_name, status, summary, details_json, error_message, start_time, end_time)
+    )
 
 # --- Phase 1: Helper Function ---
 def _ping_device_via_jump_server(ip_address, jump_host_creds):
@@ -1126,6 +1133,7 @@ def run_audit():
         # Mark audit as completed
         audit_progress['status'] = 'completed'
         audit_progress['results'] = overall_results
+        flush_writer(DATABASE_NAME)  # Commit the run's queued phase results
         audit_progress['completed'] = True
     
     # Start the audit in a background thread
@@ -1722,22 +1730,7 @@ def get_audit_results():
     
     return html_results
 
-@app.route('/view-results')
-def view_results():
-    """View past audit results from the database."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    # Get unique audit run IDs
-    cursor.execute("SELECT DISTINCT audit_run_id FROM audit_phase_results ORDER BY start_time DESC")
-    audit_runs = cursor.fetchall()
-    
-    html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Past Audit Results</title>
+RESULTS_PAGE_STYLE = """
         <style>
             body { font-family: Arial, sans-serif; margin: 20px; }
             h1, h2 { color: #2c3e50; }
@@ -1752,6 +1745,7 @@ def view_results():
             .success { color: green; }
             .failure { color: red; }
             .skipped { color: orange; }
+            .pager a { margin: 0 10px; }
             .back-btn {
                 display: inline-block; 
                 padding: 10px 15px; 
@@ -1762,6 +1756,42 @@ def view_results():
                 margin: 10px 0;
             }
         </style>
+"""
+
+_results_schema_ready = False
+
+def get_results_query():
+    """Query API over the rollup tables; creates/backfills them on first use in this process."""
+    global _results_schema_ready
+    if not _results_schema_ready:
+        initialize_database()
+        _results_schema_ready = True
+    flush_writer(DATABASE_NAME)  # Make queued phase results (and their rollups) visible
+    return AuditResultsQuery(DATABASE_NAME)
+
+def _pager_html(base_url, page, per_page, total):
+    """Previous/next links for a paginated results page."""
+    last_page = max((total + per_page - 1) // per_page, 1)
+    links = []
+    if page > 1:
+        links.append(f'<a href="{base_url}?page={page - 1}&per_page={per_page}">&laquo; Newer</a>')
+    links.append(f'Page {page} of {last_page}')
+    if page < last_page:
+        links.append(f'<a href="{base_url}?page={page + 1}&per_page={per_page}">Older &raquo;</a>')
+    return f'<p class="pager">{" ".join(links)}</p>'
+
+@app.route('/view-results')
+def view_results():
+    """View past audit runs, one summary row per run, newest first."""
+    query = get_results_query()
+    listing = query.list_runs(request.args.get('page', 1), request.args.get('per_page', DEFAULT_PAGE_SIZE))
+    
+    html = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Past Audit Results</title>
+        {RESULTS_PAGE_STYLE}
     </head>
     <body>
         <div class="container">
@@ -1769,50 +1799,99 @@ def view_results():
             <a href="/" class="back-btn">Back to Home</a>
     """
     
-    if not audit_runs:
+    if not listing['runs']:
         html += "<p>No audit results found in the database.</p>"
     else:
-        for audit_run in audit_runs:
-            audit_run_id = audit_run['audit_run_id']
-            html += f'<div class="audit-run"><h2>Audit Run: {audit_run_id}</h2>'
-            
-            # Get results for this audit run
-            cursor.execute("""
-                SELECT * FROM audit_phase_results 
-                WHERE audit_run_id = ? 
-                ORDER BY router_hostname, phase_number
-            """, (audit_run_id,))
-            results = cursor.fetchall()
-            
-            current_hostname = None
-            for result in results:
-                if result['router_hostname'] != current_hostname:
-                    if current_hostname:
-                        html += '</div>'  # Close previous device div
-                    current_hostname = result['router_hostname']
-                    html += f'<div class="device"><h3>Device: {current_hostname} ({result["router_ip"]})</h3>'
-                
-                status_class = "success" if result['status'] == "SUCCESS" else "failure" if result['status'] == "FAILURE" else "skipped"
-                html += f'<div class="phase"><h4>Phase {result["phase_number"]}: {result["phase_name"]}</h4>'
-                html += f'<p class="{status_class}">Status: {result["status"]}</p>'
-                html += f'<p>Summary: {result["summary"]}</p>'
-                if result['error']:
-                    html += f'<p class="failure">Error: {result["error"]}</p>'
-                html += '</div>'  # Close phase div
-            
-            if current_hostname:
-                html += '</div>'  # Close last device div
+        for run in listing['runs']:
+            run_id = escape(run['audit_run_id'])
+            html += f'<div class="audit-run"><h2><a href="/view-results/{run_id}">Audit Run: {run_id}</a></h2>'
+            html += f'<p>{escape(str(run["first_seen"]))} &ndash; {escape(str(run["last_seen"]))} | '
+            html += f'Routers: {run["router_count"]} | Duration: {run["total_duration_seconds"]:.1f}s</p>'
+            html += f'<p><span class="success">Success: {run["success_count"]}</span> | '
+            html += f'<span class="failure">Failure: {run["failure_count"]}</span> | '
+            html += f'<span class="skipped">Skipped: {run["skipped_count"] + run["other_count"]}</span></p>'
             html += '</div>'  # Close audit run div
+        html += _pager_html('/view-results', listing['page'], listing['per_page'], listing['total'])
     
     html += """
         </div>
     </body>
     </html>
     """
+    return html
+
+@app.route('/view-results/<audit_run_id>')
+def view_run_results(audit_run_id):
+    """View one audit run's per-phase totals and a page of its devices."""
+    query = get_results_query()
+    run = query.run_summary(audit_run_id)
+    if run is None:
+        return "<p>Audit run not found.</p>", 404
+    listing = query.run_devices(audit_run_id, request.args.get('page', 1), request.args.get('per_page', DEFAULT_PAGE_SIZE))
     
-    conn.close()
+    html = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Audit Run {escape(audit_run_id)}</title>
+        {RESULTS_PAGE_STYLE}
+    </head>
+    <body>
+        <div class="container">
+            <h1>Audit Run: {escape(audit_run_id)}</h1>
+            <a href="/view-results" class="back-btn">Back to Past Results</a>
+    """
+    
+    html += '<div class="audit-run"><h2>Phases</h2>'
+    for phase in query.run_phases(audit_run_id):
+        html += f'<p>Phase {phase["phase_number"]}: {escape(phase["phase_name"])} &ndash; '
+        html += f'<span class="success">{phase["success_count"]} ok</span>, '
+        html += f'<span class="failure">{phase["failure_count"]} failed</span>, '
+        html += f'max {phase["max_duration_seconds"]:.1f}s</p>'
+    html += '</div>'
+    
+    for device in listing['devices']:
+        html += f'<div class="device"><h3>Device: {escape(device["router_hostname"])} ({escape(str(device["router_ip"]))})</h3>'
+        for result in device['phases']:
+            status_class = "success" if result['status'] == "SUCCESS" else "failure" if result['status'] == "FAILURE" else "skipped"
+            html += f'<div class="phase"><h4>Phase {result["phase_number"]}: {escape(result["phase_name"])}</h4>'
+            html += f'<p class="{status_class}">Status: {escape(result["status"])}</p>'
+            html += f'<p>Summary: {escape(str(result["summary"]))}</p>'
+            if result['error_message']:
+                html += f'<p class="failure">Error: {escape(result["error_message"])}</p>'
+            html += '</div>'  # Close phase div
+        html += '</div>'  # Close device div
+    html += _pager_html(f'/view-results/{escape(audit_run_id)}', listing['page'], listing['per_page'], listing['total'])
+    
+    html += """
+        </div>
+    </body>
+    </html>
+    """
     return html
 
+@app.route('/api/audit-runs')
+def api_audit_runs():
+    """Paginated run summaries as JSON."""
+    query = get_results_query()
+    return jsonify(query.list_runs(request.args.get('page', 1), request.args.get('per_page', DEFAULT_PAGE_SIZE)))
+
+@app.route('/api/audit-runs/<audit_run_id>')
+def api_audit_run(audit_run_id):
+    """One run's summary, per-phase totals and a page of its devices as JSON."""
+    query = get_results_query()
+    run = query.run_summary(audit_run_id)
+    if run is None:
+        return jsonify({'error': 'Audit run not found'}), 404
+    devices = query.run_devices(audit_run_id, request.args.get('page', 1), request.args.get('per_page', DEFAULT_PAGE_SIZE))
+    return jsonify({'run': run, 'phases': query.run_phases(audit_run_id), **devices})
+
+@app.route('/api/audit-trends')
+def api_audit_trends():
+    """Status counts and durations per run for the last N runs (optionally for one router), from the rollups only."""
+    query = get_results_query()
+    return jsonify({'trends': query.trends(request.args.get('limit', 30), request.args.get('router'))})
+
 # --- Inventory Management ---
 def load_inventory_from_csv(inventory_file):
     """
@@ -1966,6 +2045,7 @@ def perform_phased_audit(routers_to_audit, jump_host_creds=None):
             
         print("\n" + "-"*60 + "\n")
     
+    flush_writer(DATABASE_NAME)  # Commit the run's queued phase results
     print(f"Completed audit of {len(routers_to_audit)} routers via jump server {jump_host_creds['ip']}")
     return overall_results
 
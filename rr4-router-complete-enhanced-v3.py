@@ -94,6 +94,8 @@ from werkzeug.utils import secure_filename
 # Networking and SSH
 import paramiko
 from netmiko import ConnectHandler, NetmikoTimeoutException, NetmikoAuthenticationException
+from paramiko_shell_session import ParamikoShellSession
+from inventory_engine import load_inventory
 
 # Environment and configuration
 from dotenv import load_dotenv, set_key, find_dotenv
@@ -108,6 +110,7 @@ matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from streaming_reports import ReportJobManager, build_streaming_pdf, chunked_table_flowables
 
 # Terminal colors
 from colorama import Fore, Style, init as colorama_init
@@ -1227,13 +1230,16 @@ def load_active_inventory():
     try:
         active_inventory_data = {"data": [], "headers": []}
         
-        with open(inventory_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            active_inventory_data["headers"] = reader.fieldnames or []
-            raw_data = list(reader)
-            
-            # Apply column mapping to convert new CSV format to internal format
-            active_inventory_data["data"] = [map_csv_columns(device) for device in raw_data]
+        # Parsed once and cached by mtime/content hash (see inventory_engine)
+        inventory_table = load_inventory(inventory_path)
+        active_inventory_data["headers"] = list(inventory_table.headers)
+        
+        # Apply column mapping to convert new CSV format to internal format
+        active_inventory_data["data"] = [map_csv_columns(device) for device in inventory_table.rows()]
+        
+        ip_column = 'management_ip' if inventory_table.has_columns('management_ip') else 'ip_address'
+        for ip_value, rows in inventory_table.duplicates(ip_column).items():
+            log_to_ui_and_console(f"⚠️ Duplicate IP {ip_value} on inventory rows {', '.join(str(i + 1) for i in rows)}", console_only=True)
         
         # SECURITY: Validate that CSV doesn't contain credential fields
         security_validation = validate_inventory_security(active_inventory_data)
@@ -2817,7 +2823,10 @@ function generateReport(type) {
     fetch(endpoints[type], {method: 'POST'})
         .then(response => response.json())
         .then(data => {
-            if (data.success) {
+            if (data.success && data.job_id) {
+                alert(`${type.toUpperCase()} report queued: ${data.filename} - it will appear in the list when ready`);
+                location.reload();
+            } else if (data.success) {
                 alert(`${type.toUpperCase()} report generated: ${data.filename}`);
                 location.reload();
             } else {
@@ -3100,6 +3109,31 @@ def api_progress_summary():
             'summary': f"Processing {enhanced_progress['current_device']} ({enhanced_progress['completed_devices']}/{enhanced_progress['total_devices']})"
     })
 
+@app.route('/api/progress-devices')
+def api_progress_devices():
+    """API endpoint for per-device progress of every in-flight device, with throughput and ETA"""
+    progress_tracker = get_progress_tracker() if PROGRESS_TRACKER_AVAILABLE else None
+    if not progress_tracker:
+        return jsonify({
+            'success': False,
+            'message': 'Progress tracker not available' if not PROGRESS_TRACKER_AVAILABLE else 'Progress tracker not initialized',
+            'audit_status': audit_status
+        })
+
+    try:
+        return jsonify({
+            'success': True,
+            'device_progress': progress_tracker.get_device_progress(),
+            'audit_status': audit_status
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error getting device progress: {str(e)}',
+            'audit_status': audit_status
+        })
+
 @app.route('/api/start-audit', methods=['POST'])
 def api_start_audit():
     """API endpoint to start audit with enhanced credential security validation"""
@@ -3745,43 +3779,26 @@ def connect_to_device_via_jump_host(jump_client: paramiko.SSHClient, device: Dic
         log_to_ui_and_console(f"❌ Connection setup failed for {device_name}: {sanitize_log_message(str(e))}")
         return None, "CONNECTION_SETUP_FAIL"
 
-class ParamikoDeviceWrapper:
-    """Wrapper to make Paramiko behave like Netmiko for command execution"""
+class ParamikoDeviceWrapper(ParamikoShellSession):
+    """Wrapper to make Paramiko behave like Netmiko over one persistent shell channel per device"""
     
     def __init__(self, client: paramiko.SSHClient, device_name: str, enable_password: str = None):
-        self.client = client
-        self.device_name = device_name
-        self.enable_password = enable_password
+        super().__init__(client, device_name, enable_password, log_func=log_to_ui_and_console)
     
     def send_command(self, command: str, **kwargs) -> str:
-        """Send command and return output"""
+        """Send command on the shared shell channel and return output"""
         try:
             log_to_ui_and_console(f"📤 Executing on {self.device_name}: {command}")
             
             # NEW: Raw trace logging for command execution
             log_raw_trace(f"Executing command: {command}", command_type="CMD_EXEC", device=self.device_name)
             
-            stdin, stdout, stderr = self.client.exec_command(command, timeout=kwargs.get('timeout', 60))
-            
-            output = stdout.read().decode('utf-8', errors='ignore')
-            error_output = stderr.read().decode('utf-8', errors='ignore')
-            
-            # Close resources
-            for resource in [stdin, stdout, stderr]:
-                try:
-                    resource.close()
-                except Exception:
-                    pass
-            
-            if error_output:
-                log_to_ui_and_console(f"⚠️ Command stderr on {self.device_name}: {error_output}")
+            output = super().send_command(command, **kwargs)
             
             log_to_ui_and_console(f"📥 Command completed on {self.device_name}")
             
             # NEW: Raw trace logging for command output
             log_raw_trace(f"Command output length: {len(output)} chars", command_type="CMD_RESULT", device=self.device_name)
-            if error_output.strip():
-                log_raw_trace(f"Command stderr: {error_output.strip()[:100]}", command_type="CMD_ERROR", device=self.device_name)
             
             return output
             
@@ -3789,10 +3806,17 @@ class ParamikoDeviceWrapper:
             log_to_ui_and_console(f"❌ Command execution failed on {self.device_name}: {e}")
             return f"ERROR: {e}"
     
+    def send_commands(self, commands: List[str], **kwargs) -> List[str]:
+        """Pipeline several show commands in one round-trip window"""
+        log_raw_trace(f"Pipelining {len(commands)} commands", command_type="CMD_EXEC", device=self.device_name)
+        outputs = super().send_commands(commands, **kwargs)
+        log_raw_trace(f"Pipelined output length: {sum(len(o) for o in outputs)} chars", command_type="CMD_RESULT", device=self.device_name)
+        return outputs
+    
     def disconnect(self):
         """Disconnect from device"""
         try:
-            self.client.close()
+            super().disconnect()
             log_to_ui_and_console(f"🔌 Disconnected from {self.device_name}")
         except Exception as e:
             log_to_ui_and_console(f"⚠️ Error disconnecting from {self.device_name}: {e}")
@@ -4072,6 +4096,8 @@ def save_command_results_to_file(device_results: Dict[str, Any]):
     except Exception as e:
         log_to_ui_and_console(f"❌ Error saving command results: {e}")
 
+STAGE_STATUS_RE = re.compile(r"A([1-8]):")
+
 def update_progress_tracking(current_device: str, completed: int, total: int, status: str):
     """Update progress tracking and emit real-time updates"""
     global enhanced_progress, current_audit_progress
@@ -4091,7 +4117,13 @@ def update_progress_tracking(current_device: str, completed: int, total: int, st
         "percentage_complete": enhanced_progress["percent_complete"],
         "status_message": status
     })
-    
+
+    # Stage statuses ("A3: Authorization - R1") move the device in the multi-device model
+    stage_match = STAGE_STATUS_RE.match(status)
+    progress_tracker = get_progress_tracker() if PROGRESS_TRACKER_AVAILABLE else None
+    if stage_match and progress_tracker:
+        progress_tracker.update_device_stage(current_device, int(stage_match.group(1)) - 1)
+
     # Emit real-time update via WebSocket
     try:
         socketio.emit('progress_update', {
@@ -4104,6 +4136,18 @@ def update_progress_tracking(current_device: str, completed: int, total: int, st
     except Exception as e:
         log_to_ui_and_console(f"⚠️ WebSocket emission error: {e}", console_only=True)
 
+def start_device_progress(device_name: str, device_index: int):
+    """Record a device entering the audit in the multi-device progress model"""
+    progress_tracker = get_progress_tracker() if PROGRESS_TRACKER_AVAILABLE else None
+    if progress_tracker:
+        progress_tracker.start_device(device_name, device_index)
+
+def finish_device_progress(device_name: str):
+    """Record a device leaving the audit; its outcome is read from device_status_tracking"""
+    progress_tracker = get_progress_tracker() if PROGRESS_TRACKER_AVAILABLE else None
+    if progress_tracker:
+        progress_tracker.finish_device(device_name, device_status_tracking.get(device_name) in ("SUCCESS", "WARNING"))
+
 def run_complete_audit():
     """Main audit function that orchestrates the complete audit process"""
     global audit_status, enhanced_progress, device_status_tracking, command_logs, device_results, audit_results_summary
@@ -4170,8 +4214,14 @@ def run_complete_audit():
             # Phase 2: Device Processing with Enhanced Error Handling
             successful_devices = 0
             failed_devices = 0
-            
+            in_flight_device = None
+
             for i, device in enumerate(devices):
+                # The device body exits through many `continue`s: finish the previous device here
+                if in_flight_device:
+                    finish_device_progress(in_flight_device)
+                    in_flight_device = None
+
                 # Check for stop signal
                 if audit_status == "Stopping":
                     log_to_ui_and_console("🛑 Audit stop requested - terminating")
@@ -4196,9 +4246,12 @@ def run_complete_audit():
                         "reason": "No IP address configured"
                     })
                     failed_devices += 1
+                    finish_device_progress(device_name)
                     continue
-                
+
                 log_to_ui_and_console(f"\n📍 Processing device {i+1}/{total_devices}: {device_name}")
+                start_device_progress(device_name, i)
+                in_flight_device = device_name
                 update_progress_tracking(device_name, i, total_devices, f"Processing {device_name}")
                 
                 # Use Enhanced 8-Stage Audit if available
@@ -4453,7 +4506,10 @@ def run_complete_audit():
                     total_devices, 
                     f"Completed {completed}/{total_devices} devices"
                 )
-        
+
+            if in_flight_device:
+                finish_device_progress(in_flight_device)
+
         finally:
             # Always close jump host connection
             try:
@@ -4817,89 +4873,81 @@ def allowed_file(filename):
 # Global variables for report tracking
 device_results: Dict[str, Any] = {}
 audit_results_summary: Dict[str, Any] = {}
-
-def generate_professional_pdf_report(audit_results: Dict[str, Any], device_data: Dict[str, Any]) -> Optional[str]:
-    """Generate professional PDF report with enhanced formatting and visualizations (cross-platform safe)"""
-    try:
-        # Ensure reports directory exists using cross-platform utilities
-        reports_dir = get_safe_path(get_script_directory(), BASE_DIR_NAME)
-        ensure_path_exists(reports_dir)
-        
-        # Generate safe filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        pdf_filename = validate_filename(f"NetAuditPro_Report_{timestamp}.pdf")
-        pdf_filepath = get_safe_path(reports_dir, pdf_filename)
-        
-        # Create PDF document
-        doc = SimpleDocTemplate(pdf_filepath)
-        styles = getSampleStyleSheet()
-        story = []
-        
-        # Custom styles
-        title_style = styles['Title']
-        title_style.fontSize = 24
-        title_style.spaceAfter = 30
-        
-        heading_style = styles['Heading1']
-        heading_style.fontSize = 16
-        heading_style.spaceBefore = 20
-        heading_style.spaceAfter = 12
-        heading_style.textColor = colors.darkblue
-        
-        # Report header
-        story.append(Paragraph("NetAuditPro v3 - Comprehensive Network Audit Report", title_style))
-        story.append(Spacer(1, 12))
-        
-        # Executive summary
-        summary_data = [
-            ["Executive Summary", ""],
-            ["Report Generated:", datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
-            ["Total Devices Audited:", len(device_data)],
-            ["Successful Connections:", audit_results.get('successful_devices', 0)],
-            ["Failed Connections:", audit_results.get('failed_devices', 0)],
-            ["Success Rate:", f"{audit_results.get('success_rate', 0):.1f}%"],
-            ["Audit Duration:", audit_results.get('duration', 'N/A')],
+report_jobs = ReportJobManager()  # Background report builds, addressed by job id
+
+def _iter_device_status_rows(device_data: Dict[str, Any]):
+    """Yield one PDF table row per device without materialising the full table"""
+    for device_name, device_info in device_data.items():
+        status = device_info.get('status', 'Unknown')
+        
+        # Color code status
+        if status == 'success':
+            status_display = 'Success'
+        elif status == 'partial':
+            status_display = 'Warning'
+        else:
+            status_display = 'Failed'
+        
+        yield [
+            device_name,
+            device_info.get('ip_address', 'N/A'),
+            status_display,
+            str(len(device_info.get('commands', {}))),
+            device_info.get('timestamp', 'N/A')
         ]
-        
-        summary_table = Table(summary_data, colWidths=[3*inch, 3*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lightblue),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
-        story.append(summary_table)
-        story.append(Spacer(1, 20))
-        
-        # Device status section
-        story.append(Paragraph("Device Status Overview", heading_style))
-        
-        device_status_data = [["Device", "IP Address", "Status", "Commands Executed", "Last Check"]]
-        
-        for device_name, device_info in device_data.items():
-            status = device_info.get('status', 'Unknown')
-            ip_addr = device_info.get('ip_address', 'N/A')
-            cmd_count = len(device_info.get('commands', {}))
-            last_check = device_info.get('timestamp', 'N/A')
-            
-            # Color code status
-            if status == 'success':
-                status_display = 'Success'
-            elif status == 'partial':
-                status_display = 'Warning'
-            else:
-                status_display = 'Failed'
-            
-            device_status_data.append([
-                device_name, ip_addr, status_display, str(cmd_count), last_check
-            ])
-        
-        device_table = Table(device_status_data, colWidths=[1.2*inch, 1.5*inch, 1*inch, 1*inch, 1.3*inch])
-        device_table.setStyle(TableStyle([
+
+def _iter_professional_report_flowables(audit_results: Dict[str, Any], device_data: Dict[str, Any], report_id: str):
+    """Yield the report flowables in order; device rows are streamed in table chunks"""
+    styles = getSampleStyleSheet()
+    
+    # Custom styles
+    title_style = styles['Title']
+    title_style.fontSize = 24
+    title_style.spaceAfter = 30
+    
+    heading_style = styles['Heading1']
+    heading_style.fontSize = 16
+    heading_style.spaceBefore = 20
+    heading_style.spaceAfter = 12
+    heading_style.textColor = colors.darkblue
+    
+    # Report header
+    yield Paragraph("NetAuditPro v3 - Comprehensive Network Audit Report", title_style)
+    yield Spacer(1, 12)
+    
+    # Executive summary
+    summary_data = [
+        ["Executive Summary", ""],
+        ["Report Generated:", datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
+        ["Total Devices Audited:", len(device_data)],
+        ["Successful Connections:", audit_results.get('successful_devices', 0)],
+        ["Failed Connections:", audit_results.get('failed_devices', 0)],
+        ["Success Rate:", f"{audit_results.get('success_rate', 0):.1f}%"],
+        ["Audit Duration:", audit_results.get('duration', 'N/A')],
+    ]
+    
+    summary_table = Table(summary_data, colWidths=[3*inch, 3*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.lightblue),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]))
+    yield summary_table
+    yield Spacer(1, 20)
+    
+    # Device status section
+    yield Paragraph("Device Status Overview", heading_style)
+    
+    yield from chunked_table_flowables(
+        ["Device", "IP Address", "Status", "Commands Executed", "Last Check"],
+        _iter_device_status_rows(device_data),
+        [1.2*inch, 1.5*inch, 1*inch, 1*inch, 1.3*inch],
+        [
             ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -4907,18 +4955,33 @@ def generate_professional_pdf_report(audit_results: Dict[str, Any], device_data:
             ('FONTSIZE', (0, 0), (-1, -1), 9),
             ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
             ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
-        story.append(device_table)
-        story.append(Spacer(1, 20))
-        
-        # Footer
-        story.append(Spacer(1, 30))
-        story.append(Paragraph("Generated by NetAuditPro v3 - Professional Network Audit Solution", styles['Normal']))
-        story.append(Paragraph(f"Report ID: {timestamp}", styles['Normal']))
+        ]
+    )
+    yield Spacer(1, 20)
+    
+    # Footer
+    yield Spacer(1, 30)
+    yield Paragraph("Generated by NetAuditPro v3 - Professional Network Audit Solution", styles['Normal'])
+    yield Paragraph(f"Report ID: {report_id}", styles['Normal'])
+
+def _new_pdf_report_path() -> Tuple[str, str]:
+    """Return (report_id, pdf_filepath) for a new timestamped report"""
+    reports_dir = get_safe_path(get_script_directory(), BASE_DIR_NAME)
+    ensure_path_exists(reports_dir)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return timestamp, get_safe_path(reports_dir, validate_filename(f"NetAuditPro_Report_{timestamp}.pdf"))
+
+def generate_professional_pdf_report(audit_results: Dict[str, Any], device_data: Dict[str, Any],
+                                     pdf_filepath: Optional[str] = None) -> Optional[str]:
+    """Generate professional PDF report, streaming device rows into chunked tables (cross-platform safe)"""
+    try:
+        if pdf_filepath:
+            report_id = os.path.splitext(os.path.basename(pdf_filepath))[0].replace("NetAuditPro_Report_", "")
+        else:
+            report_id, pdf_filepath = _new_pdf_report_path()
         
-        # Build PDF
-        doc.build(story)
-        log_to_ui_and_console(f"📊 Professional PDF report generated: {pdf_filename}")
+        build_streaming_pdf(pdf_filepath, _iter_professional_report_flowables(audit_results, device_data, report_id))
+        log_to_ui_and_console(f"📊 Professional PDF report generated: {os.path.basename(pdf_filepath)}")
         
         return pdf_filepath
         
@@ -4926,6 +4989,41 @@ def generate_professional_pdf_report(audit_results: Dict[str, Any], device_data:
         log_to_ui_and_console(f"❌ Error generating PDF report: {e}")
         return None
 
+@app.route('/api/generate-pdf-report', methods=['POST'])
+def api_generate_pdf_report():
+    """Queue a PDF report build on the background worker and return its job id"""
+    _, pdf_filepath = _new_pdf_report_path()
+    job_id = report_jobs.submit(
+        "pdf", generate_professional_pdf_report,
+        dict(audit_results_summary), dict(device_results), pdf_filepath
+    )
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'filename': os.path.basename(pdf_filepath),
+        'status_url': url_for('api_report_job_status', job_id=job_id),
+        'download_url': url_for('api_report_job_download', job_id=job_id)
+    })
+
+@app.route('/api/report-jobs/<job_id>')
+def api_report_job_status(job_id):
+    """Status of a background report job"""
+    job = report_jobs.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'message': 'Unknown report job'}), 404
+    job['filename'] = os.path.basename(job.pop('filepath') or '') or None
+    return jsonify({'success': True, 'job': job})
+
+@app.route('/api/report-jobs/<job_id>/download')
+def api_report_job_download(job_id):
+    """Download the file produced by a completed report job"""
+    job = report_jobs.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'message': 'Unknown report job'}), 404
+    if job['status'] != 'completed':
+        return jsonify({'success': False, 'message': f"Report job is {job['status']}", 'status': job['status']}), 409
+    return send_from_directory(os.path.dirname(job['filepath']), os.path.basename(job['filepath']), as_attachment=True)
+
 @app.route('/api/timing')
 def api_timing():
     """API endpoint for comprehensive timing information"""
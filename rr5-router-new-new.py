@@ -28,12 +28,17 @@ import time
 import logging
 import re
 import random
+import socket
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 import subprocess
 from dataclasses import dataclass, asdict
 from collections import defaultdict
+from collections.abc import Mapping
 
 # Network automation libraries
 try:
@@ -44,6 +49,8 @@ except ImportError:
     NETMIKO_AVAILABLE = False
     print("[WARNING] Netmiko not available, using Paramiko only")
 
+from paramiko_shell_session import ParamikoShellSession
+
 # Web interface libraries
 try:
     from flask import Flask, render_template, request, jsonify, send_file
@@ -60,6 +67,13 @@ try:
 except ImportError:
     PANDAS_AVAILABLE = False
 
+# Array library for full routing-table comparison
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 # Load environment variables
 try:
     from dotenv import load_dotenv
@@ -86,6 +100,7 @@ DEFAULT_CONFIG = {
     "output_dir": "RR5-AUDIT-RESULTS",
     "web_port": 5015,
     "timeout": 30,
+    "max_workers": 20,
     "ping_count": 10,
     "ping_timeout": 2,
     "ping_size": 1500
@@ -106,7 +121,9 @@ HEALTH_THRESHOLDS = {
     "temperature_max": 75,  # Temperature should be < 75°C
     "bgp_prefix_delta": 2,  # BGP prefix changes ≤ 2
     "cpu_delta": 10,        # CPU delta ≤ 10%
-    "crc_error_delta": 0    # CRC errors delta = 0
+    "crc_error_delta": 0,   # CRC errors delta = 0
+    "route_removed_max": 0, # No prefix may disappear from the routing table
+    "route_change_max": 2   # Added prefixes / next-hop changes ≤ 2
 }
 
 # ============================================================================
@@ -302,8 +319,40 @@ class NetworkConnector:
         self.config = config
         self.logger = logger
         self.connections = {}
+        self.held_sessions = set()
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def device_session(self, device: DeviceInfo):
+        """Hold one session to the device; connect/disconnect calls inside reuse it"""
+        connection = self.connect_device(device)
+        if not connection:
+            yield None
+            return
+        
+        with self._lock:
+            self.held_sessions.add(device.name)
+        try:
+            yield connection
+        finally:
+            with self._lock:
+                self.held_sessions.discard(device.name)
+            self.disconnect_device(device.name)
     
     def connect_device(self, device: DeviceInfo) -> Optional[Any]:
+        """Connect to device, reusing an open session"""
+        with self._lock:
+            connection = self.connections.get(device.name)
+        if connection:
+            return connection
+        
+        connection = self._open_connection(device)
+        if connection:
+            with self._lock:
+                self.connections[device.name] = connection
+        return connection
+    
+    def _open_connection(self, device: DeviceInfo) -> Optional[Any]:
         """Connect to device with fallback mechanism"""
         connection_params = {
             'device_type': device.device_type,
@@ -325,7 +374,6 @@ class NetworkConnector:
                 connection = ConnectHandler(**connection_params)
                 if self.config['device_enable']:
                     connection.enable()
-                self.connections[device.name] = connection
                 self.logger.log(f"✅ Connected to {device.name} successfully")
                 return connection
             except Exception as e:
@@ -344,8 +392,9 @@ class NetworkConnector:
             )
             
             # Wrap Paramiko client to mimic Netmiko interface
-            wrapper = ParamikoWrapper(client, self.config['device_enable'])
-            self.connections[device.name] = wrapper
+            wrapper = ParamikoWrapper(client, self.config['device_enable'], device.name)
+            if self.config['device_enable']:
+                wrapper.enable()
             self.logger.log(f"✅ Connected to {device.name} via Paramiko")
             return wrapper
             
@@ -354,57 +403,51 @@ class NetworkConnector:
             return None
     
     def disconnect_device(self, device_name: str):
-        """Disconnect from device"""
-        if device_name in self.connections:
+        """Disconnect from device (held sessions stay open until released)"""
+        with self._lock:
+            if device_name in self.held_sessions:
+                return
+            connection = self.connections.pop(device_name, None)
+        if connection:
             try:
-                self.connections[device_name].disconnect()
-                del self.connections[device_name]
+                connection.disconnect()
                 self.logger.log(f"Disconnected from {device_name}")
             except Exception as e:
                 self.logger.log(f"Error disconnecting from {device_name}: {e}", "WARNING")
     
     def disconnect_all(self):
         """Disconnect from all devices"""
+        with self._lock:
+            self.held_sessions.clear()
         for device_name in list(self.connections.keys()):
             self.disconnect_device(device_name)
 
-class ParamikoWrapper:
-    """Paramiko wrapper to mimic Netmiko interface"""
+class ParamikoWrapper(ParamikoShellSession):
+    """Paramiko wrapper to mimic Netmiko interface over one persistent shell channel"""
     
-    def __init__(self, client: paramiko.SSHClient, enable_password: str = None):
-        self.client = client
-        self.enable_password = enable_password
-        self.shell = None
+    def __init__(self, client: paramiko.SSHClient, enable_password: str = None, device_name: str = "device"):
+        super().__init__(client, device_name, enable_password)
     
     def send_command(self, command: str, **kwargs) -> str:
         """Send command and return output"""
         try:
-            stdin, stdout, stderr = self.client.exec_command(command, timeout=kwargs.get('timeout', 30))
-            output = stdout.read().decode('utf-8')
-            error = stderr.read().decode('utf-8')
-            
-            if error:
-                raise Exception(f"Command error: {error}")
-            
-            return output
+            return super().send_command(command, **kwargs)
         except Exception as e:
             raise Exception(f"Command execution failed: {e}")
     
     def enable(self):
-        """Enter enable mode (simplified)"""
+        """Enter enable mode, answering the enable password prompt"""
         if self.enable_password:
             try:
-                self.send_command("enable")
-                # Note: This is a simplified implementation
-                # Real implementation would handle enable password prompt
-            except:
+                super().enable()
+            except Exception:
                 pass
     
     def disconnect(self):
         """Disconnect from device"""
         try:
-            self.client.close()
-        except:
+            super().disconnect()
+        except Exception:
             pass
 
 # ============================================================================
@@ -618,6 +661,206 @@ class DataParser:
             self.logger.log(f"Error extracting random routes: {e}", "WARNING")
         
         return routes
+    
+    def parse_route_table(self, output: str) -> Optional['RouteTable']:
+        """Parse the complete 'show ip route' output"""
+        try:
+            return RouteTable.from_show_ip_route(output)
+        except Exception as e:
+            self.logger.log(f"Error parsing routing table: {e}", "WARNING")
+            return None
+
+# ============================================================================
+# ROUTING TABLE DIFF ENGINE
+# ============================================================================
+
+_IPV4 = r'\d+\.\d+\.\d+\.\d+'
+_ROUTE_ENTRY_RE = re.compile(rf'^([A-Za-z][A-Za-z0-9*+%&]*(?: [A-Za-z0-9]{{1,2}})?)\s+({_IPV4})(?:/(\d+))?(.*)$')
+_SUBNETTED_RE = re.compile(rf'^\s+({_IPV4})/(\d+)\s+is\s+(variably\s+)?subnetted')
+_VIA_RE = re.compile(rf'\bvia\s+({_IPV4})')
+
+def _ip_to_int(address: str) -> int:
+    return int.from_bytes(socket.inet_aton(address), 'big')
+
+def _int_to_ip(value: int) -> str:
+    return socket.inet_ntoa(int(value).to_bytes(4, 'big'))
+
+def _sorted_unique(values):
+    # np.unique without its sort: values are already sorted
+    if values.size == 0:
+        return values
+    keep = np.empty(values.size, dtype=bool)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+def _sorted_contains(haystack, values):
+    # np.isin for a sorted haystack: one binary search per value
+    positions = np.minimum(np.searchsorted(haystack, values), max(haystack.size - 1, 0))
+    return haystack[positions] == values if haystack.size else np.zeros(values.size, dtype=bool)
+
+def _classful_length(network: int) -> int:
+    first_octet = network >> 24
+    return 8 if first_octet < 128 else 16 if first_octet < 192 else 24
+
+class RouteTable:
+    """Complete IPv4 routing table of one device.
+    
+    Every path is a (prefix, next hop) pair. The prefix packs network and
+    mask length into one integer (network << 8 | length); next hop 0 means
+    directly connected / no next hop. With numpy the pairs are kept as
+    sorted uint64/uint32 arrays so two tables diff with sorted set
+    operations and are stored as compressed .npz files; without it plain
+    Python sets and JSON are used.
+    """
+    
+    FILE_SUFFIX = '.npz' if NUMPY_AVAILABLE else '.json'
+    
+    def __init__(self, prefixes, next_hops):
+        if NUMPY_AVAILABLE:
+            prefixes = np.asarray(prefixes, dtype=np.uint64)
+            next_hops = np.asarray(next_hops, dtype=np.uint32)
+            same = prefixes[1:] == prefixes[:-1]
+            if np.any(prefixes[1:] < prefixes[:-1]) or np.any(same & (next_hops[1:] < next_hops[:-1])):
+                order = np.lexsort((next_hops, prefixes))
+                prefixes, next_hops = prefixes[order], next_hops[order]
+            self.prefixes, self.next_hops = prefixes, next_hops
+        else:
+            self.prefixes, self.next_hops = list(prefixes), list(next_hops)
+    
+    def __len__(self) -> int:
+        return len(self.prefixes)
+    
+    @property
+    def prefix_count(self) -> int:
+        """Number of distinct prefixes (ECMP paths counted once)"""
+        if NUMPY_AVAILABLE:
+            return int(_sorted_unique(self.prefixes).size)
+        return len(set(self.prefixes))
+    
+    @staticmethod
+    def format_prefix(key: int) -> str:
+        return f"{_int_to_ip(int(key) >> 8)}/{int(key) & 0xFF}"
+    
+    @classmethod
+    def from_show_ip_route(cls, output: str) -> 'RouteTable':
+        """Parse IOS / IOS XE / IOS XR 'show ip route' output.
+        
+        Handles "is subnetted" headers (entries without a mask), ECMP and
+        wrapped entries whose next hops follow on continuation lines.
+        """
+        prefixes, next_hops = array('Q'), array('I')
+        subnet = None       # (network, mask, length) of the last "is subnetted" header
+        current = None      # prefix key of the last entry
+        pending = False     # entry seen, its next hop not yet
+        
+        for line in output.splitlines():
+            header = _SUBNETTED_RE.match(line)
+            if header:
+                # "172.16.0.0/24 is subnetted": /24 subnets of the classful network 172.16.0.0
+                network = _ip_to_int(header.group(1))
+                mask = (0xFFFFFFFF << (32 - _classful_length(network))) & 0xFFFFFFFF
+                subnet = None if header.group(3) else (network & mask, mask, int(header.group(2)))
+                continue
+            
+            entry = _ROUTE_ENTRY_RE.match(line)
+            if entry:
+                if pending:
+                    prefixes.append(current)
+                    next_hops.append(0)
+                network = _ip_to_int(entry.group(2))
+                if entry.group(3) is not None:
+                    length = int(entry.group(3))
+                elif subnet and network & subnet[1] == subnet[0]:
+                    length = subnet[2]
+                else:
+                    length = _classful_length(network)
+                current = network << 8 | length
+                
+                rest = entry.group(4)
+                via = _VIA_RE.search(rest)
+                pending = not rest.strip()
+                if not pending:
+                    prefixes.append(current)
+                    next_hops.append(_ip_to_int(via.group(1)) if via else 0)
+                continue
+            
+            if current is not None and line[:1].isspace():
+                via = _VIA_RE.search(line)
+                if via:
+                    prefixes.append(current)
+                    next_hops.append(_ip_to_int(via.group(1)))
+                    pending = False
+        
+        if pending:
+            prefixes.append(current)
+            next_hops.append(0)
+        
+        if NUMPY_AVAILABLE:
+            return cls(np.frombuffer(prefixes, dtype=np.uint64), np.frombuffer(next_hops, dtype=np.uint32))
+        return cls(prefixes, next_hops)
+    
+    def diff(self, post: 'RouteTable', sample_size: int = 5) -> Dict[str, Any]:
+        """Compare this (pre) table with a post table.
+        
+        Returns counts of added, removed and next-hop-changed prefixes plus
+        up to sample_size formatted prefixes of each kind.
+        """
+        if NUMPY_AVAILABLE:
+            pre_prefixes, post_prefixes = _sorted_unique(self.prefixes), _sorted_unique(post.prefixes)
+            removed = np.setdiff1d(pre_prefixes, post_prefixes, assume_unique=True)
+            added = np.setdiff1d(post_prefixes, pre_prefixes, assume_unique=True)
+            
+            # Number prefixes within the union so each (prefix, next hop) pair packs into one
+            # uint64; the pairs come out already sorted because the tables are
+            universe = _sorted_unique(np.sort(np.concatenate((pre_prefixes, post_prefixes)), kind='stable'))
+            shift = np.uint64(32)
+            pre_pairs = _sorted_unique(np.searchsorted(universe, self.prefixes).astype(np.uint64) << shift
+                                       | self.next_hops.astype(np.uint64))
+            post_pairs = _sorted_unique(np.searchsorted(universe, post.prefixes).astype(np.uint64) << shift
+                                        | post.next_hops.astype(np.uint64))
+            moved = universe[_sorted_unique(np.setxor1d(pre_pairs, post_pairs, assume_unique=True) >> shift).astype(np.intp)]
+            changed = moved[_sorted_contains(pre_prefixes, moved) & _sorted_contains(post_prefixes, moved)]
+        else:
+            pre_prefixes, post_prefixes = set(self.prefixes), set(post.prefixes)
+            removed = sorted(pre_prefixes - post_prefixes)
+            added = sorted(post_prefixes - pre_prefixes)
+            moved = {prefix for prefix, _ in set(zip(self.prefixes, self.next_hops)) ^ set(zip(post.prefixes, post.next_hops))}
+            changed = sorted(moved & pre_prefixes & post_prefixes)
+        
+        return {
+            'pre_prefixes': len(pre_prefixes),
+            'post_prefixes': len(post_prefixes),
+            'added': len(added),
+            'removed': len(removed),
+            'next_hop_changed': len(changed),
+            'samples': {
+                'added': [self.format_prefix(key) for key in added[:sample_size]],
+                'removed': [self.format_prefix(key) for key in removed[:sample_size]],
+                'next_hop_changed': [self.format_prefix(key) for key in changed[:sample_size]]
+            }
+        }
+    
+    def save(self, filepath: str):
+        """Save as compressed .npz (numpy) or JSON"""
+        if NUMPY_AVAILABLE:
+            with open(filepath, 'wb') as f:
+                np.savez_compressed(f, prefixes=self.prefixes, next_hops=self.next_hops)
+        else:
+            with open(filepath, 'w') as f:
+                json.dump({'prefixes': list(self.prefixes), 'next_hops': list(self.next_hops)}, f)
+    
+    @classmethod
+    def load(cls, filepath: str) -> 'RouteTable':
+        """Load a table written by save()"""
+        if str(filepath).endswith('.npz'):
+            if not NUMPY_AVAILABLE:
+                raise ImportError("numpy is required to load .npz routing tables")
+            with np.load(filepath) as data:
+                return cls(data['prefixes'], data['next_hops'])
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+        return cls(data['prefixes'], data['next_hops'])
 
 # ============================================================================
 # AUDIT PHASES
@@ -854,6 +1097,12 @@ class Phase2DataCollector:
                 sample_routes = self.parser.extract_random_routes(result['output'])
                 if sample_routes:
                     data['sample_routes'].extend(sample_routes)
+                
+                # Keep the complete table for the full-table comparison
+                if cmd == 'show ip route':
+                    route_table = self.parser.parse_route_table(result['output'])
+                    if route_table is not None:
+                        data['route_table'] = route_table
     
     def _test_reachability(self, connection: Any, device: DeviceInfo, data: Dict):
         """Test reachability to key destinations"""
@@ -864,32 +1113,92 @@ class Phase2DataCollector:
             'timestamp': datetime.now().isoformat()
         }
 
+STATUS_NAMES = ("PASS", "WARN", "FAIL")
+
 class Phase3Comparator:
     """Phase 3: Post-check and Comparison"""
     
-    def __init__(self, logger: AuditLogger):
+    def __init__(self, logger: AuditLogger, include_passed: bool = True):
         self.logger = logger
         self.thresholds = HEALTH_THRESHOLDS
+        self.include_passed = include_passed
     
-    def compare_datasets(self, pre_data: Dict, post_data: Dict) -> List[AuditResult]:
-        """Compare pre and post datasets"""
+    def compare_datasets(self, pre_data: Mapping, post_data: Mapping) -> List[AuditResult]:
+        """Compare pre and post datasets (dicts, or PhaseSnapshots read one device at a time)"""
         self.logger.log("🔄 Phase 3: Comparing pre and post data")
         
+        if not NUMPY_AVAILABLE:
+            return self._compare_datasets_per_device(pre_data, post_data)
+        
+        # Gather the metrics of all devices into columns, evaluate every threshold
+        # in one array pass, then restore the per-device result order
+        keyed_results = []
+        health = {column: [] for column in ('device_index', 'device', 'cpu_pre', 'cpu_post', 'mem_pre', 'mem_post')}
+        interfaces = {column: [] for column in ('device_index', 'position', 'device', 'name',
+                                                'state_pre', 'state_post', 'crc_pre', 'crc_post')}
+        routing = {column: [] for column in ('device_index', 'device', 'routes_pre', 'routes_post')}
+        
+        for device_index, device_name in enumerate(pre_data.keys()):
+            if device_name not in post_data:
+                keyed_results.append(((device_index, 0, 0, 0), self._missing_device_result(device_name)))
+                continue
+            
+            pre_entry, post_entry = pre_data[device_name], post_data[device_name]
+            
+            pre_health, post_health = pre_entry.get('health'), post_entry.get('health')
+            if pre_health and post_health:
+                health['device_index'].append(device_index)
+                health['device'].append(device_name)
+                health['cpu_pre'].append(pre_health.get('cpu_percent', 0))
+                health['cpu_post'].append(post_health.get('cpu_percent', 0))
+                health['mem_pre'].append(pre_health.get('memory_free_percent', 100))
+                health['mem_post'].append(post_health.get('memory_free_percent', 100))
+            
+            pre_device, post_device = pre_entry.get('data'), post_entry.get('data')
+            if not (pre_device and post_device):
+                continue
+            
+            pre_interfaces = {intf['name']: intf for intf in pre_device.get('interfaces', [])}
+            post_interfaces = {intf['name']: intf for intf in post_device.get('interfaces', [])}
+            for position, (intf_name, pre_intf) in enumerate(pre_interfaces.items()):
+                post_intf = post_interfaces.get(intf_name)
+                if post_intf is None:
+                    continue
+                interfaces['device_index'].append(device_index)
+                interfaces['position'].append(position)
+                interfaces['device'].append(device_name)
+                interfaces['name'].append(intf_name)
+                interfaces['state_pre'].append(pre_intf.get('status'))
+                interfaces['state_post'].append(post_intf.get('status'))
+                interfaces['crc_pre'].append(pre_intf.get('crc_errors', 0))
+                interfaces['crc_post'].append(post_intf.get('crc_errors', 0))
+            
+            routing['device_index'].append(device_index)
+            routing['device'].append(device_name)
+            routing['routes_pre'].append(pre_device.get('routing', {}).get('total_routes', 0))
+            routing['routes_post'].append(post_device.get('routing', {}).get('total_routes', 0))
+            
+            # Per-route checks stay row-wise
+            for section, compare in ((4, self._compare_sample_routes), (5, self._compare_route_tables)):
+                for row, result in enumerate(compare(device_name, pre_device, post_device)):
+                    if self.include_passed or result.status != "PASS":
+                        keyed_results.append(((device_index, section, row, 0), result))
+        
+        keyed_results.extend(self._evaluate_health(health))
+        keyed_results.extend(self._evaluate_interfaces(interfaces))
+        keyed_results.extend(self._evaluate_routing(routing))
+        keyed_results.sort(key=lambda item: item[0])
+        
+        return [result for _, result in keyed_results]
+    
+    def _compare_datasets_per_device(self, pre_data: Mapping, post_data: Mapping) -> List[AuditResult]:
+        """Row-by-row comparison (used without numpy)"""
         results = []
         
         # Compare each device
         for device_name in pre_data.keys():
             if device_name not in post_data:
-                results.append(AuditResult(
-                    check_name=f"{device_name}_availability",
-                    category="device",
-                    pre_value="Available",
-                    post_value="Missing",
-                    delta="Device not found in post-check",
-                    status="FAIL",
-                    threshold="Available",
-                    message=f"Device {device_name} not found in post-check data"
-                ))
+                results.append(self._missing_device_result(device_name))
                 continue
             
             device_results = self._compare_device_data(
@@ -899,6 +1208,141 @@ class Phase3Comparator:
             )
             results.extend(device_results)
         
+        if not self.include_passed:
+            results = [result for result in results if result.status != "PASS"]
+        return results
+    
+    def _missing_device_result(self, device_name: str) -> AuditResult:
+        return AuditResult(
+            check_name=f"{device_name}_availability",
+            category="device",
+            pre_value="Available",
+            post_value="Missing",
+            delta="Device not found in post-check",
+            status="FAIL",
+            threshold="Available",
+            message=f"Device {device_name} not found in post-check data"
+        )
+    
+    def _materialize(self, status_codes) -> List[Tuple[int, str]]:
+        """(row, status) for the rows that need an AuditResult"""
+        rows = range(len(status_codes)) if self.include_passed else np.flatnonzero(status_codes).tolist()
+        codes = status_codes.tolist()
+        return [(i, STATUS_NAMES[codes[i]]) for i in rows]
+    
+    def _evaluate_health(self, health: Dict[str, List]) -> List[Tuple[Tuple, AuditResult]]:
+        """CPU and free-memory thresholds for all devices in one pass"""
+        if not health['device']:
+            return []
+        
+        cpu_pre, cpu_post = health['cpu_pre'], health['cpu_post']
+        mem_pre, mem_post = health['mem_pre'], health['mem_post']
+        
+        cpu_pre_array = np.asarray(cpu_pre, dtype=float)
+        cpu_post_array = np.asarray(cpu_post, dtype=float)
+        cpu_status = np.where(cpu_post_array > self.thresholds['cpu_max'], 2,
+                              np.where(np.abs(cpu_post_array - cpu_pre_array) > self.thresholds['cpu_delta'], 1, 0))
+        mem_status = np.where(np.asarray(mem_post, dtype=float) > self.thresholds['memory_min'], 0, 2)
+        
+        results = []
+        for i, status in self._materialize(cpu_status):
+            device_name = health['device'][i]
+            cpu_delta = cpu_post[i] - cpu_pre[i]
+            results.append(((health['device_index'][i], 1, 0, 0), AuditResult(
+                check_name=f"{device_name}_cpu_usage",
+                category="health",
+                pre_value=f"{cpu_pre[i]}%",
+                post_value=f"{cpu_post[i]}%",
+                delta=f"{cpu_delta:+.1f}%",
+                status=status,
+                threshold=f"<{self.thresholds['cpu_max']}%, Δ<{self.thresholds['cpu_delta']}%",
+                message=f"CPU usage: {cpu_pre[i]}% → {cpu_post[i]}% (Δ{cpu_delta:+.1f}%)"
+            )))
+        
+        for i, status in self._materialize(mem_status):
+            results.append(((health['device_index'][i], 1, 1, 0), AuditResult(
+                check_name=f"{health['device'][i]}_memory_free",
+                category="health",
+                pre_value=f"{mem_pre[i]:.1f}%",
+                post_value=f"{mem_post[i]:.1f}%",
+                delta=f"{mem_post[i] - mem_pre[i]:+.1f}%",
+                status=status,
+                threshold=f">{self.thresholds['memory_min']}%",
+                message=f"Free memory: {mem_pre[i]:.1f}% → {mem_post[i]:.1f}%"
+            )))
+        
+        return results
+    
+    def _evaluate_interfaces(self, interfaces: Dict[str, List]) -> List[Tuple[Tuple, AuditResult]]:
+        """Interface state and CRC thresholds for all interfaces in one pass"""
+        if not interfaces['name']:
+            return []
+        
+        state_pre, state_post = interfaces['state_pre'], interfaces['state_post']
+        crc_pre, crc_post = interfaces['crc_pre'], interfaces['crc_post']
+        
+        state_post_array = np.array(state_post, dtype=object)
+        state_changed = np.array(state_pre, dtype=object) != state_post_array
+        state_status = np.where(state_post_array == 'down', 2, 1)
+        crc_status = np.where(np.asarray(crc_post, dtype=np.int64) == np.asarray(crc_pre, dtype=np.int64), 0, 2)
+        
+        results = []
+        for i in np.flatnonzero(state_changed).tolist():
+            intf_name = interfaces['name'][i]
+            pre_state = state_pre[i] if state_pre[i] is not None else 'unknown'
+            post_state = state_post[i] if state_post[i] is not None else 'unknown'
+            results.append(((interfaces['device_index'][i], 2, interfaces['position'][i], 0), AuditResult(
+                check_name=f"{interfaces['device'][i]}_{intf_name}_status",
+                category="interface",
+                pre_value=pre_state,
+                post_value=post_state,
+                delta="Status changed",
+                status=STATUS_NAMES[state_status[i]],
+                threshold="up",
+                message=f"Interface {intf_name} status changed: {state_pre[i]} → {state_post[i]}"
+            )))
+        
+        for i, status in self._materialize(crc_status):
+            intf_name = interfaces['name'][i]
+            crc_delta = crc_post[i] - crc_pre[i]
+            results.append(((interfaces['device_index'][i], 2, interfaces['position'][i], 1), AuditResult(
+                check_name=f"{interfaces['device'][i]}_{intf_name}_crc_errors",
+                category="interface",
+                pre_value=str(crc_pre[i]),
+                post_value=str(crc_post[i]),
+                delta=f"+{crc_delta}" if crc_delta > 0 else str(crc_delta),
+                status=status,
+                threshold="0",
+                message=f"CRC errors on {intf_name}: {crc_pre[i]} → {crc_post[i]}"
+            )))
+        
+        return results
+    
+    def _evaluate_routing(self, routing: Dict[str, List]) -> List[Tuple[Tuple, AuditResult]]:
+        """Total-route thresholds for all devices in one pass"""
+        if not routing['device']:
+            return []
+        
+        routes_pre, routes_post = routing['routes_pre'], routing['routes_post']
+        
+        route_delta = np.abs(np.asarray(routes_post, dtype=np.int64) - np.asarray(routes_pre, dtype=np.int64))
+        route_status = np.where(route_delta > self.thresholds['bgp_prefix_delta'],
+                                np.where(route_delta <= 5, 1, 2), 0)
+        
+        results = []
+        for i, status in self._materialize(route_status):
+            delta = routes_post[i] - routes_pre[i]
+            results.append(((routing['device_index'][i], 3, 0, 0), AuditResult(
+                check_name=f"{routing['device'][i]}_total_routes",
+                category="routing",
+                pre_value=str(routes_pre[i]),
+                post_value=str(routes_post[i]),
+                delta=f"{delta:+d}",
+                status=status,
+                threshold=f"Δ≤{self.thresholds['bgp_prefix_delta']}",
+                message=f"Total routes: {routes_pre[i]} → {routes_post[i]} (Δ{delta:+d})"
+            )))
+        
         return results
     
     def _compare_device_data(self, device_name: str, pre_data: Dict, post_data: Dict) -> List[AuditResult]:
@@ -906,12 +1350,12 @@ class Phase3Comparator:
         results = []
         
         # Compare health metrics
-        if 'health' in pre_data and 'health' in post_data:
+        if pre_data.get('health') and post_data.get('health'):
             health_results = self._compare_health_metrics(device_name, pre_data['health'], post_data['health'])
             results.extend(health_results)
         
         # Compare interface metrics
-        if 'data' in pre_data and 'data' in post_data:
+        if pre_data.get('data') and post_data.get('data'):
             interface_results = self._compare_interfaces(device_name, pre_data['data'], post_data['data'])
             results.extend(interface_results)
             
@@ -922,6 +1366,10 @@ class Phase3Comparator:
             # Compare sample routes
             route_results = self._compare_sample_routes(device_name, pre_data['data'], post_data['data'])
             results.extend(route_results)
+            
+            # Compare complete routing tables
+            table_results = self._compare_route_tables(device_name, pre_data['data'], post_data['data'])
+            results.extend(table_results)
         
         return results
     
@@ -1084,6 +1532,47 @@ class Phase3Comparator:
                 ))
         
         return results
+    
+    def _compare_route_tables(self, device_name: str, pre_data: Dict, post_data: Dict) -> List[AuditResult]:
+        """Compare complete routing tables"""
+        results = []
+        
+        pre_file = pre_data.get('route_table_file')
+        post_file = post_data.get('route_table_file')
+        if not pre_file or not post_file:
+            return results
+        
+        try:
+            diff = RouteTable.load(pre_file).diff(RouteTable.load(post_file))
+        except Exception as e:
+            self.logger.log(f"Error comparing routing tables for {device_name}: {e}", "WARNING")
+            return results
+        
+        checks = [
+            ('removed', "Prefixes removed", self.thresholds['route_removed_max'], "FAIL"),
+            ('added', "Prefixes added", self.thresholds['route_change_max'], "WARN"),
+            ('next_hop_changed', "Next-hop changes", self.thresholds['route_change_max'], "WARN")
+        ]
+        
+        for key, label, threshold, breach_status in checks:
+            count = diff[key]
+            samples = diff['samples'][key]
+            message = f"{label}: {count} of {diff['pre_prefixes']} → {diff['post_prefixes']} prefixes"
+            if samples:
+                message += f" (e.g. {', '.join(samples)})"
+            
+            results.append(AuditResult(
+                check_name=f"{device_name}_route_table_{key}",
+                category="routing",
+                pre_value=str(diff['pre_prefixes']),
+                post_value=str(diff['post_prefixes']),
+                delta=str(count),
+                status=breach_status if count > threshold else "PASS",
+                threshold=f"≤{threshold}",
+                message=message
+            ))
+        
+        return results
 
 # ============================================================================
 # REPORTING ENGINE
@@ -1274,6 +1763,102 @@ class ReportGenerator:
 # DATA STORAGE
 # ============================================================================
 
+def inventory_ordered(index: Dict[str, int], device_order: List[str]) -> Dict[str, int]:
+    """Index entries in inventory order, then any devices the inventory does not list"""
+    ordered = {name: index[name] for name in device_order if name in index}
+    ordered.update((name, offset) for name, offset in index.items() if name not in ordered)
+    return ordered
+
+class PhaseSnapshotWriter:
+    """Append-only phase snapshot: one JSON line per device, written as it completes.
+    
+    Byte offsets of the lines are kept as an index and saved next to the
+    snapshot (<snapshot>.idx) on close. A crashed run leaves every device
+    completed so far on disk; PhaseSnapshot rebuilds the missing index.
+    
+    Devices complete in any order; when the inventory order is given it is
+    recorded in a header line and the index follows it, so comparisons and
+    reports list devices the same way on every run.
+    """
+    
+    def __init__(self, filepath: Path, device_order: List[str] = None):
+        self.filepath = Path(filepath)
+        self.device_order = list(device_order or [])
+        self.index = {}
+        self._lock = threading.Lock()
+        self._file = open(self.filepath, 'wb')
+        if self.device_order:
+            self._file.write(json.dumps({'devices': self.device_order}).encode('utf-8') + b'\n')
+    
+    def write(self, device_name: str, device_data: Dict):
+        """Append one device's data"""
+        line = json.dumps({'device': device_name, 'data': device_data}, default=str).encode('utf-8') + b'\n'
+        with self._lock:
+            self.index[device_name] = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+    
+    def close(self):
+        """Close the snapshot and write its index"""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.close()
+            with open(f"{self.filepath}.idx", 'w') as f:
+                json.dump(inventory_ordered(self.index, self.device_order), f)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class PhaseSnapshot(Mapping):
+    """Read-only view of a phase snapshot: device name -> device data.
+    
+    Only the index is held in memory; each lookup seeks to and parses one
+    device line, so iterating a snapshot needs memory for one device.
+    """
+    
+    def __init__(self, filepath: str):
+        self.filepath = Path(filepath)
+        self.index = self._load_index()
+    
+    def _load_index(self) -> Dict[str, int]:
+        index_file = Path(f"{self.filepath}.idx")
+        if index_file.exists():
+            with open(index_file, 'r') as f:
+                return json.load(f)
+        
+        # No index (interrupted run): scan the lines, skipping a partially written last one
+        index = {}
+        device_order = []
+        with open(self.filepath, 'rb') as f:
+            offset = 0
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if offset == 0 and 'devices' in record:
+                        device_order = record['devices']
+                    else:
+                        index[record['device']] = offset
+                except (ValueError, KeyError):
+                    pass
+                offset += len(line)
+        return inventory_ordered(index, device_order)
+    
+    def __getitem__(self, device_name: str) -> Dict:
+        offset = self.index[device_name]
+        with open(self.filepath, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())['data']
+    
+    def __iter__(self):
+        return iter(self.index)
+    
+    def __len__(self) -> int:
+        return len(self.index)
+
 class DataStorage:
     """Handle data storage and retrieval"""
     
@@ -1282,6 +1867,16 @@ class DataStorage:
         self.output_dir.mkdir(exist_ok=True)
         self.logger = logger
     
+    def open_phase_snapshot(self, phase: str, timestamp: str = None,
+                            device_order: List[str] = None) -> PhaseSnapshotWriter:
+        """Open a streaming snapshot that devices are written to as they complete"""
+        if not timestamp:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        filepath = self.output_dir / f"{phase}_data_{timestamp}.jsonl"
+        self.logger.log(f"Streaming phase data to: {filepath}")
+        return PhaseSnapshotWriter(filepath, device_order)
+    
     def save_phase_data(self, phase: str, data: Dict, timestamp: str = None):
         """Save phase data to file"""
         if not timestamp:
@@ -1296,11 +1891,20 @@ class DataStorage:
         self.logger.log(f"Phase data saved: {filepath}")
         return str(filepath)
     
-    def load_phase_data(self, filepath: str) -> Dict:
-        """Load phase data from file"""
+    def save_route_table(self, phase: str, device_name: str, route_table: 'RouteTable', timestamp: str) -> str:
+        """Save a device's routing table next to the phase data"""
+        filepath = self.output_dir / f"{phase}_routes_{device_name}_{timestamp}{RouteTable.FILE_SUFFIX}"
+        route_table.save(str(filepath))
+        return str(filepath)
+    
+    def load_phase_data(self, filepath: str) -> Mapping:
+        """Load phase data from file (.jsonl snapshots are read device by device)"""
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+            if str(filepath).endswith('.jsonl'):
+                data = PhaseSnapshot(filepath)
+            else:
+                with open(filepath, 'r') as f:
+                    data = json.load(f)
             self.logger.log(f"Phase data loaded: {filepath}")
             return data
         except Exception as e:
@@ -1309,8 +1913,7 @@ class DataStorage:
     
     def list_phase_files(self, phase: str) -> List[str]:
         """List available phase files"""
-        pattern = f"{phase}_data_*.json"
-        files = list(self.output_dir.glob(pattern))
+        files = list(self.output_dir.glob(f"{phase}_data_*.json")) + list(self.output_dir.glob(f"{phase}_data_*.jsonl"))
         return [str(f) for f in sorted(files, reverse=True)]
 
 # ============================================================================
@@ -1407,7 +2010,7 @@ class RR5AuditOrchestrator:
         self.parser = DataParser(self.logger)
         self.health_checker = Phase1HealthChecker(self.connector, self.executor, self.parser, self.logger)
         self.data_collector = Phase2DataCollector(self.connector, self.executor, self.parser, self.logger)
-        self.comparator = Phase3Comparator(self.logger)
+        self.comparator = Phase3Comparator(self.logger, include_passed=not config.get('failures_only', False))
         self.reporter = ReportGenerator(config['output_dir'], self.logger)
         
         # Initialize web interface if available
@@ -1421,35 +2024,11 @@ class RR5AuditOrchestrator:
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        all_data = {}
-        
-        for device in devices:
-            device_data = {
-                'device_info': asdict(device),
-                'health': None,
-                'data': None
-            }
-            
-            try:
-                # Phase 1: Health check
-                health_metrics = self.health_checker.check_device_health(device)
-                if health_metrics:
-                    device_data['health'] = asdict(health_metrics)
-                
-                # Phase 2: Data collection
-                collected_data = self.data_collector.collect_device_data(device)
-                if collected_data:
-                    device_data['data'] = collected_data
-                
-                all_data[device.name] = device_data
-                
-            except Exception as e:
-                self.logger.log(f"Error processing device {device.name}: {e}", "ERROR")
-                device_data['error'] = str(e)
-                all_data[device.name] = device_data
+        # Devices are saved as they complete
+        with self.storage.open_phase_snapshot('pre', timestamp, [device.name for device in devices]) as snapshot:
+            self._run_devices('pre', devices, timestamp, snapshot)
         
-        # Save pre-check data
-        filepath = self.storage.save_phase_data('pre', all_data, timestamp)
+        filepath = str(snapshot.filepath)
         self.logger.log(f"✅ Pre-check completed. Data saved to: {filepath}")
         
         return filepath
@@ -1460,37 +2039,64 @@ class RR5AuditOrchestrator:
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        all_data = {}
+        # Devices are saved as they complete
+        with self.storage.open_phase_snapshot('post', timestamp, [device.name for device in devices]) as snapshot:
+            self._run_devices('post', devices, timestamp, snapshot)
         
-        for device in devices:
-            device_data = {
-                'device_info': asdict(device),
-                'health': None,
-                'data': None
-            }
-            
-            try:
-                # Same checks as pre-check
+        filepath = str(snapshot.filepath)
+        self.logger.log(f"✅ Post-check completed. Data saved to: {filepath}")
+        
+        return filepath
+    
+    def _run_devices(self, phase: str, devices: List[DeviceInfo], timestamp: str, snapshot: PhaseSnapshotWriter):
+        """Check devices concurrently (max_workers at a time), writing each to the snapshot as it completes"""
+        workers = max(1, min(int(self.config.get('max_workers', 20)), len(devices)))
+        self.logger.log(f"Checking {len(devices)} devices with {workers} workers")
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self._check_device, phase, device, timestamp): device for device in devices}
+            for completed, future in enumerate(as_completed(futures), 1):
+                device = futures[future]
+                snapshot.write(device.name, future.result())
+                self.logger.log(f"[{completed}/{len(devices)}] {device.name} done")
+    
+    def _check_device(self, phase: str, device: DeviceInfo, timestamp: str) -> Dict:
+        """Phase 1 health check and Phase 2 data collection over one device session"""
+        device_data = {
+            'device_info': asdict(device),
+            'health': None,
+            'data': None
+        }
+        
+        try:
+            with self.connector.device_session(device) as connection:
+                if not connection:
+                    device_data['error'] = "Connection failed"
+                    return device_data
+                
+                # Phase 1: Health check
                 health_metrics = self.health_checker.check_device_health(device)
                 if health_metrics:
                     device_data['health'] = asdict(health_metrics)
                 
+                # Phase 2: Data collection
                 collected_data = self.data_collector.collect_device_data(device)
                 if collected_data:
+                    self._store_route_table(phase, device, collected_data, timestamp)
                     device_data['data'] = collected_data
-                
-                all_data[device.name] = device_data
-                
-            except Exception as e:
-                self.logger.log(f"Error processing device {device.name}: {e}", "ERROR")
-                device_data['error'] = str(e)
-                all_data[device.name] = device_data
         
-        # Save post-check data
-        filepath = self.storage.save_phase_data('post', all_data, timestamp)
-        self.logger.log(f"✅ Post-check completed. Data saved to: {filepath}")
+        except Exception as e:
+            self.logger.log(f"Error processing device {device.name}: {e}", "ERROR")
+            device_data['error'] = str(e)
         
-        return filepath
+        return device_data
+    
+    def _store_route_table(self, phase: str, device: DeviceInfo, collected_data: Dict, timestamp: str):
+        """Move the parsed routing table out of the phase JSON into its own file"""
+        route_table = collected_data.pop('route_table', None)
+        if route_table is not None:
+            collected_data['route_table_file'] = self.storage.save_route_table(phase, device.name, route_table, timestamp)
+            collected_data['route_table_prefixes'] = route_table.prefix_count
     
     def run_comparison(self, pre_file: str, post_file: str) -> List[str]:
         """Run Phase 3: Comparison"""
@@ -1556,7 +2162,7 @@ Examples:
   python rr5-router-new-new.py --phase post --devices inventory.csv --output post_upgrade
   
   # Comparison phase
-  python rr5-router-new-new.py --phase compare --pre pre_upgrade/pre_data_*.json --post post_upgrade/post_data_*.json
+  python rr5-router-new-new.py --phase compare --pre pre_upgrade/pre_data_*.jsonl --post post_upgrade/post_data_*.jsonl
   
   # Web interface
   python rr5-router-new-new.py --web --port 5015
@@ -1572,6 +2178,8 @@ Examples:
     parser.add_argument('--config', help='Configuration file (YAML)')
     parser.add_argument('--web', action='store_true', help='Start web interface')
     parser.add_argument('--port', type=int, default=5015, help='Web interface port')
+    parser.add_argument('--workers', type=int, help='Devices checked concurrently (default: 20)')
+    parser.add_argument('--failures-only', action='store_true', help='Report only WARN/FAIL checks in the comparison')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose logging')
     
     args = parser.parse_args()
@@ -1590,6 +2198,12 @@ Examples:
     if args.port:
         config['web_port'] = args.port
     
+    if args.workers:
+        config['max_workers'] = args.workers
+    
+    if args.failures_only:
+        config['failures_only'] = True
+    
     config['web_enabled'] = args.web
     
     # Initialize orchestrator
@@ -11,8 +11,8 @@ import base64
 import getpass
 from pathlib import Path
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from credential_vault import derive_fernet_key, pbkdf2_sha256, constant_time_equals
 
 try:
     from colorama import Fore, Style
@@ -59,17 +59,9 @@ class CredentialManager:
                 f.write(self.salt)
             os.chmod(self.salt_file, 0o600)  # Only user can read/write
         
-        # Generate key from password
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=self.salt,
-            iterations=100000,
-        )
-        
-        # Derive the key from the password
-        key = base64.urlsafe_b64encode(kdf.derive(master_password.encode()))
-        self.cipher_suite = Fernet(key)
+        # Derive the key from the password (once per process, shared by every manager)
+        self.key = derive_fernet_key(master_password, self.salt)
+        self.cipher_suite = Fernet(self.key)
     
     def encrypt(self, plaintext):
         """
@@ -106,14 +98,7 @@ class CredentialManager:
         if not salt:
             salt = os.urandom(16)
             
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        
-        password_hash = kdf.derive(password.encode())
+        password_hash = pbkdf2_sha256(password.encode(), salt)
         return base64.b64encode(password_hash).decode(), base64.b64encode(salt).decode()
     
     def verify_password(self, password, stored_hash, salt):
@@ -124,7 +109,7 @@ class CredentialManager:
             password, 
             base64.b64decode(salt)
         )
-        return password_hash == stored_hash
+        return constant_time_equals(password_hash, stored_hash)
 
 
 def prompt_for_master_password(confirm=True):
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Interactive Shell Relay for NetAuditPro
+Multiplexes every web-terminal SSH channel in one selector loop instead of
+one polling thread per session. Output is coalesced into frame-sized batches
+within a small latency budget, and a session stops being read while its
+browser has too many unacknowledged frames so SSH flow control pushes back
+on the device rather than buffering in the server.
+"""
+
+import codecs
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+FRAME_BYTES = 16 * 1024          # Flush once this much output is buffered
+FLUSH_LATENCY = 0.02             # ...or once the oldest buffered byte is this old (seconds)
+MAX_INFLIGHT_FRAMES = 4          # Unacknowledged frames before a session is paused
+ACK_TIMEOUT = 5.0                # Seconds before unacknowledged frames are written off
+READ_CHUNK_SIZE = 32 * 1024
+IDLE_SELECT_TIMEOUT = 1.0
+
+class _RelaySession:
+    """Per-session relay state; only touched from the relay thread, except inflight counters under the lock"""
+
+    def __init__(self, sid: str, channel, flow_control: bool):
+        self.sid = sid
+        self.channel = channel
+        self.flow_control = flow_control
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.buffer = []
+        self.buffered_chars = 0
+        self.first_buffered_at = None
+        self.inflight = 0
+        self.oldest_inflight_at = None
+        self.paused = False
+        self.closed = False
+
+class ShellRelay:
+    """
+    One background thread relaying output from many paramiko channels.
+
+    emit_func(sid, text, ack_callback) delivers a frame to the browser; ack_callback
+    is None unless the session registered with flow_control=True, in which case the
+    client must acknowledge each frame (a Socket.IO emit callback) for reading to continue.
+    on_closed(sid) is called from the relay thread when a channel reaches EOF.
+    """
+
+    def __init__(self, emit_func: Callable[[str, str, Optional[Callable]], None],
+                 on_closed: Optional[Callable[[str], None]] = None,
+                 frame_bytes: int = FRAME_BYTES, flush_latency: float = FLUSH_LATENCY,
+                 max_inflight: int = MAX_INFLIGHT_FRAMES, ack_timeout: float = ACK_TIMEOUT):
+        self.emit_func = emit_func
+        self.on_closed = on_closed
+        self.frame_bytes = frame_bytes
+        self.flush_latency = flush_latency
+        self.max_inflight = max_inflight
+        self.ack_timeout = ack_timeout
+
+        self._selector = selectors.DefaultSelector()
+        self._sessions: Dict[str, _RelaySession] = {}
+        self._pending_ops = deque()
+        self._lock = threading.Lock()
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._selector.register(self._wakeup_recv, selectors.EVENT_READ, None)
+        self._thread = None
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Public API (any thread)
+    # ------------------------------------------------------------------
+
+    def register(self, sid: str, channel, flow_control: bool = False):
+        """Start relaying output from channel to the browser session sid"""
+        self._queue_op(("register", sid, channel, flow_control))
+        self._ensure_running()
+
+    def unregister(self, sid: str):
+        """Stop relaying for sid; the caller remains responsible for closing the channel"""
+        self._queue_op(("unregister", sid))
+
+    def acknowledge(self, sid: str):
+        """Record that the browser has rendered one frame for sid"""
+        with self._lock:
+            session = self._sessions.get(sid)
+            if session is None or session.inflight == 0:
+                return
+            session.inflight -= 1
+            session.oldest_inflight_at = time.monotonic() if session.inflight else None
+            resume = session.paused and session.inflight < self.max_inflight
+        if resume:
+            self._queue_op(("resume", sid))
+
+    def active_sessions(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def stop(self):
+        self._stop.set()
+        self._wake()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    # ------------------------------------------------------------------
+    # Relay loop (relay thread only)
+    # ------------------------------------------------------------------
+
+    def _queue_op(self, op: tuple):
+        with self._lock:
+            self._pending_ops.append(op)
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wakeup_send.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # A wakeup is already pending
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="shell-relay", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                for key, _ in self._selector.select(self._select_timeout()):
+                    if key.data is None:
+                        self._drain_wakeups()
+                    else:
+                        self._read(key.data)
+                self._apply_pending_ops()
+                self._flush_due()
+            except Exception as e:
+                print(f"Error in shell relay loop: {e}")
+
+    def _drain_wakeups(self):
+        try:
+            while self._wakeup_recv.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _select_timeout(self) -> float:
+        """Sleep until the earliest flush deadline, or idle when nothing is buffered"""
+        now = time.monotonic()
+        timeout = IDLE_SELECT_TIMEOUT
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            if session.first_buffered_at is not None and not session.paused:
+                timeout = min(timeout, max(0.0, session.first_buffered_at + self.flush_latency - now))
+            if session.oldest_inflight_at is not None:
+                timeout = min(timeout, max(0.0, session.oldest_inflight_at + self.ack_timeout - now))
+        return timeout
+
+    def _apply_pending_ops(self):
+        while True:
+            with self._lock:
+                if not self._pending_ops:
+                    return
+                op = self._pending_ops.popleft()
+
+            if op[0] == "register":
+                _, sid, channel, flow_control = op
+                self._drop_session(sid)
+                session = _RelaySession(sid, channel, flow_control)
+                with self._lock:
+                    self._sessions[sid] = session
+                self._selector.register(channel, selectors.EVENT_READ, session)
+                self._read(session)  # Output may have arrived before registration
+            elif op[0] == "unregister":
+                self._drop_session(op[1])
+            elif op[0] == "resume":
+                with self._lock:
+                    session = self._sessions.get(op[1])
+                if session and session.paused and not session.closed:
+                    session.paused = False
+                    self._selector.register(session.channel, selectors.EVENT_READ, session)
+                    self._read(session)
+
+    def _drop_session(self, sid: str):
+        with self._lock:
+            session = self._sessions.pop(sid, None)
+        if session and not session.paused:
+            try:
+                self._selector.unregister(session.channel)
+            except (KeyError, ValueError):
+                pass
+        return session
+
+    def _read(self, session: _RelaySession):
+        """Drain what the channel has, up to the frames the session may still send"""
+        channel = session.channel
+        try:
+            while channel.recv_ready() and session.buffered_chars < self.frame_bytes * self.max_inflight:
+                data = channel.recv(READ_CHUNK_SIZE)
+                if not data:
+                    break
+                text = session.decoder.decode(data)
+                if text:
+                    if session.first_buffered_at is None:
+                        session.first_buffered_at = time.monotonic()
+                    session.buffer.append(text)
+                    session.buffered_chars += len(text)
+
+            if not channel.recv_ready() and (channel.closed or channel.eof_received or channel.exit_status_ready()):
+                self._close(session)
+                return
+        except Exception as e:
+            print(f"Error reading shell channel for {session.sid}: {e}")
+            self._close(session)
+            return
+
+        if session.buffered_chars >= self.frame_bytes:
+            self._flush(session)
+        if session.buffered_chars >= self.frame_bytes * self.max_inflight:
+            self._pause(session)
+
+    def _pause(self, session: _RelaySession):
+        """Stop selecting on the channel; paramiko's window then fills and the device waits"""
+        if session.paused:
+            return
+        session.paused = True
+        try:
+            self._selector.unregister(session.channel)
+        except (KeyError, ValueError):
+            pass
+
+    def _flush_due(self):
+        now = time.monotonic()
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            if session.oldest_inflight_at is not None and now - session.oldest_inflight_at >= self.ack_timeout:
+                with self._lock:
+                    session.inflight = 0
+                    session.oldest_inflight_at = None
+                if session.paused and not session.closed:
+                    self._queue_op(("resume", session.sid))
+            if session.first_buffered_at is not None and now - session.first_buffered_at >= self.flush_latency:
+                self._flush(session)
+
+    def _flush(self, session: _RelaySession):
+        """Emit buffered output as frames while the client has ack credit"""
+        text = "".join(session.buffer)
+        sent = 0
+        while sent < len(text):
+            callback = None
+            if session.flow_control:
+                with self._lock:
+                    if session.inflight >= self.max_inflight:
+                        break
+                    session.inflight += 1
+                    if session.oldest_inflight_at is None:
+                        session.oldest_inflight_at = time.monotonic()
+                callback = self._ack_callback(session.sid)
+
+            frame = text[sent:sent + self.frame_bytes]
+            sent += len(frame)
+            try:
+                self.emit_func(session.sid, frame, callback)
+            except Exception as e:
+                print(f"Error emitting shell output for {session.sid}: {e}")
+
+        remaining = text[sent:]
+        session.buffer = [remaining] if remaining else []
+        session.buffered_chars = len(remaining)
+        session.first_buffered_at = time.monotonic() if remaining else None
+        if remaining and session.flow_control:
+            self._pause(session)
+
+    def _ack_callback(self, sid: str) -> Callable[..., None]:
+        def ack(*args: Any):
+            self.acknowledge(sid)
+        return ack
+
+    def _close(self, session: _RelaySession):
+        if session.closed:
+            return
+        session.closed = True
+        tail = session.decoder.decode(b"", final=True)
+        if tail:
+            session.buffer.append(tail)
+            session.buffered_chars += len(tail)
+        session.flow_control = False  # Deliver whatever is left regardless of credit
+        self._flush(session)
+        self._drop_session(session.sid)
+        if self.on_closed:
+            try:
+                self.on_closed(session.sid)
+            except Exception as e:
+                print(f"Error closing shell session {session.sid}: {e}")
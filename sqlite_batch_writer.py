@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Batched SQLite Writer for NetAuditPro
+One writer thread per database owns a single WAL-mode connection and drains
+a queue of inserts with executemany in batched transactions, instead of every
+phase result opening its own connection and committing one row at a time.
+"""
+
+import atexit
+import itertools
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 0.2   # Seconds a queued row may wait for more rows to batch with
+DEFAULT_FLUSH_TIMEOUT = 30.0   # Seconds flush() waits for the writer before giving up
+MAX_FAILED_ROWS = 100          # Most recent rejected rows kept for inspection
+
+_STOP = object()
+
+def configure_connection(conn: sqlite3.Connection):
+    """WAL lets readers (the web views) run while the writer commits; NORMAL sync is safe under WAL"""
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+def migrate_database(db_path: str, statements: Iterable[str]):
+    """Apply idempotent schema statements (CREATE TABLE/INDEX IF NOT EXISTS) and switch the file to WAL"""
+    conn = sqlite3.connect(db_path)
+    try:
+        configure_connection(conn)
+        with conn:
+            for statement in statements:
+                conn.execute(statement)
+    finally:
+        conn.close()
+
+class WriterError(RuntimeError):
+    """The writer thread is not running, so queued rows cannot be committed"""
+    pass
+
+class BatchedSQLiteWriter:
+    """Queue-fed writer thread that commits rows in batches on one connection"""
+
+    def __init__(self, db_path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 on_error: Optional[Callable[[str, tuple, Exception], None]] = None):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_error = on_error  # Called with (sql, params, error) for every row the database rejects
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.batches_committed = 0
+        self.failed_rows: "deque[Tuple[str, tuple, Exception]]" = deque(maxlen=MAX_FAILED_ROWS)
+        self.last_error: Optional[Exception] = None
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"sqlite-writer-{os.path.basename(db_path)}", daemon=True)
+        self._thread.start()
+
+    def submit(self, sql: str, params: Sequence):
+        """Queue one row; returns immediately"""
+        if not self._thread.is_alive():
+            raise WriterError(f"SQLite writer for {self.db_path} is not running: {self.last_error}")
+        self._queue.put((sql, tuple(params)))
+
+    def flush(self, timeout: Optional[float] = DEFAULT_FLUSH_TIMEOUT) -> bool:
+        """
+        Block until everything queued so far has been written (or rejected, see failed_rows).
+        Returns False if timeout expires first; raises WriterError if the writer thread died.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                if not self._thread.is_alive():
+                    raise WriterError(f"SQLite writer for {self.db_path} stopped with "
+                                      f"{self._queue.unfinished_tasks} rows pending: {self.last_error}")
+                wait = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+                if wait <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(wait)
+        return True
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _collect_batch(self, first) -> Tuple[List, bool]:
+        """Gather up to batch_size items, waiting at most flush_interval for stragglers"""
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=max(remaining, 0)) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+            if item is _STOP:
+                break
+        return batch, batch[-1] is _STOP
+
+    def _write_batch(self, conn: sqlite3.Connection, rows: List[Tuple[str, tuple]]):
+        """Write a batch in one transaction, one executemany per run of identical statements (queue order kept)"""
+        try:
+            with conn:
+                for sql, run in itertools.groupby(rows, key=lambda row: row[0]):
+                    conn.executemany(sql, [params for _, params in run])
+            self.rows_written += len(rows)
+            self.batches_committed += 1
+        except sqlite3.Error as e:
+            # The transaction rolled back: retry row by row so only the offending rows are lost
+            print(f"Error writing batch of {len(rows)} rows to {self.db_path}: {e}; retrying rows individually")
+            for sql, params in rows:
+                self._write_row(conn, sql, params)
+
+    def _write_row(self, conn: sqlite3.Connection, sql: str, params: tuple):
+        try:
+            with conn:
+                conn.execute(sql, params)
+            self.rows_written += 1
+        except sqlite3.Error as e:
+            self.last_error = e
+            self.rows_failed += 1
+            self.failed_rows.append((sql, params, e))
+            print(f"Rejected row for {self.db_path}: {e}")
+            if self.on_error:
+                try:
+                    self.on_error(sql, params, e)
+                except Exception as callback_error:
+                    print(f"SQLite writer on_error callback failed: {callback_error}")
+
+    def _run(self):
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            configure_connection(conn)
+        except sqlite3.Error as e:
+            # flush()/submit() see the dead thread and report last_error instead of waiting forever
+            if conn is not None:
+                conn.close()
+            self.last_error = e
+            print(f"SQLite writer for {self.db_path} could not open the database: {e}")
+            return
+        try:
+            while True:
+                batch, stopping = self._collect_batch(self._queue.get())
+                rows = [item for item in batch if item is not _STOP]
+                if rows:
+                    self._write_batch(conn, rows)
+                for _ in batch:
+                    self._queue.task_done()
+                if stopping:
+                    return
+        finally:
+            conn.close()
+
+_writers: Dict[str, BatchedSQLiteWriter] = {}
+_writers_lock = threading.Lock()
+
+def get_writer(db_path: str) -> BatchedSQLiteWriter:
+    """Process-wide writer for a database file, started on first use"""
+    key = os.path.abspath(db_path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = BatchedSQLiteWriter(db_path)
+        return writer
+
+def flush_writer(db_path: str):
+    """Commit pending rows for db_path before reading it back (no-op if nothing was written)"""
+    with _writers_lock:
+        writer = _writers.get(os.path.abspath(db_path))
+    if writer:
+        writer.flush()
+
+@atexit.register
+def _close_writers():
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Streaming Report Pipeline for NetAuditPro
+Builds PDF and Excel reports from row generators instead of materialising
+whole documents, caches chart images per summary hash and runs report
+builds on a background worker addressed by job id
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+
+PDF_TABLE_CHUNK_ROWS = 200
+STORY_LOOKAHEAD = 8
+REPORT_WORKER_COUNT = 2
+MAX_TRACKED_REPORT_JOBS = 100
+
+# ====================================================================
+# ATOMIC OUTPUT
+# ====================================================================
+
+@contextmanager
+def atomic_report_path(filepath: str) -> Iterator[str]:
+    """
+    Yield a private temporary path next to filepath and move the finished file
+    into place with os.replace. Concurrent report jobs writing the same report
+    each build their own file; readers only ever see a complete one.
+    """
+    directory, filename = os.path.split(filepath)
+    temp_path = os.path.join(directory, f".{uuid.uuid4().hex}_{filename}")
+    try:
+        yield temp_path
+        os.replace(temp_path, filepath)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+# ====================================================================
+# PDF STREAMING
+# ====================================================================
+
+class StreamingStory(list):
+    """
+    Flowable list for SimpleDocTemplate.build that pulls flowables from an
+    iterator on demand. reportlab checks len() before every flowable it
+    handles, so topping up a small lookahead buffer there keeps only a few
+    flowables (one table chunk each) in memory at a time.
+    """
+
+    def __init__(self, flowables: Iterable, lookahead: int = STORY_LOOKAHEAD):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+        self._exhausted = False
+
+    def __len__(self):
+        while not self._exhausted and list.__len__(self) < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._exhausted = True
+        return list.__len__(self)
+
+def chunked_table_flowables(header: List[Any], rows: Iterable[List[Any]], col_widths: List[float],
+                            style_commands: List[tuple],
+                            chunk_rows: int = PDF_TABLE_CHUNK_ROWS) -> Iterator[Table]:
+    """Yield one Table per chunk of rows, each repeating the header row"""
+    rows = iter(rows)
+    style = TableStyle(style_commands)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        table = Table([header] + chunk, colWidths=col_widths, repeatRows=1)
+        table.setStyle(style)
+        yield table
+
+def build_streaming_pdf(pdf_filepath: str, flowables: Iterable) -> str:
+    """Build a PDF from a flowable iterator without holding the whole story in memory"""
+    with atomic_report_path(pdf_filepath) as temp_path:
+        doc = SimpleDocTemplate(temp_path)
+        doc.build(StreamingStory(flowables))
+    return pdf_filepath
+
+# ====================================================================
+# EXCEL STREAMING
+# ====================================================================
+
+def create_write_only_workbook(sheet_title: str):
+    """Create an openpyxl write_only workbook with one sheet; rows are flushed as they are appended"""
+    wb = Workbook(write_only=True)
+    sheet = wb.create_sheet(title=sheet_title)
+    return wb, sheet
+
+def save_workbook(wb: Workbook, excel_filepath: str) -> str:
+    """Save a workbook through a temporary file so concurrent jobs cannot interleave writes"""
+    with atomic_report_path(excel_filepath) as temp_path:
+        wb.save(temp_path)
+    return excel_filepath
+
+def styled_row(sheet, values: Iterable[Any], font=None, fill=None, alignment=None) -> List[WriteOnlyCell]:
+    """Build a write_only row whose cells all share the given styles"""
+    row = []
+    for value in values:
+        cell = WriteOnlyCell(sheet, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if alignment is not None:
+            cell.alignment = alignment
+        row.append(cell)
+    return row
+
+# ====================================================================
+# CHART CACHE
+# ====================================================================
+
+def summary_hash(summary_data: Dict[str, Any]) -> str:
+    """Stable hash of the summary values a chart is drawn from"""
+    payload = json.dumps(summary_data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+# pyplot keeps global figure/style state: report workers render one chart at a time
+CHART_RENDER_LOCK = threading.Lock()
+
+def cached_chart(cache_dir: str, chart_name: str, summary_data: Dict[str, Any],
+                 render_func: Callable[[str], bool]) -> Optional[str]:
+    """
+    Return the cached chart image for this summary, rendering it only on a miss.
+    render_func receives the target path and returns False when there is nothing to draw.
+    The image is rendered to a temporary file and renamed into place, so readers
+    never see a partially written PNG.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    chart_path = os.path.join(cache_dir, f"{chart_name}_{summary_hash(summary_data)}.png")
+    if os.path.exists(chart_path):
+        return chart_path
+    with CHART_RENDER_LOCK:
+        if os.path.exists(chart_path):
+            return chart_path
+        temp_path = os.path.join(cache_dir, f".{chart_name}_{uuid.uuid4().hex}.png")
+        try:
+            if not render_func(temp_path):
+                return None
+            os.replace(temp_path, chart_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    return chart_path
+
+# ====================================================================
+# BACKGROUND REPORT JOBS
+# ====================================================================
+
+class ReportJobManager:
+    """Runs report builds on a small worker pool and tracks them by job id"""
+
+    def __init__(self, max_workers: int = REPORT_WORKER_COUNT, max_jobs: int = MAX_TRACKED_REPORT_JOBS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-worker")
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_jobs = max_jobs
+
+    def submit(self, report_type: str, build_func: Callable[..., Optional[str]], *args, **kwargs) -> str:
+        """Queue build_func(*args, **kwargs), which must return the generated file path"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "report_type": report_type,
+                "status": "queued",
+                "filepath": None,
+                "error": None,
+                "created": datetime.now().isoformat(),
+                "finished": None
+            }
+            while len(self._jobs) > self._max_jobs:
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run, job_id, build_func, args, kwargs)
+        return job_id
+
+    def _run(self, job_id: str, build_func: Callable, args: tuple, kwargs: dict):
+        self._update(job_id, status="running")
+        try:
+            filepath = build_func(*args, **kwargs)
+            if filepath:
+                self._update(job_id, status="completed", filepath=filepath)
+            else:
+                self._update(job_id, status="failed", error="Report builder returned no file")
+        except Exception as e:
+            self._update(job_id, status="failed", error=str(e))
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            if fields.get("status") in ("completed", "failed"):
+                job["finished"] = datetime.now().isoformat()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the job record, or None for an unknown id"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()]
@@ -7,6 +7,7 @@ Verifies the implementation works correctly
 import sys
 import os
 import json
+import time
 from datetime import datetime
 
 def test_8_stage_audit():
@@ -131,6 +132,76 @@ def test_integration_with_main_script():
         print(f"❌ Integration test failed: {e}")
         return False
 
+class SimulatedDevice:
+    """Minimal Netmiko-like connection that answers prompt checks after a fixed latency"""
+    
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.prompt_checks = 0
+    
+    def find_prompt(self):
+        time.sleep(self.latency)
+        self.prompt_checks += 1
+        return "R1#"
+
+def test_a4_readiness_detection():
+    """Test the adaptive A4 readiness check"""
+    print("\n⏳ Testing A4 Readiness Detection")
+    print("="*50)
+    
+    from enhanced_8_stage_audit import wait_for_device_ready, is_output_complete, A4_MAX_WAIT
+    
+    assert is_output_complete("Tty Line Typ\n* 0 0 CTY")
+    assert not is_output_complete("Tty Line Typ\n --More-- ")
+    assert not is_output_complete(None)
+    
+    device = SimulatedDevice(latency=0.01)
+    readiness = wait_for_device_ready(device, observed_latency=0.02, last_output="Tty Line Typ")
+    assert readiness["ready"] is True
+    assert readiness["prompt"] == "R1#"
+    assert readiness["waited"] < A4_MAX_WAIT
+    print(f"✅ Ready after {readiness['waited']:.3f}s ({readiness['attempts']} prompt check(s))")
+    
+    # Truncated output is never reported as ready
+    readiness = wait_for_device_ready(device, observed_latency=0.02, last_output="Tty Line\n--More--")
+    assert readiness["ready"] is False
+    
+    # Exec-channel wrappers have no prompt detection; complete output means ready
+    readiness = wait_for_device_ready(object(), observed_latency=0.02, last_output="Tty Line Typ")
+    assert readiness["ready"] is True
+    assert readiness["attempts"] == 0
+    print("✅ A4 readiness detection tests passed")
+
+def benchmark_a4_wait(device_count: int = 500, sample_size: int = 20, device_latency: float = 0.02):
+    """Estimate wall-clock time saved by adaptive A4 against the fixed 3-second wait"""
+    from enhanced_8_stage_audit import wait_for_device_ready, A4_MAX_WAIT
+    
+    started = time.time()
+    for _ in range(sample_size):
+        wait_for_device_ready(SimulatedDevice(device_latency), observed_latency=device_latency * 4,
+                              last_output="Tty Line Typ")
+    per_device = (time.time() - started) / sample_size
+    
+    fixed_total = device_count * A4_MAX_WAIT
+    adaptive_total = device_count * per_device
+    return {
+        "device_count": device_count,
+        "fixed_total_seconds": round(fixed_total, 1),
+        "adaptive_total_seconds": round(adaptive_total, 1),
+        "saved_seconds": round(fixed_total - adaptive_total, 1),
+        "adaptive_per_device_seconds": round(per_device, 4)
+    }
+
+def test_a4_benchmark():
+    """Benchmark: A4 wall-clock savings for a 500-device serial audit"""
+    result = benchmark_a4_wait()
+    print(f"\n📊 A4 benchmark for {result['device_count']} devices:")
+    print(f"   - Fixed 3s wait: {result['fixed_total_seconds']}s")
+    print(f"   - Adaptive readiness: {result['adaptive_total_seconds']}s "
+          f"({result['adaptive_per_device_seconds']}s/device)")
+    print(f"   - Saved: {result['saved_seconds']}s")
+    assert result["adaptive_total_seconds"] < result["fixed_total_seconds"]
+
 def main():
     """Main test function"""
     print("🚀 Enhanced 8-Stage Audit Module Test Suite")
@@ -142,13 +213,22 @@ def main():
     test1_passed = test_8_stage_audit()
     test2_passed = test_integration_with_main_script()
     
+    test3_passed = True
+    try:
+        test_a4_readiness_detection()
+        test_a4_benchmark()
+    except AssertionError as e:
+        print(f"❌ A4 readiness tests failed: {e}")
+        test3_passed = False
+    
     print("\n" + "="*60)
     print("📊 TEST SUMMARY")
     print("="*60)
     print(f"✅ Module Tests: {'PASSED' if test1_passed else 'FAILED'}")
     print(f"✅ Integration Tests: {'PASSED' if test2_passed else 'FAILED'}")
+    print(f"✅ A4 Readiness Tests: {'PASSED' if test3_passed else 'FAILED'}")
     
-    if test1_passed and test2_passed:
+    if test1_passed and test2_passed and test3_passed:
         print("\n🎉 ALL TESTS PASSED!")
         print("✅ Enhanced 8-Stage Audit Module is ready for production use")
         print("\n📋 Next Steps:")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the audit result rollups and query API
+"""
+
+import datetime
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from audit_rollups import AuditResultsQuery, ROLLUP_SCHEMA
+from sqlite_batch_writer import BatchedSQLiteWriter, migrate_database
+
+RESULTS_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS audit_phase_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        audit_run_id TEXT NOT NULL,
+        router_hostname TEXT NOT NULL,
+        router_ip TEXT,
+        phase_number INTEGER NOT NULL,
+        phase_name TEXT NOT NULL,
+        status TEXT NOT NULL,
+        summary TEXT,
+        details TEXT,
+        error_message TEXT,
+        start_time DATETIME,
+        end_time DATETIME
+    )''',
+    "CREATE INDEX IF NOT EXISTS idx_phase_results_run_router_phase "
+    "ON audit_phase_results (audit_run_id, router_hostname, phase_name)"
+]
+
+INSERT_SQL = '''INSERT INTO audit_phase_results
+    (audit_run_id, router_hostname, router_ip, phase_number, phase_name, status, summary, details, error_message, start_time, end_time)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'''
+
+BASE_TIME = datetime.datetime(2025, 6, 1, 2, 0, 0)
+
+def phase_row(run, router, phase_number, status, seconds, day=0):
+    start = BASE_TIME + datetime.timedelta(days=day, minutes=phase_number)
+    return (run, router, f"10.0.0.{router[-1]}", phase_number, f"Phase{phase_number}", status,
+            f"{status} summary", '{"big": "payload"}', "", str(start), str(start + datetime.timedelta(seconds=seconds)))
+
+class TestAuditRollups(unittest.TestCase):
+    """Test cases for the rollup triggers, backfill and AuditResultsQuery"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "phased.sqlite")
+        self.query = AuditResultsQuery(self.db_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _insert(self, rows):
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.executemany(INSERT_SQL, rows)
+        conn.close()
+
+    def test_rollups_maintained_on_insert(self):
+        """Rows written through the batched writer update every summary table"""
+        migrate_database(self.db_path, RESULTS_SCHEMA + ROLLUP_SCHEMA)
+        writer = BatchedSQLiteWriter(self.db_path, flush_interval=0.01)
+        for row in [phase_row("run-1", "R1", 1, "SUCCESS", 2), phase_row("run-1", "R1", 2, "FAILURE", 3),
+                    phase_row("run-1", "R2", 1, "SUCCESS", 4), phase_row("run-1", "R2", 2, "SKIPPED", 0)]:
+            writer.submit(INSERT_SQL, row)
+        writer.flush()
+        writer.close()
+
+        run = self.query.run_summary("run-1")
+        self.assertEqual((run['router_count'], run['result_count']), (2, 4))
+        self.assertEqual((run['success_count'], run['failure_count'], run['skipped_count']), (2, 1, 1))
+        self.assertAlmostEqual(run['total_duration_seconds'], 9, places=3)
+
+        phases = self.query.run_phases("run-1")
+        self.assertEqual([p['phase_name'] for p in phases], ["Phase1", "Phase2"])
+        self.assertAlmostEqual(phases[0]['max_duration_seconds'], 4, places=3)
+
+        devices = self.query.run_devices("run-1")
+        self.assertEqual(devices['total'], 2)
+        self.assertEqual([p['phase_number'] for p in devices['devices'][0]['phases']], [1, 2])
+        self.assertNotIn('details', devices['devices'][0]['phases'][0])
+
+    def test_existing_database_backfilled_once(self):
+        """Runs logged before the rollups existed are summarised by the migration, exactly once"""
+        migrate_database(self.db_path, RESULTS_SCHEMA)
+        self._insert([phase_row("old-run", "R1", 1, "SUCCESS", 1), phase_row("old-run", "R2", 1, "FAILURE", 1)])
+
+        migrate_database(self.db_path, RESULTS_SCHEMA + ROLLUP_SCHEMA)
+        migrate_database(self.db_path, RESULTS_SCHEMA + ROLLUP_SCHEMA)
+
+        run = self.query.run_summary("old-run")
+        self.assertEqual((run['router_count'], run['result_count'], run['failure_count']), (2, 2, 1))
+        self.assertEqual(len(self.query.run_phases("old-run")), 1)
+
+    def test_runs_paginated_newest_first(self):
+        """list_runs pages through the run summaries by most recent activity"""
+        migrate_database(self.db_path, RESULTS_SCHEMA + ROLLUP_SCHEMA)
+        self._insert([phase_row(f"run-{day}", "R1", 1, "SUCCESS", 1, day=day) for day in range(5)])
+
+        first = self.query.list_runs(page=1, per_page=2)
+        self.assertEqual([r['audit_run_id'] for r in first['runs']], ["run-4", "run-3"])
+        self.assertEqual(first['total'], 5)
+        last = self.query.list_runs(page="3", per_page="2")
+        self.assertEqual([r['audit_run_id'] for r in last['runs']], ["run-0"])
+        self.assertEqual(self.query.list_runs(page="bogus")['page'], 1)
+
+    def test_trends(self):
+        """Trends come back oldest first, overall or for a single router"""
+        migrate_database(self.db_path, RESULTS_SCHEMA + ROLLUP_SCHEMA)
+        self._insert([phase_row("run-0", "R1", 1, "SUCCESS", 1, day=0), phase_row("run-0", "R2", 1, "FAILURE", 1, day=0),
+                      phase_row("run-1", "R1", 1, "FAILURE", 1, day=1)])
+
+        overall = self.query.trends(limit=10)
+        self.assertEqual([t['audit_run_id'] for t in overall], ["run-0", "run-1"])
+        self.assertEqual(overall[0]['success_rate'], 50.0)
+
+        r1 = self.query.trends(limit=10, router_hostname="R1")
+        self.assertEqual([t['success_rate'] for t in r1], [100.0, 0.0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the captured configuration index
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import zipfile
+
+from captured_config_index import CapturedConfigIndex, iter_combined_configs, iter_configs_zip
+
+class TestCapturedConfigIndex(unittest.TestCase):
+    """Test cases for indexing, paging and streaming captured configs"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.index = CapturedConfigIndex(self.temp_dir)
+
+    def tearDown(self):
+        self.index.stop_polling()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write_config(self, audit_date, filename, content="hostname R1\n"):
+        audit_path = os.path.join(self.temp_dir, audit_date)
+        os.makedirs(audit_path, exist_ok=True)
+        with open(os.path.join(audit_path, filename), "w") as f:
+            f.write(content)
+
+    def test_refresh_indexes_config_files_only(self):
+        """Only .conf/.cfg/running-config files are indexed"""
+        self._write_config("20250101", "R1-running-config.txt")
+        self._write_config("20250101", "R2.cfg")
+        self._write_config("20250101", "summary.json")
+        self.assertEqual(self.index.refresh(), 1)
+        self.assertEqual(self.index.count_routers(), 2)
+
+    def test_unchanged_dirs_not_rescanned(self):
+        """A second refresh with no directory changes rescans nothing"""
+        self._write_config("20250101", "R1.cfg")
+        self.index.refresh()
+        self.assertEqual(self.index.refresh(), 0)
+
+        time.sleep(0.01)
+        self._write_config("20250102", "R1.cfg")
+        self.assertEqual(self.index.refresh(), 1)
+        self.assertEqual(len(self.index.files_for_router("R1")), 2)
+
+    def test_config_rewritten_in_place_reindexed(self):
+        """A config rewritten in place is picked up although its directory mtime is unchanged"""
+        self._write_config("20250101", "R1.cfg")
+        self.index.refresh()
+        audit_path = os.path.join(self.temp_dir, "20250101")
+        dir_mtime = os.stat(audit_path).st_mtime
+
+        with open(os.path.join(audit_path, "R1.cfg"), "a") as f:
+            f.write("interface Gi0/0\n")
+        os.utime(audit_path, (dir_mtime, dir_mtime))
+
+        self.assertEqual(self.index.refresh(), 1)
+        self.assertEqual(self.index.files_for_router("R1")[0]["filesize"], len("hostname R1\ninterface Gi0/0\n"))
+        self.assertEqual(self.index.refresh(), 0)
+
+    def test_index_created_on_first_use(self):
+        """Constructing an index touches nothing on disk"""
+        report_dir = os.path.join(self.temp_dir, "reports")
+        index = CapturedConfigIndex(report_dir)
+        self.assertFalse(os.path.exists(report_dir))
+        self.assertEqual(index.refresh(), 0)
+        self.assertEqual(index.count_routers(), 0)
+        self.assertTrue(os.path.exists(index.index_path))
+
+    def test_polling_refreshes_in_background(self):
+        """The poller indexes existing audits at start and picks up new ones without a query-time refresh"""
+        self._write_config("20250101", "R1.cfg")
+        self.index.start_polling(interval=0.05)
+        deadline = time.time() + 5
+        while time.time() < deadline and self.index.count_routers() < 1:
+            time.sleep(0.01)
+        self.assertEqual(self.index.count_routers(), 1)
+
+        self._write_config("20250102", "R2.cfg")
+        while time.time() < deadline and self.index.count_routers() < 2:
+            time.sleep(0.01)
+        self.assertEqual(self.index.count_routers(), 2)
+
+    def test_removed_audit_dir_dropped(self):
+        """Deleting an audit directory removes its rows on the next refresh"""
+        self._write_config("20250101", "R1.cfg")
+        self.index.refresh()
+        shutil.rmtree(os.path.join(self.temp_dir, "20250101"))
+        self.index.refresh()
+        self.assertEqual(self.index.count_routers(), 0)
+
+    def test_router_page(self):
+        """Routers are paged alphabetically and carry their configs"""
+        for i in range(30):
+            self._write_config("20250101", f"R{i:02d}.cfg")
+        self.index.refresh()
+
+        names, configs, total = self.index.router_page(2, 25)
+        self.assertEqual(total, 30)
+        self.assertEqual(names, [f"R{i:02d}" for i in range(25, 30)])
+        self.assertEqual(configs["R25"][0]["filename"], "R25.cfg")
+
+    def test_index_persists_across_instances(self):
+        """A new index over the same directory reuses the stored rows"""
+        self._write_config("20250101", "R1.cfg")
+        self.index.refresh()
+        reopened = CapturedConfigIndex(self.temp_dir)
+        self.assertEqual(reopened.refresh(), 0)
+        self.assertEqual(reopened.count_routers(), 1)
+
+    def test_combined_stream(self):
+        """The combined download contains every config with its header"""
+        self._write_config("20250101", "R1.cfg", "hostname R1-old\n")
+        self._write_config("20250102", "R1.cfg", "hostname R1-new\n")
+        self.index.refresh()
+
+        text = "".join(iter_combined_configs(self.index.files_for_router("R1")))
+        self.assertIn("===== R1.cfg (20250102) =====", text)
+        self.assertLess(text.index("R1-new"), text.index("R1-old"))
+
+    def test_zip_stream(self):
+        """The streamed zip is a valid archive holding each config"""
+        self._write_config("20250101", "R1.cfg", "hostname R1\n" * 1000)
+        self._write_config("20250102", "R1.cfg", "hostname R1\n")
+        self.index.refresh()
+
+        data = b"".join(iter_configs_zip(self.index.files_for_router("R1")))
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertEqual(sorted(archive.namelist()), ["20250101/R1.cfg", "20250102/R1.cfg"])
+            self.assertEqual(archive.read("20250102/R1.cfg"), b"hostname R1\n")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared credential vault
+"""
+
+import base64
+import os
+import subprocess
+import sys
+import textwrap
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+import credential_vault
+from credential_vault import decrypt_inventory, derive_fernet_key, key_handoff, pbkdf2_sha256
+
+SALT = b"0123456789abcdef"
+
+class TestCredentialVault(unittest.TestCase):
+    """Test cases for key derivation caching, hand-off and batch decryption"""
+
+    def setUp(self):
+        credential_vault.clear_key_cache()
+
+    def test_key_matches_cryptography_derivation(self):
+        """Keys are interchangeable with the PBKDF2HMAC derivation the tools used before"""
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=SALT, iterations=100000)
+        expected = base64.urlsafe_b64encode(kdf.derive(b"master-pass"))
+        self.assertEqual(derive_fernet_key("master-pass", SALT), expected)
+
+    def test_derivation_cached(self):
+        """The second derivation for the same password and salt is a cache hit"""
+        start = time.perf_counter()
+        first = derive_fernet_key("master-pass", SALT)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(10):
+            self.assertEqual(derive_fernet_key("master-pass", SALT), first)
+        warm = time.perf_counter() - start
+
+        self.assertLess(warm, cold)
+        self.assertNotEqual(derive_fernet_key("other-pass", SALT), first)
+        self.assertNotEqual(pbkdf2_sha256(b"master-pass", b"another-salt"), pbkdf2_sha256(b"master-pass", SALT))
+
+    def test_key_cache_bounded(self):
+        """Fresh random salts (hash_password) evict the least recently used derivations"""
+        master = pbkdf2_sha256(b"master-pass", SALT, iterations=1000)
+        for _ in range(credential_vault.MAX_CACHED_KEYS * 3):
+            pbkdf2_sha256(b"user-pass", os.urandom(16), iterations=1000)
+            pbkdf2_sha256(b"master-pass", SALT, iterations=1000)  # Recently used keys stay cached
+
+        self.assertEqual(len(credential_vault._derived), credential_vault.MAX_CACHED_KEYS)
+        self.assertIs(pbkdf2_sha256(b"master-pass", SALT, iterations=1000), master)
+
+    @unittest.skipUnless(os.name == "posix", "key hand-off uses inherited file descriptors")
+    def test_key_handoff_to_child(self):
+        """A child started inside key_handoff reads the key; a mismatched salt is refused"""
+        key = derive_fernet_key("master-pass", SALT)
+        child = textwrap.dedent(f"""
+            import sys
+            sys.path.insert(0, {os.path.dirname(os.path.abspath(__file__))!r})
+            from credential_vault import inherited_key
+            print(inherited_key(b"wrong-salt"), inherited_key({SALT!r}).decode())
+        """)
+        with key_handoff(key, SALT) as (env, pass_fds):
+            output = subprocess.run([sys.executable, "-c", child], env=dict(os.environ, **env),
+                                    pass_fds=pass_fds, capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.split(), ["None", key.decode()])
+
+    def test_decrypt_inventory(self):
+        """Encrypted fields are decrypted in one pass; failures are reported by hostname"""
+        cipher = Fernet(derive_fernet_key("master-pass", SALT))
+        other = Fernet(Fernet.generate_key())
+        routers = [
+            {'hostname': 'R1', 'password': cipher.encrypt(b"pw1").decode(), 'secret': cipher.encrypt(b"en1").decode()},
+            {'hostname': 'R2', 'password': 'plain', 'secret': ''},
+            {'hostname': 'R3', 'password': other.encrypt(b"pw3").decode()},
+        ]
+        decrypted, failed = decrypt_inventory(lambda token: cipher.decrypt(token.encode()).decode(), routers)
+        self.assertEqual((decrypted[0]['password'], decrypted[0]['secret']), ("pw1", "en1"))
+        self.assertEqual(decrypted[1]['password'], "plain")
+        self.assertEqual(decrypted[2]['password'], routers[2]['password'])
+        self.assertEqual(failed, ["R3"])
+        self.assertTrue(routers[0]['password'].startswith("gAAAAAB"))  # Inputs untouched
+
+    def test_phased_audit_decrypts_each_credential_once(self):
+        """Stored ciphertexts are decrypted once up front and handed to phase 2 as-is"""
+        import phased_audit_tool
+
+        class CountingManager:
+            calls = {"encrypt": 0, "decrypt": 0}
+
+            def __init__(self, master_password):
+                pass
+
+            def encrypt(self, value):
+                self.calls["encrypt"] += 1
+                return "gAAAAAB" + value
+
+            def decrypt(self, token):
+                self.calls["decrypt"] += 1
+                return token[len("gAAAAAB"):]
+
+        routers = [
+            {'hostname': 'R1', 'ip': '10.0.0.1', 'username': 'admin', 'password': 'gAAAAABpw1', 'secret': 'gAAAAABen1'},
+            {'hostname': 'R2', 'ip': '10.0.0.2', 'username': 'admin', 'password': 'pw2'},
+        ]
+        phase2 = MagicMock(return_value={"status": "SUCCESS", "connection": None})
+        patches = [patch.object(phased_audit_tool, name, MagicMock(return_value={"status": "SUCCESS"}))
+                   for name in ("initialize_database", "flush_writer", "execute_phase1_connectivity",
+                                "execute_phase3_config_audit", "execute_phase4_risk_assessment",
+                                "execute_phase5_reporting")]
+        patches += [patch.object(phased_audit_tool, "CredentialManager", CountingManager),
+                    patch.object(phased_audit_tool, "prompt_for_master_password", return_value="master"),
+                    patch.object(phased_audit_tool, "execute_phase2_authentication", phase2)]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+        phased_audit_tool.perform_phased_audit(routers)
+
+        self.assertEqual(CountingManager.calls, {"encrypt": 1, "decrypt": 2})  # Only R2's plaintext is encrypted
+        credentials = [call.args[4] for call in phase2.call_args_list]
+        self.assertEqual(credentials, [{'password': 'pw1', 'secret': 'en1'}, {'password': 'pw2', 'secret': ''}])
+        self.assertEqual(phase2.call_args_list[0].args[1]['password'], 'gAAAAABpw1')
+
+if __name__ == "__main__":
+    unittest.main()
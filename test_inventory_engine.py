@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared inventory engine
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+import inventory_engine
+from inventory_engine import InventoryTable, load_inventory
+
+SAMPLE = (
+    "hostname,ip,device_type,location\n"
+    " R1 ,10.0.0.1,cisco_ios,Lab\n"
+    "R2,10.0.0.2,cisco_ios\n"
+    "\n"
+    "bad_host!,10.0.0.300,cisco_ios,Lab\n"
+    "R1,router.example.com,,Lab\n"
+)
+
+class TestInventoryEngine(unittest.TestCase):
+    """Test cases for InventoryTable parsing, validation and the load cache"""
+
+    def setUp(self):
+        inventory_engine.clear_inventory_cache()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "inventory.csv")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, text):
+        with open(self.path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+
+    def test_parse_strips_and_pads(self):
+        """Cells are stripped, short rows padded and blank lines skipped"""
+        table = InventoryTable.from_text(SAMPLE)
+        self.assertEqual(table.row_count, 4)
+        self.assertEqual(table.column('hostname'), ['R1', 'R2', 'bad_host!', 'R1'])
+        self.assertEqual(table.rows()[1], {'hostname': 'R2', 'ip': '10.0.0.2', 'device_type': 'cisco_ios', 'location': ''})
+        self.assertTrue(table.has_columns('hostname', 'ip'))
+        self.assertFalse(table.has_columns('management_ip'))
+
+    def test_validate_and_duplicates(self):
+        """Bulk validation reports one message per bad row; duplicates come from hash sets"""
+        table = InventoryTable.from_text(SAMPLE)
+        self.assertEqual(table.validate(), [
+            (3, "Row 3: Invalid hostname format: bad_host!"),
+            (4, "Row 4 missing required fields: device_type"),
+        ])
+        strict = table.validate(allow_dns_names=False)
+        self.assertIn((4, "Row 4 missing required fields: device_type"), strict)
+        self.assertEqual(table.duplicates('hostname'), {'R1': [0, 3]})
+        self.assertEqual(InventoryTable.from_text("hostname,ip\nR1,10.0.0.1\n").validate(),
+                         [(0, "CSV is missing required headers: device_type")])
+        self.assertEqual(table.to_router_dict(skip_empty=True)['routers']['R2'],
+                         {'ip': '10.0.0.2', 'device_type': 'cisco_ios'})
+
+    def test_load_cached_until_changed(self):
+        """Reloading an unchanged (or merely touched) file returns the cached table"""
+        self.write(SAMPLE)
+        first = load_inventory(self.path)
+        self.assertIs(load_inventory(self.path), first)
+
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        self.assertIs(load_inventory(self.path), first)
+
+        self.write(SAMPLE + "R9,10.0.0.9,cisco_ios,Lab\n")
+        reloaded = load_inventory(self.path)
+        self.assertIsNot(reloaded, first)
+        self.assertEqual(reloaded.row_count, 5)
+
+    def test_large_inventory(self):
+        """A 50,000-row inventory loads and validates in well under a second"""
+        lines = ["hostname,ip,device_type"]
+        lines += [f"R{i},10.{i // 65536}.{i // 256 % 256}.{i % 256},cisco_ios" for i in range(50000)]
+        self.write("\n".join(lines) + "\n")
+
+        start = time.perf_counter()
+        table = load_inventory(self.path)
+        errors = table.validate()
+        duplicates = table.duplicates('hostname')
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(table.row_count, 50000)
+        self.assertEqual((errors, duplicates), ([], {}))
+        self.assertLess(elapsed, 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent Paramiko shell session module
+"""
+
+import socket
+import unittest
+from unittest.mock import MagicMock
+
+from paramiko_shell_session import ParamikoShellSession, ShellSessionError
+
+class FakeIOSChannel:
+    """Simulates an IOS interactive shell: echoes each line, prints its output and the prompt"""
+
+    def __init__(self, hostname="R1", privileged=True, outputs=None):
+        self.hostname = hostname
+        self.privileged = privileged
+        self.outputs = outputs or {}
+        self.closed = False
+        self.pending = b""
+        self.awaiting_password = False
+        self.writes = []
+
+    def prompt(self):
+        return f"{self.hostname}{'#' if self.privileged else '>'}"
+
+    def settimeout(self, timeout):
+        pass
+
+    def sendall(self, data):
+        self.writes.append(data)
+        for line in data.split("\n")[:-1]:
+            if self.awaiting_password:
+                self.awaiting_password = False
+                self.privileged = True
+                self.pending += f"\r\n{self.prompt()}".encode()
+            elif line == "enable":
+                self.awaiting_password = True
+                self.pending += f"{line}\r\nPassword: ".encode()
+            else:
+                output = self.outputs.get(line, "")
+                echo = f"{line}\r\n"
+                body = f"{output}\r\n" if output else ""
+                self.pending += f"{echo}{body}{self.prompt()}".encode()
+
+    def recv(self, size):
+        if not self.pending:
+            raise socket.timeout()
+        data, self.pending = self.pending[:size], self.pending[size:]
+        return data
+
+    def close(self):
+        self.closed = True
+
+class StallingIOSChannel(FakeIOSChannel):
+    """Holds back the output of a stalled write until the next write arrives, like a slow device"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.stall = False
+        self.held = b""
+
+    def sendall(self, data):
+        pending, self.pending = self.pending, b""
+        super().sendall(data)
+        if self.stall:
+            self.stall = False
+            self.held, self.pending = self.pending, pending
+        else:
+            self.pending = pending + self.held + self.pending
+            self.held = b""
+
+class TestParamikoShellSession(unittest.TestCase):
+    """Test cases for ParamikoShellSession"""
+
+    def setUp(self):
+        self.channel = FakeIOSChannel(outputs={
+            "show version": "Cisco IOS Software, Version 15.7\nuptime is 1 week",
+            "show ip interface brief": "Interface  IP-Address  OK? Method Status  Protocol\nGi0/0  10.0.0.1  YES manual up  up",
+        })
+        self.client = MagicMock()
+        self.client.invoke_shell.return_value = self.channel
+        self.session = ParamikoShellSession(self.client, "R1", timeout=2)
+
+    def test_single_shell_channel_reused(self):
+        """Every command runs on the one shell channel opened on first use"""
+        self.session.send_command("show version")
+        self.session.send_command("show ip interface brief")
+        self.client.invoke_shell.assert_called_once()
+        self.client.exec_command.assert_not_called()
+
+    def test_send_command_strips_echo_and_prompt(self):
+        """Output is framed by the echoed command and the returning prompt"""
+        output = self.session.send_command("show version")
+        self.assertEqual(output, "Cisco IOS Software, Version 15.7\nuptime is 1 week")
+        self.assertEqual(self.session.prompt, "R1#")
+
+    def test_paging_disabled_on_open(self):
+        """Terminal paging is disabled once when the shell opens"""
+        self.session.send_command("show version")
+        self.assertIn("terminal length 0\n", self.channel.writes)
+
+    def test_pipelined_commands_single_write(self):
+        """Pipelined show commands go out in one write and are split on sentinels"""
+        self.session.find_prompt()
+        writes_before = len(self.channel.writes)
+
+        outputs = self.session.send_commands(["show version", "show ip interface brief"])
+
+        self.assertEqual(len(self.channel.writes), writes_before + 1)
+        self.assertEqual(outputs[0], "Cisco IOS Software, Version 15.7\nuptime is 1 week")
+        self.assertTrue(outputs[1].startswith("Interface  IP-Address"))
+
+    def test_output_line_ending_in_prompt_char_kept(self):
+        """Only a line holding the device prompt is stripped, not output that ends in > or #"""
+        self.channel.outputs["show run | include description"] = " description uplink-to-PE1>\n description core#"
+        self.session.find_prompt()
+        outputs = self.session.send_commands(["show version", "show run | include description"])
+        self.assertEqual(outputs[1], " description uplink-to-PE1>\n description core#")
+        self.assertEqual(self.session.send_command("show run | include description"),
+                         " description uplink-to-PE1>\n description core#")
+
+    def test_failed_pipeline_replaces_shell(self):
+        """Late pipeline output is discarded with its channel instead of framing the next command"""
+        first = StallingIOSChannel(outputs=self.channel.outputs)
+        second = FakeIOSChannel(outputs=self.channel.outputs)
+        self.client.invoke_shell.side_effect = [first, second]
+        self.session.find_prompt()
+
+        first.stall = True
+        with self.assertRaises(ShellSessionError):
+            self.session.send_commands(["show ip interface brief", "show version"], read_timeout=0.05)
+
+        self.assertTrue(first.closed)
+        self.assertEqual(self.session.send_command("show version"),
+                         "Cisco IOS Software, Version 15.7\nuptime is 1 week")
+        self.assertIs(self.session.channel, second)
+
+    def test_timed_out_command_replaces_shell(self):
+        """A single command that times out does not leave its late output for the next one"""
+        first = StallingIOSChannel(outputs=self.channel.outputs)
+        second = FakeIOSChannel(outputs=self.channel.outputs)
+        self.client.invoke_shell.side_effect = [first, second]
+        self.session.find_prompt()
+
+        first.stall = True
+        with self.assertRaises(ShellSessionError):
+            self.session.send_command("show ip interface brief", read_timeout=0.05)
+
+        self.assertTrue(first.closed)
+        self.assertEqual(self.session.send_command("show version"),
+                         "Cisco IOS Software, Version 15.7\nuptime is 1 week")
+
+    def test_enable_answers_password_prompt(self):
+        """enable() moves from user exec to privileged exec"""
+        self.channel.privileged = False
+        self.session.enable_password = "secret"
+        self.session.enable()
+        self.assertEqual(self.session.prompt, "R1#")
+
+    def test_timeout_raises(self):
+        """A prompt that never returns raises ShellSessionError"""
+        self.session.find_prompt()
+        self.channel.sendall = lambda data: None
+        self.session.timeout = 0.05
+        with self.assertRaises(ShellSessionError):
+            self.session.send_command("show version", read_timeout=0.05)
+
+    def test_disconnect_closes_channel_and_client(self):
+        """disconnect() closes the shell channel and the SSH client"""
+        self.session.find_prompt()
+        self.session.disconnect()
+        self.assertTrue(self.channel.closed)
+        self.client.close.assert_called_once()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the NetAuditPro progress tracker
+"""
+
+import io
+import json
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from progress_tracker import HISTORY_SIZE, SNAPSHOT_HISTORY, ProgressTracker, benchmark_updates, log_combined_progress
+
+class TestProgressTracker(unittest.TestCase):
+    """Test cases for ProgressTracker state, snapshots and concurrency"""
+
+    def test_router_and_stage_progress(self):
+        """Updates are reflected in router, stage and combined progress"""
+        tracker = ProgressTracker(6)
+        tracker.update_router(1, "R2")
+        tracker.update_stage(2)
+
+        self.assertEqual(tracker.get_router_progress(), {
+            "current": 2, "total": 6, "percentage": 33.33, "router_name": "R2", "router_index": 1
+        })
+        stage = tracker.get_stage_progress()
+        self.assertEqual((stage["stage_name"], stage["percentage"], stage["stage_description"]),
+                         ("A3", 37.5, "Authorization Test"))
+        self.assertEqual(tracker.get_combined_progress()["overall_percentage"], 94.79)
+        self.assertEqual(tracker.get_progress_summary(), "Router 2/6 (33.33%) - Stage A3/8 (37.50%)")
+        self.assertEqual(tracker.get_detailed_status(),
+                         "Router 2/6 (33.33%) - [R2] - Stage A3/8 (37.50%) - [Authorization Test]")
+
+        self.assertTrue(tracker.next_router())
+        self.assertEqual((tracker.current_router_index, tracker.current_stage, tracker.router_name), (2, 0, ""))
+        tracker.complete_audit()
+        self.assertTrue(tracker.get_combined_progress()["is_completed"])
+        self.assertEqual(tracker.get_router_progress()["current"], 6)
+
+    def test_history_is_bounded(self):
+        """History keeps the most recent events in a fixed-size ring buffer"""
+        tracker = ProgressTracker(2)
+        for i in range(HISTORY_SIZE * 3):
+            tracker.update_stage(i % 8)
+
+        history = tracker.progress_history
+        self.assertEqual(len(history), HISTORY_SIZE)
+        self.assertEqual(history[-1]["event_type"], "stage_update")
+        self.assertEqual(history[-1]["stage_progress"]["stage_index"], (HISTORY_SIZE * 3 - 1) % 8)
+        self.assertEqual(len(tracker.to_dict()["progress_history"]), SNAPSHOT_HISTORY)
+
+        tracker.reset()
+        self.assertEqual([entry["event_type"] for entry in tracker.progress_history], ["progress_reset"])
+
+    def test_snapshots_cached_until_change(self):
+        """Serialized views are reused between polls and rebuilt only after a change"""
+        tracker = ProgressTracker(4)
+        tracker.update_router(0, "R1")
+        summary = tracker.get_progress_summary()
+        self.assertIs(tracker.get_progress_summary(), summary)
+
+        first = json.loads(tracker.to_json())
+        second = json.loads(tracker.to_json())
+        self.assertEqual(first["router_progress"], second["router_progress"])
+        self.assertGreater(second["elapsed_time"], first["elapsed_time"])
+        self.assertEqual(second["combined_progress"]["elapsed_time"], second["elapsed_time"])
+        self.assertEqual(first, dict(tracker.to_dict(), elapsed_time=first["elapsed_time"],
+                                     combined_progress=first["combined_progress"]))
+
+        # Callers mutating returned dicts, nested ones included, do not corrupt the cache
+        tracker.get_router_progress()["router_name"] = "changed"
+        self.assertEqual(tracker.get_router_progress()["router_name"], "R1")
+        tracker.start_device("R2", 1)
+        tracker.get_combined_progress()["devices"]["in_flight_names"].append("bogus")
+        tracker.get_device_progress()["in_flight_names"].clear()
+        router_name = tracker.get_router_progress()["router_name"]
+        decorated = tracker.to_dict()
+        decorated["combined_progress"]["router"]["router_name"] = "changed"
+        decorated["progress_history"][-1]["data"]["device_name"] = "changed"
+        decorated["progress_history"].clear()
+        tracker.progress_history[-1]["data"].clear()
+        self.assertEqual(tracker.get_device_progress()["in_flight_names"], ["R2"])
+        self.assertEqual(tracker.to_dict()["combined_progress"]["router"]["router_name"], router_name)
+        self.assertEqual(json.loads(tracker.to_json())["combined_progress"]["devices"]["in_flight_names"], ["R2"])
+        history = tracker.to_dict()["progress_history"]
+        self.assertEqual(history[-1]["event_type"], "device_start")
+        self.assertEqual(history[-1]["data"], tracker.progress_history[-1]["data"])
+        self.assertTrue(history[-1]["data"])
+
+        tracker.next_stage()
+        self.assertIsNot(tracker.get_progress_summary(), summary)
+        self.assertEqual(json.loads(tracker.to_json())["current_stage"], 1)
+
+    def test_log_messages(self):
+        tracker = ProgressTracker(2)
+        tracker.update_router(0, "R1")
+        raw_lines = []
+        with redirect_stdout(io.StringIO()) as output:
+            log_combined_progress(tracker, raw_lines.append)
+        self.assertEqual(output.getvalue().strip(),
+                         "📊 Progress: Router 1/2 (50.00%) - Stage A1/A8 (12.50%) - Overall: 78.12%")
+        self.assertEqual(raw_lines, ["[PROGRESS] [COMBINED] Router 1/2 (50.00%) | Stage A1/A8 (12.50%) | Overall 78.12%"])
+
+    def test_concurrent_transitions(self):
+        """Concurrent next_stage calls advance exactly to the last stage"""
+        tracker = ProgressTracker(1)
+        advanced = []
+
+        def worker():
+            for _ in range(100):
+                if tracker.next_stage():
+                    advanced.append(True)
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(advanced), tracker.total_stages - 1)
+        self.assertEqual(tracker.current_stage, tracker.total_stages - 1)
+
+    def test_concurrent_devices(self):
+        """Each in-flight device has its own stage; finished devices count toward overall progress"""
+        tracker = ProgressTracker(4)
+        tracker.start_device("R1", 0)
+        tracker.start_device("R2", 1)
+        tracker.update_device_stage("R1", 4)
+        tracker.update_device_stage("R2", 2)
+
+        progress = tracker.get_device_progress()
+        self.assertEqual(progress["in_flight_names"], ["R1", "R2"])
+        self.assertEqual([device["stage"]["stage_name"] for device in progress["devices"]], ["A5", "A3"])
+        self.assertEqual(progress["overall_percentage"], 18.75)
+
+        tracker.finish_device("R1")
+        tracker.finish_device("R3", success=False)  # Skipped without being started
+        combined = tracker.get_combined_progress()
+        self.assertEqual(combined["devices"], {
+            "total": 4, "in_flight": 1, "in_flight_names": ["R2"], "completed": 1, "failed": 1
+        })
+        self.assertEqual(combined["overall_percentage"], 56.25)
+        self.assertEqual(json.loads(tracker.to_json())["combined_progress"]["devices"], combined["devices"])
+
+    def test_throughput_and_eta_from_ewma(self):
+        """Devices/min and the completion estimate follow the EWMA of completion intervals"""
+        clock = [100.0]
+        with patch("progress_tracker.time.monotonic", lambda: clock[0]):
+            tracker = ProgressTracker(5)
+            self.assertIsNone(tracker.get_combined_progress()["throughput"]["eta_seconds"])
+
+            tracker.start_device("R1", 0)
+            tracker.start_device("R2", 1)
+            clock[0] = 110.0
+            tracker.finish_device("R1")
+            clock[0] = 130.0
+            tracker.finish_device("R2")
+            tracker.start_device("R3", 2)
+            clock[0] = 135.0
+
+            # Intervals 10s then 20s: EWMA 0.3 * 20 + 0.7 * 10 = 13s
+            throughput = tracker.get_combined_progress()["throughput"]
+            self.assertEqual(throughput["devices_per_minute"], round(60 / 13, 2))
+            self.assertEqual(throughput["average_device_seconds"], 16.0)
+            self.assertEqual(throughput["eta_seconds"], 3 * 13 - 5)
+            serialized = json.loads(tracker.to_json())["combined_progress"]["throughput"]
+            self.assertEqual(serialized["eta_seconds"], throughput["eta_seconds"])
+            self.assertIsNotNone(serialized["estimated_completion"])
+
+            device = tracker.get_device_progress()["devices"][0]
+            self.assertEqual((device["device_name"], device["elapsed_time"], device["eta_seconds"]), ("R3", 5.0, 11.0))
+
+    def test_concurrent_device_workers(self):
+        """64 device workers moving through all stages in parallel are all accounted for"""
+        tracker = ProgressTracker(64)
+
+        def worker(index):
+            name = f"R{index}"
+            tracker.start_device(name, index)
+            for stage in range(1, tracker.total_stages):
+                tracker.update_device_stage(name, stage)
+                tracker.get_device_progress()
+            tracker.finish_device(name, success=index % 4 != 0)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(64)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        progress = tracker.get_device_progress()
+        self.assertEqual((progress["in_flight"], progress["completed"], progress["failed"]), (0, 48, 16))
+        self.assertEqual(progress["overall_percentage"], 100.0)
+        self.assertEqual(progress["throughput"]["eta_seconds"], 0.0)
+        self.assertGreater(progress["throughput"]["devices_per_minute"], 0)
+
+    def test_benchmark_with_64_workers(self):
+        """No update is lost under 64 concurrent device workers"""
+        result = benchmark_updates(workers=64, updates_per_worker=200, pollers=2, poll_interval=0.001)
+        self.assertEqual(result["published"], result["updates"])
+        self.assertEqual(result["history_size"], HISTORY_SIZE)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,7 @@ import sys
 import os
 import tempfile
 import json
+import time
 from datetime import datetime
 
 # Add current directory to path
@@ -182,6 +183,199 @@ def test_data_parser(rr5):
         print(f"❌ Data parser test failed: {e}")
         return False
 
+def test_route_table(rr5):
+    """Test full routing-table parsing and comparison"""
+    print("\nTesting routing table diff...")
+    try:
+        pre_output = """
+Gateway of last resort is 10.0.0.1 to network 0.0.0.0
+
+S*    0.0.0.0/0 [1/0] via 10.0.0.1
+      10.0.0.0/8 is variably subnetted, 3 subnets, 2 masks
+C        10.0.0.0/24 is directly connected, GigabitEthernet0/0
+L        10.0.0.2/32 is directly connected, GigabitEthernet0/0
+O IA     10.1.1.0/24 [110/2] via 10.0.0.1, 00:01:02, GigabitEthernet0/0
+                     [110/2] via 10.0.0.3, 00:01:02, GigabitEthernet0/1
+      172.16.0.0/24 is subnetted, 2 subnets
+O        172.16.1.0 [110/2] via 10.0.0.1, 00:01:02, GigabitEthernet0/0
+B        172.16.2.0 
+           [200/0] via 10.0.0.5, 1d02h
+"""
+        post_output = pre_output.replace("                     [110/2] via 10.0.0.3, 00:01:02, GigabitEthernet0/1\n", "")
+        post_output = post_output.replace("via 10.0.0.5", "via 10.0.0.6").replace("172.16.1.0 [110/2]", "172.16.3.0 [110/2]")
+        
+        pre_table = rr5.RouteTable.from_show_ip_route(pre_output)
+        post_table = rr5.RouteTable.from_show_ip_route(post_output)
+        assert len(pre_table) == 7
+        assert pre_table.prefix_count == 6
+        
+        diff = pre_table.diff(post_table)
+        assert (diff['added'], diff['removed'], diff['next_hop_changed']) == (1, 1, 2)
+        assert diff['samples']['removed'] == ['172.16.1.0/24']
+        assert diff['samples']['next_hop_changed'] == ['10.1.1.0/24', '172.16.2.0/24']
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            logger = rr5.AuditLogger()
+            storage = rr5.DataStorage(temp_dir, logger)
+            pre_file = storage.save_route_table('pre', 'R1', pre_table, '20250101_000000')
+            post_file = storage.save_route_table('post', 'R1', post_table, '20250101_010000')
+            assert rr5.RouteTable.load(pre_file).diff(rr5.RouteTable.load(post_file)) == diff
+            
+            comparator = rr5.Phase3Comparator(logger)
+            results = comparator._compare_route_tables('R1', {'route_table_file': pre_file},
+                                                       {'route_table_file': post_file})
+            statuses = {result.check_name: result.status for result in results}
+            assert statuses == {
+                'R1_route_table_removed': 'FAIL',
+                'R1_route_table_added': 'PASS',
+                'R1_route_table_next_hop_changed': 'PASS'
+            }
+        
+        print("✅ Routing table diff test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Routing table diff test failed: {e}")
+        return False
+
+def test_parallel_pre_check(rr5):
+    """Test concurrent pre-check with one session per device"""
+    print("\nTesting parallel pre-check...")
+    try:
+        class FakeConnection:
+            def send_command(self, command, **kwargs):
+                return ""
+            
+            def disconnect(self):
+                pass
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = rr5.DEFAULT_CONFIG.copy()
+            config.update({'output_dir': temp_dir, 'max_workers': 4})
+            orchestrator = rr5.RR5AuditOrchestrator(config)
+            
+            opened = []
+            def open_connection(device):
+                time.sleep(0.2)  # Login latency
+                opened.append(device.name)
+                return FakeConnection()
+            orchestrator.connector._open_connection = open_connection
+            
+            devices = [rr5.DeviceInfo(name=f"R{i}", ip_address=f"10.0.0.{i}", device_type="cisco_ios")
+                       for i in range(8)]
+            start = time.time()
+            filepath = orchestrator.run_pre_check(devices)
+            elapsed = time.time() - start
+            
+            assert sorted(opened) == sorted(device.name for device in devices)  # One login per device
+            assert elapsed < 8 * 0.2
+            assert orchestrator.connector.connections == {}
+            
+            data = orchestrator.storage.load_phase_data(filepath)
+            assert list(data.keys()) == [device.name for device in devices]  # Inventory order, not completion order
+            assert all(entry['health'] and entry['data'] for entry in data.values())
+        
+        print("✅ Parallel pre-check test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Parallel pre-check test failed: {e}")
+        return False
+
+def test_phase_snapshot(rr5):
+    """Test streaming phase snapshots and comparing them device by device"""
+    print("\nTesting phase snapshots...")
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            logger = rr5.AuditLogger()
+            storage = rr5.DataStorage(temp_dir, logger)
+            health = {'cpu_percent': 20.0, 'memory_free_percent': 60.0}
+            
+            with storage.open_phase_snapshot('pre', '20250101_000000') as pre:
+                for name in ['R1', 'R2', 'R3']:
+                    pre.write(name, {'health': health, 'data': {}})
+            
+            # Interrupted run: no index, last line half written
+            post = storage.open_phase_snapshot('post', '20250101_010000')
+            post.write('R2', {'health': dict(health, cpu_percent=90.0), 'data': {}})
+            post.write('R1', {'health': health, 'data': {}})
+            post._file.write(b'{"device": "R3", "da')
+            post._file.flush()
+            
+            pre_data = storage.load_phase_data(str(pre.filepath))
+            post_data = storage.load_phase_data(str(post.filepath))
+            assert os.path.exists(f"{pre.filepath}.idx")
+            assert list(pre_data) == ['R1', 'R2', 'R3']
+            assert sorted(post_data) == ['R1', 'R2']
+            assert post_data['R2']['health']['cpu_percent'] == 90.0
+            assert storage.list_phase_files('pre') == [str(pre.filepath)]
+            
+            # Devices finishing out of order are listed in inventory order, with or without the index
+            with storage.open_phase_snapshot('order', '20250101_020000', ['R1', 'R2', 'R3']) as ordered:
+                for name in ['R3', 'R1', 'R2']:
+                    ordered.write(name, {'health': health, 'data': {}})
+            assert list(storage.load_phase_data(str(ordered.filepath))) == ['R1', 'R2', 'R3']
+            os.remove(f"{ordered.filepath}.idx")
+            assert list(storage.load_phase_data(str(ordered.filepath))) == ['R1', 'R2', 'R3']
+            
+            results = rr5.Phase3Comparator(logger).compare_datasets(pre_data, post_data)
+            statuses = {result.check_name: result.status for result in results}
+            assert statuses['R1_cpu_usage'] == 'PASS'
+            assert statuses['R2_cpu_usage'] == 'FAIL'
+            assert statuses['R3_availability'] == 'FAIL'
+            post.close()
+        
+        print("✅ Phase snapshot test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Phase snapshot test failed: {e}")
+        return False
+
+def test_vectorized_comparison(rr5):
+    """Test that array threshold evaluation matches the per-device comparison"""
+    print("\nTesting vectorized comparison...")
+    try:
+        import random
+        rng = random.Random(7)
+        
+        def snapshot(devices):
+            data = {}
+            for name in devices:
+                interfaces = [{'name': f"Gi0/{i}", 'status': rng.choice(['up', 'up', 'down']),
+                               'crc_errors': rng.choice([0, 0, 5])} for i in range(rng.randint(0, 6))]
+                data[name] = {
+                    'health': {'cpu_percent': rng.choice([10, 25.5, 72.0]), 'memory_free_percent': rng.uniform(20, 60)},
+                    'data': {
+                        'interfaces': interfaces,
+                        'routing': {'total_routes': rng.choice([100, 101, 104, 120])},
+                        'sample_routes': [{'prefix': '10.0.0.0/24', 'next_hop': rng.choice(['10.1.1.1', '10.1.1.2'])}]
+                    }
+                }
+            return data
+        
+        names = [f"R{i}" for i in range(60)]
+        pre_data = snapshot(names)
+        post_data = snapshot(names[:-3] + ['R99'])
+        post_data['R5']['health'] = None
+        
+        logger = rr5.AuditLogger()
+        comparator = rr5.Phase3Comparator(logger)
+        vectorized = comparator.compare_datasets(pre_data, post_data)
+        per_device = comparator._compare_datasets_per_device(pre_data, post_data)
+        assert vectorized == per_device
+        assert {result.status for result in vectorized} == {'PASS', 'WARN', 'FAIL'}
+        
+        failures = rr5.Phase3Comparator(logger, include_passed=False).compare_datasets(pre_data, post_data)
+        assert failures == [result for result in per_device if result.status != 'PASS']
+        
+        print("✅ Vectorized comparison test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Vectorized comparison test failed: {e}")
+        return False
+
 def test_report_generator(rr5):
     """Test report generation"""
     print("\nTesting report generator...")
@@ -278,6 +472,10 @@ def main():
         (test_data_structures, rr5),
         (test_logger, rr5),
         (test_data_parser, rr5),
+        (test_route_table, rr5),
+        (test_parallel_pre_check, rr5),
+        (test_phase_snapshot, rr5),
+        (test_vectorized_comparison, rr5),
         (test_report_generator, rr5),
         (test_credential_sanitization, rr5)
     ]
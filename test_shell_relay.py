@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the multiplexed interactive shell relay
+"""
+
+import select
+import socket
+import threading
+import time
+import unittest
+
+from shell_relay import ShellRelay
+
+class FakeChannel:
+    """Selectable stand-in for a paramiko channel; the test writes device output into the far end"""
+
+    def __init__(self):
+        self._local, self.device = socket.socketpair()
+        self.closed = False
+        self.eof_received = False
+
+    def fileno(self):
+        return self._local.fileno()
+
+    def recv_ready(self):
+        return bool(select.select([self._local], [], [], 0)[0]) and not self.eof_received
+
+    def recv(self, size):
+        data = self._local.recv(size)
+        if not data:
+            self.eof_received = True
+        return data
+
+    def exit_status_ready(self):
+        return self.eof_received
+
+class TestShellRelay(unittest.TestCase):
+    """Test cases for ShellRelay"""
+
+    def setUp(self):
+        self.frames = []
+        self.callbacks = []
+        self.closed = []
+        self.lock = threading.Lock()
+        self.relay = ShellRelay(self._emit, on_closed=self.closed.append,
+                                frame_bytes=1024, flush_latency=0.02, max_inflight=2, ack_timeout=5.0)
+
+    def tearDown(self):
+        self.relay.stop()
+
+    def _emit(self, sid, text, callback):
+        with self.lock:
+            self.frames.append((sid, text))
+            if callback:
+                self.callbacks.append(callback)
+
+    def _wait_for(self, predicate, timeout=2.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.005)
+        return predicate()
+
+    def _output(self, sid):
+        with self.lock:
+            return "".join(text for frame_sid, text in self.frames if frame_sid == sid)
+
+    def test_small_writes_coalesced(self):
+        """Several small writes inside the latency budget go out as one frame"""
+        channel = FakeChannel()
+        self.relay.register("s1", channel)
+        for _ in range(5):
+            channel.device.sendall(b"ab")
+        self.assertTrue(self._wait_for(lambda: self._output("s1") == "ababababab"))
+        self.assertLessEqual(len(self.frames), 2)
+
+    def test_one_thread_for_many_sessions(self):
+        """All sessions share the single relay thread"""
+        threads_before = threading.active_count()
+        channels = {f"s{i}": FakeChannel() for i in range(20)}
+        for sid, channel in channels.items():
+            self.relay.register(sid, channel)
+        for sid, channel in channels.items():
+            channel.device.sendall(f"{sid}#".encode())
+        self.assertTrue(self._wait_for(lambda: all(self._output(sid) == f"{sid}#" for sid in channels)))
+        self.assertEqual(threading.active_count(), threads_before + 1)
+
+    def test_frames_capped_at_frame_size(self):
+        """Bulk output is split into frame-sized messages"""
+        channel = FakeChannel()
+        self.relay.register("s1", channel)
+        channel.device.sendall(b"x" * 3000)
+        self.assertTrue(self._wait_for(lambda: len(self._output("s1")) == 3000))
+        self.assertTrue(all(len(text) <= 1024 for _, text in self.frames))
+
+    def test_backpressure_until_ack(self):
+        """A flow-controlled session stops at max_inflight frames until the client acks"""
+        channel = FakeChannel()
+        self.relay.register("s1", channel, flow_control=True)
+        channel.device.sendall(b"y" * 5000)
+        self.assertTrue(self._wait_for(lambda: len(self.frames) == 2))
+        time.sleep(0.1)
+        self.assertEqual(len(self.frames), 2)
+
+        for _ in range(3):
+            with self.lock:
+                pending, self.callbacks = self.callbacks, []
+            for callback in pending:
+                callback()
+            self._wait_for(lambda: len(self._output("s1")) == 5000, timeout=0.5)
+        self.assertEqual(len(self._output("s1")), 5000)
+
+    def test_split_utf8_sequence(self):
+        """A multi-byte character split across reads is decoded intact"""
+        channel = FakeChannel()
+        self.relay.register("s1", channel)
+        encoded = "router✓".encode("utf-8")
+        channel.device.sendall(encoded[:-1])
+        time.sleep(0.05)
+        channel.device.sendall(encoded[-1:])
+        self.assertTrue(self._wait_for(lambda: self._output("s1") == "router✓"))
+
+    def test_eof_flushes_and_reports_close(self):
+        """Closing the device side delivers remaining output and calls on_closed"""
+        channel = FakeChannel()
+        self.relay.register("s1", channel)
+        channel.device.sendall(b"bye")
+        channel.device.close()
+        self.assertTrue(self._wait_for(lambda: self.closed == ["s1"]))
+        self.assertEqual(self._output("s1"), "bye")
+        self.assertEqual(self.relay.active_sessions(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the batched WAL-mode SQLite writer
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from sqlite_batch_writer import BatchedSQLiteWriter, WriterError, flush_writer, get_writer, migrate_database
+
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS audit_phase_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        audit_run_id TEXT NOT NULL,
+        router_hostname TEXT NOT NULL,
+        phase_name TEXT NOT NULL,
+        status TEXT NOT NULL
+    )''',
+    "CREATE INDEX IF NOT EXISTS idx_phase_results_run_router_phase "
+    "ON audit_phase_results (audit_run_id, router_hostname, phase_name)"
+]
+
+INSERT_SQL = "INSERT INTO audit_phase_results (audit_run_id, router_hostname, phase_name, status) VALUES (?, ?, ?, ?)"
+
+class TestBatchedSQLiteWriter(unittest.TestCase):
+    """Test cases for BatchedSQLiteWriter and the schema migration helper"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "audit.sqlite")
+        migrate_database(self.db_path, SCHEMA)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _count(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM audit_phase_results").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_concurrent_rows_committed_in_batches(self):
+        """Rows from many worker threads land in far fewer transactions than rows"""
+        writer = BatchedSQLiteWriter(self.db_path, batch_size=500, flush_interval=0.05)
+
+        def worker(index):
+            for phase in range(50):
+                writer.submit(INSERT_SQL, (f"run-1", f"R{index}", f"phase{phase}", "SUCCESS"))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.flush()
+
+        self.assertEqual(self._count(), 1000)
+        self.assertEqual(writer.rows_written, 1000)
+        self.assertLess(writer.batches_committed, 100)
+        writer.close()
+
+    def test_wal_mode(self):
+        """The database is switched to WAL journaling"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        finally:
+            conn.close()
+
+    def test_migration_adds_index_to_existing_database(self):
+        """An old database without indexes is migrated in place, keeping its rows"""
+        legacy_path = os.path.join(self.temp_dir, "legacy.sqlite")
+        conn = sqlite3.connect(legacy_path)
+        conn.execute(SCHEMA[0])
+        conn.execute(INSERT_SQL, ("old-run", "R1", "Connectivity", "SUCCESS"))
+        conn.commit()
+        conn.close()
+
+        migrate_database(legacy_path, SCHEMA)
+        migrate_database(legacy_path, SCHEMA)  # Idempotent
+
+        conn = sqlite3.connect(legacy_path)
+        try:
+            indexes = [row[1] for row in conn.execute("PRAGMA index_list('audit_phase_results')")]
+            self.assertIn("idx_phase_results_run_router_phase", indexes)
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM audit_phase_results").fetchone()[0], 1)
+        finally:
+            conn.close()
+
+    def test_failed_batch_does_not_stop_writer(self):
+        """A bad row is reported and later rows are still written"""
+        writer = BatchedSQLiteWriter(self.db_path, flush_interval=0.01)
+        writer.submit("INSERT INTO missing_table VALUES (?)", (1,))
+        writer.flush()
+        self.assertIsNotNone(writer.last_error)
+        writer.submit(INSERT_SQL, ("run-2", "R1", "Connectivity", "SUCCESS"))
+        writer.flush()
+        self.assertEqual(self._count(), 1)
+        writer.close()
+
+    def test_bad_row_only_loses_itself(self):
+        """A failing row rolls back its batch, which is retried row by row in queue order"""
+        rejected = []
+        writer = BatchedSQLiteWriter(self.db_path, batch_size=500, flush_interval=0.2,
+                                     on_error=lambda sql, params, error: rejected.append(params))
+        writer.submit(INSERT_SQL, ("run-4", "R1", "Connectivity", "SUCCESS"))
+        writer.submit("UPDATE audit_phase_results SET status = ? WHERE router_hostname = ?", ("FAILED", "R1"))
+        writer.submit(INSERT_SQL, ("run-4", "R2", "Connectivity", None))  # NOT NULL violation
+        writer.submit(INSERT_SQL, ("run-4", "R3", "Connectivity", "SUCCESS"))
+        self.assertTrue(writer.flush())
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute("SELECT router_hostname, status FROM audit_phase_results ORDER BY id").fetchall()
+        finally:
+            conn.close()
+        # The UPDATE ran after the first INSERT and before the third, as queued
+        self.assertEqual(rows, [("R1", "FAILED"), ("R3", "SUCCESS")])
+        self.assertEqual((writer.rows_written, writer.rows_failed), (3, 1))
+        self.assertEqual(rejected, [("run-4", "R2", "Connectivity", None)])
+        self.assertEqual(len(writer.failed_rows), 1)
+        writer.close()
+
+    def test_flush_reports_dead_writer(self):
+        """A writer that cannot open its database fails flush/submit instead of hanging"""
+        writer = BatchedSQLiteWriter(os.path.join(self.temp_dir, "missing-dir", "audit.sqlite"))
+        writer._thread.join(timeout=5)
+        self.assertIsNotNone(writer.last_error)
+        with self.assertRaises(WriterError):
+            writer.submit(INSERT_SQL, ("run-5", "R1", "Connectivity", "SUCCESS"))
+        writer._queue.put((INSERT_SQL, ("run-5", "R1", "Connectivity", "SUCCESS")))
+        with self.assertRaises(WriterError):
+            writer.flush(timeout=5)
+
+    def test_shared_writer_per_database(self):
+        """get_writer hands every caller the same writer for a database file"""
+        writer = get_writer(self.db_path)
+        self.assertIs(writer, get_writer(os.path.join(self.temp_dir, ".", "audit.sqlite")))
+        writer.submit(INSERT_SQL, ("run-3", "R1", "Connectivity", "SUCCESS"))
+        flush_writer(self.db_path)
+        self.assertEqual(self._count(), 1)
+
+if __name__ == "__main__":
+    unittest.main()
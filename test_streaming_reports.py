@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the streaming report pipeline
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import openpyxl
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph
+
+from streaming_reports import (
+    ReportJobManager, StreamingStory, build_streaming_pdf, cached_chart,
+    chunked_table_flowables, create_write_only_workbook, save_workbook, styled_row, summary_hash
+)
+
+class TestStreamingReports(unittest.TestCase):
+    """Test cases for streaming PDF/Excel generation, chart caching and report jobs"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_streaming_story_pulls_lazily(self):
+        """Only the lookahead window is pulled from the flowable iterator"""
+        pulled = []
+
+        def source():
+            for i in range(100):
+                pulled.append(i)
+                yield i
+
+        story = StreamingStory(source(), lookahead=4)
+        self.assertEqual(len(story), 4)
+        self.assertEqual(len(pulled), 4)
+        del story[0]
+        self.assertEqual(len(story), 4)
+        self.assertEqual(len(pulled), 5)
+
+    def test_chunked_tables_repeat_header(self):
+        """Rows are split into fixed-size tables that each carry the header"""
+        rows = ([f"R{i}", "OK"] for i in range(450))
+        tables = list(chunked_table_flowables(["Router", "Status"], rows, [100, 100], [], chunk_rows=200))
+        self.assertEqual([len(t._cellvalues) for t in tables], [201, 201, 51])
+        self.assertTrue(all(t._cellvalues[0] == ["Router", "Status"] for t in tables))
+
+    def test_build_streaming_pdf(self):
+        """A multi-page PDF builds from a generator of flowables"""
+        styles = getSampleStyleSheet()
+
+        def flowables():
+            yield Paragraph("Report", styles['h1'])
+            yield from chunked_table_flowables(["Router", "Status"], ([f"R{i}", "OK"] for i in range(1000)), [200, 200], [])
+
+        pdf_path = build_streaming_pdf(os.path.join(self.temp_dir, "report.pdf"), flowables())
+        self.assertTrue(os.path.getsize(pdf_path) > 0)
+
+    def test_write_only_workbook(self):
+        """Rows appended to the write_only sheet round-trip through openpyxl"""
+        wb, sheet = create_write_only_workbook("Audit Summary")
+        sheet.append(styled_row(sheet, ["Router", "Status"], font=openpyxl.styles.Font(bold=True)))
+        for i in range(500):
+            sheet.append([f"R{i}", "OK"])
+        path = os.path.join(self.temp_dir, "report.xlsx")
+        wb.save(path)
+
+        loaded = openpyxl.load_workbook(path, read_only=True)["Audit Summary"]
+        rows = list(loaded.iter_rows(values_only=True))
+        self.assertEqual(rows[0], ("Router", "Status"))
+        self.assertEqual(len(rows), 501)
+
+    def test_concurrent_jobs_write_whole_reports(self):
+        """Two jobs building the same report never leave a mixed or partial file behind"""
+        path = os.path.join(self.temp_dir, "audit_summary_report.xlsx")
+        barrier = threading.Barrier(2)
+
+        def build(rows):
+            wb, sheet = create_write_only_workbook("Audit Summary")
+            for i in range(rows):
+                sheet.append([f"R{i}", "OK"])
+            barrier.wait(timeout=5)
+            return save_workbook(wb, path)
+
+        manager = ReportJobManager(max_workers=2)
+        jobs = [manager.submit("excel", build, rows) for rows in (300, 700)]
+        deadline = time.time() + 10
+        while time.time() < deadline and any(manager.get(j)["status"] in ("queued", "running") for j in jobs):
+            time.sleep(0.01)
+
+        self.assertEqual([manager.get(j)["status"] for j in jobs], ["completed", "completed"])
+        rows = len(list(openpyxl.load_workbook(path, read_only=True)["Audit Summary"].iter_rows(values_only=True)))
+        self.assertIn(rows, (300, 700))
+        self.assertEqual(os.listdir(self.temp_dir), ["audit_summary_report.xlsx"])
+
+        # A build that fails part-way leaves the previous report in place
+        def failing_flowables():
+            yield Paragraph("Report", getSampleStyleSheet()['h1'])
+            raise RuntimeError("boom")
+
+        pdf_path = build_streaming_pdf(os.path.join(self.temp_dir, "report.pdf"), iter([Paragraph("Old", getSampleStyleSheet()['h1'])]))
+        size = os.path.getsize(pdf_path)
+        with self.assertRaises(RuntimeError):
+            build_streaming_pdf(pdf_path, failing_flowables())
+        self.assertEqual(os.path.getsize(pdf_path), size)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ["audit_summary_report.xlsx", "report.pdf"])
+
+    def test_chart_cached_per_summary_hash(self):
+        """Charts render once per distinct summary and are reused afterwards"""
+        renders = []
+
+        def render(path):
+            renders.append(path)
+            with open(path, "wb") as f:
+                f.write(b"png")
+            return True
+
+        summary = {"collected": 5, "total_routers": 6}
+        first = cached_chart(self.temp_dir, "overall", summary, render)
+        second = cached_chart(self.temp_dir, "overall", dict(summary), render)
+        self.assertEqual(first, second)
+        self.assertEqual(len(renders), 1)
+
+        cached_chart(self.temp_dir, "overall", {"collected": 6, "total_routers": 6}, render)
+        self.assertEqual(len(renders), 2)
+        self.assertNotEqual(summary_hash(summary), summary_hash({"collected": 6, "total_routers": 6}))
+
+    def test_concurrent_chart_renders_serialized_and_atomic(self):
+        """Concurrent workers render a chart once, never overlap, and never expose a partial file"""
+        active, overlaps, renders = [], [], []
+
+        def render(path):
+            active.append(path)
+            overlaps.append(len(active) > 1)
+            renders.append(path)
+            self.assertNotEqual(os.path.basename(path), f"overall_{summary_hash({'collected': 1})}.png")
+            with open(path, "wb") as f:
+                f.write(b"part")
+                time.sleep(0.05)
+                f.write(b"ial-png")
+            active.remove(path)
+            return True
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cached_chart(self.temp_dir, "overall", {"collected": 1}, render)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(renders), 1)
+        self.assertFalse(any(overlaps))
+        self.assertEqual(len(set(results)), 1)
+        with open(results[0], "rb") as f:
+            self.assertEqual(f.read(), b"partial-png")
+        self.assertEqual(os.listdir(self.temp_dir), [os.path.basename(results[0])])
+
+    def test_chart_with_nothing_to_draw(self):
+        """A renderer returning False yields no chart path"""
+        self.assertIsNone(cached_chart(self.temp_dir, "empty", {}, lambda path: False))
+
+    def test_report_job_lifecycle(self):
+        """Jobs run in the background and report completion or failure"""
+        manager = ReportJobManager(max_workers=1)
+        ok_job = manager.submit("pdf", lambda: os.path.join(self.temp_dir, "done.pdf"))
+
+        def failing_build():
+            raise RuntimeError("boom")
+
+        bad_job = manager.submit("excel", failing_build)
+
+        deadline = time.time() + 5
+        while time.time() < deadline and any(manager.get(j)["status"] in ("queued", "running") for j in (ok_job, bad_job)):
+            time.sleep(0.01)
+
+        self.assertEqual(manager.get(ok_job)["status"], "completed")
+        self.assertEqual(manager.get(bad_job)["status"], "failed")
+        self.assertEqual(manager.get(bad_job)["error"], "boom")
+        self.assertIsNone(manager.get("unknown"))
+
+if __name__ == "__main__":
+    unittest.main()